@@ -51,6 +51,7 @@ ENVS_REQUIRES = [
     "fabric",
     "grpcio",
     "protobuf",
+    "zstandard",
 ]
 
 EXPLORER_REQUIRES = [
@@ -1,14 +1,25 @@
 import argparse
+import importlib
 import sys
+from typing import List, Optional
 
 import conductor
-import conductor.cli.run
-import conductor.cli.archive
-import conductor.cli.restore
-import conductor.cli.where
-import conductor.cli.clean
-import conductor.cli.gc
-import conductor.cli.explorer
+
+# The modules that implement Conductor's commands (in the order they are listed
+# in the help message). Each module has a `register_command()` function that
+# adds the command's parser. We only import the module of the command that is
+# being run because some commands have dependencies that are slow to import.
+_COMMAND_MODULES = {
+    "run": "conductor.cli.run",
+    "archive": "conductor.cli.archive",
+    "restore": "conductor.cli.restore",
+    "where": "conductor.cli.where",
+    "clean": "conductor.cli.clean",
+    "gc": "conductor.cli.gc",
+    "stats": "conductor.cli.stats",
+    "explorer": "conductor.cli.explorer",
+    "daemon": "conductor.cli.daemon",
+}
 
 
 def main():
@@ -27,13 +38,14 @@ def main():
         help="Run in debug mode (used mainly during Conductor development).",
     )
     subparsers = parser.add_subparsers(title="Commands")
-    conductor.cli.run.register_command(subparsers)
-    conductor.cli.archive.register_command(subparsers)
-    conductor.cli.restore.register_command(subparsers)
-    conductor.cli.where.register_command(subparsers)
-    conductor.cli.clean.register_command(subparsers)
-    conductor.cli.gc.register_command(subparsers)
-    conductor.cli.explorer.register_command(subparsers)
+    command = _find_command(sys.argv[1:])
+    if command is not None:
+        _register_command(subparsers, command)
+    else:
+        # Register all commands so that the help message (or the error message
+        # for an unknown command) lists them.
+        for module_command in _COMMAND_MODULES:
+            _register_command(subparsers, module_command)
     args = parser.parse_args()
 
     if args.version:
@@ -47,5 +59,22 @@ def main():
     args.func(args)
 
 
+def _find_command(argv: List[str]) -> Optional[str]:
+    """
+    Returns the command being run, or `None` if it is not a known command. The
+    command is the first positional argument (the top-level options do not take
+    values).
+    """
+    for arg in argv:
+        if arg.startswith("-"):
+            continue
+        return arg if arg in _COMMAND_MODULES else None
+    return None
+
+
+def _register_command(subparsers, command: str) -> None:
+    importlib.import_module(_COMMAND_MODULES[command]).register_command(subparsers)
+
+
 if __name__ == "__main__":
     main()
@@ -14,6 +14,7 @@ from conductor.utils.output_archiving import (
     generate_archive_name,
     create_archive,
     platform_archive_type,
+    ArchiveProgress,
     ArchiveType,
 )
 
@@ -120,8 +121,18 @@ def main(args):
         if len(tasks_to_archive_with_versions) == 0:
             raise NoTaskOutputsToArchive()
 
+        final_progress = None
+
+        def record_progress(progress: ArchiveProgress) -> None:
+            nonlocal final_progress
+            final_progress = progress
+
         create_archive(
-            ctx, tasks_to_archive_with_versions, output_archive_path, archive_type
+            ctx,
+            tasks_to_archive_with_versions,
+            output_archive_path,
+            archive_type,
+            progress=record_progress,
         )
 
         # Compute a relative path to the current working directory, if possible
@@ -130,6 +141,8 @@ def main(args):
         except ValueError:
             relative_output_path = output_archive_path
         print("✨ Done! Archive saved as", str(relative_output_path))
+        if final_progress is not None:
+            print("Archived", final_progress.summary())
 
     except:
         output_archive_path.unlink(missing_ok=True)
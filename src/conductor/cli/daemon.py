@@ -0,0 +1,103 @@
+import pathlib
+import subprocess
+import sys
+import time
+
+from conductor.config import (
+    DAEMON_LOG_FILE,
+    DAEMON_START_TIMEOUT_S,
+    OUTPUT_DIR,
+)
+from conductor.daemon.client import daemon_socket_path, send_request
+from conductor.errors import DaemonStartFailed, MissingProjectRoot
+from conductor.utils.project_root import find_project_root
+from conductor.utils.user_code import cli_command
+
+# How often to check whether the daemon has started (or stopped).
+_POLL_INTERVAL_S = 0.05
+
+
+def register_command(subparsers):
+    parser = subparsers.add_parser(
+        "daemon",
+        help="Manage the project's daemon, which keeps the project's state in "
+        "memory to speed up commands.",
+    )
+    parser.add_argument(
+        "action",
+        choices=["start", "stop", "status", "serve"],
+        help="The action to take. Use 'start' to start the daemon in the "
+        "background, 'stop' to stop it, and 'status' to check whether it is "
+        "running. 'serve' runs the daemon in the foreground.",
+    )
+    parser.set_defaults(func=main)
+
+
+@cli_command
+def main(args):
+    project_root = find_project_root(pathlib.Path.cwd())
+    if project_root is None:
+        raise MissingProjectRoot()
+
+    if args.action == "start":
+        _start_daemon(project_root)
+    elif args.action == "stop":
+        _stop_daemon(project_root)
+    elif args.action == "status":
+        response = send_request(project_root, {"command": "ping"})
+        if response is None:
+            print("The daemon is not running.")
+        else:
+            print("The daemon is running (pid {}).".format(response["pid"]))
+    else:
+        from conductor.daemon.server import DaemonServer
+
+        DaemonServer(project_root).serve_forever()
+
+
+def _start_daemon(project_root: pathlib.Path) -> None:
+    response = send_request(project_root, {"command": "ping"})
+    if response is not None:
+        print("The daemon is already running (pid {}).".format(response["pid"]))
+        return
+
+    output_path = project_root / OUTPUT_DIR
+    output_path.mkdir(exist_ok=True)
+    log_path = output_path / DAEMON_LOG_FILE
+    with open(log_path, "w", encoding="UTF-8") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "conductor", "daemon", "serve"],
+            cwd=project_root,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            # The daemon should keep running after this process exits (and it
+            # should not receive signals sent to the terminal).
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT_S
+    while time.monotonic() < deadline and process.poll() is None:
+        response = send_request(project_root, {"command": "ping"})
+        if response is not None:
+            print("Started the daemon (pid {}).".format(response["pid"]))
+            return
+        time.sleep(_POLL_INTERVAL_S)
+
+    if process.poll() is None:
+        process.terminate()
+    raise DaemonStartFailed(log_file=str(log_path))
+
+
+def _stop_daemon(project_root: pathlib.Path) -> None:
+    response = send_request(project_root, {"command": "stop"})
+    if response is None:
+        print("The daemon is not running.")
+        return
+
+    # The daemon removes its socket when it exits.
+    socket_path = daemon_socket_path(project_root)
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT_S
+    while time.monotonic() < deadline and socket_path.exists():
+        time.sleep(_POLL_INTERVAL_S)
+    print("Stopped the daemon (pid {}).".format(response["pid"]))
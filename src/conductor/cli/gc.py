@@ -17,7 +17,7 @@ _REGULAR_TASK_REGEX = re.compile(r"^(?P<name>[a-zA-Z0-9_-]+)\.task$")
 def register_command(subparsers) -> None:
     parser = subparsers.add_parser(
         "gc",
-        help="Removes failed experiment task outputs.",
+        help="Removes failed experiment task outputs and unused deduplicated files.",
     )
     parser.add_argument(
         "-n",
@@ -45,15 +45,17 @@ def main(args) -> None:
     }
 
     output_path = ctx.output_path
+    blob_store = ctx.blob_store
     cwd = pathlib.Path.cwd()
     assert output_path.is_absolute()
     stack = [output_path]
+    all_to_delete: List[pathlib.Path] = []
     while len(stack) > 0:
         curr_path = stack.pop()
         to_delete: List[pathlib.Path] = []
 
         for inner in curr_path.iterdir():
-            if not inner.is_dir():
+            if not inner.is_dir() or inner == blob_store.root:
                 continue
             exp_match = _EXPERIMENT_TASK_REGEX.match(inner.name)
             if exp_match is None:
@@ -76,8 +78,19 @@ def main(args) -> None:
         if args.dry_run:
             for exp_path in to_delete:
                 print("Would delete", str(exp_path.relative_to(cwd)))
+            all_to_delete.extend(to_delete)
         else:
             for exp_path in to_delete:
                 if args.verbose:
                     print("Deleting", str(exp_path.relative_to(cwd)))
                 shutil.rmtree(exp_path, ignore_errors=True)
+
+    # Remove the deduplicated files that are no longer part of any task output
+    # (e.g., because they were only used by the deleted task outputs).
+    if args.dry_run:
+        for blob_path in blob_store.unreferenced_blobs(ignored_paths=all_to_delete):
+            print("Would delete", str(blob_path.relative_to(cwd)))
+    else:
+        for blob_path in blob_store.remove_unreferenced():
+            if args.verbose:
+                print("Deleted", str(blob_path.relative_to(cwd)))
@@ -3,7 +3,7 @@ import pathlib
 from conductor.context import Context
 from conductor.errors import ArchiveFileInvalid
 from conductor.utils.user_code import cli_command
-from conductor.utils.output_archiving import restore_archive
+from conductor.utils.output_archiving import ArchiveProgress, restore_archive
 
 
 def register_command(subparsers):
@@ -32,4 +32,15 @@ def main(args):
     if not archive_file.is_file():
         raise ArchiveFileInvalid()
 
-    restore_archive(ctx, archive_file, expect_no_duplicates=args.strict)
+    final_progress = None
+
+    def record_progress(progress: ArchiveProgress) -> None:
+        nonlocal final_progress
+        final_progress = progress
+
+    num_restored = restore_archive(
+        ctx, archive_file, expect_no_duplicates=args.strict, progress=record_progress
+    )
+    print("✨ Done! Restored {} task output(s).".format(num_restored))
+    if final_progress is not None:
+        print("Extracted", final_progress.summary())
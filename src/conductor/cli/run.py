@@ -1,7 +1,9 @@
 import multiprocessing
+import os
 import sys
+from typing import TYPE_CHECKING
 
-from conductor.context import Context
+from conductor.daemon.client import forward_command
 from conductor.errors import (
     InvalidJobsCount,
     CannotSelectJobCount,
@@ -12,11 +14,12 @@ from conductor.errors import (
     AtLeastCommitNotAncestor,
 )
 from conductor.task_identifier import TaskIdentifier
-from conductor.execution.executor import Executor
-from conductor.execution.planning.planner import ExecutionPlanner
 from conductor.utils.user_code import cli_command
 from conductor.utils.colored_output import print_bold
 
+if TYPE_CHECKING:
+    from conductor.context import Context
+
 # Value used to indicate when Conductor should select the maximum number of
 # parallel tasks.
 _AUTOFILL_JOBS = -1
@@ -104,7 +107,7 @@ def validate_and_retrieve_jobs_count(args) -> int:
         return args.jobs
 
 
-def validate_args(args, ctx: Context):
+def validate_args(args, ctx: "Context"):
     for_commit = args.this_commit or args.at_least is not None
     if args.this_commit and args.at_least is not None:
         raise CannotSetBothCommitFlags()
@@ -118,21 +121,29 @@ def validate_args(args, ctx: Context):
 
 @cli_command
 def main(args):
-    num_jobs = validate_and_retrieve_jobs_count(args)
+    # Checking tasks does not execute them, so the daemon can do it (if it is
+    # running).
+    if args.check and forward_command("run", args):
+        return
+
+    # N.B. These modules are slow to import, so we only import them if the
+    # command runs locally.
+    from conductor.context import Context
+    from conductor.execution.executor import Executor
+    from conductor.execution.planning.planner import ExecutionPlanner
+
     ctx = Context.from_cwd()
+    if args.check:
+        check_tasks(ctx, args)
+        return
+
+    num_jobs = validate_and_retrieve_jobs_count(args)
     validate_args(args, ctx)
     task_identifier = TaskIdentifier.from_str(
         args.task_identifier,
         require_prefix=False,
     )
-    ctx.task_index.load_transitive_closure(task_identifier)
-
-    if args.check:
-        print_bold(
-            "✓ Task(s) are OK. Skipping execution because --check was set.",
-            file=sys.stderr,
-        )
-        return
+    ctx.task_index.load_transitive_closure(task_identifier, num_workers=num_jobs)
 
     # Convert the specified commit to a hash, if needed.
     commit = None
@@ -146,7 +157,13 @@ def main(args):
 
         # Validate the commit hash. It must be an ancestor of the current commit.
         assert ctx.current_commit is not None
-        commit_is_ancestor = ctx.git.is_ancestor(ctx.current_commit.hash, commit)
+        commit_graph = ctx.commit_graph
+        if commit_graph is not None:
+            commit_is_ancestor = commit_graph.is_ancestor(
+                ctx.current_commit.hash, commit
+            )
+        else:
+            commit_is_ancestor = ctx.git.is_ancestor(ctx.current_commit.hash, commit)
         if not commit_is_ancestor:
             raise AtLeastCommitNotAncestor()
 
@@ -156,3 +173,25 @@ def main(args):
     )
     executor = Executor(execution_slots=num_jobs)
     executor.run_plan(plan, ctx, stop_on_first_error=args.stop_early)
+
+
+def check_tasks(ctx: "Context", args):
+    """
+    Parses and validates the tasks that would be executed, without executing
+    them.
+    """
+    validate_and_retrieve_jobs_count(args)
+    validate_args(args, ctx)
+    task_identifier = TaskIdentifier.from_str(
+        args.task_identifier,
+        require_prefix=False,
+    )
+    # When only checking the tasks, parsing is the bulk of the work so we use
+    # all available cores.
+    ctx.task_index.load_transitive_closure(
+        task_identifier, num_workers=os.cpu_count() or 1
+    )
+    print_bold(
+        "✓ Task(s) are OK. Skipping execution because --check was set.",
+        file=sys.stderr,
+    )
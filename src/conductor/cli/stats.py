@@ -0,0 +1,123 @@
+import math
+from typing import List, Optional, Sequence
+
+from conductor.context import Context
+from conductor.execution.version_index import TaskExecution
+from conductor.task_identifier import TaskIdentifier
+from conductor.task_types.base import TaskType
+from conductor.utils.user_code import cli_command
+
+_PERCENTILES = [50, 90, 99]
+
+_SIZE_UNITS = ["B", "KiB", "MiB", "GiB", "TiB"]
+
+
+def register_command(subparsers):
+    parser = subparsers.add_parser(
+        "stats",
+        help="Prints resource usage statistics about previous task executions.",
+    )
+    parser.add_argument(
+        "task_identifier",
+        type=str,
+        nargs="?",
+        help="Only print statistics about this task and its dependencies. If "
+        "unspecified, Conductor will print statistics about all tasks that it has "
+        "executed.",
+    )
+    parser.set_defaults(func=main)
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """
+    Returns the `p`-th percentile (0 <= p <= 100) of the given non-empty,
+    sorted values, using linear interpolation between the closest ranks.
+    """
+    assert len(sorted_values) > 0
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        rank - lower
+    )
+
+
+def compute_tasks_to_report(
+    ctx: Context, raw_task_identifier: Optional[str]
+) -> Optional[List[TaskIdentifier]]:
+    if raw_task_identifier is None:
+        return None
+
+    task_identifier = TaskIdentifier.from_str(
+        raw_task_identifier,
+        require_prefix=False,
+    )
+    ctx.task_index.load_transitive_closure(task_identifier)
+
+    relevant_tasks: List[TaskIdentifier] = []
+
+    def append(task: TaskType):
+        if task.identifier not in relevant_tasks:
+            relevant_tasks.append(task.identifier)
+
+    root_task = ctx.task_index.get_task(task_identifier)
+    root_task.traverse(ctx, append)
+    return relevant_tasks
+
+
+@cli_command
+def main(args):
+    ctx = Context.from_cwd()
+    tasks_to_report = compute_tasks_to_report(ctx, args.task_identifier)
+    executions = ctx.version_index.get_task_executions(tasks_to_report)
+    if len(executions) == 0:
+        print("No task execution statistics have been recorded yet.")
+        return
+
+    header = ["Task", "Runs"]
+    header.extend("Wall p{}".format(p) for p in _PERCENTILES)
+    header.extend(["CPU p50", "Peak RSS max", "Output p50"])
+    rows = [header]
+    for task_id in sorted(executions.keys(), key=str):
+        rows.append(_summarize(task_id, executions[task_id]))
+
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    for row in rows:
+        # Left-align the task identifier, right-align the numeric columns.
+        cells = [row[0].ljust(widths[0])]
+        cells.extend(cell.rjust(width) for cell, width in zip(row[1:], widths[1:]))
+        print("  ".join(cells).rstrip())
+
+
+def _summarize(task_id: TaskIdentifier, executions: List[TaskExecution]) -> List[str]:
+    wall_times = sorted(e.wall_time_s for e in executions)
+    cpu_times = sorted(e.cpu_time_s for e in executions if e.cpu_time_s is not None)
+    peak_rss = [e.peak_rss_kb for e in executions if e.peak_rss_kb is not None]
+    output_bytes = sorted(
+        e.output_bytes for e in executions if e.output_bytes is not None
+    )
+
+    row = [str(task_id), str(len(executions))]
+    row.extend(_format_seconds(percentile(wall_times, p)) for p in _PERCENTILES)
+    row.append(
+        _format_seconds(percentile(cpu_times, 50)) if len(cpu_times) > 0 else "-"
+    )
+    row.append(_format_bytes(max(peak_rss) * 1024) if len(peak_rss) > 0 else "-")
+    row.append(
+        _format_bytes(percentile(output_bytes, 50)) if len(output_bytes) > 0 else "-"
+    )
+    return row
+
+
+def _format_seconds(seconds: float) -> str:
+    return "{:.2f}s".format(seconds)
+
+
+def _format_bytes(num_bytes: float) -> str:
+    for unit in _SIZE_UNITS[:-1]:
+        if num_bytes < 1024:
+            return "{:.1f} {}".format(num_bytes, unit)
+        num_bytes /= 1024
+    return "{:.1f} {}".format(num_bytes, _SIZE_UNITS[-1])
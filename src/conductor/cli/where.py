@@ -1,6 +1,11 @@
+from typing import TYPE_CHECKING
+
+from conductor.daemon.client import forward_command
 from conductor.errors import NoTaskOutputPath
 from conductor.utils.user_code import cli_command
-from conductor.lib.path import where
+
+if TYPE_CHECKING:
+    from conductor.context import Context
 
 
 def register_command(subparsers):
@@ -33,7 +38,20 @@ def register_command(subparsers):
 
 @cli_command
 def main(args):
-    result = where(
+    if forward_command("where", args):
+        return
+    # N.B. The context is slow to import, so we only import it when the command
+    # runs locally (i.e., when the daemon is not running).
+    from conductor.context import Context
+
+    print_output_path(Context.from_cwd(), args)
+
+
+def print_output_path(ctx: "Context", args):
+    from conductor.lib.path import _where
+
+    result = _where(
+        ctx,
         args.task_identifier,
         relative_to_project_root=args.project,
         non_existent_ok=args.non_existent_ok,
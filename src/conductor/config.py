@@ -15,6 +15,45 @@ TASK_OUTPUT_DIR_SUFFIX = ".task"
 # The file name of the on-disk version index.
 VERSION_INDEX_NAME = "version_index.sqlite"
 
+# The file name of the on-disk commit ancestry index.
+COMMIT_INDEX_NAME = "commit_index.sqlite"
+
+# The file name of the on-disk index of task input fingerprints.
+FINGERPRINT_INDEX_NAME = "fingerprint_index.sqlite"
+
+# The file name of the on-disk COND file parse cache.
+COND_PARSE_CACHE_NAME = "cond_parse_cache.sqlite"
+
+# The file name of the UNIX socket that Conductor's daemon listens on (it is
+# stored in the output directory).
+DAEMON_SOCKET_NAME = "daemon.sock"
+
+# The file name of the daemon's log (it is stored in the output directory).
+DAEMON_LOG_FILE = "daemon.log"
+
+# The daemon exits if it does not receive a command for this many seconds.
+DAEMON_IDLE_TIMEOUT_S = 3 * 60 * 60
+
+# How long `cond daemon start` waits for the daemon to start accepting commands.
+DAEMON_START_TIMEOUT_S = 10
+
+# Changes to the version index made by finished tasks are committed together
+# if they are made within this many seconds of each other (a "group commit").
+VERSION_INDEX_GROUP_COMMIT_WINDOW_S = 0.5
+
+# A process that is running a task whose results other processes can reuse
+# (i.e., a task that declares its inputs) holds an "execution lease" on the
+# task. It renews the lease at this interval (in seconds).
+EXECUTION_LEASE_HEARTBEAT_INTERVAL_S = 10.0
+
+# A lease that has not been renewed for this many seconds is considered stale
+# (e.g., its process was killed), so another process can take it over.
+EXECUTION_LEASE_TIMEOUT_S = 60.0
+
+# How often a process that is waiting for another process' execution lease
+# checks whether the lease was released.
+EXECUTION_LEASE_POLL_INTERVAL_S = 1.0
+
 # A template for the version index backup when performing a version migration.
 VERSION_INDEX_BACKUP_NAME_TEMPLATE = "version_index_backup-v{vfrom}-v{vto}.sqlite"
 
@@ -47,8 +86,21 @@ ARCHIVE_FILE_NAME_TEMPLATE = "cond-archive+{timestamp}.tar.{extension}"
 # The file name of the version index used in a Conductor archive.
 ARCHIVE_VERSION_INDEX = "version_index_archive.sqlite"
 
-# The name of the staging directory where archived files are temporarily extracted.
-ARCHIVE_STAGING = "archive-tmp"
+# The prefix of the (temporary) directories used to stage an archive's version
+# index while the archive is created or restored.
+ARCHIVE_INDEX_STAGING_PREFIX = "archive-index-"
+
+# The prefix of the (temporary) directories inside the output directory where
+# streamed archives are extracted before their task outputs are moved into place.
+ARCHIVE_STAGING_PREFIX = "archive-staging-"
+
+# The size of the chunks used to stream archives to and from remote environments.
+ARCHIVE_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# The directory (inside the output directory) of the content-addressed store of
+# deduplicated task output files. Task paths cannot contain a ".", so this
+# directory never collides with a task's output directory.
+BLOB_STORE_DIR = ".blobs"
 
 # The names of the files that store copies of a task's standard output and error.
 STDOUT_LOG_FILE = "stdout.log"
@@ -76,7 +128,8 @@ MAESTRO_LOG_FILE = "maestro.log"
 MAESTRO_COND_WHEEL_TEMPLATE = "conductor_cli-{version}-py3-none-any.whl"
 MAESTRO_BUNDLE_LOCATION = "bundles"
 MAESTRO_WORKSPACE_LOCATION = "workspaces"
+MAESTRO_MIRROR_LOCATION = "mirrors"
+MAESTRO_OUTPUT_STORE_LOCATION = "output_store"
 MAESTRO_WORKSPACE_NAME_FORMAT = "{name}.{timestamp}"
-MAESTRO_TASK_TRANSFER_LOCATION = "task_outputs"
 
 MAESTRO_PYTHON_VERSION = "3.10.12"
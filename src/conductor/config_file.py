@@ -3,6 +3,7 @@ import pathlib
 
 from typing import Any, Dict
 from conductor.errors import ConfigParseError, ConfigInvalidValue
+from conductor.utils.run_resources import ResourceAmount, is_valid_capacity
 
 
 class ConfigFile:
@@ -30,6 +31,57 @@ class ConfigFile:
             )
         return value
 
+    @property
+    def cache_cond_files(self) -> bool:
+        # Caches the tasks parsed from COND files (keyed by the files' contents).
+        # Default: False
+        if _CACHE_COND_FILES_KEY not in self._raw_config:
+            return False
+        value = self._raw_config[_CACHE_COND_FILES_KEY]
+        if type(value) is not bool:
+            raise ConfigInvalidValue(
+                config_key=_CACHE_COND_FILES_KEY
+            ).add_extra_context("The value must be a boolean.")
+        return value
+
+    @property
+    def deduplicate_outputs(self) -> bool:
+        # Stores the files in experiment task outputs in a content-addressed
+        # blob store, hard linking identical files instead of keeping copies.
+        # Default: False
+        if _DEDUPLICATE_OUTPUTS_KEY not in self._raw_config:
+            return False
+        value = self._raw_config[_DEDUPLICATE_OUTPUTS_KEY]
+        if type(value) is not bool:
+            raise ConfigInvalidValue(
+                config_key=_DEDUPLICATE_OUTPUTS_KEY
+            ).add_extra_context("The value must be a boolean.")
+        return value
+
+    @property
+    def resources(self) -> Dict[str, ResourceAmount]:
+        # The machine's capacity for each resource that tasks can request (see
+        # the `resources` argument of `run_experiment()` and `run_command()`).
+        # Capacities for `cpus` and `memory_gb` that are not set here are
+        # detected automatically.
+        # Default: {}
+        if _RESOURCES_KEY not in self._raw_config:
+            return {}
+        value = self._raw_config[_RESOURCES_KEY]
+        if type(value) is not dict:
+            raise ConfigInvalidValue(config_key=_RESOURCES_KEY).add_extra_context(
+                "The value must be a table."
+            )
+        for resource, capacity in value.items():
+            if not is_valid_capacity(capacity):
+                raise ConfigInvalidValue(
+                    config_key="{}.{}".format(_RESOURCES_KEY, resource)
+                ).add_extra_context("The value must be a non-negative number.")
+        return value
+
 
 # Config keys (global)
 _DISABLE_GIT_KEY = "disable_git"
+_CACHE_COND_FILES_KEY = "cache_cond_files"
+_DEDUPLICATE_OUTPUTS_KEY = "deduplicate_outputs"
+_RESOURCES_KEY = "resources"
@@ -1,15 +1,28 @@
-import itertools
 import pathlib
-from typing import Optional, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 
-from conductor.config import CONFIG_FILE_NAME, OUTPUT_DIR, VERSION_INDEX_NAME
+from conductor.config import (
+    BLOB_STORE_DIR,
+    COMMIT_INDEX_NAME,
+    COND_PARSE_CACHE_NAME,
+    CONFIG_FILE_NAME,
+    FINGERPRINT_INDEX_NAME,
+    OUTPUT_DIR,
+    VERSION_INDEX_NAME,
+)
 from conductor.config_file import ConfigFile
 from conductor.envs.manager import EnvManager
 from conductor.errors import MissingProjectRoot, OutputDirTaken
+from conductor.execution.blob_store import BlobStore
+from conductor.execution.commit_index import CommitIndex
+from conductor.execution.fingerprint_index import FingerprintIndex
 from conductor.execution.version_index import VersionIndex, Version
+from conductor.parsing.parse_cache import CondParseCache
 from conductor.parsing.task_index import TaskIndex
 from conductor.task_identifier import TaskIdentifier
-from conductor.utils.git import Git
+from conductor.utils.git import Git, CommitGraph
+from conductor.utils.project_root import find_project_root
 from conductor.utils.tee import TeeProcessor
 
 
@@ -19,9 +32,16 @@ class Context:
     carry out Conductor's functionality.
     """
 
-    def __init__(self, project_root: pathlib.Path):
+    def __init__(
+        self,
+        project_root: pathlib.Path,
+        parse_cache: Optional[CondParseCache] = None,
+    ):
+        """
+        If `parse_cache` is set, it is used instead of the on-disk COND file
+        parse cache (e.g., the daemon uses a cache that it keeps in memory).
+        """
         self._project_root = project_root
-        self._task_index = TaskIndex(self._project_root)
         self._output_path = project_root / OUTPUT_DIR
         self._ensure_output_dir_exists()
 
@@ -29,20 +49,51 @@ class Context:
             pathlib.Path(self._project_root, CONFIG_FILE_NAME)
         )
 
+        if parse_cache is None and self._config_file.cache_cond_files:
+            parse_cache = CondParseCache(
+                self._project_root,
+                pathlib.Path(self.output_path, COND_PARSE_CACHE_NAME),
+            )
+        self._parse_cache = parse_cache
+        self._task_index = TaskIndex(self._project_root, parse_cache=parse_cache)
+
         self._git = Git(self._project_root)
         self._uses_git_fetched = False
         self._uses_git = False
         self._curr_commit_fetched = False
         self._curr_commit: Optional[Git.Commit] = None
+        self._commit_graph_fetched = False
+        self._commit_graph: Optional[CommitGraph] = None
 
         self._version_index = VersionIndex.create_or_load(
-            pathlib.Path(self.output_path, VERSION_INDEX_NAME)
+            pathlib.Path(self.output_path, VERSION_INDEX_NAME), write_ahead_log=True
         )
 
+        # The fingerprint index is only needed by tasks that declare their
+        # inputs, so we create it lazily.
+        self._fingerprint_index: Optional[FingerprintIndex] = None
+
+        # Fingerprints computed while planning, keyed by what was computed,
+        # the task, and `at_least_commit`. A task's fingerprint depends on the
+        # fingerprints of all of its transitive dependencies, so we memoize
+        # them (see `TaskType._deps_fingerprint()`).
+        self._fingerprint_memo: Dict[
+            Tuple[str, TaskIdentifier, Optional[str]], Optional[str]
+        ] = {}
+
         # We lazily initialize the TeeProcessor because it may not always be needed.
         self._tee_processor: Optional[TeeProcessor] = None
 
-        self._env_manager: Optional[EnvManager] = EnvManager.create()
+        # Deduplicates task outputs in the background (see
+        # `deduplicate_in_background()`). Created lazily.
+        self._deduplicator: Optional[ThreadPoolExecutor] = None
+        self._pending_deduplications: List[Future] = []
+
+        # Creating the environment manager imports the dependencies needed to
+        # use remote environments, which are slow to import. So we only create
+        # it when it is first used (i.e., when a plan uses environments).
+        self._env_manager_created = False
+        self._env_manager: Optional[EnvManager] = None
 
         # Used during execution to store task output versions that are passed
         # between tasks executed in a remote environment.
@@ -54,12 +105,10 @@ class Context:
         Creates a new `Context` by searching for the project root from the
         current working directory.
         """
-        here = pathlib.Path.cwd()
-        for path in itertools.chain([here], here.parents):
-            maybe_config_path = path / CONFIG_FILE_NAME
-            if maybe_config_path.is_file():
-                return cls(project_root=path)
-        raise MissingProjectRoot()
+        project_root = find_project_root(pathlib.Path.cwd())
+        if project_root is None:
+            raise MissingProjectRoot()
+        return cls(project_root=project_root)
 
     @property
     def project_root(self) -> pathlib.Path:
@@ -69,6 +118,10 @@ class Context:
     def output_path(self) -> pathlib.Path:
         return self._output_path
 
+    @property
+    def config_file(self) -> ConfigFile:
+        return self._config_file
+
     @property
     def task_index(self) -> TaskIndex:
         return self._task_index
@@ -77,6 +130,31 @@ class Context:
     def version_index(self) -> VersionIndex:
         return self._version_index
 
+    @property
+    def fingerprint_index(self) -> FingerprintIndex:
+        if self._fingerprint_index is None:
+            self._fingerprint_index = FingerprintIndex.create_or_load(
+                pathlib.Path(self.output_path, FINGERPRINT_INDEX_NAME)
+            )
+        return self._fingerprint_index
+
+    @property
+    def fingerprint_memo(
+        self,
+    ) -> Dict[Tuple[str, TaskIdentifier, Optional[str]], Optional[str]]:
+        """
+        Memoized task fingerprints. This must be cleared when a task's most
+        relevant version changes, since the fingerprints of the tasks that
+        depend on it change too.
+        """
+        return self._fingerprint_memo
+
+    @property
+    def blob_store(self) -> BlobStore:
+        # N.B. The store is used (e.g., when archives are restored) even if
+        # new task outputs are not deduplicated.
+        return BlobStore(self.output_path / BLOB_STORE_DIR)
+
     @property
     def git(self) -> Git:
         return self._git
@@ -95,6 +173,24 @@ class Context:
             self._curr_commit_fetched = True
         return self._curr_commit
 
+    @property
+    def commit_graph(self) -> Optional[CommitGraph]:
+        """
+        The in-memory ancestry of the current commit. This is `None` if the
+        project does not use git or if there are no commits.
+        """
+        if not self._commit_graph_fetched:
+            curr_commit = self.current_commit
+            if curr_commit is not None:
+                commit_index = CommitIndex.create_or_load(
+                    pathlib.Path(self.output_path, COMMIT_INDEX_NAME)
+                )
+                self._commit_graph = commit_index.load_commit_graph(
+                    self._git, curr_commit.hash
+                )
+            self._commit_graph_fetched = True
+        return self._commit_graph
+
     @property
     def tee_processor(self) -> TeeProcessor:
         if self._tee_processor is None:
@@ -103,12 +199,58 @@ class Context:
 
     @property
     def envs(self) -> Optional[EnvManager]:
+        if not self._env_manager_created:
+            self._env_manager = EnvManager.create()
+            self._env_manager_created = True
         return self._env_manager
 
     @property
     def env_task_versions(self) -> Dict[TaskIdentifier, Version]:
         return self._env_task_versions
 
+    def deduplicate_in_background(self, output_path: pathlib.Path) -> None:
+        """
+        Adds the files under `output_path` to the blob store (see
+        `BlobStore.deduplicate()`) on a background thread. Hashing a large
+        task output takes a while and the task's dependents do not need to
+        wait for it.
+        """
+        if self._deduplicator is None:
+            # N.B. One thread is enough; deduplication is mostly disk-bound.
+            self._deduplicator = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="conductor-dedup"
+            )
+        # Forget the deduplications that succeeded (e.g., Maestro never waits
+        # for them).
+        self._pending_deduplications = [
+            future
+            for future in self._pending_deduplications
+            if not future.done() or future.exception() is not None
+        ]
+        self._pending_deduplications.append(
+            self._deduplicator.submit(self.blob_store.deduplicate, output_path)
+        )
+
+    def wait_for_deduplication(self) -> None:
+        """
+        Waits until the task outputs passed to `deduplicate_in_background()`
+        are deduplicated. This raises the first error encountered, if any.
+        """
+        pending = self._pending_deduplications
+        self._pending_deduplications = []
+        for future in pending:
+            future.result()
+
+    def reset_task_index(self) -> None:
+        """
+        Discards the loaded tasks so that they are loaded again when they are
+        next used. Loaded tasks cache state (e.g., their most relevant output
+        version), so this is used when a `Context` is reused across commands.
+        The parse cache is kept.
+        """
+        self._task_index = TaskIndex(self._project_root, parse_cache=self._parse_cache)
+        self._fingerprint_memo.clear()
+
     def use_cloned_version_index(self) -> None:
         self._version_index = self._version_index.clone()
 
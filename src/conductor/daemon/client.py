@@ -0,0 +1,89 @@
+import json
+import os
+import pathlib
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+import conductor
+from conductor.config import DAEMON_SOCKET_NAME, OUTPUT_DIR
+from conductor.utils.project_root import find_project_root
+
+# N.B. This module is imported by the commands that can be forwarded to the
+# daemon, so it should only import modules that are fast to import.
+
+# UNIX socket paths are limited to 108 bytes on Linux (104 on macOS).
+_MAX_SOCKET_PATH_LENGTH = 100
+
+
+def daemon_socket_path(project_root: pathlib.Path) -> pathlib.Path:
+    return project_root / OUTPUT_DIR / DAEMON_SOCKET_NAME
+
+
+def socket_address(socket_path: pathlib.Path) -> Optional[str]:
+    """
+    Returns the address to use to bind or connect to the UNIX socket at
+    `socket_path`. A relative path is used if the absolute path is too long.
+    Returns `None` if both paths are too long.
+    """
+    address = str(socket_path)
+    if len(address) <= _MAX_SOCKET_PATH_LENGTH:
+        return address
+    address = os.path.relpath(socket_path)
+    if len(address) <= _MAX_SOCKET_PATH_LENGTH:
+        return address
+    return None
+
+
+def send_request(
+    project_root: pathlib.Path, request: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Sends a request to the project's daemon and returns its response. Returns
+    `None` if the daemon is not running.
+    """
+    address = socket_address(daemon_socket_path(project_root))
+    if address is None:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(address)
+        except OSError:
+            # The daemon is not running (the socket may be left over from a
+            # daemon that did not shut down cleanly).
+            return None
+        request = {"version": conductor.__version__, **request}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as response_file:
+            response_line = response_file.readline()
+        if len(response_line) == 0:
+            return None
+        return json.loads(response_line)
+    finally:
+        sock.close()
+
+
+def forward_command(command: str, args) -> bool:
+    """
+    Runs the command in the project's daemon, if one is running, and prints its
+    output. This exits the process with the command's exit code if the command
+    failed.
+
+    Returns `False` if the command could not be forwarded (e.g., because the
+    daemon is not running). In that case, the command should run locally.
+    """
+    project_root = find_project_root(pathlib.Path.cwd())
+    if project_root is None or not daemon_socket_path(project_root).exists():
+        return False
+    command_args = {key: value for key, value in vars(args).items() if key != "func"}
+    response = send_request(project_root, {"command": command, "args": command_args})
+    if response is None or response["status"] != "ok":
+        # N.B. The daemon rejects commands from a different version of
+        # Conductor.
+        return False
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    if response["exit_code"] != 0:
+        sys.exit(response["exit_code"])
+    return True
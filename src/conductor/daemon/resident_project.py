@@ -0,0 +1,134 @@
+import os
+import pathlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from conductor.config import CONFIG_FILE_NAME
+from conductor.context import Context
+from conductor.parsing.parse_cache import CondParseCache, hash_file
+from conductor.utils.git import Git
+
+# A file's (size, modification time, inode number), or `None` if the file does
+# not exist. A file is assumed to be unchanged if its signature is unchanged.
+FileSignature = Optional[Tuple[int, int, int]]
+
+
+def file_signature(path: pathlib.Path) -> FileSignature:
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+
+
+class _ParsedCondFile(NamedTuple):
+    signature: FileSignature
+    includes: List[Tuple[pathlib.Path, FileSignature]]
+    raw_tasks: Dict[str, Dict]
+
+
+class ResidentParseCache(CondParseCache):
+    """
+    A COND file parse cache that is kept in memory (it is used by the daemon).
+
+    Unlike the on-disk cache, entries are validated using the signatures of
+    the COND file and the files it includes. So checking whether a parsed COND
+    file is still valid does not read any files.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, project_root: pathlib.Path):
+        # N.B. This cache does not use the on-disk cache's database.
+        self._project_root = project_root
+        self._entries: Dict[pathlib.Path, _ParsedCondFile] = {}
+
+    def lookup(self, cond_file_path: pathlib.Path) -> Optional[Dict[str, Dict]]:
+        entry = self._entries.get(cond_file_path, None)
+        if entry is None or entry.signature != file_signature(cond_file_path):
+            return None
+        for include_path, include_signature in entry.includes:
+            if file_signature(include_path) != include_signature:
+                return None
+        # N.B. Raw tasks are copied before they are materialized, so they can
+        # be shared.
+        return entry.raw_tasks
+
+    def store(
+        self,
+        cond_file_path: pathlib.Path,
+        file_hash: str,
+        included_files: List[pathlib.Path],
+        raw_tasks: Dict[str, Dict],
+    ) -> None:
+        signature = file_signature(cond_file_path)
+        # The file may have been modified after it was parsed. Its hash is
+        # checked after its signature is taken so that such modifications are
+        # detected when the entry is next used.
+        if signature is None or hash_file(cond_file_path) != file_hash:
+            return
+        self._entries[cond_file_path] = _ParsedCondFile(
+            signature=signature,
+            includes=[
+                (include_path, file_signature(include_path))
+                for include_path in included_files
+            ],
+            raw_tasks=raw_tasks,
+        )
+
+
+class ResidentProject:
+    """
+    The project state that the daemon keeps in memory between commands: the
+    parsed COND files, the open version index, and the project's git state.
+
+    Before each command, the state is validated using file signatures. Parsed
+    COND files are invalidated when they (or the files they include) change.
+    The `Context` (and with it, the git state) is recreated when the project's
+    configuration file or the checked out commit (i.e., git's `HEAD`) changes.
+    """
+
+    def __init__(self, project_root: pathlib.Path):
+        self._project_root = project_root
+        self._parse_cache = ResidentParseCache(project_root)
+        self._git_dir = Git(project_root).git_dir()
+        self._ctx: Optional[Context] = None
+        self._ctx_signature: List[FileSignature] = []
+
+    @property
+    def project_root(self) -> pathlib.Path:
+        return self._project_root
+
+    def context(self) -> Context:
+        """
+        Returns a `Context` for running a command. The returned context does
+        not have any loaded tasks.
+        """
+        if (
+            self._git_dir is None
+            and file_signature(self._project_root / ".git") is not None
+        ):
+            # The project started using git after the daemon started.
+            self._git_dir = Git(self._project_root).git_dir()
+
+        signature = self._compute_signature()
+        if self._ctx is None or signature != self._ctx_signature:
+            self._ctx = Context(self._project_root, parse_cache=self._parse_cache)
+            self._ctx_signature = signature
+        else:
+            self._ctx.reset_task_index()
+        return self._ctx
+
+    def _compute_signature(self) -> List[FileSignature]:
+        paths = [self._project_root / CONFIG_FILE_NAME]
+        if self._git_dir is not None:
+            head_path = self._git_dir / "HEAD"
+            paths.append(head_path)
+            paths.append(self._git_dir / "packed-refs")
+            # If a branch is checked out, `HEAD` refers to the branch (and its
+            # file changes when a commit is made on the branch).
+            try:
+                head = head_path.read_text(encoding="UTF-8").strip()
+                if head.startswith("ref: "):
+                    paths.append(self._git_dir / head[len("ref: ") :])
+            except OSError:
+                pass
+        return [file_signature(path) for path in paths]
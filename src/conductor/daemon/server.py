@@ -0,0 +1,161 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import socket
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+import conductor
+import conductor.cli.run as run_cli
+import conductor.cli.where as where_cli
+from conductor.config import DAEMON_IDLE_TIMEOUT_S
+from conductor.context import Context
+from conductor.daemon.client import daemon_socket_path, socket_address
+from conductor.daemon.resident_project import ResidentProject
+from conductor.errors import ConductorAbort, ConductorError, DaemonSocketPathTooLong
+from conductor.errors.signal import register_signal_handlers
+from conductor.utils.user_code import print_error
+
+# The commands that can be forwarded to the daemon. These commands do not
+# execute tasks or modify the project's state, so they can run against the
+# daemon's (long-lived) context.
+_COMMANDS: Dict[str, Callable[[Context, Any], None]] = {
+    "where": where_cli.print_output_path,
+    "run": run_cli.check_tasks,
+}
+
+# How often the daemon checks whether it should exit when it is idle.
+_POLL_INTERVAL_S = 1.0
+
+
+class DaemonServer:
+    """
+    Conductor's daemon. It keeps a project's state (e.g., its parsed COND
+    files) in memory and runs commands forwarded by `cond` over a UNIX socket
+    in the project's output directory.
+
+    Each connection carries one request and one response, each of which is a
+    line of JSON. The daemon handles requests one at a time.
+    """
+
+    def __init__(self, project_root: pathlib.Path):
+        self._project = ResidentProject(project_root)
+        self._socket_path = daemon_socket_path(project_root)
+        self._should_stop = False
+        self._last_request_time = time.monotonic()
+
+    def serve_forever(self) -> None:
+        """
+        Serves requests until the daemon is stopped, it is idle for too long,
+        or its socket is removed (e.g., by `cond clean`).
+        """
+        address = socket_address(self._socket_path)
+        if address is None:
+            raise DaemonSocketPathTooLong(socket_path=str(self._socket_path))
+        with contextlib.suppress(FileNotFoundError):
+            self._socket_path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        socket_inode: Optional[int] = None
+        try:
+            sock.bind(address)
+            os.chmod(self._socket_path, 0o600)
+            socket_inode = self._socket_path.stat().st_ino
+            sock.listen()
+            sock.settimeout(_POLL_INTERVAL_S)
+            register_signal_handlers()
+            while not self._should_stop:
+                try:
+                    conn, _ = sock.accept()
+                except socket.timeout:
+                    if self._is_idle() or not self._owns_socket(socket_inode):
+                        break
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    try:
+                        self._handle_connection(conn)
+                    except (OSError, ValueError):
+                        # The client disconnected or sent a malformed request.
+                        pass
+                self._last_request_time = time.monotonic()
+        except ConductorAbort:
+            # The daemon was asked to exit (e.g., using SIGTERM).
+            pass
+        finally:
+            sock.close()
+            if self._owns_socket(socket_inode):
+                self._socket_path.unlink()
+
+    def _handle_connection(self, conn: socket.socket) -> None:
+        with conn.makefile("rb") as request_file:
+            request_line = request_file.readline()
+        if len(request_line) == 0:
+            return
+        response = self._handle_request(json.loads(request_line))
+        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+
+    def _handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request["command"]
+        if command == "ping":
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "version": conductor.__version__,
+            }
+        elif command == "stop":
+            self._should_stop = True
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "version": conductor.__version__,
+            }
+
+        # Commands are only run for clients that use the same version of
+        # Conductor.
+        if request.get("version", None) != conductor.__version__:
+            return {"status": "incompatible", "version": conductor.__version__}
+        elif command in _COMMANDS:
+            return self._run_command(
+                _COMMANDS[command], argparse.Namespace(**request["args"])
+            )
+        else:
+            return {"status": "unknown_command"}
+
+    def _run_command(
+        self, command_main: Callable[[Context, Any], None], args
+    ) -> Dict[str, Any]:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = 0
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                command_main(self._project.context(), args)
+            except ConductorAbort:
+                raise
+            except ConductorError as ex:
+                print_error(ex, debug=args.debug)
+                exit_code = 1
+            except Exception:  # pylint: disable=broad-except
+                # An unexpected error should not take down the daemon.
+                print(traceback.format_exc(), file=sys.stderr)
+                exit_code = 1
+        return {
+            "status": "ok",
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "exit_code": exit_code,
+        }
+
+    def _is_idle(self) -> bool:
+        return time.monotonic() - self._last_request_time > DAEMON_IDLE_TIMEOUT_S
+
+    def _owns_socket(self, socket_inode: Optional[int]) -> bool:
+        try:
+            return self._socket_path.stat().st_ino == socket_inode
+        except FileNotFoundError:
+            return False
@@ -1,13 +1,14 @@
 import grpc
 import pathlib
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 
 import conductor.envs.proto_gen.maestro_pb2 as pb
 import conductor.envs.proto_gen.maestro_pb2_grpc as maestro_grpc
 from conductor.envs.maestro.interface import (
     ExecuteTaskResponse,
     ExecuteTaskType,
-    PackTaskOutputsResponse,
+    TaskOutputSink,
+    TaskOutputStream,
 )
 from conductor.task_identifier import TaskIdentifier
 from conductor.errors import ConductorError, InternalError
@@ -49,15 +50,38 @@ class MaestroGrpcClient:
         self._channel = grpc.insecure_channel("{}:{}".format(self._host, self._port))
         self._stub = maestro_grpc.MaestroStub(self._channel)
 
-    def unpack_bundle(self, bundle_path: pathlib.Path) -> str:
+    def unpack_bundle(
+        self,
+        repository_name: str,
+        commit_hash: str,
+        bundle_path: Optional[pathlib.Path],
+    ) -> str:
+        """
+        Creates a new workspace containing `commit_hash`. If Maestro does not
+        already have the commit, `bundle_path` must refer to a bundle (in the
+        remote environment) that contains it.
+        """
         assert self._stub is not None
         # pylint: disable-next=no-member
-        msg = pb.UnpackBundleRequest(bundle_path=str(bundle_path))
+        msg = pb.UnpackBundleRequest(
+            bundle_path=str(bundle_path) if bundle_path is not None else "",
+            repository_name=repository_name,
+            commit_hash=commit_hash,
+        )
         result = self._stub.UnpackBundle(msg)
         if result.WhichOneof("result") == "error":
             raise _pb_to_error(result.error)
         return result.response.workspace_name
 
+    def get_repository_commits(self, repository_name: str) -> List[str]:
+        assert self._stub is not None
+        # pylint: disable-next=no-member
+        msg = pb.GetRepositoryCommitsRequest(repository_name=repository_name)
+        result = self._stub.GetRepositoryCommits(msg)
+        if result.WhichOneof("result") == "error":
+            raise _pb_to_error(result.error)
+        return list(result.response.commit_hashes)
+
     def execute_task(
         self,
         workspace_name: str,
@@ -66,7 +90,13 @@ class MaestroGrpcClient:
         dep_versions: Dict[TaskIdentifier, Version],
         execute_task_type: ExecuteTaskType,
         output_version: Optional[Version],
+        output_sink: Optional[TaskOutputSink] = None,
     ) -> ExecuteTaskResponse:
+        """
+        Runs the task in the remote environment. If `output_sink` is provided,
+        the task's output is streamed back (chunk by chunk) to the sink while
+        the task runs.
+        """
         assert self._stub is not None
         # pylint: disable-next=no-member
         msg = pb.ExecuteTaskRequest(
@@ -96,7 +126,22 @@ class MaestroGrpcClient:
             msg.result_version.has_uncommitted_changes = (
                 output_version.has_uncommitted_changes
             )
-        result = self._stub.ExecuteTask(msg)
+        if output_sink is None:
+            result = self._stub.ExecuteTask(msg)
+        else:
+            result = None
+            for event in self._stub.ExecuteTaskStreamOutput(msg):
+                if event.WhichOneof("event") == "output":
+                    output_sink(
+                        _output_stream_from_pb(event.output.stream),
+                        event.output.data,
+                    )
+                else:
+                    result = event.result
+            if result is None:
+                raise InternalError(
+                    details="Maestro did not return the result of the task's execution."
+                )
         if result.WhichOneof("result") == "error":
             raise _pb_to_error(result.error)
         response = result.response
@@ -109,21 +154,70 @@ class MaestroGrpcClient:
         self,
         workspace_name: str,
         workspace_rel_project_root: pathlib.Path,
-        archive_path: pathlib.Path,
         archive_type: ArchiveType,
+        archive_data: Iterable[bytes],
     ) -> int:
+        """
+        Sends an archive of task outputs to Maestro, chunk by chunk. Maestro
+        extracts the archive while it is received. N.B. `archive_data` is
+        consumed on a gRPC thread.
+        """
+        assert self._stub is not None
+
+        def requests() -> Iterator:
+            # pylint: disable-next=no-member
+            yield pb.UnpackTaskOutputsRequest(
+                # pylint: disable-next=no-member
+                header=pb.UnpackTaskOutputsHeader(
+                    workspace_name=workspace_name,
+                    project_root=str(workspace_rel_project_root),
+                    archive_type=_archive_type_to_pb(archive_type),
+                )
+            )
+            for data in archive_data:
+                # pylint: disable-next=no-member
+                yield pb.UnpackTaskOutputsRequest(archive_data=data)
+
+        result = self._stub.UnpackTaskOutputs(requests())
+        if result.WhichOneof("result") == "error":
+            raise _pb_to_error(result.error)
+        return result.response.num_unpacked_tasks
+
+    def restore_cached_task_outputs(
+        self,
+        workspace_name: str,
+        workspace_rel_project_root: pathlib.Path,
+        versioned_tasks: List[Tuple[TaskIdentifier, Version]],
+    ) -> List[Tuple[TaskIdentifier, Version]]:
+        """
+        Asks Maestro to restore the given task outputs from its output store.
+        Returns the task outputs that were restored (i.e., the ones that do not
+        need to be transferred).
+        """
         assert self._stub is not None
         # pylint: disable-next=no-member
-        msg = pb.UnpackTaskOutputsRequest(
+        msg = pb.RestoreCachedTaskOutputsRequest(
             workspace_name=workspace_name,
             project_root=str(workspace_rel_project_root),
-            task_archive_path=str(archive_path),
-            archive_type=_archive_type_to_pb(archive_type),
         )
-        result = self._stub.UnpackTaskOutputs(msg)
+        for task_id, version in versioned_tasks:
+            _task_with_version_to_pb(task_id, version, msg.versioned_tasks.add())
+        result = self._stub.RestoreCachedTaskOutputs(msg)
         if result.WhichOneof("result") == "error":
             raise _pb_to_error(result.error)
-        return result.response.num_unpacked_tasks
+        restored = []
+        for task in result.response.restored_tasks:
+            restored.append(
+                (
+                    TaskIdentifier.from_str(task.task_identifier),
+                    Version(
+                        task.version.timestamp,
+                        task.version.commit_hash,
+                        has_uncommitted_changes=task.version.has_uncommitted_changes,
+                    ),
+                )
+            )
+        return restored
 
     def pack_task_outputs(
         self,
@@ -132,7 +226,11 @@ class MaestroGrpcClient:
         versioned_tasks: List[Tuple[TaskIdentifier, Version]],
         unversioned_tasks: List[TaskIdentifier],
         archive_type: ArchiveType,
-    ) -> PackTaskOutputsResponse:
+    ) -> Iterator[bytes]:
+        """
+        Asks Maestro to archive the given task outputs. Returns the archive's
+        data, chunk by chunk, as Maestro creates it.
+        """
         assert self._stub is not None
         # pylint: disable-next=no-member
         msg = pb.PackTaskOutputsRequest(
@@ -141,22 +239,10 @@ class MaestroGrpcClient:
             archive_type=_archive_type_to_pb(archive_type),
         )
         for task_id, version in versioned_tasks:
-            vt = msg.versioned_tasks.add()
-            vt.task_identifier = str(task_id)
-            vt.version.timestamp = version.timestamp
-            if version.commit_hash is not None:
-                vt.version.commit_hash = version.commit_hash
-            vt.version.has_uncommitted_changes = version.has_uncommitted_changes
+            _task_with_version_to_pb(task_id, version, msg.versioned_tasks.add())
         for task_id in unversioned_tasks:
             msg.unversioned_task_identifiers.append(str(task_id))
-        result = self._stub.PackTaskOutputs(msg)
-        if result.WhichOneof("result") == "error":
-            raise _pb_to_error(result.error)
-        response = result.response
-        return PackTaskOutputsResponse(
-            num_packed_tasks=response.num_packed_tasks,
-            task_archive_path=pathlib.Path(response.task_archive_path),
-        )
+        return _archive_data_from_events(self._stub.PackTaskOutputs(msg))
 
     def shutdown(self, key: str) -> str:
         assert self._stub is not None
@@ -189,6 +275,27 @@ def _pb_to_error(ex: pb.ConductorError) -> ConductorError:
     return error
 
 
+def _archive_data_from_events(
+    events: Iterator[pb.PackTaskOutputsEvent],  # pylint: disable=no-member
+) -> Iterator[bytes]:
+    for event in events:
+        if event.WhichOneof("event") == "error":
+            raise _pb_to_error(event.error)
+        yield event.archive_data
+
+
+def _task_with_version_to_pb(
+    task_id: TaskIdentifier,
+    version: Version,
+    out: pb.TaskWithVersion,  # pylint: disable=no-member
+) -> None:
+    out.task_identifier = str(task_id)
+    out.version.timestamp = version.timestamp
+    if version.commit_hash is not None:
+        out.version.commit_hash = version.commit_hash
+    out.version.has_uncommitted_changes = version.has_uncommitted_changes
+
+
 # pylint: disable-next=no-member
 def _archive_type_to_pb(archive_type: ArchiveType) -> pb.ArchiveType:
     if archive_type == ArchiveType.Gzip:
@@ -198,3 +305,14 @@ def _archive_type_to_pb(archive_type: ArchiveType) -> pb.ArchiveType:
         # pylint: disable-next=no-member
         return pb.AT_ZSTD
     raise InternalError(details=f"Unsupported archive type {str(archive_type)}.")
+
+
+# pylint: disable-next=no-member
+def _output_stream_from_pb(stream: pb.OutputStream) -> TaskOutputStream:
+    # pylint: disable-next=no-member
+    if stream == pb.OS_STDOUT:
+        return TaskOutputStream.Stdout
+    # pylint: disable-next=no-member
+    elif stream == pb.OS_STDERR:
+        return TaskOutputStream.Stderr
+    raise InternalError(details=f"Unsupported output stream {str(stream)}.")
@@ -1,34 +1,54 @@
 import asyncio
+import contextlib
+import errno
 import logging
+import os
 import pathlib
+import signal
+import threading
 import time
-from typing import Any, Dict, List, Tuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Optional,
+)
 
 from conductor.config import (
+    MAESTRO_MIRROR_LOCATION,
+    MAESTRO_OUTPUT_STORE_LOCATION,
     MAESTRO_WORKSPACE_LOCATION,
     MAESTRO_WORKSPACE_NAME_FORMAT,
-    MAESTRO_TASK_TRANSFER_LOCATION,
+    ARCHIVE_STREAM_CHUNK_SIZE,
 )
 from conductor.context import Context
 from conductor.envs.maestro.interface import (
     MaestroInterface,
     ExecuteTaskResponse,
     ExecuteTaskType,
-    PackTaskOutputsResponse,
+    TaskOutputSink,
+    TaskOutputStream,
 )
+from conductor.envs.maestro.output_store import TaskOutputStore
 from conductor.errors import InternalError
-from conductor.execution.executor import Executor
+from conductor.execution.handle import OperationExecutionHandle
 from conductor.execution.operation_state import OperationState
 from conductor.execution.ops.run_task_executable import RunTaskExecutable
-from conductor.execution.plan import ExecutionPlan
 from conductor.execution.version_index import Version
 from conductor.task_identifier import TaskIdentifier
 from conductor.task_types.run import RunCommand, RunExperiment
+from conductor.utils.sigchld import returncode_from_status
 from conductor.utils.output_archiving import (
-    create_archive,
-    restore_archive,
-    generate_archive_name,
+    extract_archive_to_staging,
+    install_extracted_archive,
+    write_archive,
     ArchiveType,
+    ExtractedArchive,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,34 +60,91 @@ class Maestro(MaestroInterface):
     environment and executes tasks when requested by the main Conductor process.
     """
 
-    def __init__(self, maestro_root: pathlib.Path) -> None:
+    def __init__(
+        self, maestro_root: pathlib.Path, max_concurrent_tasks: Optional[int] = None
+    ) -> None:
         self._maestro_root = maestro_root
         # Stores the contexts for each workspace. This allows for context reuse.
         self._contexts: Dict[pathlib.Path, Context] = {}
+        # Serializes changes to each repository's mirror.
+        self._mirror_locks: Dict[str, asyncio.Lock] = {}
+        # The repository that each workspace (created by this daemon) contains.
+        self._workspace_repositories: Dict[str, str] = {}
 
-    async def unpack_bundle(self, bundle_path: pathlib.Path) -> str:
-        bundle_name = bundle_path.stem
-        workspace_name = MAESTRO_WORKSPACE_NAME_FORMAT.format(
-            name=bundle_name, timestamp=str(int(time.time()))
+        if max_concurrent_tasks is None:
+            max_concurrent_tasks = os.cpu_count() or 1
+        self._slots = _ExecutionSlots(max_concurrent_tasks)
+        # Used to wait for task processes to exit without blocking the event
+        # loop (one thread per running task).
+        self._waiters = ThreadPoolExecutor(
+            max_workers=max_concurrent_tasks, thread_name_prefix="maestro-wait"
         )
-        abs_workspace_path = (
-            self._maestro_root / MAESTRO_WORKSPACE_LOCATION / workspace_name
-        )
-        abs_workspace_path.mkdir(parents=True, exist_ok=True)
-        abs_bundle_path = self._maestro_root / bundle_path
-        # N.B. Good practice to use async versions here, but we intend to have
-        # only one caller.
-        clone_args = ["git", "clone", str(abs_bundle_path), str(abs_workspace_path)]
-        logger.debug("Running args: %s", str(clone_args))
-        process = await asyncio.create_subprocess_exec(*clone_args)
-        await process.wait()
-        if process.returncode != 0:
-            raise InternalError(details="Failed to unpack the bundle.")
+        logger.info("Running up to %d task(s) concurrently.", max_concurrent_tasks)
+
+    async def unpack_bundle(
+        self,
+        repository_name: str,
+        commit_hash: str,
+        bundle_path: Optional[pathlib.Path],
+    ) -> str:
+        mirror_path = self._get_mirror_path(repository_name)
+
+        # We keep a bare mirror of each repository. Bundles only contain the
+        # commits that the mirror is missing, and workspaces are worktrees of
+        # the mirror (so they share its objects).
+        async with self._get_mirror_lock(repository_name):
+            workspace_name = self._generate_workspace_name(repository_name)
+            abs_workspace_path = (
+                self._maestro_root / MAESTRO_WORKSPACE_LOCATION / workspace_name
+            )
+            abs_workspace_path.parent.mkdir(parents=True, exist_ok=True)
+            if not mirror_path.exists():
+                mirror_path.parent.mkdir(parents=True, exist_ok=True)
+                await _run_git(["init", "--quiet", "--bare", str(mirror_path)])
+            if bundle_path is not None:
+                abs_bundle_path = self._maestro_root / bundle_path
+                await _run_git(
+                    ["fetch", "--quiet", str(abs_bundle_path), "HEAD"],
+                    cwd=mirror_path,
+                )
+                abs_bundle_path.unlink(missing_ok=True)
+            # The ref records the commit that the workspace uses. It also
+            # prevents the commit from being garbage collected.
+            await _run_git(
+                ["update-ref", f"refs/workspaces/{workspace_name}", commit_hash],
+                cwd=mirror_path,
+            )
+            await _run_git(
+                [
+                    "worktree",
+                    "add",
+                    "--quiet",
+                    "--detach",
+                    str(abs_workspace_path),
+                    commit_hash,
+                ],
+                cwd=mirror_path,
+            )
+        self._workspace_repositories[workspace_name] = repository_name
         logger.info(
-            "Unpacked bundle %s to workspace %s", str(bundle_path), workspace_name
+            "Created workspace %s for commit %s (bundle: %s)",
+            workspace_name,
+            commit_hash,
+            str(bundle_path),
         )
         return workspace_name
 
+    async def get_repository_commits(self, repository_name: str) -> List[str]:
+        mirror_path = self._get_mirror_path(repository_name)
+        async with self._get_mirror_lock(repository_name):
+            if not mirror_path.exists():
+                return []
+            output = await _run_git(
+                ["for-each-ref", "--format=%(objectname)", "refs/workspaces"],
+                cwd=mirror_path,
+            )
+        return sorted(set(output.split()))
+
     async def execute_task(
         self,
         workspace_name: str,
@@ -76,6 +153,7 @@ class Maestro(MaestroInterface):
         dep_versions: Dict[TaskIdentifier, Version],
         execute_task_type: ExecuteTaskType,
         output_version: Optional[Version],
+        output_sink: Optional[TaskOutputSink] = None,
     ) -> ExecuteTaskResponse:
         full_project_root = self._get_full_project_root(workspace_name, project_root)
         start_timestamp = int(time.time())
@@ -116,7 +194,13 @@ class Maestro(MaestroInterface):
             "working_path": task_to_run.get_working_path(ctx),
             "deps_output_paths": deps_output_paths,
             "parallelizable": task_to_run.parallelizable,
+            "resources": task_to_run.resources,
+            "mutex": task_to_run.mutex,
         }
+        if output_sink is not None:
+            sink = output_sink
+            kwargs["stdout_sink"] = lambda data: sink(TaskOutputStream.Stdout, data)
+            kwargs["stderr_sink"] = lambda data: sink(TaskOutputStream.Stderr, data)
 
         if execute_task_type == ExecuteTaskType.RunExperiment:
             assert isinstance(task_to_run, RunExperiment)
@@ -142,20 +226,19 @@ class Maestro(MaestroInterface):
 
         op = RunTaskExecutable(**kwargs)  # pylint: disable=missing-kwoa
 
-        # 4. Run the task.
-        plan = ExecutionPlan(
-            task_to_run=task_to_run,
-            all_ops=[op],
-            root_op=op,
-            initial_ops=[op],
-            cached_tasks=[],
-            num_tasks_to_run=1,
-            used_envs=set(),
-        )
-        executor = Executor(execution_slots=1, silent=True)
-        executor.run_plan(plan, ctx)
+        # 4. Run the task. Tasks that are not parallelizable run by themselves.
+        async with self._slots.acquire(exclusive=not op.parallelizable) as slot:
+            logger.info("Running task %s (slot: %s)", str(task_identifier), slot)
+            handle = op.start_execution(ctx, slot)
+            await self._wait_for_exit(handle)
+            # This raises an error if the task failed.
+            op.finish_execution(handle, ctx)
         # Make sure any new versions are committed.
         ctx.version_index.commit_changes()
+        if output_version is not None:
+            output_store = self._get_output_store(workspace_name, project_root)
+            if output_store is not None:
+                output_store.add(ctx, task_identifier, output_version)
 
         end_timestamp = int(time.time())
         return ExecuteTaskResponse(
@@ -167,52 +250,120 @@ class Maestro(MaestroInterface):
         self,
         workspace_name: str,
         project_root: pathlib.Path,
-        archive_path: pathlib.Path,
         archive_type: ArchiveType,
+        archive_data: AsyncIterator[bytes],
     ) -> int:
         full_project_root = self._get_full_project_root(workspace_name, project_root)
         ctx = self._get_context(full_project_root)
-        full_archive_path = (
-            self._maestro_root
-            / MAESTRO_TASK_TRANSFER_LOCATION
-            / workspace_name
-            / archive_path
+        loop = asyncio.get_running_loop()
+
+        # We extract the archive (on another thread) while we receive it. The
+        # project's version index is only used on this thread, once the archive
+        # has been extracted (see `install_extracted_archive()`).
+        #
+        # N.B. The extraction runs on a dedicated thread because it blocks until
+        # the whole archive is received. Running it on the default executor
+        # could use up all of the executor's threads (with enough concurrent
+        # transfers), leaving none to write the received data into the pipe.
+        read_fd, write_fd = os.pipe()
+        extraction = _run_in_thread(
+            lambda: _extract_from_pipe(ctx.output_path, read_fd, archive_type)
         )
-        if not full_archive_path.exists():
-            raise InternalError(
-                details=f"Archive {archive_path} does not exist in the task transfer directory."
-            )
-        return restore_archive(
-            ctx, full_archive_path, archive_type, expect_no_duplicates=False
+        pipe = open(write_fd, "wb")
+        try:
+            async for data in archive_data:
+                await loop.run_in_executor(None, pipe.write, data)
+        except BrokenPipeError:
+            # The extraction stopped early (e.g., the archive is invalid). It
+            # reports the error.
+            pass
+        except:
+            # We stopped receiving the archive (e.g., the caller went away).
+            await loop.run_in_executor(None, _close_pipe, pipe)
+            await asyncio.wait([extraction])
+            if extraction.exception() is None:
+                extraction.result().discard()
+            raise
+        await loop.run_in_executor(None, _close_pipe, pipe)
+
+        extracted = await extraction
+        num_restored, restored_versions = install_extracted_archive(ctx, extracted)
+        output_store = self._get_output_store(workspace_name, project_root)
+        if output_store is not None:
+            for task_id, version in restored_versions:
+                output_store.add(ctx, task_id, version)
+        return num_restored
+
+    async def restore_cached_task_outputs(
+        self,
+        workspace_name: str,
+        project_root: pathlib.Path,
+        versioned_tasks: List[Tuple[TaskIdentifier, Version]],
+    ) -> List[Tuple[TaskIdentifier, Version]]:
+        full_project_root = self._get_full_project_root(workspace_name, project_root)
+        output_store = self._get_output_store(workspace_name, project_root)
+        if output_store is None:
+            return []
+        ctx = self._get_context(full_project_root)
+        restored = []
+        try:
+            for task_id, version in versioned_tasks:
+                if output_store.restore(ctx, task_id, version):
+                    restored.append((task_id, version))
+            ctx.version_index.commit_changes()
+        except:
+            ctx.version_index.rollback_changes()
+            raise
+        logger.info(
+            "Restored %d of %d task output(s) from the output store.",
+            len(restored),
+            len(versioned_tasks),
         )
+        return restored
 
-    async def pack_task_outputs(
+    async def pack_task_outputs(  # pylint: disable=invalid-overridden-method
         self,
         workspace_name: str,
         project_root: pathlib.Path,
         versioned_tasks: List[Tuple[TaskIdentifier, Version]],
         unversioned_tasks: List[TaskIdentifier],
         archive_type: ArchiveType,
-    ) -> PackTaskOutputsResponse:
+    ) -> AsyncIterator[bytes]:
         full_project_root = self._get_full_project_root(workspace_name, project_root)
         ctx = self._get_context(full_project_root)
-        archive_dir = (
-            self._maestro_root / MAESTRO_TASK_TRANSFER_LOCATION / workspace_name
-        )
-        archive_dir.mkdir(parents=True, exist_ok=True)
-        archive_name = generate_archive_name(archive_type)
-        full_archive_path = archive_dir / archive_name
+        loop = asyncio.get_running_loop()
 
         tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]] = (
             versioned_tasks + [(t, None) for t in unversioned_tasks]
         )
-        num_packed = create_archive(
-            ctx, tasks_to_archive, full_archive_path, archive_type
-        )
-        return PackTaskOutputsResponse(
-            num_packed_tasks=num_packed,
-            task_archive_path=pathlib.Path(archive_name),
+        # `write_archive()` looks up these tasks on another thread, so we make
+        # sure they are loaded here.
+        for task_id, _ in tasks_to_archive:
+            ctx.task_index.get_task(task_id)
+
+        # We send the archive while it is being created. The archive is created
+        # on a dedicated thread because it blocks until the whole archive is
+        # sent (see `unpack_task_outputs()`).
+        read_fd, write_fd = os.pipe()
+        creation = _run_in_thread(
+            lambda: _write_to_pipe(ctx, tasks_to_archive, write_fd, archive_type)
         )
+        pipe = open(read_fd, "rb")
+        try:
+            while True:
+                data = await loop.run_in_executor(
+                    None, pipe.read, ARCHIVE_STREAM_CHUNK_SIZE
+                )
+                if len(data) == 0:
+                    break
+                yield data
+        finally:
+            # If we stopped early (e.g., the caller went away), closing the
+            # pipe stops the archive's creation.
+            await loop.run_in_executor(None, pipe.close)
+            await asyncio.wait([creation])
+        num_packed = creation.result()
+        logger.info("Packed %d task output(s).", num_packed)
 
     async def shutdown(self, key: str) -> str:
         logger.info("Received shutdown message with key %s", key)
@@ -220,6 +371,62 @@ class Maestro(MaestroInterface):
         loop.create_task(_orchestrate_shutdown())
         return "OK"
 
+    async def _wait_for_exit(self, handle: OperationExecutionHandle) -> None:
+        assert handle.pid is not None
+        pid = handle.pid
+        try:
+            loop = asyncio.get_running_loop()
+            _, status, rusage = await loop.run_in_executor(
+                self._waiters, os.wait4, pid, 0
+            )
+        except asyncio.CancelledError:
+            # The daemon is shutting down. Terminate the task's process group
+            # (i.e., the task and its child processes).
+            _terminate_process_group(pid)
+            raise
+        handle.returncode = returncode_from_status(status)
+        handle.rusage = rusage
+        if handle.process is not None:
+            # We reaped the process, so the `Popen` object must not try to wait
+            # for it.
+            handle.process.returncode = handle.returncode
+
+    def _generate_workspace_name(self, repository_name: str) -> str:
+        workspace_name = MAESTRO_WORKSPACE_NAME_FORMAT.format(
+            name=repository_name, timestamp=str(int(time.time()))
+        )
+        workspaces_path = self._maestro_root / MAESTRO_WORKSPACE_LOCATION
+        candidate = workspace_name
+        suffix = 1
+        # Workspaces can be created in quick succession now that they reuse
+        # the mirror, so the timestamp alone is not necessarily unique.
+        while (workspaces_path / candidate).exists():
+            candidate = f"{workspace_name}-{suffix}"
+            suffix += 1
+        return candidate
+
+    def _get_output_store(
+        self, workspace_name: str, project_root: pathlib.Path
+    ) -> Optional[TaskOutputStore]:
+        repository_name = self._workspace_repositories.get(workspace_name, None)
+        if repository_name is None:
+            # The workspace was not created by this daemon.
+            return None
+        return TaskOutputStore(
+            self._maestro_root
+            / MAESTRO_OUTPUT_STORE_LOCATION
+            / repository_name
+            / project_root
+        )
+
+    def _get_mirror_path(self, repository_name: str) -> pathlib.Path:
+        return self._maestro_root / MAESTRO_MIRROR_LOCATION / f"{repository_name}.git"
+
+    def _get_mirror_lock(self, repository_name: str) -> asyncio.Lock:
+        if repository_name not in self._mirror_locks:
+            self._mirror_locks[repository_name] = asyncio.Lock()
+        return self._mirror_locks[repository_name]
+
     def _get_full_project_root(
         self, workspace_name: str, project_root: pathlib.Path
     ) -> pathlib.Path:
@@ -242,6 +449,109 @@ class Maestro(MaestroInterface):
         return self._contexts[full_project_root]
 
 
+class _ExecutionSlots:
+    """
+    Limits the number of tasks that run concurrently and assigns each running
+    task a slot (exposed to the task as `COND_SLOT`). Tasks that run
+    exclusively occupy every slot and are not assigned a slot.
+    """
+
+    def __init__(self, num_slots: int) -> None:
+        assert num_slots > 0
+        self._num_slots = num_slots
+        self._available_slots = list(reversed(range(num_slots)))
+        self._changed = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, exclusive: bool) -> AsyncIterator[Optional[int]]:
+        async with self._changed:
+            if exclusive:
+                await self._changed.wait_for(
+                    lambda: len(self._available_slots) == self._num_slots
+                )
+                taken = list(self._available_slots)
+                self._available_slots.clear()
+            else:
+                await self._changed.wait_for(lambda: len(self._available_slots) > 0)
+                taken = [self._available_slots.pop()]
+        try:
+            # As with local execution, we only expose slots when more than one
+            # task can run at a time.
+            yield taken[0] if not exclusive and self._num_slots > 1 else None
+        finally:
+            async with self._changed:
+                self._available_slots.extend(taken)
+                self._changed.notify_all()
+
+
+def _run_in_thread(work: Callable[[], Any]) -> "asyncio.Future[Any]":
+    """
+    Runs `work` on a new thread and returns an awaitable future for its result.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(work())
+        except BaseException as ex:  # pylint: disable=broad-except
+            future.set_exception(ex)
+
+    threading.Thread(target=run, name="maestro-transfer").start()
+    return asyncio.wrap_future(future)
+
+
+def _extract_from_pipe(
+    output_path: pathlib.Path, read_fd: int, archive_type: ArchiveType
+) -> ExtractedArchive:
+    with open(read_fd, "rb") as pipe:
+        return extract_archive_to_staging(output_path, pipe, archive_type)
+
+
+def _close_pipe(pipe: BinaryIO) -> None:
+    try:
+        pipe.close()
+    except BrokenPipeError:
+        # The reader already stopped (and reports why).
+        pass
+
+
+def _write_to_pipe(
+    ctx: Context,
+    tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]],
+    write_fd: int,
+    archive_type: ArchiveType,
+) -> int:
+    with open(write_fd, "wb") as pipe:
+        return write_archive(ctx, tasks_to_archive, pipe, archive_type)
+
+
+async def _run_git(args: List[str], cwd: Optional[pathlib.Path] = None) -> str:
+    """
+    Runs `git` with the given arguments and returns its standard output.
+    """
+    logger.debug("Running git with args: %s", str(args))
+    process = await asyncio.create_subprocess_exec(
+        "git", *args, cwd=cwd, stdout=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        raise InternalError(
+            details=f"Failed to run git {args[0]} (exit code {process.returncode})."
+        )
+    return stdout.decode("utf-8")
+
+
+def _terminate_process_group(pid: int) -> None:
+    try:
+        group_id = os.getpgid(pid)
+        if group_id >= 0:
+            os.killpg(group_id, signal.SIGTERM)
+    except OSError as ex:
+        # Ignore errors due to the process not existing or having no children.
+        if ex.errno != errno.ESRCH and ex.errno != errno.ECHILD:
+            raise
+
+
 async def _orchestrate_shutdown() -> None:
     tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
     for task in tasks:
@@ -1,9 +1,15 @@
+import asyncio
 import pathlib
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 import conductor.envs.proto_gen.maestro_pb2_grpc as rpc
 import conductor.envs.proto_gen.maestro_pb2 as pb
-from conductor.envs.maestro.interface import MaestroInterface, ExecuteTaskType
+from conductor.envs.maestro.interface import (
+    MaestroInterface,
+    ExecuteTaskType,
+    TaskOutputSink,
+    TaskOutputStream,
+)
 from conductor.errors import ConductorError, InternalError
 from conductor.execution.version_index import Version
 from conductor.task_identifier import TaskIdentifier
@@ -27,16 +33,73 @@ class MaestroGrpc(rpc.MaestroServicer):
         self, request: pb.UnpackBundleRequest, context
     ) -> pb.UnpackBundleResult:
         try:
-            bundle_path = pathlib.Path(request.bundle_path)
-            workspace_name = await self._maestro.unpack_bundle(bundle_path)
+            bundle_path = (
+                pathlib.Path(request.bundle_path)
+                if len(request.bundle_path) > 0
+                else None
+            )
+            workspace_name = await self._maestro.unpack_bundle(
+                request.repository_name, request.commit_hash, bundle_path
+            )
             return pb.UnpackBundleResult(
                 response=pb.UnpackBundleResponse(workspace_name=workspace_name)
             )
         except ConductorError as ex:
             return pb.UnpackBundleResult(error=_error_to_pb(ex))
 
+    async def GetRepositoryCommits(
+        self, request: pb.GetRepositoryCommitsRequest, context
+    ) -> pb.GetRepositoryCommitsResult:
+        try:
+            commit_hashes = await self._maestro.get_repository_commits(
+                request.repository_name
+            )
+            return pb.GetRepositoryCommitsResult(
+                response=pb.GetRepositoryCommitsResponse(commit_hashes=commit_hashes)
+            )
+        except ConductorError as ex:
+            return pb.GetRepositoryCommitsResult(error=_error_to_pb(ex))
+
     async def ExecuteTask(
         self, request: pb.ExecuteTaskRequest, context
+    ) -> pb.ExecuteTaskResult:
+        return await self._execute_task(request, output_sink=None)
+
+    async def ExecuteTaskStreamOutput(
+        self, request: pb.ExecuteTaskRequest, context
+    ) -> AsyncIterator[pb.ExecuteTaskEvent]:
+        loop = asyncio.get_running_loop()
+        chunks: "asyncio.Queue[pb.TaskOutputChunk]" = asyncio.Queue()
+
+        # N.B. The sink is called from the threads that read the task's output.
+        def output_sink(stream: TaskOutputStream, data: bytes) -> None:
+            chunk = pb.TaskOutputChunk(stream=_output_stream_to_pb(stream), data=data)
+            loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+
+        execution = asyncio.ensure_future(
+            self._execute_task(request, output_sink=output_sink)
+        )
+        try:
+            while not execution.done():
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait(
+                    [next_chunk, execution], return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_chunk.done():
+                    yield pb.ExecuteTaskEvent(output=next_chunk.result())
+                else:
+                    next_chunk.cancel()
+            # The task's output is fully read before the execution completes,
+            # so any remaining chunks are already in the queue.
+            while not chunks.empty():
+                yield pb.ExecuteTaskEvent(output=chunks.get_nowait())
+            yield pb.ExecuteTaskEvent(result=execution.result())
+        finally:
+            # The caller may have gone away (e.g., it was interrupted).
+            execution.cancel()
+
+    async def _execute_task(
+        self, request: pb.ExecuteTaskRequest, output_sink: Optional[TaskOutputSink]
     ) -> pb.ExecuteTaskResult:
         try:
             workspace_name = request.workspace_name
@@ -74,6 +137,7 @@ class MaestroGrpc(rpc.MaestroServicer):
                 dep_versions,
                 execute_task_type,
                 output_version,
+                output_sink,
             )
             return pb.ExecuteTaskResult(
                 response=pb.ExecuteTaskResponse(
@@ -85,15 +149,29 @@ class MaestroGrpc(rpc.MaestroServicer):
             return pb.ExecuteTaskResult(error=_error_to_pb(ex))
 
     async def UnpackTaskOutputs(
-        self, request: pb.UnpackTaskOutputsRequest, context
+        self, request_iterator: AsyncIterator[pb.UnpackTaskOutputsRequest], context
     ) -> pb.UnpackTaskOutputsResult:
         try:
-            workspace_name = request.workspace_name
-            project_root = pathlib.Path(request.project_root)
-            archive_path = pathlib.Path(request.task_archive_path)
-            archive_type = _archive_type_from_pb(request.archive_type)
+            requests = request_iterator.__aiter__()
+            try:
+                first_request = await requests.__anext__()
+            except StopAsyncIteration:
+                first_request = None
+            if first_request is None or first_request.WhichOneof("request") != "header":
+                raise InternalError(
+                    details="UnpackTaskOutputs requests must start with a header."
+                )
+            header = first_request.header
+
+            async def archive_data() -> AsyncIterator[bytes]:
+                async for request in requests:
+                    yield request.archive_data
+
             num_unpacked_tasks = await self._maestro.unpack_task_outputs(
-                workspace_name, project_root, archive_path, archive_type
+                header.workspace_name,
+                pathlib.Path(header.project_root),
+                _archive_type_from_pb(header.archive_type),
+                archive_data(),
             )
             return pb.UnpackTaskOutputsResult(
                 response=pb.UnpackTaskOutputsResponse(
@@ -103,41 +181,51 @@ class MaestroGrpc(rpc.MaestroServicer):
         except ConductorError as ex:
             return pb.UnpackTaskOutputsResult(error=_error_to_pb(ex))
 
+    async def RestoreCachedTaskOutputs(
+        self, request: pb.RestoreCachedTaskOutputsRequest, context
+    ) -> pb.RestoreCachedTaskOutputsResult:
+        try:
+            workspace_name = request.workspace_name
+            project_root = pathlib.Path(request.project_root)
+            versioned_tasks = [
+                _task_with_version_from_pb(task) for task in request.versioned_tasks
+            ]
+            restored_tasks = await self._maestro.restore_cached_task_outputs(
+                workspace_name, project_root, versioned_tasks
+            )
+            response = pb.RestoreCachedTaskOutputsResponse()
+            for task_id, version in restored_tasks:
+                _task_with_version_to_pb(
+                    task_id, version, response.restored_tasks.add()
+                )
+            return pb.RestoreCachedTaskOutputsResult(response=response)
+        except ConductorError as ex:
+            return pb.RestoreCachedTaskOutputsResult(error=_error_to_pb(ex))
+
     async def PackTaskOutputs(
         self, request: pb.PackTaskOutputsRequest, context
-    ) -> pb.PackTaskOutputsResult:
+    ) -> AsyncIterator[pb.PackTaskOutputsEvent]:
         try:
             workspace_name = request.workspace_name
             project_root = pathlib.Path(request.project_root)
             archive_type = _archive_type_from_pb(request.archive_type)
-            versioned_tasks = []
-            for task in request.versioned_tasks:
-                task_id = TaskIdentifier.from_str(task.task_identifier)
-                version = Version(
-                    task.version.timestamp,
-                    task.version.commit_hash,
-                    has_uncommitted_changes=task.version.has_uncommitted_changes,
-                )
-                versioned_tasks.append((task_id, version))
+            versioned_tasks = [
+                _task_with_version_from_pb(task) for task in request.versioned_tasks
+            ]
             unversioned_tasks = []
             for task_id_str in request.unversioned_task_identifiers:
                 task_id = TaskIdentifier.from_str(task_id_str)
                 unversioned_tasks.append(task_id)
-            response = await self._maestro.pack_task_outputs(
+            async for data in self._maestro.pack_task_outputs(
                 workspace_name,
                 project_root,
                 versioned_tasks,
                 unversioned_tasks,
                 archive_type,
-            )
-            return pb.PackTaskOutputsResult(
-                response=pb.PackTaskOutputsResponse(
-                    num_packed_tasks=response.num_packed_tasks,
-                    task_archive_path=str(response.task_archive_path),
-                )
-            )
+            ):
+                yield pb.PackTaskOutputsEvent(archive_data=data)
         except ConductorError as ex:
-            return pb.PackTaskOutputsResult(error=_error_to_pb(ex))
+            yield pb.PackTaskOutputsEvent(error=_error_to_pb(ex))
 
     async def Shutdown(self, request: pb.ShutdownRequest, context) -> pb.ShutdownResult:
         try:
@@ -168,9 +256,39 @@ def _error_to_pb(ex: ConductorError) -> pb.ConductorError:
     return error
 
 
+def _task_with_version_from_pb(
+    task: pb.TaskWithVersion,
+) -> Tuple[TaskIdentifier, Version]:
+    task_id = TaskIdentifier.from_str(task.task_identifier)
+    version = Version(
+        task.version.timestamp,
+        task.version.commit_hash,
+        has_uncommitted_changes=task.version.has_uncommitted_changes,
+    )
+    return task_id, version
+
+
+def _task_with_version_to_pb(
+    task_id: TaskIdentifier, version: Version, out: pb.TaskWithVersion
+) -> None:
+    out.task_identifier = str(task_id)
+    out.version.timestamp = version.timestamp
+    if version.commit_hash is not None:
+        out.version.commit_hash = version.commit_hash
+    out.version.has_uncommitted_changes = version.has_uncommitted_changes
+
+
 def _archive_type_from_pb(at: pb.ArchiveType) -> ArchiveType:
     if at == pb.AT_GZIP:
         return ArchiveType.Gzip
     if at == pb.AT_ZSTD:
         return ArchiveType.Zstd
     raise InternalError(details=f"Unsupported archive type {str(at)}.")
+
+
+def _output_stream_to_pb(stream: TaskOutputStream) -> pb.OutputStream:
+    if stream == TaskOutputStream.Stdout:
+        return pb.OS_STDOUT
+    if stream == TaskOutputStream.Stderr:
+        return pb.OS_STDERR
+    raise InternalError(details=f"Unsupported output stream {str(stream)}.")
@@ -1,6 +1,6 @@
 import enum
 import pathlib
-from typing import Dict, NamedTuple, List, Tuple, Optional
+from typing import AsyncIterator, Callable, Dict, NamedTuple, List, Tuple, Optional
 from conductor.task_identifier import TaskIdentifier
 from conductor.execution.version_index import Version
 from conductor.utils.output_archiving import ArchiveType
@@ -16,9 +16,13 @@ class ExecuteTaskType(enum.Enum):
     RunCommand = "run_command"
 
 
-class PackTaskOutputsResponse(NamedTuple):
-    num_packed_tasks: int
-    task_archive_path: pathlib.Path
+class TaskOutputStream(enum.Enum):
+    Stdout = "stdout"
+    Stderr = "stderr"
+
+
+# Receives a running task's output, chunk by chunk.
+TaskOutputSink = Callable[[TaskOutputStream, bytes], None]
 
 
 class MaestroInterface:
@@ -27,7 +31,15 @@ class MaestroInterface:
     the gRPC implementation details from Maestro.
     """
 
-    async def unpack_bundle(self, bundle_path: pathlib.Path) -> str:
+    async def unpack_bundle(
+        self,
+        repository_name: str,
+        commit_hash: str,
+        bundle_path: Optional[pathlib.Path],
+    ) -> str:
+        raise NotImplementedError
+
+    async def get_repository_commits(self, repository_name: str) -> List[str]:
         raise NotImplementedError
 
     async def execute_task(
@@ -38,6 +50,7 @@ class MaestroInterface:
         dep_versions: Dict[TaskIdentifier, Version],
         execute_task_type: ExecuteTaskType,
         output_version: Optional[Version],
+        output_sink: Optional[TaskOutputSink] = None,
     ) -> ExecuteTaskResponse:
         raise NotImplementedError
 
@@ -45,19 +58,27 @@ class MaestroInterface:
         self,
         workspace_name: str,
         project_root: pathlib.Path,
-        archive_path: pathlib.Path,
         archive_type: ArchiveType,
+        archive_data: AsyncIterator[bytes],
     ) -> int:
         raise NotImplementedError
 
-    async def pack_task_outputs(
+    async def restore_cached_task_outputs(
+        self,
+        workspace_name: str,
+        project_root: pathlib.Path,
+        versioned_tasks: List[Tuple[TaskIdentifier, Version]],
+    ) -> List[Tuple[TaskIdentifier, Version]]:
+        raise NotImplementedError
+
+    def pack_task_outputs(
         self,
         workspace_name: str,
         project_root: pathlib.Path,
         versioned_tasks: List[Tuple[TaskIdentifier, Version]],
         unversioned_tasks: List[TaskIdentifier],
         archive_type: ArchiveType,
-    ) -> PackTaskOutputsResponse:
+    ) -> AsyncIterator[bytes]:
         raise NotImplementedError
 
     async def shutdown(self, key: str) -> str:
@@ -0,0 +1,128 @@
+import os
+import pathlib
+import shutil
+import uuid
+from typing import Optional
+
+import conductor.filename as f
+from conductor.context import Context
+from conductor.execution.version_index import Version
+from conductor.task_identifier import TaskIdentifier
+from conductor.utils.output_archiving import link_tree
+
+
+class TaskOutputStore:
+    """
+    Stores the versioned task outputs that Maestro has seen (i.e., outputs that
+    it produced or that were transferred to it), keyed by task identifier and
+    version. The store outlives workspaces, so outputs do not need to be
+    transferred to the environment again in later sessions.
+
+    Stores are keyed by the repository's name, which does not uniquely identify
+    a project (e.g., two clones share it). So entries are also keyed by the
+    commit that the version was produced from, and versions that were not
+    produced from a commit are not stored.
+
+    Outputs are hard linked into and out of the store when possible, so storing
+    an output does not copy its data.
+    """
+
+    def __init__(self, root: pathlib.Path) -> None:
+        self._root = root
+
+    def contains(self, task_identifier: TaskIdentifier, version: Version) -> bool:
+        entry_path = self._entry_path(task_identifier, version)
+        return entry_path is not None and entry_path.is_dir()
+
+    def add(
+        self, ctx: Context, task_identifier: TaskIdentifier, version: Version
+    ) -> None:
+        """
+        Adds the task's output (in the project represented by `ctx`) to the
+        store, if it is not already stored.
+        """
+        entry_path = self._entry_path(task_identifier, version)
+        if entry_path is None or entry_path.exists():
+            return
+        output_path = pathlib.Path(
+            ctx.output_path,
+            task_identifier.path,
+            f.task_output_dir(task_identifier, version),
+        )
+        if not output_path.is_dir():
+            return
+
+        # We populate a temporary directory first so that the store never
+        # contains partial outputs.
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = entry_path.parent / ".{}.{}".format(
+            entry_path.name, uuid.uuid4().hex
+        )
+        try:
+            link_tree(output_path, staging_path)
+            os.rename(staging_path, entry_path)
+        except OSError:
+            # The entry may have been added concurrently. Either way, the store
+            # is still consistent.
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+    def restore(
+        self, ctx: Context, task_identifier: TaskIdentifier, version: Version
+    ) -> bool:
+        """
+        Makes the stored task output available in the project represented by
+        `ctx`. Returns `False` if the output is not in the store.
+
+        The caller is responsible for committing (or rolling back) the changes
+        to the project's version index.
+        """
+        entry_path = self._entry_path(task_identifier, version)
+        if entry_path is None or not entry_path.is_dir():
+            return False
+        output_path = pathlib.Path(
+            ctx.output_path,
+            task_identifier.path,
+            f.task_output_dir(task_identifier, version),
+        )
+
+        # We link the output into a temporary directory first so that a failed
+        # restore does not leave partial outputs behind. The output is then
+        # transferred instead.
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = output_path.parent / ".{}.{}".format(
+            output_path.name, uuid.uuid4().hex
+        )
+        try:
+            link_tree(entry_path, staging_path)
+        except OSError:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            return False
+
+        insert_count = ctx.version_index.insert_output_version(
+            task_identifier, version, unchecked=True
+        )
+        if insert_count == 0:
+            # The project already has this version.
+            shutil.rmtree(staging_path, ignore_errors=True)
+            return True
+        if output_path.exists():
+            # The version is not in the project's version index, so this is a
+            # leftover (e.g., a partial output of an interrupted transfer).
+            shutil.rmtree(output_path)
+        os.rename(staging_path, output_path)
+        return True
+
+    def _entry_path(
+        self, task_identifier: TaskIdentifier, version: Version
+    ) -> Optional[pathlib.Path]:
+        if version.commit_hash is None:
+            return None
+        return pathlib.Path(
+            self._root,
+            task_identifier.path,
+            "{}.{}{}".format(
+                f.task_output_dir(task_identifier, version),
+                version.commit_hash,
+                ".uncommitted" if version.has_uncommitted_changes else "",
+            ),
+        )
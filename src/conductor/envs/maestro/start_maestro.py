@@ -73,6 +73,12 @@ def main():
     parser.add_argument(
         "--port", type=int, required=True, help="The port to listen on."
     )
+    parser.add_argument(
+        "--max-concurrent-tasks",
+        type=int,
+        help="The maximum number of tasks to run at the same time. Defaults to "
+        "the number of CPUs.",
+    )
     parser.add_argument(
         "--debug", action="store_true", help="Set to enable debug logging."
     )
@@ -92,7 +98,7 @@ def main():
         maestro_root = pathlib.Path(args.root)
         logger.info("Using Maestro root directory: %s", str(maestro_root))
         logger.info("Starting Maestro daemon on %s:%d...", args.interface, args.port)
-        maestro = Maestro(maestro_root)
+        maestro = Maestro(maestro_root, args.max_concurrent_tasks)
         task = event_loop.create_task(start_maestro(maestro, args.interface, args.port))
         event_loop.run_until_complete(task)
     except asyncio.CancelledError:
@@ -35,9 +35,16 @@ class EnvManager:
         self._impl: mgr_impl.EnvManagerImpl = impl
 
     def start_remote_env(
-        self, name: str, host: str, user: str, config: Dict[str, Any]
+        self,
+        name: str,
+        host: str,
+        user: str,
+        config: Dict[str, Any],
+        max_concurrent_tasks: Optional[int] = None,
     ) -> "RemoteEnv":
-        return self._impl.start_remote_env(name, host, user, config)
+        return self._impl.start_remote_env(
+            name, host, user, config, max_concurrent_tasks
+        )
 
     def get_remote_env(self, name: str) -> "RemoteEnv":
         return self._impl.get_remote_env(name)
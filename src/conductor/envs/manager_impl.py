@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from conductor.errors import InternalError
 from conductor.envs.remote_env import RemoteEnv
@@ -9,7 +9,12 @@ class EnvManagerImpl:
         self._active_envs: Dict[str, RemoteEnv] = {}
 
     def start_remote_env(
-        self, name: str, host: str, user: str, config: Dict[str, Any]
+        self,
+        name: str,
+        host: str,
+        user: str,
+        config: Dict[str, Any],
+        max_concurrent_tasks: Optional[int],
     ) -> RemoteEnv:
         if name in self._active_envs:
             # This is a internal error as we should not be trying to start an
@@ -17,7 +22,7 @@ class EnvManagerImpl:
             raise InternalError(
                 details=f"Environment with name '{name}' already exists."
             )
-        remote_env = RemoteEnv.start(host, user, config)
+        remote_env = RemoteEnv.start(host, user, config, max_concurrent_tasks)
         self._active_envs[name] = remote_env
         return remote_env
 
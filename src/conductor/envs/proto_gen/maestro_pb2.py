@@ -24,57 +24,75 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rmaestro.proto\x12\tconductor\"\x99\x01\n\x0e\x43onductorError\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12%\n\x06kwargs\x18\x02 \x03(\x0b\x32\x15.conductor.ErrorKwarg\x12\x19\n\x11\x66ile_context_path\x18\x03 \x01(\t\x12 \n\x18\x66ile_context_line_number\x18\x04 \x01(\x05\x12\x15\n\rextra_context\x18\x05 \x01(\t\"(\n\nErrorKwarg\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\"*\n\x13UnpackBundleRequest\x12\x13\n\x0b\x62undle_path\x18\x01 \x01(\t\".\n\x14UnpackBundleResponse\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\"\x7f\n\x12UnpackBundleResult\x12\x33\n\x08response\x18\x01 \x01(\x0b\x32\x1f.conductor.UnpackBundleResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"\xf3\x01\n\x12\x45xecuteTaskRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x17\n\x0ftask_identifier\x18\x03 \x01(\t\x12/\n\x0c\x64\x65p_versions\x18\x04 \x03(\x0b\x32\x19.conductor.TaskDependency\x12\x35\n\x11\x65xecute_task_type\x18\x05 \x01(\x0e\x32\x1a.conductor.ExecuteTaskType\x12.\n\x0eresult_version\x18\x06 \x01(\x0b\x32\x16.conductor.TaskVersion\"R\n\x0eTaskDependency\x12\x17\n\x0ftask_identifier\x18\x01 \x01(\t\x12\'\n\x07version\x18\x02 \x01(\x0b\x32\x16.conductor.TaskVersion\"V\n\x0bTaskVersion\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\x12\x13\n\x0b\x63ommit_hash\x18\x02 \x01(\t\x12\x1f\n\x17has_uncommitted_changes\x18\x03 \x01(\x08\"S\n\x0fTaskWithVersion\x12\x17\n\x0ftask_identifier\x18\x01 \x01(\t\x12\'\n\x07version\x18\x02 \x01(\x0b\x32\x16.conductor.TaskVersion\"E\n\x13\x45xecuteTaskResponse\x12\x17\n\x0fstart_timestamp\x18\x01 \x01(\x04\x12\x15\n\rend_timestamp\x18\x02 \x01(\x04\"}\n\x11\x45xecuteTaskResult\x12\x32\n\x08response\x18\x01 \x01(\x0b\x32\x1e.conductor.ExecuteTaskResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"\x91\x01\n\x18UnpackTaskOutputsRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x19\n\x11task_archive_path\x18\x03 \x01(\t\x12,\n\x0c\x61rchive_type\x18\x04 \x01(\x0e\x32\x16.conductor.ArchiveType\"\x89\x01\n\x17UnpackTaskOutputsResult\x12\x38\n\x08response\x18\x01 \x01(\x0b\x32$.conductor.UnpackTaskOutputsResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"7\n\x19UnpackTaskOutputsResponse\x12\x1a\n\x12num_unpacked_tasks\x18\x01 \x01(\x04\"\xcf\x01\n\x16PackTaskOutputsRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x33\n\x0fversioned_tasks\x18\x03 \x03(\x0b\x32\x1a.conductor.TaskWithVersion\x12$\n\x1cunversioned_task_identifiers\x18\x04 \x03(\t\x12,\n\x0c\x61rchive_type\x18\x05 \x01(\x0e\x32\x16.conductor.ArchiveType\"\x85\x01\n\x15PackTaskOutputsResult\x12\x36\n\x08response\x18\x01 \x01(\x0b\x32\".conductor.PackTaskOutputsResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"N\n\x17PackTaskOutputsResponse\x12\x18\n\x10num_packed_tasks\x18\x01 \x01(\x04\x12\x19\n\x11task_archive_path\x18\x02 \x01(\t\"\x1e\n\x0fShutdownRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\"#\n\x10ShutdownResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"w\n\x0eShutdownResult\x12/\n\x08response\x18\x01 \x01(\x0b\x32\x1b.conductor.ShutdownResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result*P\n\x0f\x45xecuteTaskType\x12\x12\n\x0eTT_UNSPECIFIED\x10\x00\x12\x15\n\x11TT_RUN_EXPERIMENT\x10\x01\x12\x12\n\x0eTT_RUN_COMMAND\x10\x02*;\n\x0b\x41rchiveType\x12\x12\n\x0e\x41T_UNSPECIFIED\x10\x00\x12\x0b\n\x07\x41T_GZIP\x10\x01\x12\x0b\n\x07\x41T_ZSTD\x10\x02\x32\xa7\x03\n\x07Maestro\x12O\n\x0cUnpackBundle\x12\x1e.conductor.UnpackBundleRequest\x1a\x1d.conductor.UnpackBundleResult\"\x00\x12L\n\x0b\x45xecuteTask\x12\x1d.conductor.ExecuteTaskRequest\x1a\x1c.conductor.ExecuteTaskResult\"\x00\x12^\n\x11UnpackTaskOutputs\x12#.conductor.UnpackTaskOutputsRequest\x1a\".conductor.UnpackTaskOutputsResult\"\x00\x12X\n\x0fPackTaskOutputs\x12!.conductor.PackTaskOutputsRequest\x1a .conductor.PackTaskOutputsResult\"\x00\x12\x43\n\x08Shutdown\x12\x1a.conductor.ShutdownRequest\x1a\x19.conductor.ShutdownResult\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rmaestro.proto\x12\tconductor\"\x99\x01\n\x0e\x43onductorError\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12%\n\x06kwargs\x18\x02 \x03(\x0b\x32\x15.conductor.ErrorKwarg\x12\x19\n\x11\x66ile_context_path\x18\x03 \x01(\t\x12 \n\x18\x66ile_context_line_number\x18\x04 \x01(\x05\x12\x15\n\rextra_context\x18\x05 \x01(\t\"(\n\nErrorKwarg\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\"X\n\x13UnpackBundleRequest\x12\x13\n\x0b\x62undle_path\x18\x01 \x01(\t\x12\x17\n\x0frepository_name\x18\x02 \x01(\t\x12\x13\n\x0b\x63ommit_hash\x18\x03 \x01(\t\".\n\x14UnpackBundleResponse\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\"\x7f\n\x12UnpackBundleResult\x12\x33\n\x08response\x18\x01 \x01(\x0b\x32\x1f.conductor.UnpackBundleResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"6\n\x1bGetRepositoryCommitsRequest\x12\x17\n\x0frepository_name\x18\x01 \x01(\t\"5\n\x1cGetRepositoryCommitsResponse\x12\x15\n\rcommit_hashes\x18\x01 \x03(\t\"\x8f\x01\n\x1aGetRepositoryCommitsResult\x12;\n\x08response\x18\x01 \x01(\x0b\x32\'.conductor.GetRepositoryCommitsResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"\xf3\x01\n\x12\x45xecuteTaskRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x17\n\x0ftask_identifier\x18\x03 \x01(\t\x12/\n\x0c\x64\x65p_versions\x18\x04 \x03(\x0b\x32\x19.conductor.TaskDependency\x12\x35\n\x11\x65xecute_task_type\x18\x05 \x01(\x0e\x32\x1a.conductor.ExecuteTaskType\x12.\n\x0eresult_version\x18\x06 \x01(\x0b\x32\x16.conductor.TaskVersion\"R\n\x0eTaskDependency\x12\x17\n\x0ftask_identifier\x18\x01 \x01(\t\x12\'\n\x07version\x18\x02 \x01(\x0b\x32\x16.conductor.TaskVersion\"V\n\x0bTaskVersion\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\x12\x13\n\x0b\x63ommit_hash\x18\x02 \x01(\t\x12\x1f\n\x17has_uncommitted_changes\x18\x03 \x01(\x08\"S\n\x0fTaskWithVersion\x12\x17\n\x0ftask_identifier\x18\x01 \x01(\t\x12\'\n\x07version\x18\x02 \x01(\x0b\x32\x16.conductor.TaskVersion\"E\n\x13\x45xecuteTaskResponse\x12\x17\n\x0fstart_timestamp\x18\x01 \x01(\x04\x12\x15\n\rend_timestamp\x18\x02 \x01(\x04\"}\n\x11\x45xecuteTaskResult\x12\x32\n\x08response\x18\x01 \x01(\x0b\x32\x1e.conductor.ExecuteTaskResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"H\n\x0fTaskOutputChunk\x12\'\n\x06stream\x18\x01 \x01(\x0e\x32\x17.conductor.OutputStream\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"y\n\x10\x45xecuteTaskEvent\x12,\n\x06output\x18\x01 \x01(\x0b\x32\x1a.conductor.TaskOutputChunkH\x00\x12.\n\x06result\x18\x02 \x01(\x0b\x32\x1c.conductor.ExecuteTaskResultH\x00\x42\x07\n\x05\x65vent\"s\n\x18UnpackTaskOutputsRequest\x12\x34\n\x06header\x18\x01 \x01(\x0b\x32\".conductor.UnpackTaskOutputsHeaderH\x00\x12\x16\n\x0c\x61rchive_data\x18\x02 \x01(\x0cH\x00\x42\t\n\x07request\"u\n\x17UnpackTaskOutputsHeader\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12,\n\x0c\x61rchive_type\x18\x03 \x01(\x0e\x32\x16.conductor.ArchiveType\"\x89\x01\n\x17UnpackTaskOutputsResult\x12\x38\n\x08response\x18\x01 \x01(\x0b\x32$.conductor.UnpackTaskOutputsResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"7\n\x19UnpackTaskOutputsResponse\x12\x1a\n\x12num_unpacked_tasks\x18\x01 \x01(\x04\"\x84\x01\n\x1fRestoreCachedTaskOutputsRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x33\n\x0fversioned_tasks\x18\x03 \x03(\x0b\x32\x1a.conductor.TaskWithVersion\"\x97\x01\n\x1eRestoreCachedTaskOutputsResult\x12?\n\x08response\x18\x01 \x01(\x0b\x32+.conductor.RestoreCachedTaskOutputsResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result\"V\n RestoreCachedTaskOutputsResponse\x12\x32\n\x0erestored_tasks\x18\x01 \x03(\x0b\x32\x1a.conductor.TaskWithVersion\"\xcf\x01\n\x16PackTaskOutputsRequest\x12\x16\n\x0eworkspace_name\x18\x01 \x01(\t\x12\x14\n\x0cproject_root\x18\x02 \x01(\t\x12\x33\n\x0fversioned_tasks\x18\x03 \x03(\x0b\x32\x1a.conductor.TaskWithVersion\x12$\n\x1cunversioned_task_identifiers\x18\x04 \x03(\t\x12,\n\x0c\x61rchive_type\x18\x05 \x01(\x0e\x32\x16.conductor.ArchiveType\"c\n\x14PackTaskOutputsEvent\x12\x16\n\x0c\x61rchive_data\x18\x01 \x01(\x0cH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x07\n\x05\x65vent\"\x1e\n\x0fShutdownRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\"#\n\x10ShutdownResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"w\n\x0eShutdownResult\x12/\n\x08response\x18\x01 \x01(\x0b\x32\x1b.conductor.ShutdownResponseH\x00\x12*\n\x05\x65rror\x18\x02 \x01(\x0b\x32\x19.conductor.ConductorErrorH\x00\x42\x08\n\x06result*P\n\x0f\x45xecuteTaskType\x12\x12\n\x0eTT_UNSPECIFIED\x10\x00\x12\x15\n\x11TT_RUN_EXPERIMENT\x10\x01\x12\x12\n\x0eTT_RUN_COMMAND\x10\x02*@\n\x0cOutputStream\x12\x12\n\x0eOS_UNSPECIFIED\x10\x00\x12\r\n\tOS_STDOUT\x10\x01\x12\r\n\tOS_STDERR\x10\x02*;\n\x0b\x41rchiveType\x12\x12\n\x0e\x41T_UNSPECIFIED\x10\x00\x12\x0b\n\x07\x41T_GZIP\x10\x01\x12\x0b\n\x07\x41T_ZSTD\x10\x02\x32\xe3\x05\n\x07Maestro\x12O\n\x0cUnpackBundle\x12\x1e.conductor.UnpackBundleRequest\x1a\x1d.conductor.UnpackBundleResult\"\x00\x12g\n\x14GetRepositoryCommits\x12&.conductor.GetRepositoryCommitsRequest\x1a%.conductor.GetRepositoryCommitsResult\"\x00\x12L\n\x0b\x45xecuteTask\x12\x1d.conductor.ExecuteTaskRequest\x1a\x1c.conductor.ExecuteTaskResult\"\x00\x12Y\n\x17\x45xecuteTaskStreamOutput\x12\x1d.conductor.ExecuteTaskRequest\x1a\x1b.conductor.ExecuteTaskEvent\"\x00\x30\x01\x12`\n\x11UnpackTaskOutputs\x12#.conductor.UnpackTaskOutputsRequest\x1a\".conductor.UnpackTaskOutputsResult\"\x00(\x01\x12s\n\x18RestoreCachedTaskOutputs\x12*.conductor.RestoreCachedTaskOutputsRequest\x1a).conductor.RestoreCachedTaskOutputsResult\"\x00\x12Y\n\x0fPackTaskOutputs\x12!.conductor.PackTaskOutputsRequest\x1a\x1f.conductor.PackTaskOutputsEvent\"\x00\x30\x01\x12\x43\n\x08Shutdown\x12\x1a.conductor.ShutdownRequest\x1a\x19.conductor.ShutdownResult\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'maestro_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_EXECUTETASKTYPE']._serialized_start=2109
-  _globals['_EXECUTETASKTYPE']._serialized_end=2189
-  _globals['_ARCHIVETYPE']._serialized_start=2191
-  _globals['_ARCHIVETYPE']._serialized_end=2250
+  _globals['_EXECUTETASKTYPE']._serialized_start=2959
+  _globals['_EXECUTETASKTYPE']._serialized_end=3039
+  _globals['_OUTPUTSTREAM']._serialized_start=3041
+  _globals['_OUTPUTSTREAM']._serialized_end=3105
+  _globals['_ARCHIVETYPE']._serialized_start=3107
+  _globals['_ARCHIVETYPE']._serialized_end=3166
   _globals['_CONDUCTORERROR']._serialized_start=29
   _globals['_CONDUCTORERROR']._serialized_end=182
   _globals['_ERRORKWARG']._serialized_start=184
   _globals['_ERRORKWARG']._serialized_end=224
   _globals['_UNPACKBUNDLEREQUEST']._serialized_start=226
-  _globals['_UNPACKBUNDLEREQUEST']._serialized_end=268
-  _globals['_UNPACKBUNDLERESPONSE']._serialized_start=270
-  _globals['_UNPACKBUNDLERESPONSE']._serialized_end=316
-  _globals['_UNPACKBUNDLERESULT']._serialized_start=318
-  _globals['_UNPACKBUNDLERESULT']._serialized_end=445
-  _globals['_EXECUTETASKREQUEST']._serialized_start=448
-  _globals['_EXECUTETASKREQUEST']._serialized_end=691
-  _globals['_TASKDEPENDENCY']._serialized_start=693
-  _globals['_TASKDEPENDENCY']._serialized_end=775
-  _globals['_TASKVERSION']._serialized_start=777
-  _globals['_TASKVERSION']._serialized_end=863
-  _globals['_TASKWITHVERSION']._serialized_start=865
-  _globals['_TASKWITHVERSION']._serialized_end=948
-  _globals['_EXECUTETASKRESPONSE']._serialized_start=950
-  _globals['_EXECUTETASKRESPONSE']._serialized_end=1019
-  _globals['_EXECUTETASKRESULT']._serialized_start=1021
-  _globals['_EXECUTETASKRESULT']._serialized_end=1146
-  _globals['_UNPACKTASKOUTPUTSREQUEST']._serialized_start=1149
-  _globals['_UNPACKTASKOUTPUTSREQUEST']._serialized_end=1294
-  _globals['_UNPACKTASKOUTPUTSRESULT']._serialized_start=1297
-  _globals['_UNPACKTASKOUTPUTSRESULT']._serialized_end=1434
-  _globals['_UNPACKTASKOUTPUTSRESPONSE']._serialized_start=1436
-  _globals['_UNPACKTASKOUTPUTSRESPONSE']._serialized_end=1491
-  _globals['_PACKTASKOUTPUTSREQUEST']._serialized_start=1494
-  _globals['_PACKTASKOUTPUTSREQUEST']._serialized_end=1701
-  _globals['_PACKTASKOUTPUTSRESULT']._serialized_start=1704
-  _globals['_PACKTASKOUTPUTSRESULT']._serialized_end=1837
-  _globals['_PACKTASKOUTPUTSRESPONSE']._serialized_start=1839
-  _globals['_PACKTASKOUTPUTSRESPONSE']._serialized_end=1917
-  _globals['_SHUTDOWNREQUEST']._serialized_start=1919
-  _globals['_SHUTDOWNREQUEST']._serialized_end=1949
-  _globals['_SHUTDOWNRESPONSE']._serialized_start=1951
-  _globals['_SHUTDOWNRESPONSE']._serialized_end=1986
-  _globals['_SHUTDOWNRESULT']._serialized_start=1988
-  _globals['_SHUTDOWNRESULT']._serialized_end=2107
-  _globals['_MAESTRO']._serialized_start=2253
-  _globals['_MAESTRO']._serialized_end=2676
+  _globals['_UNPACKBUNDLEREQUEST']._serialized_end=314
+  _globals['_UNPACKBUNDLERESPONSE']._serialized_start=316
+  _globals['_UNPACKBUNDLERESPONSE']._serialized_end=362
+  _globals['_UNPACKBUNDLERESULT']._serialized_start=364
+  _globals['_UNPACKBUNDLERESULT']._serialized_end=491
+  _globals['_GETREPOSITORYCOMMITSREQUEST']._serialized_start=493
+  _globals['_GETREPOSITORYCOMMITSREQUEST']._serialized_end=547
+  _globals['_GETREPOSITORYCOMMITSRESPONSE']._serialized_start=549
+  _globals['_GETREPOSITORYCOMMITSRESPONSE']._serialized_end=602
+  _globals['_GETREPOSITORYCOMMITSRESULT']._serialized_start=605
+  _globals['_GETREPOSITORYCOMMITSRESULT']._serialized_end=748
+  _globals['_EXECUTETASKREQUEST']._serialized_start=751
+  _globals['_EXECUTETASKREQUEST']._serialized_end=994
+  _globals['_TASKDEPENDENCY']._serialized_start=996
+  _globals['_TASKDEPENDENCY']._serialized_end=1078
+  _globals['_TASKVERSION']._serialized_start=1080
+  _globals['_TASKVERSION']._serialized_end=1166
+  _globals['_TASKWITHVERSION']._serialized_start=1168
+  _globals['_TASKWITHVERSION']._serialized_end=1251
+  _globals['_EXECUTETASKRESPONSE']._serialized_start=1253
+  _globals['_EXECUTETASKRESPONSE']._serialized_end=1322
+  _globals['_EXECUTETASKRESULT']._serialized_start=1324
+  _globals['_EXECUTETASKRESULT']._serialized_end=1449
+  _globals['_TASKOUTPUTCHUNK']._serialized_start=1451
+  _globals['_TASKOUTPUTCHUNK']._serialized_end=1523
+  _globals['_EXECUTETASKEVENT']._serialized_start=1525
+  _globals['_EXECUTETASKEVENT']._serialized_end=1646
+  _globals['_UNPACKTASKOUTPUTSREQUEST']._serialized_start=1648
+  _globals['_UNPACKTASKOUTPUTSREQUEST']._serialized_end=1763
+  _globals['_UNPACKTASKOUTPUTSHEADER']._serialized_start=1765
+  _globals['_UNPACKTASKOUTPUTSHEADER']._serialized_end=1882
+  _globals['_UNPACKTASKOUTPUTSRESULT']._serialized_start=1885
+  _globals['_UNPACKTASKOUTPUTSRESULT']._serialized_end=2022
+  _globals['_UNPACKTASKOUTPUTSRESPONSE']._serialized_start=2024
+  _globals['_UNPACKTASKOUTPUTSRESPONSE']._serialized_end=2079
+  _globals['_RESTORECACHEDTASKOUTPUTSREQUEST']._serialized_start=2082
+  _globals['_RESTORECACHEDTASKOUTPUTSREQUEST']._serialized_end=2214
+  _globals['_RESTORECACHEDTASKOUTPUTSRESULT']._serialized_start=2217
+  _globals['_RESTORECACHEDTASKOUTPUTSRESULT']._serialized_end=2368
+  _globals['_RESTORECACHEDTASKOUTPUTSRESPONSE']._serialized_start=2370
+  _globals['_RESTORECACHEDTASKOUTPUTSRESPONSE']._serialized_end=2456
+  _globals['_PACKTASKOUTPUTSREQUEST']._serialized_start=2459
+  _globals['_PACKTASKOUTPUTSREQUEST']._serialized_end=2666
+  _globals['_PACKTASKOUTPUTSEVENT']._serialized_start=2668
+  _globals['_PACKTASKOUTPUTSEVENT']._serialized_end=2767
+  _globals['_SHUTDOWNREQUEST']._serialized_start=2769
+  _globals['_SHUTDOWNREQUEST']._serialized_end=2799
+  _globals['_SHUTDOWNRESPONSE']._serialized_start=2801
+  _globals['_SHUTDOWNRESPONSE']._serialized_end=2836
+  _globals['_SHUTDOWNRESULT']._serialized_start=2838
+  _globals['_SHUTDOWNRESULT']._serialized_end=2957
+  _globals['_MAESTRO']._serialized_start=3169
+  _globals['_MAESTRO']._serialized_end=3908
 # @@protoc_insertion_point(module_scope)
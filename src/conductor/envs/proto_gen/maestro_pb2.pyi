@@ -12,6 +12,12 @@ class ExecuteTaskType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     TT_RUN_EXPERIMENT: _ClassVar[ExecuteTaskType]
     TT_RUN_COMMAND: _ClassVar[ExecuteTaskType]
 
+class OutputStream(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    OS_UNSPECIFIED: _ClassVar[OutputStream]
+    OS_STDOUT: _ClassVar[OutputStream]
+    OS_STDERR: _ClassVar[OutputStream]
+
 class ArchiveType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     __slots__ = ()
     AT_UNSPECIFIED: _ClassVar[ArchiveType]
@@ -20,6 +26,9 @@ class ArchiveType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
 TT_UNSPECIFIED: ExecuteTaskType
 TT_RUN_EXPERIMENT: ExecuteTaskType
 TT_RUN_COMMAND: ExecuteTaskType
+OS_UNSPECIFIED: OutputStream
+OS_STDOUT: OutputStream
+OS_STDERR: OutputStream
 AT_UNSPECIFIED: ArchiveType
 AT_GZIP: ArchiveType
 AT_ZSTD: ArchiveType
@@ -47,10 +56,14 @@ class ErrorKwarg(_message.Message):
     def __init__(self, key: _Optional[str] = ..., value: _Optional[str] = ...) -> None: ...
 
 class UnpackBundleRequest(_message.Message):
-    __slots__ = ("bundle_path",)
+    __slots__ = ("bundle_path", "repository_name", "commit_hash")
     BUNDLE_PATH_FIELD_NUMBER: _ClassVar[int]
+    REPOSITORY_NAME_FIELD_NUMBER: _ClassVar[int]
+    COMMIT_HASH_FIELD_NUMBER: _ClassVar[int]
     bundle_path: str
-    def __init__(self, bundle_path: _Optional[str] = ...) -> None: ...
+    repository_name: str
+    commit_hash: str
+    def __init__(self, bundle_path: _Optional[str] = ..., repository_name: _Optional[str] = ..., commit_hash: _Optional[str] = ...) -> None: ...
 
 class UnpackBundleResponse(_message.Message):
     __slots__ = ("workspace_name",)
@@ -66,6 +79,26 @@ class UnpackBundleResult(_message.Message):
     error: ConductorError
     def __init__(self, response: _Optional[_Union[UnpackBundleResponse, _Mapping]] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
 
+class GetRepositoryCommitsRequest(_message.Message):
+    __slots__ = ("repository_name",)
+    REPOSITORY_NAME_FIELD_NUMBER: _ClassVar[int]
+    repository_name: str
+    def __init__(self, repository_name: _Optional[str] = ...) -> None: ...
+
+class GetRepositoryCommitsResponse(_message.Message):
+    __slots__ = ("commit_hashes",)
+    COMMIT_HASHES_FIELD_NUMBER: _ClassVar[int]
+    commit_hashes: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, commit_hashes: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class GetRepositoryCommitsResult(_message.Message):
+    __slots__ = ("response", "error")
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    response: GetRepositoryCommitsResponse
+    error: ConductorError
+    def __init__(self, response: _Optional[_Union[GetRepositoryCommitsResponse, _Mapping]] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
+
 class ExecuteTaskRequest(_message.Message):
     __slots__ = ("workspace_name", "project_root", "task_identifier", "dep_versions", "execute_task_type", "result_version")
     WORKSPACE_NAME_FIELD_NUMBER: _ClassVar[int]
@@ -124,17 +157,39 @@ class ExecuteTaskResult(_message.Message):
     error: ConductorError
     def __init__(self, response: _Optional[_Union[ExecuteTaskResponse, _Mapping]] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
 
+class TaskOutputChunk(_message.Message):
+    __slots__ = ("stream", "data")
+    STREAM_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    stream: OutputStream
+    data: bytes
+    def __init__(self, stream: _Optional[_Union[OutputStream, str]] = ..., data: _Optional[bytes] = ...) -> None: ...
+
+class ExecuteTaskEvent(_message.Message):
+    __slots__ = ("output", "result")
+    OUTPUT_FIELD_NUMBER: _ClassVar[int]
+    RESULT_FIELD_NUMBER: _ClassVar[int]
+    output: TaskOutputChunk
+    result: ExecuteTaskResult
+    def __init__(self, output: _Optional[_Union[TaskOutputChunk, _Mapping]] = ..., result: _Optional[_Union[ExecuteTaskResult, _Mapping]] = ...) -> None: ...
+
 class UnpackTaskOutputsRequest(_message.Message):
-    __slots__ = ("workspace_name", "project_root", "task_archive_path", "archive_type")
+    __slots__ = ("header", "archive_data")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    ARCHIVE_DATA_FIELD_NUMBER: _ClassVar[int]
+    header: UnpackTaskOutputsHeader
+    archive_data: bytes
+    def __init__(self, header: _Optional[_Union[UnpackTaskOutputsHeader, _Mapping]] = ..., archive_data: _Optional[bytes] = ...) -> None: ...
+
+class UnpackTaskOutputsHeader(_message.Message):
+    __slots__ = ("workspace_name", "project_root", "archive_type")
     WORKSPACE_NAME_FIELD_NUMBER: _ClassVar[int]
     PROJECT_ROOT_FIELD_NUMBER: _ClassVar[int]
-    TASK_ARCHIVE_PATH_FIELD_NUMBER: _ClassVar[int]
     ARCHIVE_TYPE_FIELD_NUMBER: _ClassVar[int]
     workspace_name: str
     project_root: str
-    task_archive_path: str
     archive_type: ArchiveType
-    def __init__(self, workspace_name: _Optional[str] = ..., project_root: _Optional[str] = ..., task_archive_path: _Optional[str] = ..., archive_type: _Optional[_Union[ArchiveType, str]] = ...) -> None: ...
+    def __init__(self, workspace_name: _Optional[str] = ..., project_root: _Optional[str] = ..., archive_type: _Optional[_Union[ArchiveType, str]] = ...) -> None: ...
 
 class UnpackTaskOutputsResult(_message.Message):
     __slots__ = ("response", "error")
@@ -150,6 +205,30 @@ class UnpackTaskOutputsResponse(_message.Message):
     num_unpacked_tasks: int
     def __init__(self, num_unpacked_tasks: _Optional[int] = ...) -> None: ...
 
+class RestoreCachedTaskOutputsRequest(_message.Message):
+    __slots__ = ("workspace_name", "project_root", "versioned_tasks")
+    WORKSPACE_NAME_FIELD_NUMBER: _ClassVar[int]
+    PROJECT_ROOT_FIELD_NUMBER: _ClassVar[int]
+    VERSIONED_TASKS_FIELD_NUMBER: _ClassVar[int]
+    workspace_name: str
+    project_root: str
+    versioned_tasks: _containers.RepeatedCompositeFieldContainer[TaskWithVersion]
+    def __init__(self, workspace_name: _Optional[str] = ..., project_root: _Optional[str] = ..., versioned_tasks: _Optional[_Iterable[_Union[TaskWithVersion, _Mapping]]] = ...) -> None: ...
+
+class RestoreCachedTaskOutputsResult(_message.Message):
+    __slots__ = ("response", "error")
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    response: RestoreCachedTaskOutputsResponse
+    error: ConductorError
+    def __init__(self, response: _Optional[_Union[RestoreCachedTaskOutputsResponse, _Mapping]] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
+
+class RestoreCachedTaskOutputsResponse(_message.Message):
+    __slots__ = ("restored_tasks",)
+    RESTORED_TASKS_FIELD_NUMBER: _ClassVar[int]
+    restored_tasks: _containers.RepeatedCompositeFieldContainer[TaskWithVersion]
+    def __init__(self, restored_tasks: _Optional[_Iterable[_Union[TaskWithVersion, _Mapping]]] = ...) -> None: ...
+
 class PackTaskOutputsRequest(_message.Message):
     __slots__ = ("workspace_name", "project_root", "versioned_tasks", "unversioned_task_identifiers", "archive_type")
     WORKSPACE_NAME_FIELD_NUMBER: _ClassVar[int]
@@ -164,21 +243,13 @@ class PackTaskOutputsRequest(_message.Message):
     archive_type: ArchiveType
     def __init__(self, workspace_name: _Optional[str] = ..., project_root: _Optional[str] = ..., versioned_tasks: _Optional[_Iterable[_Union[TaskWithVersion, _Mapping]]] = ..., unversioned_task_identifiers: _Optional[_Iterable[str]] = ..., archive_type: _Optional[_Union[ArchiveType, str]] = ...) -> None: ...
 
-class PackTaskOutputsResult(_message.Message):
-    __slots__ = ("response", "error")
-    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+class PackTaskOutputsEvent(_message.Message):
+    __slots__ = ("archive_data", "error")
+    ARCHIVE_DATA_FIELD_NUMBER: _ClassVar[int]
     ERROR_FIELD_NUMBER: _ClassVar[int]
-    response: PackTaskOutputsResponse
+    archive_data: bytes
     error: ConductorError
-    def __init__(self, response: _Optional[_Union[PackTaskOutputsResponse, _Mapping]] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
-
-class PackTaskOutputsResponse(_message.Message):
-    __slots__ = ("num_packed_tasks", "task_archive_path")
-    NUM_PACKED_TASKS_FIELD_NUMBER: _ClassVar[int]
-    TASK_ARCHIVE_PATH_FIELD_NUMBER: _ClassVar[int]
-    num_packed_tasks: int
-    task_archive_path: str
-    def __init__(self, num_packed_tasks: _Optional[int] = ..., task_archive_path: _Optional[str] = ...) -> None: ...
+    def __init__(self, archive_data: _Optional[bytes] = ..., error: _Optional[_Union[ConductorError, _Mapping]] = ...) -> None: ...
 
 class ShutdownRequest(_message.Message):
     __slots__ = ("key",)
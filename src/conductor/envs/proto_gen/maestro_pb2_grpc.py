@@ -40,20 +40,35 @@ class MaestroStub(object):
                 request_serializer=maestro__pb2.UnpackBundleRequest.SerializeToString,
                 response_deserializer=maestro__pb2.UnpackBundleResult.FromString,
                 _registered_method=True)
+        self.GetRepositoryCommits = channel.unary_unary(
+                '/conductor.Maestro/GetRepositoryCommits',
+                request_serializer=maestro__pb2.GetRepositoryCommitsRequest.SerializeToString,
+                response_deserializer=maestro__pb2.GetRepositoryCommitsResult.FromString,
+                _registered_method=True)
         self.ExecuteTask = channel.unary_unary(
                 '/conductor.Maestro/ExecuteTask',
                 request_serializer=maestro__pb2.ExecuteTaskRequest.SerializeToString,
                 response_deserializer=maestro__pb2.ExecuteTaskResult.FromString,
                 _registered_method=True)
-        self.UnpackTaskOutputs = channel.unary_unary(
+        self.ExecuteTaskStreamOutput = channel.unary_stream(
+                '/conductor.Maestro/ExecuteTaskStreamOutput',
+                request_serializer=maestro__pb2.ExecuteTaskRequest.SerializeToString,
+                response_deserializer=maestro__pb2.ExecuteTaskEvent.FromString,
+                _registered_method=True)
+        self.UnpackTaskOutputs = channel.stream_unary(
                 '/conductor.Maestro/UnpackTaskOutputs',
                 request_serializer=maestro__pb2.UnpackTaskOutputsRequest.SerializeToString,
                 response_deserializer=maestro__pb2.UnpackTaskOutputsResult.FromString,
                 _registered_method=True)
-        self.PackTaskOutputs = channel.unary_unary(
+        self.RestoreCachedTaskOutputs = channel.unary_unary(
+                '/conductor.Maestro/RestoreCachedTaskOutputs',
+                request_serializer=maestro__pb2.RestoreCachedTaskOutputsRequest.SerializeToString,
+                response_deserializer=maestro__pb2.RestoreCachedTaskOutputsResult.FromString,
+                _registered_method=True)
+        self.PackTaskOutputs = channel.unary_stream(
                 '/conductor.Maestro/PackTaskOutputs',
                 request_serializer=maestro__pb2.PackTaskOutputsRequest.SerializeToString,
-                response_deserializer=maestro__pb2.PackTaskOutputsResult.FromString,
+                response_deserializer=maestro__pb2.PackTaskOutputsEvent.FromString,
                 _registered_method=True)
         self.Shutdown = channel.unary_unary(
                 '/conductor.Maestro/Shutdown',
@@ -73,6 +88,14 @@ class MaestroServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetRepositoryCommits(self, request, context):
+        """Used to retrieve the commits that Maestro already has for a repository.
+        The caller uses them to only send the commits that Maestro is missing.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ExecuteTask(self, request, context):
         """Used to execute a Conductor task.
         """
@@ -80,10 +103,29 @@ class MaestroServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
-    def UnpackTaskOutputs(self, request, context):
+    def ExecuteTaskStreamOutput(self, request, context):
+        """Used to execute a Conductor task while streaming its output (stdout and
+        stderr) back to the caller. The last message in the stream contains the
+        task's result.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UnpackTaskOutputs(self, request_iterator, context):
         """Used to unpack an archive containing task outputs. These are usually the
         inputs required for a task that we intend to execute in this remote
-        environment.
+        environment. The first message in the stream describes the archive and the
+        rest contain its data; Maestro extracts the archive while it is received.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RestoreCachedTaskOutputs(self, request, context):
+        """Used to make task outputs that Maestro already has (e.g., that were
+        produced or transferred in an earlier session) available in a workspace.
+        Callers use this to avoid transferring these outputs again.
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -91,7 +133,8 @@ class MaestroServicer(object):
 
     def PackTaskOutputs(self, request, context):
         """Used to pack task outputs into an archive. These are the outputs of a task
-        that we ran in this remote environment.
+        that we ran in this remote environment. The archive's data is streamed
+        back to the caller while the archive is created.
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -112,20 +155,35 @@ def add_MaestroServicer_to_server(servicer, server):
                     request_deserializer=maestro__pb2.UnpackBundleRequest.FromString,
                     response_serializer=maestro__pb2.UnpackBundleResult.SerializeToString,
             ),
+            'GetRepositoryCommits': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetRepositoryCommits,
+                    request_deserializer=maestro__pb2.GetRepositoryCommitsRequest.FromString,
+                    response_serializer=maestro__pb2.GetRepositoryCommitsResult.SerializeToString,
+            ),
             'ExecuteTask': grpc.unary_unary_rpc_method_handler(
                     servicer.ExecuteTask,
                     request_deserializer=maestro__pb2.ExecuteTaskRequest.FromString,
                     response_serializer=maestro__pb2.ExecuteTaskResult.SerializeToString,
             ),
-            'UnpackTaskOutputs': grpc.unary_unary_rpc_method_handler(
+            'ExecuteTaskStreamOutput': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExecuteTaskStreamOutput,
+                    request_deserializer=maestro__pb2.ExecuteTaskRequest.FromString,
+                    response_serializer=maestro__pb2.ExecuteTaskEvent.SerializeToString,
+            ),
+            'UnpackTaskOutputs': grpc.stream_unary_rpc_method_handler(
                     servicer.UnpackTaskOutputs,
                     request_deserializer=maestro__pb2.UnpackTaskOutputsRequest.FromString,
                     response_serializer=maestro__pb2.UnpackTaskOutputsResult.SerializeToString,
             ),
-            'PackTaskOutputs': grpc.unary_unary_rpc_method_handler(
+            'RestoreCachedTaskOutputs': grpc.unary_unary_rpc_method_handler(
+                    servicer.RestoreCachedTaskOutputs,
+                    request_deserializer=maestro__pb2.RestoreCachedTaskOutputsRequest.FromString,
+                    response_serializer=maestro__pb2.RestoreCachedTaskOutputsResult.SerializeToString,
+            ),
+            'PackTaskOutputs': grpc.unary_stream_rpc_method_handler(
                     servicer.PackTaskOutputs,
                     request_deserializer=maestro__pb2.PackTaskOutputsRequest.FromString,
-                    response_serializer=maestro__pb2.PackTaskOutputsResult.SerializeToString,
+                    response_serializer=maestro__pb2.PackTaskOutputsEvent.SerializeToString,
             ),
             'Shutdown': grpc.unary_unary_rpc_method_handler(
                     servicer.Shutdown,
@@ -171,6 +229,33 @@ class Maestro(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetRepositoryCommits(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/conductor.Maestro/GetRepositoryCommits',
+            maestro__pb2.GetRepositoryCommitsRequest.SerializeToString,
+            maestro__pb2.GetRepositoryCommitsResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ExecuteTask(request,
             target,
@@ -199,7 +284,7 @@ class Maestro(object):
             _registered_method=True)
 
     @staticmethod
-    def UnpackTaskOutputs(request,
+    def ExecuteTaskStreamOutput(request,
             target,
             options=(),
             channel_credentials=None,
@@ -209,9 +294,36 @@ class Maestro(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
+        return grpc.experimental.unary_stream(
             request,
             target,
+            '/conductor.Maestro/ExecuteTaskStreamOutput',
+            maestro__pb2.ExecuteTaskRequest.SerializeToString,
+            maestro__pb2.ExecuteTaskEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UnpackTaskOutputs(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
             '/conductor.Maestro/UnpackTaskOutputs',
             maestro__pb2.UnpackTaskOutputsRequest.SerializeToString,
             maestro__pb2.UnpackTaskOutputsResult.FromString,
@@ -226,7 +338,7 @@ class Maestro(object):
             _registered_method=True)
 
     @staticmethod
-    def PackTaskOutputs(request,
+    def RestoreCachedTaskOutputs(request,
             target,
             options=(),
             channel_credentials=None,
@@ -237,11 +349,38 @@ class Maestro(object):
             timeout=None,
             metadata=None):
         return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/conductor.Maestro/RestoreCachedTaskOutputs',
+            maestro__pb2.RestoreCachedTaskOutputsRequest.SerializeToString,
+            maestro__pb2.RestoreCachedTaskOutputsResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PackTaskOutputs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
             request,
             target,
             '/conductor.Maestro/PackTaskOutputs',
             maestro__pb2.PackTaskOutputsRequest.SerializeToString,
-            maestro__pb2.PackTaskOutputsResult.FromString,
+            maestro__pb2.PackTaskOutputsEvent.FromString,
             options,
             channel_credentials,
             insecure,
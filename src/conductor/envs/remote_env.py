@@ -1,7 +1,9 @@
 import pathlib
+import socket
+import threading
 import time
 import io
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Set
 
 from fabric import Connection
 
@@ -11,24 +13,44 @@ from conductor.envs.install_maestro import ensure_maestro_installed
 from conductor.envs.maestro.client import MaestroGrpcClient
 from conductor.errors import InternalError
 
+# The first port to try when selecting a port for the Maestro daemon.
+_BASE_PORT = 7583
+
 
 class RemoteEnv:
     """
     Represents a remote environment that has a Maestro daemon running. We
     communicate with the daemon via gRPC over an SSH tunnel.
+
+    Different environments may be used concurrently (from different threads),
+    but uses of the same environment's SSH connection are serialized.
     """
 
+    # Ports that have been assigned to environments in this process.
+    _UsedPorts: Set[int] = set()
+    _UsedPortsLock = threading.Lock()
+
     @classmethod
-    def start(cls, host: str, user: str, config: Dict[str, Any]) -> "RemoteEnv":
+    def start(
+        cls,
+        host: str,
+        user: str,
+        config: Dict[str, Any],
+        max_concurrent_tasks: Optional[int] = None,
+    ) -> "RemoteEnv":
         """
         Starts a remote environment on `user@host`. This method is blocking and
         will return after the environment has been started.
+
+        `max_concurrent_tasks` limits the number of tasks that the environment
+        runs at the same time (by default, it is the environment's CPU count).
         """
         # Open the SSH connection and set up the tunnel.
         conn = Connection(host=host, user=user, connect_kwargs=config)
         conn.open()
-        # NOTE: Need to cycle through ports until we find one that is open.
-        port = 7583
+        # Several environments may be active at the same time, so each one
+        # needs its own tunnel port.
+        port = cls._allocate_port()
         tunnel = TunneledSshConnection(conn, port=port)
         tunnel.open()
 
@@ -38,9 +60,12 @@ class RemoteEnv:
         # Start the daemon in the remote environment.
         venv_python = maestro_root / MAESTRO_VENV_NAME / "bin" / "python3"
         out_pipe = io.StringIO()
+        daemon_args = f"--root {str(maestro_root)} --port {port} --debug"
+        if max_concurrent_tasks is not None:
+            daemon_args += f" --max-concurrent-tasks {max_concurrent_tasks}"
         daemon = conn.run(
             f"{str(venv_python)} -m conductor.envs.maestro.start_maestro "
-            f"--root {str(maestro_root)} --port {port} --debug",
+            f"{daemon_args}",
             asynchronous=True,
             out_stream=out_pipe,
         )
@@ -81,6 +106,7 @@ class RemoteEnv:
         self._maestro_root = maestro_root
         self._client: Optional[MaestroGrpcClient] = None
         self._workspace_name: Optional[str] = None
+        self._connection_lock = threading.Lock()
 
     def client(self) -> MaestroGrpcClient:
         """
@@ -127,15 +153,17 @@ class RemoteEnv:
                 / remote_path
             )
 
-        self._connection.run(f"mkdir -p {str(full_remote_path.parent)}", hide=True)
-        self._connection.put(str(local_path), str(full_remote_path))
+        with self._connection_lock:
+            self._connection.run(f"mkdir -p {str(full_remote_path.parent)}", hide=True)
+            self._connection.put(str(local_path), str(full_remote_path))
 
     def delete_file(self, remote_path: pathlib.Path) -> None:
         """
         Deletes a file in the remote environment.
         """
         full_remote_path = self._maestro_root / remote_path
-        self._connection.run(f"rm -f {str(full_remote_path)}", hide=True)
+        with self._connection_lock:
+            self._connection.run(f"rm -f {str(full_remote_path)}", hide=True)
 
     def pull_file(self, remote_path: pathlib.Path, local_path: pathlib.Path) -> None:
         """
@@ -143,7 +171,8 @@ class RemoteEnv:
         remote path should be a relative path to the Maestro root.
         """
         full_remote_path = self._maestro_root / remote_path
-        self._connection.get(str(full_remote_path), str(local_path))
+        with self._connection_lock:
+            self._connection.get(str(full_remote_path), str(local_path))
 
     def shutdown(self) -> None:
         """
@@ -160,12 +189,36 @@ class RemoteEnv:
         self._connection.close()
         # N.B. This has to be closed after all the Fabric resources are closed.
         self._out_pipe.close()
+        with RemoteEnv._UsedPortsLock:
+            RemoteEnv._UsedPorts.discard(self._port)
 
     def set_workspace_name(self, name: str) -> None:
         self._workspace_name = name
 
+    @classmethod
+    def _allocate_port(cls) -> int:
+        """
+        Returns the first port (starting from `_BASE_PORT`) that is not used by
+        another environment and that can be bound locally.
+        """
+        with cls._UsedPortsLock:
+            port = _BASE_PORT
+            while port in cls._UsedPorts or not _can_bind(port):
+                port += 1
+            cls._UsedPorts.add(port)
+            return port
+
     @staticmethod
     def _compute_maestro_root(c: Connection) -> pathlib.Path:
         result = c.run("echo $HOME", hide=True)
         home_dir = result.stdout.strip()
         return pathlib.Path(home_dir) / MAESTRO_ROOT
+
+
+def _can_bind(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("localhost", port))
+            return True
+        except OSError:
+            return False
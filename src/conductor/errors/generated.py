@@ -272,6 +272,22 @@ class IncludeFileInvalidExtension(ConductorError):
         )
 
 
+class RunResourcesInvalidValue(ConductorError):
+    error_code = 1018
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.key = kwargs["key"]
+        self.identifier = kwargs["identifier"]
+
+    def _message(self):
+        return "Encountered an invalid resource request for '{key}' when processing task '{identifier}'. Resource names must be strings and resource amounts must be non-negative numbers.".format(
+            key=self.key,
+            identifier=self.identifier,
+        )
+
+
 class TaskNotFound(ConductorError):
     error_code = 2001
 
@@ -428,6 +444,20 @@ class CorruptedVersionIndex(ConductorError):
         )
 
 
+class EnvMaxConcurrentTasksInvalid(ConductorError):
+    error_code = 2012
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.env_name = kwargs["env_name"]
+
+    def _message(self):
+        return "The environment '{env_name}' has an invalid max_concurrent_tasks value. It must be a positive integer.".format(
+            env_name=self.env_name,
+        )
+
+
 class TaskNonZeroExit(ConductorError):
     error_code = 3001
 
@@ -630,6 +660,42 @@ class EnvExtraFileNotInRepository(ConductorError):
         )
 
 
+class ResourceRequestExceedsCapacity(ConductorError):
+    error_code = 3015
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.task_identifier = kwargs["task_identifier"]
+        self.amount = kwargs["amount"]
+        self.resource = kwargs["resource"]
+        self.capacity = kwargs["capacity"]
+
+    def _message(self):
+        return "Task '{task_identifier}' requests {amount} of resource '{resource}', but the machine's capacity is only {capacity}. Adjust the task's resource request or set a larger capacity under the 'resources' table in your project's cond_config.toml.".format(
+            task_identifier=self.task_identifier,
+            amount=self.amount,
+            resource=self.resource,
+            capacity=self.capacity,
+        )
+
+
+class OutputVersionTaken(ConductorError):
+    error_code = 3016
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.task_identifier = kwargs["task_identifier"]
+        self.output_dir = kwargs["output_dir"]
+
+    def _message(self):
+        return "Conductor cannot run task '{task_identifier}' because the output directory for its new version ('{output_dir}') already exists. Another Conductor process may be using the same version. Please try running the task again.".format(
+            task_identifier=self.task_identifier,
+            output_dir=self.output_dir,
+        )
+
+
 class OutputFileExists(ConductorError):
     error_code = 4001
 
@@ -896,6 +962,34 @@ class MissingExplorerSupport(ConductorError):
         )
 
 
+class DaemonStartFailed(ConductorError):
+    error_code = 5013
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.log_file = kwargs["log_file"]
+
+    def _message(self):
+        return "Conductor's daemon did not start. See {log_file} for details.".format(
+            log_file=self.log_file,
+        )
+
+
+class DaemonSocketPathTooLong(ConductorError):
+    error_code = 5014
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.kwargs = kwargs
+        self.socket_path = kwargs["socket_path"]
+
+    def _message(self):
+        return "The path to the project's output directory is too long for Conductor's daemon to create its socket ({socket_path}).".format(
+            socket_path=self.socket_path,
+        )
+
+
 class InternalError(ConductorError):
     error_code = 6000
 
@@ -929,6 +1023,7 @@ ERRORS_BY_CODE = {
     1015: ExperimentGroupInvalidExperimentInstance,
     1016: RunArgumentsNonPrimitiveValue,
     1017: IncludeFileInvalidExtension,
+    1018: RunResourcesInvalidValue,
     2001: TaskNotFound,
     2002: MissingProjectRoot,
     2003: CyclicDependency,
@@ -940,6 +1035,7 @@ ERRORS_BY_CODE = {
     2009: EnvNotEnv,
     2010: EnvExtraFilesNotRelative,
     2011: CorruptedVersionIndex,
+    2012: EnvMaxConcurrentTasksInvalid,
     3001: TaskNonZeroExit,
     3002: TaskFailed,
     3003: OutputDirTaken,
@@ -954,6 +1050,8 @@ ERRORS_BY_CODE = {
     3012: EnvConfigInvalid,
     3013: EnvExtraFileNotFound,
     3014: EnvExtraFileNotInRepository,
+    3015: ResourceRequestExceedsCapacity,
+    3016: OutputVersionTaken,
     4001: OutputFileExists,
     4002: OutputPathDoesNotExist,
     4003: NoTaskOutputsToArchive,
@@ -973,6 +1071,8 @@ ERRORS_BY_CODE = {
     5010: AtLeastCommitNotAncestor,
     5011: NoTaskOutputPath,
     5012: MissingExplorerSupport,
+    5013: DaemonStartFailed,
+    5014: DaemonSocketPathTooLong,
     6000: InternalError,
 }
 
@@ -996,6 +1096,7 @@ __all__ = [
     "ExperimentGroupInvalidExperimentInstance",
     "RunArgumentsNonPrimitiveValue",
     "IncludeFileInvalidExtension",
+    "RunResourcesInvalidValue",
     "TaskNotFound",
     "MissingProjectRoot",
     "CyclicDependency",
@@ -1007,6 +1108,7 @@ __all__ = [
     "EnvNotEnv",
     "EnvExtraFilesNotRelative",
     "CorruptedVersionIndex",
+    "EnvMaxConcurrentTasksInvalid",
     "TaskNonZeroExit",
     "TaskFailed",
     "OutputDirTaken",
@@ -1021,6 +1123,8 @@ __all__ = [
     "EnvConfigInvalid",
     "EnvExtraFileNotFound",
     "EnvExtraFileNotInRepository",
+    "ResourceRequestExceedsCapacity",
+    "OutputVersionTaken",
     "OutputFileExists",
     "OutputPathDoesNotExist",
     "NoTaskOutputsToArchive",
@@ -1040,5 +1144,7 @@ __all__ = [
     "AtLeastCommitNotAncestor",
     "NoTaskOutputPath",
     "MissingExplorerSupport",
+    "DaemonStartFailed",
+    "DaemonSocketPathTooLong",
     "InternalError",
 ]
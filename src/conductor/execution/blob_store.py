@@ -0,0 +1,241 @@
+import collections
+import hashlib
+import os
+import pathlib
+import re
+import stat
+import uuid
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Identifies a file on disk (its device and inode numbers).
+FileId = Tuple[int, int]
+
+_HEX_DIGEST_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DeduplicationResult(NamedTuple):
+    # The number of files that were replaced by links to existing blobs.
+    num_deduplicated: int
+    # The number of bytes that no longer take up space on disk.
+    num_bytes_saved: int
+
+
+class BlobStore:
+    """
+    A content-addressed store of task output files, kept inside the output
+    directory. Each blob is named after the SHA-256 hash of its contents and
+    task output files with identical contents are hard links to the same blob.
+    So repeated task output versions only take up space for the files that
+    differ.
+
+    A blob is referenced by the task output files that link to it. Blobs that
+    are no longer referenced (i.e., their link count is 1) can be removed with
+    `remove_unreferenced()`. Deduplicated files are shared, so they must not be
+    modified in place.
+    """
+
+    _ChunkSize = 1024 * 1024
+
+    def __init__(self, root: pathlib.Path) -> None:
+        self._root = root
+
+    @property
+    def root(self) -> pathlib.Path:
+        return self._root
+
+    @staticmethod
+    def blob_name(digest: str) -> pathlib.PurePosixPath:
+        """
+        Returns the name of the blob with the given digest (relative to the
+        store's root).
+        """
+        return pathlib.PurePosixPath(digest[:2], digest[2:])
+
+    @staticmethod
+    def digest_from_name(name: pathlib.PurePosixPath) -> Optional[str]:
+        """
+        Returns the digest of the blob with the given name (relative to the
+        store's root), or `None` if `name` is not a valid blob name.
+        """
+        if len(name.parts) != 2 or len(name.parts[0]) != 2:
+            return None
+        digest = name.parts[0] + name.parts[1]
+        if _HEX_DIGEST_REGEX.match(digest) is None:
+            return None
+        return digest
+
+    def blob_path(self, digest: str) -> pathlib.Path:
+        return self._root / self.blob_name(digest)
+
+    def deduplicate(self, path: pathlib.Path) -> DeduplicationResult:
+        """
+        Adds the regular files under `path` to the store. Files whose contents
+        are already stored are replaced with hard links to the stored blob.
+        Files that cannot be deduplicated (e.g., because the file system does
+        not support hard links) are left as they are.
+        """
+        num_deduplicated = 0
+        num_bytes_saved = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                file_path = pathlib.Path(dirpath, filename)
+                try:
+                    bytes_saved = self._deduplicate_file(file_path)
+                except OSError:
+                    continue
+                if bytes_saved is not None:
+                    num_deduplicated += 1
+                    num_bytes_saved += bytes_saved
+        return DeduplicationResult(num_deduplicated, num_bytes_saved)
+
+    def add(self, digest: str, contents: IO[bytes], mode: int) -> bool:
+        """
+        Stores `contents` (e.g., read from an archive) as the blob with the
+        given digest, unless the blob is already stored. Returns `False` if the
+        contents do not match the digest.
+        """
+        blob_path = self.blob_path(digest)
+        if blob_path.exists():
+            return True
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _temporary_path(blob_path)
+        try:
+            hasher = hashlib.sha256()
+            with open(temp_path, "wb") as file:
+                while True:
+                    data = contents.read(self._ChunkSize)
+                    if len(data) == 0:
+                        break
+                    hasher.update(data)
+                    file.write(data)
+            if hasher.hexdigest() != digest:
+                return False
+            os.chmod(temp_path, stat.S_IMODE(mode))
+            try:
+                os.link(temp_path, blob_path)
+            except FileExistsError:
+                # The blob was stored concurrently.
+                pass
+            return True
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def blob_names_by_file_id(self) -> Dict[FileId, pathlib.PurePosixPath]:
+        """
+        Maps the file IDs of the stored blobs to their names (relative to the
+        store's root). Task output files that were deduplicated share their
+        file ID with a blob.
+        """
+        return {
+            _file_id(blob_stat): pathlib.PurePosixPath(
+                blob_path.relative_to(self._root)
+            )
+            for blob_path, blob_stat in self._blobs()
+        }
+
+    def unreferenced_blobs(
+        self, ignored_paths: Iterable[pathlib.Path] = ()
+    ) -> List[pathlib.Path]:
+        """
+        Returns the stored blobs that no task output files link to. Links under
+        `ignored_paths` (e.g., directories that are about to be removed) are
+        not counted.
+        """
+        ignored_links: "collections.Counter[FileId]" = collections.Counter()
+        for ignored_path in ignored_paths:
+            for dirpath, _, filenames in os.walk(ignored_path):
+                for filename in filenames:
+                    try:
+                        file_stat = os.lstat(os.path.join(dirpath, filename))
+                    except OSError:
+                        continue
+                    if file_stat.st_nlink > 1:
+                        ignored_links[_file_id(file_stat)] += 1
+
+        return [
+            blob_path
+            for blob_path, blob_stat in self._blobs()
+            if blob_stat.st_nlink - ignored_links[_file_id(blob_stat)] <= 1
+        ]
+
+    def remove_unreferenced(self) -> List[pathlib.Path]:
+        """
+        Removes the stored blobs that no task output files link to. Returns the
+        paths of the removed blobs.
+        """
+        removed = []
+        for blob_path in self.unreferenced_blobs():
+            try:
+                blob_path.unlink()
+                removed.append(blob_path)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _deduplicate_file(self, file_path: pathlib.Path) -> Optional[int]:
+        """
+        Returns the number of bytes saved, or `None` if the file was not
+        replaced with a link.
+        """
+        file_stat = os.lstat(file_path)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+            return None
+        blob_path = self.blob_path(_hash_file(file_path, self._ChunkSize))
+        try:
+            blob_stat = os.lstat(blob_path)
+        except FileNotFoundError:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.link(file_path, blob_path)
+            return None
+
+        if _file_id(blob_stat) == _file_id(file_stat):
+            # Already deduplicated.
+            return None
+        if stat.S_IMODE(blob_stat.st_mode) != stat.S_IMODE(file_stat.st_mode):
+            # Linked files share their permissions (e.g., whether they are
+            # executable), so we leave this file as it is.
+            return None
+
+        temp_path = _temporary_path(file_path)
+        os.link(blob_path, temp_path)
+        try:
+            os.replace(temp_path, file_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return file_stat.st_size
+
+    def _blobs(self) -> Iterator[Tuple[pathlib.Path, os.stat_result]]:
+        if not self._root.is_dir():
+            return
+        with os.scandir(self._root) as prefix_dirs:
+            for prefix_dir in prefix_dirs:
+                if len(prefix_dir.name) != 2 or not prefix_dir.is_dir(
+                    follow_symlinks=False
+                ):
+                    continue
+                with os.scandir(prefix_dir.path) as blobs:
+                    for blob in blobs:
+                        if blob.name.startswith("."):
+                            # A blob that is being added.
+                            continue
+                        yield pathlib.Path(blob.path), blob.stat(follow_symlinks=False)
+
+
+def _hash_file(path: pathlib.Path, chunk_size: int) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(chunk_size)
+            if len(data) == 0:
+                break
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _file_id(file_stat: os.stat_result) -> FileId:
+    return (file_stat.st_dev, file_stat.st_ino)
+
+
+def _temporary_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(".{}.{}".format(path.name, uuid.uuid4().hex))
@@ -0,0 +1,122 @@
+import sqlite3
+import pathlib
+from typing import Dict, List, Optional
+
+from conductor.utils.git import Git, CommitGraph
+import conductor.execution.commit_index_queries as q
+
+
+class CommitIndex:
+    """
+    The `CommitIndex` is a persistent data structure that stores the ancestry
+    (parents and generation numbers) of the commits that Conductor has seen.
+
+    A commit's ancestry never changes once the commit exists. So the index is
+    append-only and is incrementally updated with the commits added since the
+    last indexed `HEAD`. This lets Conductor answer ancestry queries without
+    invoking `git` once `HEAD` has been indexed.
+
+    The ancestry of a shallow clone's commits is incomplete and changes when
+    the clone is deepened, so it is never stored in the index.
+    """
+
+    # FormatVersion = 1 may contain the (incomplete) ancestry of shallow clones
+    FormatVersion = 2
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    @classmethod
+    def create_or_load(cls, path: pathlib.Path) -> "CommitIndex":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        format_version = conn.execute(q.get_format_version).fetchone()[0]
+        if format_version not in (0, cls.FormatVersion):
+            # The index only caches information that can be retrieved from
+            # git, so it is safe to rebuild it from scratch.
+            conn.close()
+            path.unlink()
+            conn = sqlite3.connect(path)
+            format_version = 0
+
+        if format_version == 0:
+            # Need to create the DB
+            conn.execute(q.create_commits_table)
+            conn.execute(q.create_commit_parents_table)
+            conn.execute(q.create_indexed_heads_table)
+            conn.execute(q.set_format_version.format(version=cls.FormatVersion))
+            conn.commit()
+
+        return cls(conn)
+
+    def load_commit_graph(self, git: Git, head_hash: str) -> Optional[CommitGraph]:
+        """
+        Returns a `CommitGraph` containing the ancestry of `head_hash`,
+        indexing any commits that are not already in the index. Returns `None`
+        if the ancestry could not be retrieved.
+        """
+        if git.is_shallow():
+            # A shallow clone's history is short, so it is cheap to retrieve.
+            return git.load_commit_graph(head_hash)
+
+        if not self._ensure_indexed(git, head_hash):
+            return None
+
+        parents: Dict[str, List[str]] = {}
+        generations: Dict[str, int] = {}
+        cursor = self._conn.cursor()
+        cursor.execute(q.ancestry_of_commit, (head_hash,))
+        for commit_hash, generation, parent_hash in cursor:
+            commit_parents = parents.setdefault(commit_hash, [])
+            if parent_hash is not None:
+                commit_parents.append(parent_hash)
+            generations[commit_hash] = generation
+        graph = CommitGraph(git, head_hash, parents, generations)
+
+        # Indexed heads that are ancestors of `head_hash` are now redundant.
+        for indexed_head in self._get_indexed_heads():
+            if indexed_head != head_hash and indexed_head in graph:
+                cursor.execute(q.delete_indexed_head, (indexed_head,))
+        cursor.execute(q.insert_indexed_head, (head_hash,))
+        self._conn.commit()
+        return graph
+
+    def _ensure_indexed(self, git: Git, head_hash: str) -> bool:
+        cursor = self._conn.cursor()
+        if cursor.execute(q.has_commit, (head_hash,)).fetchone() is not None:
+            return True
+
+        # Only retrieve the commits that are not reachable from the heads we
+        # have already indexed.
+        indexed_heads = self._get_indexed_heads()
+        parents_list = git.get_parents_list(head_hash, exclude=indexed_heads)
+        if parents_list is None and len(indexed_heads) > 0:
+            # An indexed head may no longer exist (e.g., it was on a branch
+            # that was deleted and garbage collected).
+            parents_list = git.get_parents_list(head_hash)
+        if parents_list is None:
+            return False
+
+        generations = CommitGraph.compute_generations(
+            parents_list, lookup_generation=self._get_generation
+        )
+        cursor.executemany(
+            q.insert_commit,
+            [(entry[0], generations[entry[0]]) for entry in parents_list],
+        )
+        cursor.executemany(
+            q.insert_commit_parent,
+            [
+                (entry[0], idx, parent)
+                for entry in parents_list
+                for idx, parent in enumerate(entry[1:])
+            ],
+        )
+        return True
+
+    def _get_generation(self, commit_hash: str) -> Optional[int]:
+        row = self._conn.execute(q.get_generation, (commit_hash,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _get_indexed_heads(self) -> List[str]:
+        return [row[0] for row in self._conn.execute(q.get_indexed_heads)]
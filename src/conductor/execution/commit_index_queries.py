@@ -0,0 +1,75 @@
+create_commits_table = """
+  CREATE TABLE IF NOT EXISTS commits (
+    commit_hash TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (commit_hash)
+  )
+"""
+
+create_commit_parents_table = """
+  CREATE TABLE IF NOT EXISTS commit_parents (
+    commit_hash TEXT NOT NULL,
+    parent_order INTEGER NOT NULL,
+    parent_hash TEXT NOT NULL,
+    PRIMARY KEY (commit_hash, parent_order)
+  )
+"""
+
+# Commits whose full ancestry has been indexed. They are used as exclusions
+# when incrementally indexing new commits.
+create_indexed_heads_table = """
+  CREATE TABLE IF NOT EXISTS indexed_heads (
+    commit_hash TEXT NOT NULL,
+    PRIMARY KEY (commit_hash)
+  )
+"""
+
+set_format_version = "PRAGMA user_version = {version:d}"
+
+get_format_version = "PRAGMA user_version"
+
+has_commit = "SELECT 1 FROM commits WHERE commit_hash = ?"
+
+get_generation = "SELECT generation FROM commits WHERE commit_hash = ?"
+
+insert_commit = """
+  INSERT OR IGNORE INTO commits (commit_hash, generation) VALUES (?, ?)
+"""
+
+insert_commit_parent = """
+  INSERT OR IGNORE INTO commit_parents (commit_hash, parent_order, parent_hash)
+  VALUES (?, ?, ?)
+"""
+
+get_indexed_heads = "SELECT commit_hash FROM indexed_heads"
+
+insert_indexed_head = """
+  INSERT OR IGNORE INTO indexed_heads (commit_hash) VALUES (?)
+"""
+
+delete_indexed_head = "DELETE FROM indexed_heads WHERE commit_hash = ?"
+
+# Returns `(commit_hash, generation, parent_hash)` rows for every commit in the
+# ancestry of the given commit (including itself). Commits with multiple
+# parents appear once per parent, in parent order. Root commits have a `NULL`
+# parent hash.
+ancestry_of_commit = """
+  WITH RECURSIVE ancestry(commit_hash) AS (
+    SELECT ?
+    UNION
+    SELECT p.parent_hash
+    FROM commit_parents AS p
+    INNER JOIN ancestry AS a ON p.commit_hash = a.commit_hash
+  )
+  SELECT
+    a.commit_hash,
+    c.generation,
+    p.parent_hash
+  FROM
+    ancestry AS a
+  INNER JOIN
+    commits AS c ON a.commit_hash = c.commit_hash
+  LEFT JOIN
+    commit_parents AS p ON a.commit_hash = p.commit_hash
+  ORDER BY a.commit_hash, p.parent_order
+"""
@@ -1,12 +1,19 @@
 import errno
+import heapq
 import time
-import collections
 import os
 import signal
-from typing import Dict, List, Iterable, Tuple, Deque
+import statistics
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Iterable, Optional, Set, Tuple
 
 from conductor.context import Context
-from conductor.errors import ConductorError, ConductorAbort
+from conductor.errors import (
+    ConductorError,
+    ConductorAbort,
+    ResourceRequestExceedsCapacity,
+)
 from conductor.execution.handle import OperationExecutionHandle
 from conductor.execution.ops.operation import Operation
 from conductor.execution.plan import ExecutionPlan
@@ -19,16 +26,41 @@ from conductor.utils.colored_output import (
     print_red,
     print_yellow,
 )
+from conductor.utils.run_resources import ResourcePool
 from conductor.utils.sigchld import SigchldHelper
 from conductor.utils.time import time_to_readable_string
 
+# The smallest cost (in seconds) used when estimating the cost of running an
+# operation.
+_MIN_ESTIMATED_COST_S = 1.0
+
 
 class _ReadyToRunQueue:
+    """
+    Holds the operations that are ready to run. Within each class of
+    operations (parallelizable and sequential), operations with a higher
+    priority are dequeued first. Operations with equal priorities are dequeued
+    in the order they were enqueued.
+    """
+
     def __init__(self) -> None:
-        self._sequential_ops: Deque[Operation] = collections.deque()
-        self._parallel_ops: Deque[Operation] = collections.deque()
+        self._sequential_ops: List[Tuple[float, int, Operation]] = []
+        self._parallel_ops: List[Tuple[float, int, Operation]] = []
+        self._priorities: Dict[int, float] = {}
+        self._next_sequence_num = 0
 
-    def load(self, initial_ops: Iterable[Operation]) -> None:
+    def load(
+        self,
+        initial_ops: Iterable[Operation],
+        priorities: Optional[Dict[int, float]] = None,
+    ) -> None:
+        """
+        Enqueues the given initial operations. `priorities` maps operation ids
+        (i.e., `id(op)`) to their scheduling priority; operations that are
+        missing from the mapping have a priority of 0.
+        """
+        if priorities is not None:
+            self._priorities = priorities
         for op in initial_ops:
             self.enqueue_op(op)
 
@@ -39,54 +71,139 @@ class _ReadyToRunQueue:
         return len(self._parallel_ops) > 0
 
     def enqueue_op(self, op: Operation) -> None:
+        # `heapq` is a min-heap, so we negate the priority. The sequence number
+        # breaks ties in FIFO order (and ensures operations are never compared).
+        entry = (-self._priorities.get(id(op), 0.0), self._next_sequence_num, op)
+        self._next_sequence_num += 1
         if op.parallelizable:
-            self._parallel_ops.append(op)
+            heapq.heappush(self._parallel_ops, entry)
         else:
-            self._sequential_ops.append(op)
+            heapq.heappush(self._sequential_ops, entry)
 
     def dequeue_next(self) -> Operation:
         if self.has_parallelizable_ops():
-            return self._parallel_ops.popleft()
+            return heapq.heappop(self._parallel_ops)[2]
         else:
-            return self._sequential_ops.popleft()
+            return heapq.heappop(self._sequential_ops)[2]
+
+    def dequeue_next_parallelizable(
+        self, can_run: Callable[[Operation], bool]
+    ) -> Optional[Operation]:
+        """
+        Dequeues the highest priority parallelizable operation for which
+        `can_run` returns `True`, if any.
+        """
+        skipped = []
+        selected = None
+        while len(self._parallel_ops) > 0:
+            entry = heapq.heappop(self._parallel_ops)
+            if can_run(entry[2]):
+                selected = entry[2]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._parallel_ops, entry)
+        return selected
 
     def clear(self) -> None:
         self._sequential_ops.clear()
         self._parallel_ops.clear()
+        self._priorities = {}
+        self._next_sequence_num = 0
+
+
+def compute_critical_path_priorities(
+    ops: Iterable[Operation], op_cost: Callable[[Operation], float]
+) -> Dict[int, float]:
+    """
+    Computes the scheduling priority of each operation: the total cost of the
+    most expensive path from the operation to the end of the execution graph
+    (including the operation's own cost). Running operations with the longest
+    remaining path first keeps the critical path moving, which minimizes the
+    overall execution time when there are more ready operations than slots.
+
+    The returned dictionary is keyed by operation id (i.e., `id(op)`).
+    """
+    priorities: Dict[int, float] = {}
+    for root in ops:
+        if id(root) in priorities:
+            continue
+        # Iterative post-order traversal over `deps_of` (the graph is a DAG),
+        # to avoid hitting the recursion limit on long dependency chains.
+        stack: List[Tuple[Operation, bool]] = [(root, False)]
+        while len(stack) > 0:
+            op, children_done = stack.pop()
+            if id(op) in priorities:
+                continue
+            if not children_done:
+                stack.append((op, True))
+                for dep_of in op.deps_of:
+                    if id(dep_of) not in priorities:
+                        stack.append((dep_of, False))
+                continue
+            longest_downstream = max(
+                (priorities[id(dep_of)] for dep_of in op.deps_of), default=0.0
+            )
+            priorities[id(op)] = op_cost(op) + longest_downstream
+    return priorities
 
 
 class _InflightOperations:
     def __init__(self) -> None:
         self._processes: Dict[int, Tuple[OperationExecutionHandle, Operation]] = {}
+        self._background_ops: Dict[
+            Future, Tuple[OperationExecutionHandle, Operation]
+        ] = {}
         self._sync_ops: List[Tuple[OperationExecutionHandle, Operation]] = []
 
     def add_op(self, handle: OperationExecutionHandle, op: Operation) -> None:
         if handle.is_sync:
             self._sync_ops.append((handle, op))
+        elif handle.is_background:
+            handle.future = Future()
+            self._background_ops[handle.future] = (handle, op)
+            _start_background_work(handle)
         else:
             assert handle.pid is not None
             self._processes[handle.pid] = (handle, op)
+            SigchldHelper.instance().track_pid(handle.pid)
 
     def __len__(self) -> int:
-        return len(self._processes) + len(self._sync_ops)
+        return len(self._processes) + len(self._background_ops) + len(self._sync_ops)
 
     def has_sync_ops(self) -> bool:
         return len(self._sync_ops) > 0
 
-    def wait_for_next_op(self) -> Tuple[OperationExecutionHandle, Operation]:
+    def wait_for_next_op(
+        self, timeout: Optional[float] = None
+    ) -> Optional[Tuple[OperationExecutionHandle, Operation]]:
+        """
+        Waits for the next operation to finish. If `timeout` is set, this
+        returns `None` if no operation finishes within `timeout` seconds.
+        """
         if len(self._sync_ops) > 0:
             return self._sync_ops.pop()
 
-        # Wait for the next child process to finish.
+        # Wait for the next child process or background operation to finish.
+        deadline = time.monotonic() + timeout if timeout is not None else None
         while True:
-            pid, returncode = SigchldHelper.instance().wait()
-            if pid in self._processes:
-                break
-        assert pid in self._processes
-        handle, task = self._processes[pid]
-        del self._processes[pid]
-        handle.returncode = returncode
-        return handle, task
+            if deadline is not None and not SigchldHelper.instance().wait_until_ready(
+                deadline - time.monotonic()
+            ):
+                return None
+            event = SigchldHelper.instance().wait()
+            if isinstance(event, Future):
+                if event in self._background_ops:
+                    return self._background_ops.pop(event)
+            elif event.pid in self._processes:
+                handle, op = self._processes.pop(event.pid)
+                handle.returncode = event.returncode
+                handle.rusage = event.rusage
+                if handle.process is not None:
+                    # We reaped the process, so the `Popen` object must not
+                    # try to wait for it.
+                    handle.process.returncode = event.returncode
+                return handle, op
 
     def terminate_processes(self) -> None:
         # Send SIGTERM to each process' process group (i.e., the subprocess and
@@ -108,9 +225,48 @@ class _InflightOperations:
     def clear(self) -> None:
         self.terminate_processes()
         self._processes.clear()
+        # N.B. Background work cannot be interrupted. Any background work that
+        # is still running will finish on its own (its completion is ignored).
+        self._background_ops.clear()
         self._sync_ops.clear()
 
 
+def _start_background_work(handle: OperationExecutionHandle) -> None:
+    assert handle.background_work is not None
+    assert handle.future is not None
+    work = handle.background_work
+    future = handle.future
+
+    def run():
+        try:
+            future.set_result(work())
+        except BaseException as ex:  # pylint: disable=broad-exception-caught
+            future.set_exception(ex)
+        SigchldHelper.instance().post_completed(future)
+
+    # N.B. We use daemon threads so that in-progress background work does not
+    # prevent Conductor from exiting (e.g., when the user aborts execution).
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+
+def _version_index_update_due_in(ctx: Context) -> Optional[float]:
+    """
+    Returns the number of seconds until the version index needs to be updated
+    (i.e., its pending group commit or the renewal of its execution leases is
+    due), or `None` if no update is needed.
+    """
+    due_ins = [
+        due_in
+        for due_in in (
+            ctx.version_index.group_commit_due_in(),
+            ctx.version_index.execution_lease_renewal_due_in(),
+        )
+        if due_in is not None
+    ]
+    return min(due_ins) if len(due_ins) > 0 else None
+
+
 class Executor:
     def __init__(self, execution_slots: int, silent: bool = False) -> None:
         assert execution_slots > 0
@@ -119,8 +275,19 @@ class Executor:
 
         self._ready_to_run = _ReadyToRunQueue()
         self._inflight_ops = _InflightOperations()
+        self._resources = ResourcePool({})
+        self._held_mutexes: Set[str] = set()
         self._completed_ops: List[Operation] = []
         self._running_parallel = False
+        # The number of in-flight operations that take up an execution slot
+        # (see `Operation.runs_locally`).
+        self._num_local_inflight = 0
+        # Operations that do not run locally are numbered after the execution
+        # slots (they are not limited by the number of execution slots).
+        self._background_slots: Set[int] = set()
+        # Whether operations may run concurrently (i.e., whether the operations
+        # launched in parallel need to be told apart by their slot).
+        self._may_overlap = False
         self._num_tasks_to_run = 0
         self._num_tasks_dequeued = 0
 
@@ -141,6 +308,11 @@ class Executor:
             self._num_tasks_to_run = plan.num_tasks_to_run
             ctx.env_task_versions.clear()
             start = time.time()
+            self._resources = ResourcePool.from_configured(ctx.config_file.resources)
+            self._check_resource_requests(plan)
+            self._may_overlap = self._slots > 1 or any(
+                not op.runs_locally for op in plan.all_ops
+            )
 
             # 1. Print out any cached tasks.
             if not self._silent:
@@ -153,7 +325,12 @@ class Executor:
 
             # 2. Run the operations as they become eligible for execution.
             should_stop = False
-            self._ready_to_run.load(plan.initial_ops)
+            self._ready_to_run.load(
+                plan.initial_ops,
+                compute_critical_path_priorities(
+                    plan.all_ops, self._make_cost_estimator(plan, ctx)
+                ),
+            )
             with SigchldHelper.instance().track():
                 while self._ready_to_run.has_ops() or len(self._inflight_ops) > 0:
                     should_stop = self._launch_ops_if_able(ctx, stop_on_first_error)
@@ -175,6 +352,10 @@ class Executor:
             # encountering an error.
             self._inflight_ops.terminate_processes()
 
+            # Wait for the finished tasks' outputs to be deduplicated (see
+            # `Context.deduplicate_in_background()`).
+            ctx.wait_for_deduplication()
+
             # 3. Report the results.
             self._report_execution_results(plan, elapsed_time=(time.time() - start))
 
@@ -193,7 +374,16 @@ class Executor:
             raise
 
         finally:
-            if ctx.envs is not None:
+            # Release the execution leases of tasks that did not finish (e.g.,
+            # because they failed or were skipped) and commit the changes made
+            # by the tasks that finished most recently (see
+            # `VersionIndex.group_commit_changes()`).
+            ctx.version_index.release_execution_leases()
+            ctx.version_index.commit_changes()
+
+            # N.B. We check `used_envs` first to avoid creating the environment
+            # manager for plans that do not use environments.
+            if len(plan.used_envs) > 0 and ctx.envs is not None:
                 for env_name in plan.used_envs:
                     try:
                         ctx.envs.shutdown_remote_env(env_name, missing_ok=True)
@@ -209,32 +399,101 @@ class Executor:
         self._completed_ops.clear()
         self._inflight_ops.clear()
         self._running_parallel = False
+        self._num_local_inflight = 0
+        self._background_slots.clear()
+        self._may_overlap = False
         self._available_slots = list(reversed(range(self._slots)))
+        self._held_mutexes.clear()
         self._num_tasks_to_run = 0
         self._num_tasks_dequeued = 0
 
+    def _check_resource_requests(self, plan: ExecutionPlan) -> None:
+        # Parallelizable operations that request more resources than the
+        # machine has would never be launched.
+        for op in plan.all_ops:
+            if not op.parallelizable:
+                continue
+            exceeding = self._resources.find_exceeding(op.resources)
+            if exceeding is None:
+                continue
+            resource, amount = exceeding
+            raise ResourceRequestExceedsCapacity(
+                task_identifier=(
+                    str(op.main_task.identifier)
+                    if op.main_task is not None
+                    else "(unknown)"
+                ),
+                resource=resource,
+                amount=amount,
+                capacity=self._resources.capacity_of(resource),
+            )
+
+    def _make_cost_estimator(
+        self, plan: ExecutionPlan, ctx: Context
+    ) -> Callable[[Operation], float]:
+        """
+        Returns a function that estimates the relative cost of running an
+        operation, for use in prioritizing ready-to-run operations.
+
+        Operations whose tasks have been executed before are assigned their
+        median recorded wall time (in seconds). All other operations are
+        assigned the median of those costs (or a unit cost when there is no
+        history).
+        """
+        task_ids = [
+            op.main_task.identifier for op in plan.all_ops if op.main_task is not None
+        ]
+        executions = ctx.version_index.get_task_executions(task_ids)
+        known_costs = {
+            # Differences between short operations are mostly noise, so we
+            # treat them as equally cheap. This keeps them in their enqueued
+            # (i.e., declared) order.
+            task_id: max(
+                statistics.median(e.wall_time_s for e in task_executions),
+                _MIN_ESTIMATED_COST_S,
+            )
+            for task_id, task_executions in executions.items()
+        }
+        default_cost = (
+            statistics.median(known_costs.values())
+            if len(known_costs) > 0
+            else _MIN_ESTIMATED_COST_S
+        )
+
+        def estimate(op: Operation) -> float:
+            if op.main_task is None:
+                return default_cost
+            return known_costs.get(op.main_task.identifier, default_cost)
+
+        return estimate
+
     def _launch_ops_if_able(self, ctx: Context, stop_on_first_error: bool) -> bool:
         """
         Launches as many operations as possible while respecting the operation's
-        parallelization setting and the number of execution slots available.
+        parallelization setting, mutex group, the number of execution slots
+        available, and the resources available.
 
         Returns `True` if an error occurs and `stop_on_first_error` is set to `True.
         """
         while True:
-            can_launch_any_ready_op = (
-                self._ready_to_run.has_ops() and len(self._inflight_ops) == 0
-            )
-            can_launch_parallelizable_op = (
-                self._running_parallel
-                and len(self._inflight_ops) < self._slots
-                and self._ready_to_run.has_parallelizable_ops()
-            )
-
-            if not can_launch_any_ready_op and not can_launch_parallelizable_op:
+            if self._ready_to_run.has_ops() and len(self._inflight_ops) == 0:
+                # Parallelizable tasks are prioritized (dequeued first). Among
+                # them, the ones on the longest remaining path are dequeued
+                # first.
+                next_op = self._ready_to_run.dequeue_next()
+            elif self._running_parallel and self._ready_to_run.has_parallelizable_ops():
+                # Launch the highest priority parallelizable operation whose
+                # requested resources (and execution slot, if it runs locally)
+                # are available (if any).
+                maybe_next_op = self._ready_to_run.dequeue_next_parallelizable(
+                    self._can_launch_alongside_inflight
+                )
+                if maybe_next_op is None:
+                    break
+                next_op = maybe_next_op
+            else:
                 break
 
-            # Parallelizable tasks are prioritized (dequeued first).
-            next_op = self._ready_to_run.dequeue_next()
             prev_running_parallel = self._running_parallel
             self._running_parallel = next_op.parallelizable
             if next_op.main_task is not None:
@@ -246,7 +505,7 @@ class Executor:
             # Conductor switches to running tasks in parallel, we want to stop
             # printing the extra newline character.
             avoid_leading_newline = (
-                prev_running_parallel and self._running_parallel and self._slots > 1
+                prev_running_parallel and self._running_parallel and self._may_overlap
             )
 
             if not next_op.exe_deps_succeeded():
@@ -283,15 +542,22 @@ class Executor:
                     )
                 try:
                     slot = (
-                        self._available_slots[-1]
-                        if self._running_parallel and self._slots > 1
+                        self._next_slot(next_op)
+                        if self._running_parallel and self._may_overlap
                         else None
                     )
                     handle = next_op.start_execution(ctx, slot)
                     handle.slot = slot
                     self._inflight_ops.add_op(handle, next_op)
-                    if slot is not None:
-                        self._available_slots.pop()
+                    self._resources.acquire(next_op.resources)
+                    if next_op.mutex is not None:
+                        self._held_mutexes.add(next_op.mutex)
+                    if next_op.runs_locally:
+                        self._num_local_inflight += 1
+                        if slot is not None:
+                            self._available_slots.pop()
+                    elif slot is not None:
+                        self._background_slots.add(slot)
                 except ConductorAbort:
                     next_op.set_state(OperationState.ABORTED)
                     # N.B. A slot may be leaked here, but it does not matter
@@ -307,6 +573,25 @@ class Executor:
 
         return False
 
+    def _next_slot(self, op: Operation) -> int:
+        if op.runs_locally:
+            return self._available_slots[-1]
+        slot = self._slots
+        while slot in self._background_slots:
+            slot += 1
+        return slot
+
+    def _can_launch_alongside_inflight(self, op: Operation) -> bool:
+        # Skipped operations (i.e., ones whose dependencies failed) do not run,
+        # so they do not need any resources.
+        if not op.exe_deps_succeeded():
+            return True
+        if op.mutex is not None and op.mutex in self._held_mutexes:
+            return False
+        if op.runs_locally and self._num_local_inflight >= self._slots:
+            return False
+        return self._resources.fits(op.resources)
+
     def _wait_for_next_inflight_op(
         self, ctx: Context, stop_on_first_error: bool
     ) -> bool:
@@ -318,7 +603,18 @@ class Executor:
         assert len(self._inflight_ops) > 0
 
         error_occurred = False
-        handle, op = self._inflight_ops.wait_for_next_op()
+        while True:
+            next_op = self._inflight_ops.wait_for_next_op(
+                timeout=_version_index_update_due_in(ctx)
+            )
+            if next_op is not None:
+                break
+            # The pending group commit or the renewal of the execution leases
+            # is due. We commit before waiting again so that other processes
+            # can see (and write to) the version index while we wait.
+            ctx.version_index.renew_execution_leases()
+            ctx.version_index.commit_changes()
+        handle, op = next_op
         try:
             op.finish_execution(handle, ctx)
             op.set_state(OperationState.SUCCEEDED)
@@ -343,8 +639,15 @@ class Executor:
             error_occurred = True
             self._print_op_failed(op)
 
-        if handle.slot is not None:
-            self._available_slots.append(handle.slot)
+        if op.runs_locally:
+            self._num_local_inflight -= 1
+            if handle.slot is not None:
+                self._available_slots.append(handle.slot)
+        elif handle.slot is not None:
+            self._background_slots.discard(handle.slot)
+        self._resources.release(op.resources)
+        if op.mutex is not None:
+            self._held_mutexes.discard(op.mutex)
         self._process_finished_op(op)
 
         return error_occurred and stop_on_first_error
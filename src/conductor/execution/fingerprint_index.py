@@ -0,0 +1,184 @@
+import glob
+import hashlib
+import os
+import pathlib
+import sqlite3
+from typing import Iterable, Iterator, List, Optional
+
+from conductor.utils.git import Git
+import conductor.execution.fingerprint_index_queries as q
+
+
+class FingerprintIndex:
+    """
+    The `FingerprintIndex` is a persistent data structure that stores the
+    fingerprints of the tasks that were executed successfully, along with the
+    content hashes of the input files that were used to compute them.
+
+    A task's fingerprint summarizes everything that determines its result
+    (e.g., its command, its input files, and its dependencies' fingerprints).
+    If a task's current fingerprint matches its stored fingerprint, the task
+    does not need to run again.
+
+    Input file hashes are only recomputed when a file's size, modification
+    time, or inode number changes. So checking whether a task is up to date
+    does not read its input files unless they were modified.
+    """
+
+    FormatVersion = 1
+
+    _ChunkSize = 1024 * 1024
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    @classmethod
+    def create_or_load(cls, path: pathlib.Path) -> "FingerprintIndex":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        format_version = conn.execute(q.get_format_version).fetchone()[0]
+        if format_version not in (0, cls.FormatVersion):
+            # Losing the stored fingerprints only means that the affected tasks
+            # will run again, so it is safe to rebuild the index from scratch.
+            conn.close()
+            path.unlink()
+            conn = sqlite3.connect(path)
+            format_version = 0
+
+        if format_version == 0:
+            # Need to create the DB
+            conn.execute(q.create_task_fingerprints_table)
+            conn.execute(q.create_file_hashes_table)
+            conn.execute(q.set_format_version.format(version=cls.FormatVersion))
+            conn.commit()
+
+        return cls(conn)
+
+    def get_fingerprint(self, task_identifier: str) -> Optional[str]:
+        row = self._conn.execute(q.get_task_fingerprint, (task_identifier,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_fingerprint(self, task_identifier: str, fingerprint: str) -> None:
+        self._conn.execute(q.set_task_fingerprint, (task_identifier, fingerprint))
+        self._conn.commit()
+
+    def remove_fingerprint(self, task_identifier: str) -> None:
+        self._conn.execute(q.delete_task_fingerprint, (task_identifier,))
+        self._conn.commit()
+
+    def hash_inputs(
+        self,
+        project_root: pathlib.Path,
+        base_path: pathlib.Path,
+        patterns: Iterable[str],
+        ignored_path: Optional[pathlib.Path] = None,
+        git: Optional[Git] = None,
+    ) -> str:
+        """
+        Computes a hash of the files matched by the given glob `patterns`
+        (relative to `base_path`). Directories that match are included
+        recursively; if `git` is provided, only the files in a directory that
+        are not ignored by git are included (see `Git.list_files()`). Files
+        under `ignored_path` (e.g., Conductor's output directory) are skipped.
+
+        The hash covers the patterns themselves and each matched file's path
+        (relative to `project_root`, if it is inside the project) and contents.
+        """
+        hasher = hashlib.sha256()
+        try:
+            for pattern in patterns:
+                hasher.update(b"pattern\0")
+                hasher.update(pattern.encode())
+                hasher.update(b"\0")
+                for file_path in self._matched_files(
+                    base_path, pattern, ignored_path, git
+                ):
+                    hasher.update(_display_path(file_path, project_root).encode())
+                    hasher.update(b"\0")
+                    hasher.update(self._file_hash(file_path).encode())
+                    hasher.update(b"\0")
+        finally:
+            # Persist the file hashes that were (re)computed.
+            self._conn.commit()
+        return hasher.hexdigest()
+
+    def _matched_files(
+        self,
+        base_path: pathlib.Path,
+        pattern: str,
+        ignored_path: Optional[pathlib.Path],
+        git: Optional[Git],
+    ) -> List[pathlib.Path]:
+        matched = set()
+        for match in glob.glob(str(base_path / pattern), recursive=True):
+            for file_path in _files_under(pathlib.Path(os.path.abspath(match)), git):
+                if ignored_path is not None and _is_under(file_path, ignored_path):
+                    continue
+                matched.add(file_path)
+        return sorted(matched)
+
+    def _file_hash(self, file_path: pathlib.Path) -> str:
+        file_stat = file_path.stat()
+        key = str(file_path)
+        row = self._conn.execute(q.get_file_hash, (key,)).fetchone()
+        if row is not None and tuple(row[:3]) == (
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_ino,
+        ):
+            return row[3]
+
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            while True:
+                data = file.read(self._ChunkSize)
+                if len(data) == 0:
+                    break
+                hasher.update(data)
+        file_hash = hasher.hexdigest()
+        self._conn.execute(
+            q.set_file_hash,
+            (
+                key,
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                file_stat.st_ino,
+                file_hash,
+            ),
+        )
+        return file_hash
+
+
+def _files_under(path: pathlib.Path, git: Optional[Git]) -> Iterator[pathlib.Path]:
+    if path.is_file():
+        yield path
+        return
+    if git is not None:
+        listed_files = git.list_files(path)
+        if listed_files is not None:
+            # N.B. Listed files may have been deleted from the working tree.
+            yield from (file_path for file_path in listed_files if file_path.is_file())
+            return
+    for dirpath, dirnames, filenames in os.walk(path):
+        # Walk in a deterministic order.
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = pathlib.Path(dirpath, filename)
+            if file_path.is_file():
+                yield file_path
+
+
+def _is_under(path: pathlib.Path, parent: pathlib.Path) -> bool:
+    # N.B. We do not use `is_relative_to()` for compatibility with Python 3.8.
+    try:
+        path.relative_to(parent)
+        return True
+    except ValueError:
+        return False
+
+
+def _display_path(path: pathlib.Path, project_root: pathlib.Path) -> str:
+    try:
+        return str(path.relative_to(project_root))
+    except ValueError:
+        return str(path)
@@ -0,0 +1,44 @@
+create_task_fingerprints_table = """
+  CREATE TABLE IF NOT EXISTS task_fingerprints (
+    task_identifier TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (task_identifier)
+  )
+"""
+
+# Content hashes of input files. An entry is only used if the file's size,
+# modification time, and inode number are unchanged.
+create_file_hashes_table = """
+  CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    file_hash TEXT NOT NULL,
+    PRIMARY KEY (path)
+  )
+"""
+
+set_format_version = "PRAGMA user_version = {version:d}"
+
+get_format_version = "PRAGMA user_version"
+
+get_task_fingerprint = """
+  SELECT fingerprint FROM task_fingerprints WHERE task_identifier = ?
+"""
+
+set_task_fingerprint = """
+  INSERT OR REPLACE INTO task_fingerprints (task_identifier, fingerprint)
+  VALUES (?, ?)
+"""
+
+delete_task_fingerprint = "DELETE FROM task_fingerprints WHERE task_identifier = ?"
+
+get_file_hash = """
+  SELECT size, mtime_ns, inode, file_hash FROM file_hashes WHERE path = ?
+"""
+
+set_file_hash = """
+  INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, file_hash)
+  VALUES (?, ?, ?, ?, ?)
+"""
@@ -1,4 +1,7 @@
-from typing import Optional
+import resource
+import subprocess
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
 from conductor.utils.output_handler import OutputHandler
 
 
@@ -10,21 +13,57 @@ class OperationExecutionHandle:
     def __init__(
         self,
         pid: Optional[int],
+        background_work: Optional[Callable[[], Any]] = None,
     ):
         self.pid: Optional[int] = pid
         self.stdout: Optional[OutputHandler] = None
         self.stderr: Optional[OutputHandler] = None
         self.returncode: Optional[int] = None
         self.slot: Optional[int] = None
+        # Only set for asynchronously executing operations (i.e., processes).
+        self.rusage: Optional[resource.struct_rusage] = None
+        # N.B. We hold a reference to the process' `Popen` object (if any)
+        # until the process has exited. Otherwise the `Popen` object's
+        # finalizer may reap the process before `SigchldHelper` does.
+        self.process: Optional[subprocess.Popen] = None
+        # Only set for operations that run in the background (i.e., on a
+        # thread). The executor runs `background_work` and stores its outcome
+        # in `future`.
+        self.background_work = background_work
+        self.future: Optional[Future] = None
 
     @classmethod
-    def from_async_process(cls, pid: int):
-        return cls(pid)
+    def from_async_process(cls, process: subprocess.Popen):
+        handle = cls(process.pid)
+        handle.process = process
+        return handle
 
     @classmethod
     def from_sync_execution(cls):
         return cls(pid=None)
 
+    @classmethod
+    def from_background_work(cls, work: Callable[[], Any]):
+        """
+        Used by operations that need to do blocking work that does not involve
+        the main Conductor process' state (e.g., communicating with a remote
+        environment). The work runs on a background thread; the operation
+        retrieves its result using `background_result()` when it finishes.
+        """
+        return cls(pid=None, background_work=work)
+
     @property
     def is_sync(self) -> bool:
-        return self.pid is None
+        return self.pid is None and self.background_work is None
+
+    @property
+    def is_background(self) -> bool:
+        return self.background_work is not None
+
+    def background_result(self) -> Any:
+        """
+        Returns the result of the background work, re-raising any exception
+        that it raised.
+        """
+        assert self.future is not None and self.future.done()
+        return self.future.result()
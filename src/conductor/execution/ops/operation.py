@@ -5,6 +5,9 @@ from conductor.errors.base import ConductorError
 from conductor.execution.handle import OperationExecutionHandle
 from conductor.execution.operation_state import OperationState
 from conductor.task_types.base import TaskType
+from conductor.utils.run_resources import RunResources
+
+_NO_RESOURCES = RunResources({})
 
 
 class Operation:
@@ -53,6 +56,32 @@ class Operation:
         """
         return False
 
+    @property
+    def runs_locally(self) -> bool:
+        """
+        Is `True` if this operation does its work on this machine, in which
+        case it takes up one of the executor's execution slots. Operations that
+        wait in the background for work done elsewhere (e.g., in a remote
+        environment) do not.
+        """
+        return True
+
+    @property
+    def resources(self) -> RunResources:
+        """
+        The (local) resources that this operation holds while it executes.
+        This only matters for parallelizable operations.
+        """
+        return _NO_RESOURCES
+
+    @property
+    def mutex(self) -> Optional[str]:
+        """
+        The name of the mutex group that this operation belongs to, if any.
+        Operations in the same mutex group never execute concurrently.
+        """
+        return None
+
     def start_progress_message(self) -> Optional[str]:
         """
         A message to display when this operation starts executing.
@@ -1,5 +1,7 @@
+import os
 import pathlib
-from typing import Dict, Optional
+import sys
+from typing import Callable, Dict, Optional, TextIO
 
 from conductor.context import Context
 from conductor.errors import MissingEnvSupport, EnvsRequireGit, InternalError
@@ -10,6 +12,7 @@ from conductor.execution.version_index import Version
 from conductor.task_identifier import TaskIdentifier
 from conductor.task_types.base import TaskType
 from conductor.task_types.run import RunCommand, RunExperiment
+from conductor.utils.output_handler import OutputHandler, RecordType
 
 
 class RunRemoteTask(Operation):
@@ -46,6 +49,27 @@ class RunRemoteTask(Operation):
     def env_name(self) -> str:
         return self._env_name
 
+    @property
+    def parallelizable(self) -> bool:
+        # The task runs in the remote environment, so it can run alongside
+        # local tasks. Tasks that are not parallelizable still need to run
+        # one at a time within their environment (see `mutex`).
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        # The executor only waits for the remote environment to run the task.
+        return False
+
+    @property
+    def mutex(self) -> Optional[str]:
+        if isinstance(self._task, (RunCommand, RunExperiment)):
+            if self._task.mutex is not None:
+                return self._task.mutex
+            if self._task.parallelizable:
+                return None
+        return "env:{}".format(self._env_name)
+
     @property
     def output_version(self) -> Optional[Version]:
         return self._output_version
@@ -55,7 +79,7 @@ class RunRemoteTask(Operation):
     ) -> OperationExecutionHandle:
         # Import this here to avoid import errors for people who have not
         # installed the [envs] extras.
-        from conductor.envs.maestro.interface import ExecuteTaskType
+        from conductor.envs.maestro.interface import ExecuteTaskType, TaskOutputStream
 
         if ctx.envs is None:
             raise MissingEnvSupport()
@@ -73,16 +97,76 @@ class RunRemoteTask(Operation):
         remote_env = ctx.envs.get_remote_env(self._env_name)
         client = remote_env.client()
         workspace_name = remote_env.workspace_name()
-        # NOTE: This can be made asynchronous if needed.
-        client.execute_task(
-            workspace_name,
-            self._project_root,
-            self._task.identifier,
-            self._dep_versions,
-            execute_task_type,
-            self._output_version,
-        )
-        return OperationExecutionHandle.from_sync_execution()
+
+        # As with local tasks, we only show the task's output when it does not
+        # run alongside other tasks (to avoid interleaving their output). The
+        # task's logs are still recorded in the remote environment.
+        stdout: Optional[_StreamedOutput] = None
+        stderr: Optional[_StreamedOutput] = None
+        output_sink: Optional[Callable[[TaskOutputStream, bytes], None]] = None
+        if slot is None:
+            stdout = _StreamedOutput(sys.stdout, ctx)
+            stderr = _StreamedOutput(sys.stderr, ctx)
+            streams = {
+                TaskOutputStream.Stdout: stdout,
+                TaskOutputStream.Stderr: stderr,
+            }
+
+            def output_sink(stream: TaskOutputStream, data: bytes) -> None:
+                streams[stream].write(data)
+
+        def execute_task():
+            try:
+                return client.execute_task(
+                    workspace_name,
+                    self._project_root,
+                    self._task.identifier,
+                    self._dep_versions,
+                    execute_task_type,
+                    self._output_version,
+                    output_sink,
+                )
+            finally:
+                if stdout is not None and stderr is not None:
+                    stdout.close_writer()
+                    stderr.close_writer()
+
+        handle = OperationExecutionHandle.from_background_work(execute_task)
+        handle.stdout = stdout
+        handle.stderr = stderr
+        return handle
 
     def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
-        pass
+        if handle.stdout is not None and handle.stderr is not None:
+            handle.stdout.finish()
+            handle.stderr.finish()
+        handle.background_result()
+
+
+class _StreamedOutput(OutputHandler):
+    """
+    Writes a remote task's streamed output to the terminal. The output is
+    written to a pipe so that it is handled the same way as a local task's
+    output.
+    """
+
+    def __init__(self, stream: TextIO, ctx: Context) -> None:
+        super().__init__(None, RecordType.Teed)
+        read_fd, write_fd = os.pipe()
+        self._reader = open(read_fd, "rb")
+        self._writer = open(write_fd, "wb", buffering=0)
+        self.maybe_tee(self._reader, stream, ctx)
+
+    def write(self, data: bytes) -> None:
+        self._writer.write(data)
+
+    def close_writer(self) -> None:
+        self._writer.close()
+
+    def finish(self) -> None:
+        # N.B. The writer is normally closed once the remote task finishes. We
+        # also close it here so that we never wait forever for the output to
+        # end (e.g., if the execution was aborted).
+        self.close_writer()
+        super().finish()
+        self._reader.close()
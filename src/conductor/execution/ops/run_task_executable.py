@@ -1,8 +1,10 @@
 import os
 import pathlib
 import signal
+import stat
 import subprocess
 import sys
+import time
 from typing import Optional, Sequence
 
 from conductor.config import (
@@ -21,16 +23,19 @@ from conductor.errors import (
     TaskFailed,
     TaskNonZeroExit,
     ConductorAbort,
+    OutputVersionTaken,
 )
 from conductor.execution.handle import OperationExecutionHandle
 from conductor.execution.ops.operation import Operation
 from conductor.execution.operation_state import OperationState
-from conductor.execution.version_index import Version
+from conductor.execution.version_index import TaskExecution, Version
 from conductor.task_types.base import TaskType
 from conductor.task_identifier import TaskIdentifier
 from conductor.utils.output_handler import RecordType, OutputHandler
 from conductor.utils.run_arguments import RunArguments
 from conductor.utils.run_options import RunOptions
+from conductor.utils.run_resources import RunResources
+from conductor.utils.tee import OutputSink
 
 
 class RunTaskExecutable(Operation):
@@ -50,6 +55,11 @@ class RunTaskExecutable(Operation):
         version_to_record: Optional[Version],
         serialize_args_options: bool,
         parallelizable: bool,
+        resources: RunResources,
+        mutex: Optional[str],
+        fingerprint_to_record: Optional[str] = None,
+        stdout_sink: Optional[OutputSink] = None,
+        stderr_sink: Optional[OutputSink] = None,
     ) -> None:
         super().__init__(initial_state)
         self._identifier = identifier
@@ -66,6 +76,14 @@ class RunTaskExecutable(Operation):
         self._version_to_record = version_to_record
         self._serialize_args_options = serialize_args_options
         self._parallelizable = parallelizable
+        self._resources = resources
+        self._mutex = mutex
+        self._fingerprint_to_record = fingerprint_to_record
+        # If set, the task's output is sent to these sinks instead of the
+        # terminal (used to stream a remote task's output back to the user).
+        self._stdout_sink = stdout_sink
+        self._stderr_sink = stderr_sink
+        self._started_at: Optional[float] = None
 
     @property
     def associated_task(self) -> Optional[TaskType]:
@@ -79,7 +97,27 @@ class RunTaskExecutable(Operation):
         self, ctx: Context, slot: Optional[int]
     ) -> OperationExecutionHandle:
         try:
-            self._output_path.mkdir(parents=True, exist_ok=True)
+            if (
+                self._fingerprint_to_record is not None
+                and self._version_to_record is None
+            ):
+                # The task's (unversioned) outputs are about to change, so they
+                # no longer match the recorded fingerprint (even if the task
+                # fails).
+                ctx.fingerprint_index.remove_fingerprint(str(self._identifier))
+            if self._version_to_record is not None:
+                # A new version's output directory must not exist yet. Creating
+                # it is atomic, so this also ensures that Conductor processes
+                # that share the project never write to the same directory.
+                try:
+                    self._output_path.mkdir(parents=True, exist_ok=False)
+                except FileExistsError as ex:
+                    raise OutputVersionTaken(
+                        task_identifier=self._identifier,
+                        output_dir=str(self._output_path),
+                    ) from ex
+            else:
+                self._output_path.mkdir(parents=True, exist_ok=True)
 
             env_vars = {
                 **os.environ,
@@ -101,12 +139,13 @@ class RunTaskExecutable(Operation):
                 record_type = RecordType.NotRecorded
 
             stdout_output = OutputHandler(
-                self._output_path / STDOUT_LOG_FILE, record_type
+                self._output_path / STDOUT_LOG_FILE, record_type, self._stdout_sink
             )
             stderr_output = OutputHandler(
-                self._output_path / STDERR_LOG_FILE, record_type
+                self._output_path / STDERR_LOG_FILE, record_type, self._stderr_sink
             )
 
+            self._started_at = time.time()
             process = subprocess.Popen(
                 [self._run],
                 shell=True,
@@ -121,7 +160,7 @@ class RunTaskExecutable(Operation):
             stdout_output.maybe_tee(process.stdout, sys.stdout, ctx)
             stderr_output.maybe_tee(process.stderr, sys.stderr, ctx)
 
-            handle = OperationExecutionHandle.from_async_process(pid=process.pid)
+            handle = OperationExecutionHandle.from_async_process(process)
             handle.stdout = stdout_output
             handle.stderr = stderr_output
             return handle
@@ -150,6 +189,10 @@ class RunTaskExecutable(Operation):
 
         assert handle.returncode is not None
         if handle.returncode != 0:
+            # Other processes that wait for this task's results can run the
+            # task themselves.
+            self._release_execution_lease(ctx)
+            ctx.version_index.group_commit_changes()
             raise TaskNonZeroExit(
                 task_identifier=self._identifier, code=handle.returncode
             )
@@ -163,11 +206,89 @@ class RunTaskExecutable(Operation):
                 )
 
         if self._version_to_record is not None:
+            if ctx.config_file.deduplicate_outputs:
+                ctx.deduplicate_in_background(self._output_path)
             ctx.version_index.insert_output_version(
                 self._identifier, self._version_to_record
             )
-            ctx.version_index.commit_changes()
+            if self._fingerprint_to_record is not None:
+                ctx.version_index.set_version_fingerprint(
+                    self._identifier,
+                    self._version_to_record,
+                    self._fingerprint_to_record,
+                )
+            # N.B. The lease is released in the same commit that records the
+            # version, so processes that wait for it always find the version.
+            self._release_execution_lease(ctx)
+        ctx.version_index.insert_task_execution(
+            self._identifier, self._measure_execution(handle)
+        )
+        # N.B. The executor commits the group when it is due.
+        ctx.version_index.group_commit_changes()
+        if self._fingerprint_to_record is not None and self._version_to_record is None:
+            ctx.fingerprint_index.set_fingerprint(
+                str(self._identifier), self._fingerprint_to_record
+            )
+
+    def _release_execution_lease(self, ctx: Context) -> None:
+        # See `ExecutionPlanner._acquire_execution_lease()`.
+        if self._version_to_record is None or self._fingerprint_to_record is None:
+            return
+        ctx.version_index.release_execution_lease(
+            self._identifier, self._fingerprint_to_record
+        )
+
+    def _measure_execution(self, handle: OperationExecutionHandle) -> TaskExecution:
+        assert self._started_at is not None
+        finished_at = time.time()
+        cpu_time_s = None
+        peak_rss_kb = None
+        if handle.rusage is not None:
+            cpu_time_s = handle.rusage.ru_utime + handle.rusage.ru_stime
+            # N.B. `ru_maxrss` is reported in bytes on macOS, and in kilobytes
+            # on Linux.
+            if sys.platform == "darwin":
+                peak_rss_kb = handle.rusage.ru_maxrss // 1024
+            else:
+                peak_rss_kb = handle.rusage.ru_maxrss
+        return TaskExecution(
+            finished_at=finished_at,
+            wall_time_s=finished_at - self._started_at,
+            cpu_time_s=cpu_time_s,
+            peak_rss_kb=peak_rss_kb,
+            output_bytes=_directory_size_bytes(self._output_path),
+            version_timestamp=(
+                self._version_to_record.timestamp
+                if self._version_to_record is not None
+                else None
+            ),
+        )
 
     @property
     def parallelizable(self) -> bool:
         return self._parallelizable
+
+    @property
+    def resources(self) -> RunResources:
+        return self._resources
+
+    @property
+    def mutex(self) -> Optional[str]:
+        return self._mutex
+
+
+def _directory_size_bytes(path: pathlib.Path) -> Optional[int]:
+    """
+    Returns the total size of the regular files under `path` (symbolic links
+    are not followed), or `None` if the size could not be computed.
+    """
+    try:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                file_stat = os.lstat(os.path.join(dirpath, filename))
+                if stat.S_ISREG(file_stat.st_mode):
+                    total += file_stat.st_size
+        return total
+    except OSError:
+        return None
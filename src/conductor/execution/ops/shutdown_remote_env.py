@@ -35,6 +35,14 @@ class ShutdownRemoteEnv(Operation):
     def env_name(self) -> str:
         return self._env_name
 
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        return False
+
     def clone_without_deps(self) -> "ShutdownRemoteEnv":
         return ShutdownRemoteEnv(
             initial_state=self._state,
@@ -48,14 +56,16 @@ class ShutdownRemoteEnv(Operation):
     ) -> OperationExecutionHandle:
         if ctx.envs is None:
             raise MissingEnvSupport()
+        envs = ctx.envs
 
-        ctx.envs.shutdown_remote_env(self._env_name)
-        self._invoke_shutdown_runnable()
+        def shutdown_env() -> None:
+            envs.shutdown_remote_env(self._env_name)
+            self._invoke_shutdown_runnable()
 
-        return OperationExecutionHandle.from_sync_execution()
+        return OperationExecutionHandle.from_background_work(shutdown_env)
 
     def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
-        pass
+        handle.background_result()
 
     def _invoke_shutdown_runnable(self) -> None:
         if self._shutdown_runnable is None:
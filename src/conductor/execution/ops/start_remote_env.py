@@ -23,12 +23,14 @@ class StartRemoteEnv(Operation):
         start_runnable: Optional[str],
         working_path: pathlib.Path,
         connect_config_runnable: str,
+        max_concurrent_tasks: Optional[int] = None,
     ) -> None:
         super().__init__(initial_state)
         self._env_name = env_name
         self._start_runnable = start_runnable
         self._working_path = working_path
         self._connect_config_runnable = connect_config_runnable
+        self._max_concurrent_tasks = max_concurrent_tasks
 
     def start_progress_message(self) -> Optional[str]:
         return f"Starting environment '{self._env_name}'..."
@@ -40,6 +42,14 @@ class StartRemoteEnv(Operation):
     def env_name(self) -> str:
         return self._env_name
 
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        return False
+
     def clone_without_deps(self) -> "StartRemoteEnv":
         return StartRemoteEnv(
             initial_state=self._state,
@@ -47,6 +57,7 @@ class StartRemoteEnv(Operation):
             start_runnable=self._start_runnable,
             working_path=self._working_path,
             connect_config_runnable=self._connect_config_runnable,
+            max_concurrent_tasks=self._max_concurrent_tasks,
         )
 
     def start_execution(
@@ -54,23 +65,31 @@ class StartRemoteEnv(Operation):
     ) -> OperationExecutionHandle:
         if ctx.envs is None:
             raise MissingEnvSupport()
+        envs = ctx.envs
+
+        def start_env() -> None:
+            self._invoke_start_runnable()
+
+            connect_config = self._get_raw_connect_config()
+            host = connect_config["host"]
+            user = connect_config["user"]
+            del connect_config["host"]
+            del connect_config["user"]
+
+            envs.start_remote_env(
+                name=self._env_name,
+                host=host,
+                user=user,
+                config=connect_config,
+                max_concurrent_tasks=self._max_concurrent_tasks,
+            )
 
-        self._invoke_start_runnable()
-
-        connect_config = self._get_raw_connect_config()
-        host = connect_config["host"]
-        user = connect_config["user"]
-        del connect_config["host"]
-        del connect_config["user"]
-
-        ctx.envs.start_remote_env(
-            name=self._env_name, host=host, user=user, config=connect_config
-        )
-
-        return OperationExecutionHandle.from_sync_execution()
+        # Starting an environment can take a while, so we do it in the
+        # background to let other operations make progress.
+        return OperationExecutionHandle.from_background_work(start_env)
 
     def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
-        pass
+        handle.background_result()
 
     def _invoke_start_runnable(self) -> None:
         if self._start_runnable is None:
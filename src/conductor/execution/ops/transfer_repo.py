@@ -7,6 +7,7 @@ from conductor.errors import (
     EnvsRequireGit,
     EnvExtraFileNotFound,
     EnvExtraFileNotInRepository,
+    InternalError,
 )
 from conductor.execution.handle import OperationExecutionHandle
 from conductor.execution.ops.operation import Operation
@@ -37,6 +38,14 @@ class TransferRepo(Operation):
     def env_name(self) -> str:
         return self._env_name
 
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        return False
+
     def start_execution(
         self, ctx: Context, slot: Optional[int]
     ) -> OperationExecutionHandle:
@@ -48,35 +57,66 @@ class TransferRepo(Operation):
         # Compute paths to the extra files and verify they exist before proceeding.
         extra_file_paths = self._validate_and_process_extra_files(ctx)
 
-        # Create a bundle of the current repository.
-        repo_name = ctx.project_root.name
-        bundle_name = f"{repo_name}.bundle"
-        local_bundle_path = ctx.output_path / bundle_name
-        ctx.git.create_bundle(symbol="HEAD", bundle_path=local_bundle_path)
-
-        # Transfer the bundle to the remote environment.
+        git = ctx.git
         remote_env = ctx.envs.get_remote_env(self._env_name)
-        remote_bundle_path = pathlib.Path(MAESTRO_BUNDLE_LOCATION) / bundle_name
-        remote_env.transfer_file(local_bundle_path, remote_bundle_path)
-
-        # Remove the local copy.
-        local_bundle_path.unlink(missing_ok=True)
+        repo_name = ctx.project_root.name
+        # N.B. The local bundle's name includes the environment's name because
+        # the repository may be transferred to several environments at once.
+        local_bundle_path = ctx.output_path / f"{repo_name}-{self._env_name}.bundle"
+
+        def transfer() -> None:
+            client = remote_env.client()
+            commit_hash = git.rev_parse("HEAD")
+            if commit_hash is None:
+                raise InternalError(
+                    details="Failed to find the repository's current commit."
+                )
 
-        # Unpack the bundle in the remote environment.
-        client = remote_env.client()
-        workspace_name = client.unpack_bundle(remote_bundle_path)
-        remote_env.set_workspace_name(workspace_name)
+            # Maestro keeps a mirror of the repository, so we only send the
+            # commits that it does not already have.
+            remote_commits = git.find_existing_commits(
+                client.get_repository_commits(repo_name)
+            )
+            missing_commits = git.get_parents_list(commit_hash, exclude=remote_commits)
+            if missing_commits is None:
+                raise InternalError(
+                    details="Failed to find the commits to send to the environment."
+                )
 
-        # Transfer the extra files to the remote environment.
-        for local_abs_path, remote_repo_rel_path in extra_file_paths:
-            remote_env.transfer_file(
-                local_abs_path, remote_repo_rel_path, inside_workspace=True
+            remote_bundle_path: Optional[pathlib.Path] = None
+            if len(missing_commits) > 0:
+                # Create a bundle containing the missing commits.
+                if not git.create_bundle(
+                    symbol="HEAD",
+                    bundle_path=local_bundle_path,
+                    exclude=remote_commits,
+                ):
+                    raise InternalError(details="Failed to create a repository bundle.")
+
+                # Transfer the bundle to the remote environment.
+                bundle_name = f"{repo_name}.bundle"
+                remote_bundle_path = pathlib.Path(MAESTRO_BUNDLE_LOCATION) / bundle_name
+                remote_env.transfer_file(local_bundle_path, remote_bundle_path)
+
+                # Remove the local copy.
+                local_bundle_path.unlink(missing_ok=True)
+
+            # Create a workspace in the remote environment.
+            workspace_name = client.unpack_bundle(
+                repo_name, commit_hash, remote_bundle_path
             )
+            remote_env.set_workspace_name(workspace_name)
+
+            # Transfer the extra files to the remote environment.
+            for local_abs_path, remote_repo_rel_path in extra_file_paths:
+                remote_env.transfer_file(
+                    local_abs_path, remote_repo_rel_path, inside_workspace=True
+                )
 
-        return OperationExecutionHandle.from_sync_execution()
+        return OperationExecutionHandle.from_background_work(transfer)
 
     def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
-        pass
+        handle.background_result()
 
     def _validate_and_process_extra_files(
         self, ctx: Context
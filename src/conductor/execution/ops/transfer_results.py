@@ -1,6 +1,9 @@
 import enum
+import os
 import pathlib
-from typing import Optional, List, Tuple
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, List, Tuple, TYPE_CHECKING
 
 from conductor.context import Context
 from conductor.errors import MissingEnvSupport, EnvsRequireGit, InternalError
@@ -10,12 +13,17 @@ from conductor.execution.operation_state import OperationState
 from conductor.execution.version_index import Version
 from conductor.task_identifier import TaskIdentifier
 from conductor.utils.output_archiving import (
-    create_archive,
-    restore_archive,
+    extract_archive_to_staging,
+    install_extracted_archive,
+    write_archive,
     platform_archive_type,
-    generate_archive_name,
+    ArchiveType,
+    ExtractedArchive,
 )
-from conductor.config import MAESTRO_TASK_TRANSFER_LOCATION
+from conductor.config import ARCHIVE_STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from conductor.envs.remote_env import RemoteEnv
 
 
 class TransferDirection(enum.Enum):
@@ -60,6 +68,14 @@ class TransferResults(Operation):
     def unversioned_tasks(self) -> List[TaskIdentifier]:
         return self._unversioned_tasks
 
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        return False
+
     def start_execution(
         self, ctx: Context, slot: Optional[int]
     ) -> OperationExecutionHandle:
@@ -69,92 +85,181 @@ class TransferResults(Operation):
             raise EnvsRequireGit()
 
         remote_env = ctx.envs.get_remote_env(self._env_name)
-        client = remote_env.client()
-        workspace_name = remote_env.workspace_name()
         archive_type = platform_archive_type()
 
+        # N.B. The transfers run in the background, but we only access the
+        # version index on the main thread (i.e., in `start_execution()` and
+        # `finish_execution()`). So we extract a received archive into a
+        # staging directory in the background and move its task outputs into
+        # place when the operation finishes. Creating an archive does not use
+        # the version index, so we can do that in the background.
         if self._direction == TransferDirection.ToEnv:
-            archive_name = generate_archive_name(archive_type)
-            out_archive_path = ctx.output_path / archive_name
-            tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]] = (
-                self._versioned_tasks
-                + [(task, None) for task in self._unversioned_tasks]
+            # `write_archive()` looks up these tasks. We make sure they are
+            # loaded here so that the lookups do not modify the task index.
+            for task_id, _ in self._versioned_tasks:
+                ctx.task_index.get_task(task_id)
+            for task_id in self._unversioned_tasks:
+                ctx.task_index.get_task(task_id)
+            return OperationExecutionHandle.from_background_work(
+                lambda: self._send_outputs(ctx, remote_env, archive_type)
             )
-            try:
-                num_archived = create_archive(
-                    ctx, tasks_to_archive, out_archive_path, archive_type
-                )
-                if num_archived != len(tasks_to_archive):
-                    raise InternalError(
-                        details="Not all tasks were archived. Expected "
-                        f"{len(tasks_to_archive)}, got {num_archived}."
-                    )
-                remote_archive_path = (
-                    pathlib.Path(MAESTRO_TASK_TRANSFER_LOCATION)
-                    / workspace_name
-                    / archive_name
+
+        elif self._direction == TransferDirection.FromEnv:
+            return OperationExecutionHandle.from_background_work(
+                lambda: self._receive_outputs(remote_env, ctx.output_path, archive_type)
+            )
+
+        else:
+            raise InternalError(
+                details=f"Unsupported transfer direction: {self._direction}"
+            )
+
+    def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
+        extracted: Optional[ExtractedArchive] = handle.background_result()
+        if extracted is None:
+            # Nothing to restore (we sent task outputs to the environment).
+            return
+
+        num_extracted, _ = install_extracted_archive(
+            ctx, extracted, expect_no_duplicates=False
+        )
+        if num_extracted != len(self._versioned_tasks) + len(self._unversioned_tasks):
+            raise InternalError(
+                details="Not all tasks were restored from the archive. "
+                f"Expected {len(self._versioned_tasks) + len(self._unversioned_tasks)}, "
+                f"got {num_extracted}."
+            )
+
+    def _send_outputs(
+        self, ctx: Context, remote_env: "RemoteEnv", archive_type: ArchiveType
+    ) -> None:
+        """
+        Sends the task outputs that the remote environment does not already
+        have.
+        """
+        client = remote_env.client()
+        workspace_name = remote_env.workspace_name()
+
+        # The environment may already have some of the versioned outputs (e.g.,
+        # from an earlier session), so we only need to send the rest.
+        versioned_tasks = self._versioned_tasks
+        if len(versioned_tasks) > 0:
+            restored = {
+                (task_id, version.timestamp)
+                for task_id, version in client.restore_cached_task_outputs(
+                    workspace_name, self._project_root, versioned_tasks
                 )
-                remote_env.transfer_file(out_archive_path, remote_archive_path)
+            }
+            versioned_tasks = [
+                (task_id, version)
+                for task_id, version in versioned_tasks
+                if (task_id, version.timestamp) not in restored
+            ]
+
+        tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]] = (
+            versioned_tasks + [(task, None) for task in self._unversioned_tasks]
+        )
+        if len(tasks_to_archive) == 0:
+            return
+
+        # We create the archive (on another thread) while we send it, and the
+        # environment extracts it while it receives it. So the archive is never
+        # written to disk.
+        read_fd, write_fd = os.pipe()
+
+        def create_archive() -> int:
+            with open(write_fd, "wb") as pipe:
+                return write_archive(ctx, tasks_to_archive, pipe, archive_type)
+
+        creation = _run_in_thread(create_archive)
+        with open(read_fd, "rb") as pipe:
+            try:
                 num_unpacked = client.unpack_task_outputs(
                     workspace_name,
                     self._project_root,
-                    pathlib.Path(archive_name),
-                    archive_type,
-                )
-                if num_unpacked != num_archived:
-                    raise InternalError(
-                        details="Not all tasks were unpacked in the remote "
-                        f"environment. Expected {num_archived}, got "
-                        f"{num_unpacked}."
-                    )
-            finally:
-                out_archive_path.unlink(missing_ok=True)
-                remote_env.delete_file(remote_archive_path)
-        elif self._direction == TransferDirection.FromEnv:
-            try:
-                result = client.pack_task_outputs(
-                    remote_env.workspace_name(),
-                    self._project_root,
-                    self._versioned_tasks,
-                    self._unversioned_tasks,
                     archive_type,
+                    iter(lambda: pipe.read(ARCHIVE_STREAM_CHUNK_SIZE), b""),
                 )
-                if result.num_packed_tasks != len(self._versioned_tasks) + len(
-                    self._unversioned_tasks
-                ):
-                    raise InternalError(
-                        details="Not all tasks were packed. Expected "
-                        f"{len(self._versioned_tasks) + len(self._unversioned_tasks)}, "
-                        f"got {result.num_packed_tasks}."
-                    )
-                remote_archive_path = (
-                    pathlib.Path(MAESTRO_TASK_TRANSFER_LOCATION)
-                    / workspace_name
-                    / result.task_archive_path
-                )
-                local_archive_path = ctx.output_path / result.task_archive_path
-                remote_env.pull_file(remote_archive_path, local_archive_path)
-                num_extracted = restore_archive(
-                    ctx, local_archive_path, archive_type, expect_no_duplicates=False
-                )
-                if num_extracted != len(self._versioned_tasks) + len(
-                    self._unversioned_tasks
-                ):
-                    raise InternalError(
-                        details="Not all tasks were restored from the archive. "
-                        f"Expected {len(self._versioned_tasks) + len(self._unversioned_tasks)}, "
-                        f"got {num_extracted}."
-                    )
-            finally:
-                remote_env.delete_file(remote_archive_path)
-                local_archive_path.unlink(missing_ok=True)
-
-        else:
+            except Exception as ex:
+                # If creating the archive failed, the environment only saw a
+                # truncated archive. So we report the original error instead.
+                creation_error = creation.exception() if creation.done() else None
+                if creation_error is not None:
+                    raise creation_error from ex
+                raise
+        # N.B. The pipe is closed, so the archive's creation will finish (it
+        # fails if the environment stopped reading early).
+        num_archived = creation.result()
+        if num_archived != len(tasks_to_archive):
             raise InternalError(
-                details=f"Unsupported transfer direction: {self._direction}"
+                details="Not all tasks were archived. Expected "
+                f"{len(tasks_to_archive)}, got {num_archived}."
+            )
+        if num_unpacked != num_archived:
+            raise InternalError(
+                details="Not all tasks were unpacked in the remote "
+                f"environment. Expected {num_archived}, got "
+                f"{num_unpacked}."
             )
 
-        return OperationExecutionHandle.from_sync_execution()
+    def _receive_outputs(
+        self,
+        remote_env: "RemoteEnv",
+        output_path: pathlib.Path,
+        archive_type: ArchiveType,
+    ) -> ExtractedArchive:
+        """
+        Has the remote environment pack the task outputs and extracts the
+        archive (into a staging directory) while it is received.
+        """
+        client = remote_env.client()
+        workspace_name = remote_env.workspace_name()
+        archive_data = client.pack_task_outputs(
+            workspace_name,
+            self._project_root,
+            self._versioned_tasks,
+            self._unversioned_tasks,
+            archive_type,
+        )
+        read_fd, write_fd = os.pipe()
 
-    def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
-        pass
+        def receive_archive() -> None:
+            with open(write_fd, "wb") as pipe:
+                for data in archive_data:
+                    pipe.write(data)
+
+        receipt = _run_in_thread(receive_archive)
+        with open(read_fd, "rb") as pipe:
+            try:
+                extracted = extract_archive_to_staging(output_path, pipe, archive_type)
+            except Exception as ex:
+                # If the environment failed to create the archive, we only saw
+                # a truncated archive. So we report the original error instead.
+                receipt_error = receipt.exception() if receipt.done() else None
+                if receipt_error is not None:
+                    raise receipt_error from ex
+                raise
+        try:
+            # The whole archive was read, so the transfer has finished. This
+            # raises any errors reported by the environment.
+            receipt.result()
+        except:
+            extracted.discard()
+            raise
+        return extracted
+
+
+def _run_in_thread(work: Callable[[], Any]) -> Future:
+    """
+    Runs `work` on a new thread and returns a future for its result.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(work())
+        except BaseException as ex:  # pylint: disable=broad-except
+            future.set_exception(ex)
+
+    threading.Thread(target=run, name="conductor-transfer").start()
+    return future
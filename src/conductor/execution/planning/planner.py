@@ -1,5 +1,7 @@
+import time
 from typing import Dict, List, Optional, Set, Tuple
 
+from conductor.config import EXECUTION_LEASE_POLL_INTERVAL_S
 from conductor.context import Context
 from conductor.errors import InternalError, EnvsRequireGit
 from conductor.execution.ops.combine_outputs import CombineOutputs
@@ -21,6 +23,7 @@ from conductor.task_types.combine import Combine
 from conductor.task_types.environment import Environment
 from conductor.task_types.group import Group
 from conductor.task_types.run import RunCommand, RunExperiment
+from conductor.utils.colored_output import print_yellow
 
 
 class ExecutionPlanner:
@@ -59,7 +62,29 @@ class ExecutionPlanner:
         This function converts the task graph into a physical operation graph,
         eliminating tasks that do not need to execute (due to having cached
         results).
+
+        Tasks whose results can be reused by other Conductor processes are
+        leased to this process (see `_acquire_execution_lease()`). The executor
+        releases the leases when it runs the plan.
         """
+        try:
+            return self._create_plan_for(task_id, run_again, at_least_commit)
+        except BaseException:
+            # The leases acquired so far will not be released by the executor.
+            self._ctx.version_index.release_execution_leases()
+            self._ctx.version_index.commit_changes()
+            raise
+
+    def _create_plan_for(
+        self,
+        task_id: TaskIdentifier,
+        run_again: bool,
+        at_least_commit: Optional[str],
+    ) -> "ExecutionPlan":
+
+        # Fingerprints are memoized per plan (files may have changed since
+        # the last plan).
+        self._ctx.fingerprint_memo.clear()
 
         all_ops: List[Operation] = []
         initial_operations: List[Operation] = []
@@ -68,6 +93,21 @@ class ExecutionPlanner:
         num_tasks_to_run = 0
         used_envs: Set[str] = set()
 
+        if not run_again:
+            # Compute the most relevant existing versions of all experiments
+            # in the task graph at once, instead of one at a time as they are
+            # visited below.
+            experiments: Dict[TaskIdentifier, RunExperiment] = {}
+
+            def collect_experiments(task: TaskType) -> None:
+                if isinstance(task, RunExperiment):
+                    experiments[task.identifier] = task
+
+            task_to_run.traverse(self._ctx, collect_experiments)
+            RunExperiment.compute_most_relevant_versions(
+                self._ctx, list(experiments.values())
+            )
+
         # First pass (depth first):
         # 1. Prune tasks that do not need to execute (due to having cached results).
         # 2. Link task dependencies.
@@ -89,6 +129,11 @@ class ExecutionPlanner:
                     cached_tasks.append(lt.task)
                     continue
 
+                if self._acquire_execution_lease(lt.task, run_again, at_least_commit):
+                    # Another process ran this task while we were waiting.
+                    cached_tasks.append(lt.task)
+                    continue
+
                 lt.state = LoweringState.SECOND_VISIT
                 stack.append(lt)
 
@@ -132,7 +177,7 @@ class ExecutionPlanner:
                         root_op = ops[-1]
 
                 else:
-                    new_op = self._create_local_operation(lt)
+                    new_op = self._create_local_operation(lt, at_least_commit)
 
                     # Hook the new dependency into the graph.
                     for dep in lt.deps:
@@ -162,7 +207,51 @@ class ExecutionPlanner:
             used_envs=used_envs,
         )
 
-    def _create_local_operation(self, lt: LoweringTask) -> Operation:
+    def _acquire_execution_lease(
+        self, task: TaskType, run_again: bool, at_least_commit: Optional[str]
+    ) -> bool:
+        """
+        Acquires the lease for running a task that is cached by its fingerprint
+        (see `VersionIndex.try_acquire_execution_lease()`), so that concurrent
+        Conductor processes that share the project run it once. If another
+        process is running the task, this waits until it finishes.
+
+        Returns `True` if the other process produced a version that can be
+        used instead (i.e., the task no longer needs to run).
+        """
+        if not isinstance(task, RunExperiment) or not task.caches_by_fingerprint:
+            return False
+        fingerprint = task.compute_fingerprint(self._ctx, at_least_commit)
+        if fingerprint is None:
+            return False
+
+        version_index = self._ctx.version_index
+        printed_waiting_message = False
+        while not version_index.try_acquire_execution_lease(
+            task.identifier, fingerprint
+        ):
+            if run_again or not version_index.must_wait_for_execution_lease(
+                task.identifier, fingerprint
+            ):
+                # The task runs without the lease (i.e., it may run in
+                # another process too).
+                return False
+            if not printed_waiting_message:
+                print_yellow(
+                    "⏳ Waiting for another Conductor process to finish running "
+                    "{}.".format(str(task.identifier))
+                )
+                printed_waiting_message = True
+            time.sleep(EXECUTION_LEASE_POLL_INTERVAL_S)
+            version_index.renew_execution_leases()
+            task.recompute_most_relevant_version(self._ctx, at_least_commit)
+            if not task.should_run(self._ctx, at_least_commit):
+                return True
+        return False
+
+    def _create_local_operation(
+        self, lt: LoweringTask, at_least_commit: Optional[str]
+    ) -> Operation:
         """
         This is used when the task maps to a single operation (when the task
         runs locally).
@@ -186,6 +275,11 @@ class ExecutionPlanner:
                 version_to_record=exp_version,
                 serialize_args_options=True,
                 parallelizable=lt.task.parallelizable,
+                resources=lt.task.resources,
+                mutex=lt.task.mutex,
+                fingerprint_to_record=lt.task.compute_fingerprint(
+                    self._ctx, at_least_commit
+                ),
             )
 
         elif isinstance(lt.task, RunCommand):
@@ -205,6 +299,13 @@ class ExecutionPlanner:
                 version_to_record=None,
                 serialize_args_options=False,
                 parallelizable=lt.task.parallelizable,
+                resources=lt.task.resources,
+                mutex=lt.task.mutex,
+                # N.B. The task's dependencies have been lowered, so their
+                # fingerprints reflect the outputs they will produce.
+                fingerprint_to_record=lt.task.compute_fingerprint(
+                    self._ctx, at_least_commit
+                ),
             )
 
         elif isinstance(lt.task, Combine):
@@ -290,6 +391,7 @@ class ExecutionPlanner:
             start_runnable=env_task.start,
             working_path=env_startstop_working_path,
             connect_config_runnable=env_task.connect_config,
+            max_concurrent_tasks=env_task.max_concurrent_tasks,
         )
         ops.append(start_env)
 
@@ -2,9 +2,15 @@ import sqlite3
 import pathlib
 import shutil
 import time
-from typing import Any, Iterable, List, Optional, Tuple, Sequence
-
-from conductor.config import VERSION_INDEX_BACKUP_NAME_TEMPLATE
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Sequence
+
+from conductor.config import (
+    EXECUTION_LEASE_HEARTBEAT_INTERVAL_S,
+    EXECUTION_LEASE_TIMEOUT_S,
+    VERSION_INDEX_BACKUP_NAME_TEMPLATE,
+    VERSION_INDEX_GROUP_COMMIT_WINDOW_S,
+)
 from conductor.errors import UnsupportedVersionIndexFormat, CorruptedVersionIndex
 from conductor.task_identifier import TaskIdentifier
 from conductor.utils.git import Git
@@ -73,6 +79,43 @@ class Version:
         )
 
 
+class TaskExecution:
+    """
+    Resource usage statistics about one (successful) execution of a task.
+    Statistics that could not be measured are `None`.
+    """
+
+    def __init__(
+        self,
+        *,
+        finished_at: float,
+        wall_time_s: float,
+        cpu_time_s: Optional[float],
+        peak_rss_kb: Optional[int],
+        output_bytes: Optional[int],
+        version_timestamp: Optional[int] = None,
+    ):
+        self.finished_at = finished_at
+        self.wall_time_s = wall_time_s
+        self.cpu_time_s = cpu_time_s
+        self.peak_rss_kb = peak_rss_kb
+        self.output_bytes = output_bytes
+        self.version_timestamp = version_timestamp
+
+    def __repr__(self) -> str:
+        return (
+            "TaskExecution(finished_at={}, wall_time_s={}, cpu_time_s={}, "
+            "peak_rss_kb={}, output_bytes={}, version_timestamp={})".format(
+                self.finished_at,
+                self.wall_time_s,
+                str(self.cpu_time_s),
+                str(self.peak_rss_kb),
+                str(self.output_bytes),
+                str(self.version_timestamp),
+            )
+        )
+
+
 class VersionIndex:
     """
     The `VersionIndex` is a persistent data structure that keeps track of all
@@ -81,23 +124,52 @@ class VersionIndex:
 
     # v0.4.0 and older: FormatVersion = 1
     # v0.7.0 and older: FormatVersion = 2
-    FormatVersion = 3
+    # FormatVersion = 3 does not have the `task_executions` table
+    # FormatVersion = 4 does not have the `version_fingerprints` table
+    # FormatVersion = 5 does not have the `version_allocator` table
+    # FormatVersion = 6 does not have the `execution_leases` table
+    FormatVersion = 7
 
     def __init__(
         self,
         conn: sqlite3.Connection,
-        last_timestamp: int,
         underlying_db_path: pathlib.Path,
+        write_ahead_log: bool = False,
     ):
         self._conn = conn
-        self._last_timestamp = last_timestamp
         self._underlying_db_path = underlying_db_path
+        self._write_ahead_log = write_ahead_log
+        # When the oldest change that is waiting for a group commit was made
+        # (see `group_commit_changes()`).
+        self._group_commit_started_at: Optional[float] = None
+        # Identifies the execution leases held through this index (see
+        # `try_acquire_execution_lease()`).
+        self._lease_owner = uuid.uuid4().hex
+        self._lease_owner_started_at = time.time()
+        self._held_leases: Set[Tuple[str, str]] = set()
+        self._leases_renewed_at: Optional[float] = None
 
     @classmethod
-    def create_or_load(cls, path: pathlib.Path) -> "VersionIndex":
+    def create_or_load(
+        cls, path: pathlib.Path, write_ahead_log: bool = False
+    ) -> "VersionIndex":
+        """
+        Opens the version index stored at `path`, creating it if needed.
+
+        If `write_ahead_log` is set, the index uses SQLite's write-ahead log.
+        Commits are then cheaper and do not block readers (e.g., the explorer).
+        It should not be set for an index whose file is copied while the index
+        is open (e.g., an archive's index), since committed changes may only be
+        in the log.
+        """
         if path.exists():
             conn = sqlite3.connect(path)
             format_version = conn.execute(q.get_format_version).fetchone()[0]
+            if format_version != cls.FormatVersion:
+                # Move any changes in the write-ahead log into the index file
+                # so that the migrations' backup copies include them.
+                conn.execute(q.checkpoint_write_ahead_log)
+
             if format_version == 1:
                 # Upgrade the version index to format 2.
                 cls._run_v1_to_v2_migration(conn, path)
@@ -108,17 +180,36 @@ class VersionIndex:
                 cls._run_v2_to_v3_migration(conn, path)
                 format_version = 3
 
+            if format_version == 3:
+                # Upgrade the version index to format 4.
+                cls._run_v3_to_v4_migration(conn, path)
+                format_version = 4
+
+            if format_version == 4:
+                # Upgrade the version index to format 5.
+                cls._run_v4_to_v5_migration(conn, path)
+                format_version = 5
+
+            if format_version == 5:
+                # Upgrade the version index to format 6.
+                cls._run_v5_to_v6_migration(conn, path)
+                format_version = 6
+
+            if format_version == 6:
+                # Upgrade the version index to format 7.
+                cls._run_v6_to_v7_migration(conn, path)
+                format_version = 7
+
             if format_version != cls.FormatVersion:
                 raise UnsupportedVersionIndexFormat(version=format_version)
 
-            # Need to restore the last timestamp used.
-            result = conn.execute(q.get_max_timestamp).fetchone()
+            if write_ahead_log:
+                cls._use_write_ahead_log(conn)
+
             return VersionIndex(
                 conn=conn,
-                last_timestamp=(
-                    result[0] if result is not None and result[0] is not None else 0
-                ),
                 underlying_db_path=path,
+                write_ahead_log=write_ahead_log,
             )
 
         # Need to create the DB
@@ -127,8 +218,17 @@ class VersionIndex:
         conn.execute(q.set_format_version.format(version=cls.FormatVersion))
         conn.execute(q.create_table)
         conn.execute(q.create_version_overrides_table)
+        conn.execute(q.create_task_executions_table)
+        conn.execute(q.create_task_executions_index)
+        conn.execute(q.create_version_fingerprints_table)
+        conn.execute(q.create_version_fingerprints_index)
+        conn.execute(q.create_version_allocator_table)
+        conn.execute(q.initialize_version_allocator)
+        conn.execute(q.create_execution_leases_table)
         conn.commit()
-        return VersionIndex(conn, 0, path)
+        if write_ahead_log:
+            cls._use_write_ahead_log(conn)
+        return VersionIndex(conn, path, write_ahead_log)
 
     def clone(self) -> "VersionIndex":
         """
@@ -137,10 +237,12 @@ class VersionIndex:
         needed in Conductor's explorer API).
         """
         conn = sqlite3.connect(self._underlying_db_path)
+        if self._write_ahead_log:
+            self._use_write_ahead_log(conn)
         return VersionIndex(
             conn=conn,
-            last_timestamp=self._last_timestamp,
             underlying_db_path=self._underlying_db_path,
+            write_ahead_log=self._write_ahead_log,
         )
 
     def get_latest_output_version(
@@ -163,13 +265,40 @@ class VersionIndex:
             results.append(self._version_from_row(row[1:]))
         return results
 
+    def get_all_versions_for_tasks(
+        self, task_identifiers: Sequence[TaskIdentifier]
+    ) -> Dict[TaskIdentifier, List[Version]]:
+        """
+        Retrieves all existing versions of the specified tasks in bulk. Tasks
+        without any versions are omitted from the returned dictionary.
+        """
+        results: Dict[TaskIdentifier, List[Version]] = {}
+        cursor = self._conn.cursor()
+        for chunk in _chunked(task_identifiers):
+            query = q.all_entries_for_tasks.format(params=", ".join("?" * len(chunk)))
+            cursor.execute(query, [str(task_id) for task_id in chunk])
+            for row in cursor:
+                results.setdefault(TaskIdentifier.from_str(row[0]), []).append(
+                    self._version_from_row(row[1:])
+                )
+        return results
+
     def generate_new_output_version(self, commit: Optional[Git.Commit]) -> Version:
-        timestamp = int(time.time())
-        if timestamp == self._last_timestamp:
-            timestamp += 1
-        elif timestamp < self._last_timestamp:
-            timestamp = self._last_timestamp + 1
-        self._last_timestamp = timestamp
+        """
+        Allocates a new output version. Versions are allocated through the
+        index file, so Conductor processes that share a project (e.g.,
+        concurrent `cond run`s) never allocate the same version.
+        """
+        # If there are changes waiting for a (group) commit, this connection
+        # already holds the index's write lock. The allocation is then
+        # committed along with those changes. Otherwise, we commit the
+        # allocation right away so that we do not hold the lock.
+        commit_allocation = not self._conn.in_transaction
+        cursor = self._conn.cursor()
+        cursor.execute(q.allocate_version_timestamp, (int(time.time()),))
+        timestamp = cursor.execute(q.get_allocated_version_timestamp).fetchone()[0]
+        if commit_allocation:
+            self._conn.commit()
 
         commit_hash: Optional[str] = None
         if commit is not None:
@@ -202,7 +331,46 @@ class VersionIndex:
                 has_uncommitted_changes,
             ),
         )
-        return cursor.rowcount
+        inserted = cursor.rowcount
+        # Make sure that the version is not allocated again (e.g., when it
+        # comes from an archive).
+        cursor.execute(q.reserve_version_timestamp, (version.timestamp,))
+        return inserted
+
+    def set_version_fingerprint(
+        self, task_identifier: TaskIdentifier, version: Version, fingerprint: str
+    ) -> None:
+        cursor = self._conn.cursor()
+        cursor.execute(
+            q.insert_version_fingerprint,
+            (str(task_identifier), version.timestamp, fingerprint),
+        )
+
+    def get_version_fingerprint(
+        self, task_identifier: TaskIdentifier, version: Version
+    ) -> Optional[str]:
+        cursor = self._conn.cursor()
+        cursor.execute(
+            q.get_version_fingerprint, (str(task_identifier), version.timestamp)
+        )
+        row = cursor.fetchone()
+        return row[0] if row is not None else None
+
+    def get_latest_version_with_fingerprint(
+        self, task_identifier: TaskIdentifier, fingerprint: str
+    ) -> Optional[Version]:
+        """
+        Returns the newest version of the task's outputs that was recorded with
+        the given fingerprint, if one exists.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute(
+            q.latest_version_with_fingerprint, (str(task_identifier), fingerprint)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._version_from_row(row)
 
     def get_all_versions(self) -> List[Tuple[TaskIdentifier, Version]]:
         cursor = self._conn.cursor()
@@ -257,6 +425,77 @@ class VersionIndex:
             is_override=True,
         )
 
+    def get_version_overrides(
+        self, task_identifiers: Sequence[TaskIdentifier]
+    ) -> Dict[TaskIdentifier, Version]:
+        """
+        Retrieves the version overrides of the specified tasks in bulk. Tasks
+        without an override are omitted from the returned dictionary.
+        """
+        results: Dict[TaskIdentifier, Version] = {}
+        cursor = self._conn.cursor()
+        for chunk in _chunked(task_identifiers):
+            query = q.get_version_overrides_for_tasks.format(
+                params=", ".join("?" * len(chunk))
+            )
+            cursor.execute(query, [str(task_id) for task_id in chunk])
+            for row in cursor:
+                timestamp = int(row[1])
+                # See `get_version_override()`.
+                if row[3] is None:
+                    raise CorruptedVersionIndex(
+                        task_identifier=row[0],
+                        timestamp=timestamp,
+                    )
+                results[TaskIdentifier.from_str(row[0])] = Version(
+                    timestamp=timestamp,
+                    commit_hash=row[2],
+                    has_uncommitted_changes=(False if row[3] == 0 else True),
+                    is_override=True,
+                )
+        return results
+
+    def insert_task_execution(
+        self, task_identifier: TaskIdentifier, execution: TaskExecution
+    ) -> None:
+        cursor = self._conn.cursor()
+        cursor.execute(
+            q.insert_task_execution,
+            (
+                str(task_identifier),
+                execution.finished_at,
+                execution.version_timestamp,
+                execution.wall_time_s,
+                execution.cpu_time_s,
+                execution.peak_rss_kb,
+                execution.output_bytes,
+            ),
+        )
+
+    def get_task_executions(
+        self, task_identifiers: Optional[Sequence[TaskIdentifier]] = None
+    ) -> Dict[TaskIdentifier, List[TaskExecution]]:
+        """
+        Retrieves the recorded executions of the specified tasks (or of all
+        tasks, if `task_identifiers` is `None`), ordered from oldest to newest.
+        Tasks without any recorded executions are omitted from the returned
+        dictionary.
+        """
+        results: Dict[TaskIdentifier, List[TaskExecution]] = {}
+        cursor = self._conn.cursor()
+        if task_identifiers is None:
+            cursor.execute(q.all_task_executions)
+            self._collect_task_executions(cursor, results)
+            return results
+
+        for chunk in _chunked(task_identifiers):
+            query = q.task_executions_for_tasks.format(
+                params=", ".join("?" * len(chunk))
+            )
+            cursor.execute(query, [str(task_id) for task_id in chunk])
+            self._collect_task_executions(cursor, results)
+        return results
+
     def get_versioned_tasks(
         self, tasks: Optional[List[TaskIdentifier]], latest_only: bool
     ) -> List[Tuple[TaskIdentifier, Version]]:
@@ -332,7 +571,10 @@ class VersionIndex:
         """
         cursor = self._conn.cursor()
         cursor.executemany(q.insert_new_version, rows)
-        return cursor.rowcount
+        inserted = cursor.rowcount
+        # See `insert_output_version()`.
+        cursor.execute(q.reserve_indexed_version_timestamps)
+        return inserted
 
     def bulk_load_unversioned(self, task_ids: Iterable[TaskIdentifier]) -> int:
         """
@@ -344,16 +586,187 @@ class VersionIndex:
         cursor.executemany(q.add_unversioned_task, rows)
         return cursor.rowcount
 
+    def try_acquire_execution_lease(
+        self, task_identifier: TaskIdentifier, fingerprint: str
+    ) -> bool:
+        """
+        Tries to acquire the lease for running the task to produce a version
+        with the given fingerprint, and returns whether this index holds the
+        lease. A lease held by another process can only be taken over once it
+        is stale (i.e., it was not renewed for `EXECUTION_LEASE_TIMEOUT_S`
+        seconds).
+
+        Leases let concurrent Conductor processes that share a project run
+        such a task once: other processes wait for the lease to be released
+        and then use the version instead (see `must_wait_for_execution_lease()`).
+        The holder must renew its leases (see `renew_execution_leases()`).
+        """
+        # See `generate_new_output_version()`.
+        commit_lease = not self._conn.in_transaction
+        now = time.time()
+        cursor = self._conn.cursor()
+        cursor.execute(
+            q.acquire_execution_lease,
+            (
+                str(task_identifier),
+                fingerprint,
+                self._lease_owner,
+                self._lease_owner_started_at,
+                now,
+                now - EXECUTION_LEASE_TIMEOUT_S,
+            ),
+        )
+        acquired = cursor.rowcount > 0
+        if commit_lease:
+            self._conn.commit()
+        if acquired:
+            if len(self._held_leases) == 0:
+                self._leases_renewed_at = time.monotonic()
+            self._held_leases.add((str(task_identifier), fingerprint))
+        return acquired
+
+    def must_wait_for_execution_lease(
+        self, task_identifier: TaskIdentifier, fingerprint: str
+    ) -> bool:
+        """
+        Returns whether another process holds the (non-stale) lease for running
+        the task to produce a version with the given fingerprint, and this
+        process should wait for the lease to be released.
+
+        To avoid deadlocks (i.e., two processes that each wait for a lease held
+        by the other), a process only waits for leases held by processes that
+        started before it.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute(q.get_execution_lease, (str(task_identifier), fingerprint))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+        owner, owner_started_at, heartbeat_at = row
+        if owner == self._lease_owner:
+            return False
+        if heartbeat_at < time.time() - EXECUTION_LEASE_TIMEOUT_S:
+            return False
+        return (owner_started_at, owner) < (
+            self._lease_owner_started_at,
+            self._lease_owner,
+        )
+
+    def renew_execution_leases(self) -> None:
+        """
+        Renews the leases held by this index if their renewal is due (see
+        `execution_lease_renewal_due_in()`).
+        """
+        due_in = self.execution_lease_renewal_due_in()
+        if due_in is None or due_in > 0:
+            return
+        # See `generate_new_output_version()`.
+        commit_renewal = not self._conn.in_transaction
+        cursor = self._conn.cursor()
+        cursor.execute(q.renew_execution_leases, (time.time(), self._lease_owner))
+        if commit_renewal:
+            self._conn.commit()
+        self._leases_renewed_at = time.monotonic()
+
+    def execution_lease_renewal_due_in(self) -> Optional[float]:
+        """
+        Returns the number of seconds until the leases held by this index need
+        to be renewed (this may be negative if the renewal is overdue), or
+        `None` if this index does not hold any leases.
+        """
+        if len(self._held_leases) == 0 or self._leases_renewed_at is None:
+            return None
+        return (
+            self._leases_renewed_at
+            + EXECUTION_LEASE_HEARTBEAT_INTERVAL_S
+            - time.monotonic()
+        )
+
+    def release_execution_lease(
+        self, task_identifier: TaskIdentifier, fingerprint: str
+    ) -> None:
+        """
+        Releases the lease, if it is held by this index. The release is part
+        of the pending changes, so it can be committed along with the version
+        that the lease was held for.
+        """
+        key = (str(task_identifier), fingerprint)
+        if key not in self._held_leases:
+            return
+        cursor = self._conn.cursor()
+        cursor.execute(q.release_execution_lease, (*key, self._lease_owner))
+        self._held_leases.discard(key)
+
+    def release_execution_leases(self) -> None:
+        """
+        Releases all leases held by this index. Like
+        `release_execution_lease()`, the release must be committed.
+        """
+        if len(self._held_leases) == 0:
+            return
+        cursor = self._conn.cursor()
+        cursor.execute(q.release_execution_leases, (self._lease_owner,))
+        self._held_leases.clear()
+
     def commit_changes(self):
+        self._group_commit_started_at = None
         if not self._conn.in_transaction:
             return
         self._conn.commit()
 
+    def group_commit_changes(self) -> None:
+        """
+        Commits the pending changes as part of a group commit. The changes are
+        committed together with any other changes made within
+        `VERSION_INDEX_GROUP_COMMIT_WINDOW_S` seconds, so that finishing many
+        tasks in quick succession does not require a commit per task.
+
+        Callers must ensure that the group is eventually committed (i.e., that
+        `commit_changes()` is called once `group_commit_due_in()` seconds have
+        elapsed, or when they are done making changes).
+        """
+        if not self._conn.in_transaction:
+            return
+        now = time.monotonic()
+        if self._group_commit_started_at is None:
+            self._group_commit_started_at = now
+        if now - self._group_commit_started_at >= VERSION_INDEX_GROUP_COMMIT_WINDOW_S:
+            self.commit_changes()
+
+    def group_commit_due_in(self) -> Optional[float]:
+        """
+        Returns the number of seconds until the pending group commit is due
+        (this may be negative if it is overdue), or `None` if there are no
+        changes waiting for a group commit.
+        """
+        if self._group_commit_started_at is None:
+            return None
+        return (
+            self._group_commit_started_at
+            + VERSION_INDEX_GROUP_COMMIT_WINDOW_S
+            - time.monotonic()
+        )
+
     def rollback_changes(self):
+        self._group_commit_started_at = None
         if not self._conn.in_transaction:
             return
         self._conn.rollback()
 
+    @staticmethod
+    def _use_write_ahead_log(conn: sqlite3.Connection) -> None:
+        # N.B. The journal mode is stored in the index file, but the
+        # synchronous setting applies to each connection.
+        try:
+            journal_mode = conn.execute(q.enable_write_ahead_log).fetchone()[0]
+        except sqlite3.OperationalError:
+            # Switching to the write-ahead log requires exclusive access to the
+            # index (e.g., another process may be using it). We use the default
+            # journal until it can be switched.
+            return
+        if journal_mode.lower() == "wal":
+            conn.execute(q.set_synchronous_normal)
+
     @staticmethod
     def _run_v1_to_v2_migration(conn: sqlite3.Connection, path: pathlib.Path):
         # Upgrades the version index's persistent format from version 1 to 2.
@@ -399,9 +812,120 @@ class VersionIndex:
             conn.rollback()
             raise
 
+    @staticmethod
+    def _run_v3_to_v4_migration(conn: sqlite3.Connection, path: pathlib.Path):
+        # Upgrades the version index's persistent format from version 3 to 4.
+        # This adds the `task_executions` table.
+        backup_copy_path = path.with_name(
+            VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=3, vto=4)
+        )
+        if not backup_copy_path.exists():
+            # Back up the version index file first.
+            shutil.copy2(src=path, dst=backup_copy_path)
+
+        # Run the migration.
+        try:
+            conn.execute(q.v3_to_v4_create_task_executions_table)
+            conn.execute(q.v3_to_v4_create_task_executions_index)
+            conn.execute(q.set_format_version.format(version=4))
+            conn.commit()
+        except RuntimeError:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _run_v4_to_v5_migration(conn: sqlite3.Connection, path: pathlib.Path):
+        # Upgrades the version index's persistent format from version 4 to 5.
+        # This adds the `version_fingerprints` table.
+        backup_copy_path = path.with_name(
+            VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=4, vto=5)
+        )
+        if not backup_copy_path.exists():
+            # Back up the version index file first.
+            shutil.copy2(src=path, dst=backup_copy_path)
+
+        # Run the migration.
+        try:
+            conn.execute(q.v4_to_v5_create_version_fingerprints_table)
+            conn.execute(q.v4_to_v5_create_version_fingerprints_index)
+            conn.execute(q.set_format_version.format(version=5))
+            conn.commit()
+        except RuntimeError:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _run_v5_to_v6_migration(conn: sqlite3.Connection, path: pathlib.Path):
+        # Upgrades the version index's persistent format from version 5 to 6.
+        # This adds the `version_allocator` table.
+        backup_copy_path = path.with_name(
+            VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=5, vto=6)
+        )
+        if not backup_copy_path.exists():
+            # Back up the version index file first.
+            shutil.copy2(src=path, dst=backup_copy_path)
+
+        # Run the migration.
+        try:
+            conn.execute(q.v5_to_v6_create_version_allocator_table)
+            conn.execute(q.v5_to_v6_initialize_version_allocator)
+            conn.execute(q.set_format_version.format(version=6))
+            conn.commit()
+        except RuntimeError:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _run_v6_to_v7_migration(conn: sqlite3.Connection, path: pathlib.Path):
+        # Upgrades the version index's persistent format from version 6 to 7.
+        # This adds the `execution_leases` table.
+        backup_copy_path = path.with_name(
+            VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=6, vto=7)
+        )
+        if not backup_copy_path.exists():
+            # Back up the version index file first.
+            shutil.copy2(src=path, dst=backup_copy_path)
+
+        # Run the migration.
+        try:
+            conn.execute(q.v6_to_v7_create_execution_leases_table)
+            conn.execute(q.set_format_version.format(version=7))
+            conn.commit()
+        except RuntimeError:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _collect_task_executions(
+        cursor: sqlite3.Cursor, results: Dict[TaskIdentifier, List[TaskExecution]]
+    ) -> None:
+        for row in cursor:
+            results.setdefault(TaskIdentifier.from_str(row[0]), []).append(
+                TaskExecution(
+                    finished_at=row[1],
+                    version_timestamp=row[2],
+                    wall_time_s=row[3],
+                    cpu_time_s=row[4],
+                    peak_rss_kb=row[5],
+                    output_bytes=row[6],
+                )
+            )
+
     def _version_from_row(self, row: Sequence[Any]) -> Version:
         return Version(
             timestamp=row[0],
             commit_hash=row[1],
             has_uncommitted_changes=(False if row[2] == 0 else True),
         )
+
+
+# SQLite limits the number of parameters in a single query (999 in older
+# versions), so bulk lookups are split into chunks of at most this size.
+_MAX_QUERY_PARAMS = 500
+
+
+def _chunked(
+    task_identifiers: Sequence[TaskIdentifier],
+) -> Iterable[Sequence[TaskIdentifier]]:
+    for idx in range(0, len(task_identifiers), _MAX_QUERY_PARAMS):
+        yield task_identifiers[idx : idx + _MAX_QUERY_PARAMS]
@@ -25,11 +25,137 @@ create_version_overrides_table = """
   )
 """
 
+# Records resource usage statistics about each (successful) task execution.
+# `version_timestamp` is `NULL` for tasks that are not versioned.
+create_task_executions_table = """
+  CREATE TABLE IF NOT EXISTS task_executions (
+    task_identifier TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    version_timestamp INTEGER,
+    wall_time_s REAL NOT NULL,
+    cpu_time_s REAL,
+    peak_rss_kb INTEGER,
+    output_bytes INTEGER
+  )
+"""
+
+create_task_executions_index = """
+  CREATE INDEX IF NOT EXISTS task_executions_by_task
+    ON task_executions (task_identifier)
+"""
+
+# The fingerprints (cache keys) of versioned task outputs. Only versions of
+# tasks that declare their inputs have a fingerprint.
+create_version_fingerprints_table = """
+  CREATE TABLE IF NOT EXISTS version_fingerprints (
+    task_identifier TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (task_identifier, timestamp)
+  )
+"""
+
+create_version_fingerprints_index = """
+  CREATE INDEX IF NOT EXISTS version_fingerprints_by_fingerprint
+    ON version_fingerprints (task_identifier, fingerprint)
+"""
+
+# The last timestamp used for an output version. The table has exactly one
+# row. Conductor processes that share a project allocate new versions by
+# updating this row, so they never allocate the same version twice.
+create_version_allocator_table = """
+  CREATE TABLE IF NOT EXISTS version_allocator (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_timestamp INTEGER NOT NULL
+  )
+"""
+
+initialize_version_allocator = """
+  INSERT INTO version_allocator (id, last_timestamp)
+    SELECT 0, COALESCE(MAX(timestamp), 0) FROM version_index
+"""
+
+# N.B. Updating the row first acquires the index's write lock, so the read that
+# follows cannot race with another process's allocation.
+allocate_version_timestamp = """
+  UPDATE version_allocator SET last_timestamp = MAX(last_timestamp + 1, ?)
+"""
+
+get_allocated_version_timestamp = "SELECT last_timestamp FROM version_allocator"
+
+reserve_version_timestamp = """
+  UPDATE version_allocator SET last_timestamp = MAX(last_timestamp, ?)
+"""
+
+reserve_indexed_version_timestamps = """
+  UPDATE version_allocator SET last_timestamp = MAX(
+    last_timestamp,
+    (SELECT COALESCE(MAX(timestamp), 0) FROM version_index)
+  )
+"""
+
+# Leases held by processes that are running a task to produce a version with
+# the given fingerprint. Other processes wait for the lease to be released and
+# then use the version instead of running the task themselves.
+create_execution_leases_table = """
+  CREATE TABLE IF NOT EXISTS execution_leases (
+    task_identifier TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    owner_started_at REAL NOT NULL,
+    heartbeat_at REAL NOT NULL,
+    PRIMARY KEY (task_identifier, fingerprint)
+  )
+"""
+
+# N.B. The lease is only taken over if it is stale (or already held by the
+# owner). Otherwise, no rows are changed.
+acquire_execution_lease = """
+  INSERT INTO execution_leases (
+    task_identifier,
+    fingerprint,
+    owner,
+    owner_started_at,
+    heartbeat_at
+  )
+  VALUES (?, ?, ?, ?, ?)
+  ON CONFLICT(task_identifier, fingerprint)
+  DO UPDATE SET
+    owner=excluded.owner,
+    owner_started_at=excluded.owner_started_at,
+    heartbeat_at=excluded.heartbeat_at
+  WHERE execution_leases.owner = excluded.owner
+    OR execution_leases.heartbeat_at < ?
+"""
+
+get_execution_lease = """
+  SELECT owner, owner_started_at, heartbeat_at FROM execution_leases
+    WHERE task_identifier = ? AND fingerprint = ?
+"""
+
+renew_execution_leases = """
+  UPDATE execution_leases SET heartbeat_at = ? WHERE owner = ?
+"""
+
+release_execution_lease = """
+  DELETE FROM execution_leases
+    WHERE task_identifier = ? AND fingerprint = ? AND owner = ?
+"""
+
+release_execution_leases = "DELETE FROM execution_leases WHERE owner = ?"
+
 set_format_version = "PRAGMA user_version = {version:d}"
 
 get_format_version = "PRAGMA user_version"
 
-get_max_timestamp = "SELECT MAX(timestamp) FROM version_index"
+enable_write_ahead_log = "PRAGMA journal_mode = WAL"
+
+# N.B. In WAL mode, this only syncs the log when it is checkpointed. Committed
+# changes survive a crash of the process, and the index cannot be corrupted by
+# a power loss (the most recent commits may be rolled back instead).
+set_synchronous_normal = "PRAGMA synchronous = NORMAL"
+
+checkpoint_write_ahead_log = "PRAGMA wal_checkpoint(TRUNCATE)"
 
 insert_new_version = """
   INSERT INTO version_index (
@@ -104,6 +230,20 @@ all_entries_for_task = """
     task_identifier = ?
 """
 
+# N.B. The `{params}` placeholder must be replaced with a comma-separated list
+# of `?` parameters (one per task identifier).
+all_entries_for_tasks = """
+  SELECT
+    task_identifier,
+    timestamp,
+    git_commit_hash,
+    has_uncommitted_changes
+  FROM
+    version_index
+  WHERE
+    task_identifier IN ({params})
+"""
+
 latest_entry_for_task = """
   SELECT
     task_identifier,
@@ -163,6 +303,103 @@ get_version_override = """
     o.task_identifier = ?
 """
 
+# N.B. The `{params}` placeholder must be replaced with a comma-separated list
+# of `?` parameters (one per task identifier).
+get_version_overrides_for_tasks = """
+  SELECT
+    o.task_identifier,
+    o.timestamp,
+    v.git_commit_hash,
+    v.has_uncommitted_changes
+  FROM
+    version_overrides AS o
+  LEFT JOIN
+    version_index AS v
+  ON
+    o.task_identifier = v.task_identifier
+    AND o.timestamp = v.timestamp
+  WHERE
+    o.task_identifier IN ({params})
+"""
+
+insert_task_execution = """
+  INSERT INTO task_executions (
+    task_identifier,
+    finished_at,
+    version_timestamp,
+    wall_time_s,
+    cpu_time_s,
+    peak_rss_kb,
+    output_bytes
+  )
+  VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+all_task_executions = """
+  SELECT
+    task_identifier,
+    finished_at,
+    version_timestamp,
+    wall_time_s,
+    cpu_time_s,
+    peak_rss_kb,
+    output_bytes
+  FROM
+    task_executions
+  ORDER BY task_identifier, finished_at
+"""
+
+# N.B. The `{params}` placeholder must be replaced with a comma-separated list
+# of `?` parameters (one per task identifier).
+task_executions_for_tasks = """
+  SELECT
+    task_identifier,
+    finished_at,
+    version_timestamp,
+    wall_time_s,
+    cpu_time_s,
+    peak_rss_kb,
+    output_bytes
+  FROM
+    task_executions
+  WHERE
+    task_identifier IN ({params})
+  ORDER BY task_identifier, finished_at
+"""
+
+insert_version_fingerprint = """
+  INSERT OR REPLACE INTO version_fingerprints (
+    task_identifier,
+    timestamp,
+    fingerprint
+  )
+  VALUES (?, ?, ?)
+"""
+
+get_version_fingerprint = """
+  SELECT fingerprint FROM version_fingerprints
+  WHERE task_identifier = ? AND timestamp = ?
+"""
+
+latest_version_with_fingerprint = """
+  SELECT
+    v.timestamp,
+    v.git_commit_hash,
+    v.has_uncommitted_changes
+  FROM
+    version_index AS v
+  INNER JOIN
+    version_fingerprints AS f
+  ON
+    v.task_identifier = f.task_identifier
+    AND v.timestamp = f.timestamp
+  WHERE
+    f.task_identifier = ?
+    AND f.fingerprint = ?
+  ORDER BY v.timestamp DESC
+  LIMIT 1
+"""
+
 
 # Queries used in format 1 (retained for testing purposes)
 
@@ -201,3 +438,33 @@ v1_to_v2_rename_new_table = "ALTER TABLE version_index_new RENAME TO version_ind
 # - Add the `version_overrides` table
 
 v2_to_v3_create_version_overrides_table = create_version_overrides_table
+
+
+# Queries used for migrating from format 3 to format 4
+# - Add the `task_executions` table (and its index)
+
+v3_to_v4_create_task_executions_table = create_task_executions_table
+
+v3_to_v4_create_task_executions_index = create_task_executions_index
+
+
+# Queries used for migrating from format 4 to format 5
+# - Add the `version_fingerprints` table (and its index)
+
+v4_to_v5_create_version_fingerprints_table = create_version_fingerprints_table
+
+v4_to_v5_create_version_fingerprints_index = create_version_fingerprints_index
+
+
+# Queries used for migrating from format 5 to format 6
+# - Add the `version_allocator` table (initialized with the newest version)
+
+v5_to_v6_create_version_allocator_table = create_version_allocator_table
+
+v5_to_v6_initialize_version_allocator = initialize_version_allocator
+
+
+# Queries used for migrating from format 6 to format 7
+# - Add the `execution_leases` table
+
+v6_to_v7_create_execution_leases_table = create_execution_leases_table
@@ -1,4 +1,5 @@
 import importlib.resources as pkg_resources
+import os
 from typing import Optional, List, Dict
 
 from fastapi import FastAPI, HTTPException
@@ -37,7 +38,7 @@ def get_all_versions() -> List[m.TaskResults]:
     """
     assert ctx is not None
     ctx.use_cloned_version_index()
-    ctx.task_index.load_all_known_tasks(ctx.git)
+    ctx.task_index.load_all_known_tasks(ctx.git, num_workers=os.cpu_count() or 1)
     all_results = ctx.version_index.get_all_versions()
     mapped: Dict[TaskIdentifier, List[m.ResultVersion]] = {}
     for task_id, version in all_results:
@@ -75,7 +76,7 @@ def get_task_graph() -> m.TaskGraph:
     """
     assert ctx is not None
     index = ctx.task_index
-    index.load_all_known_tasks(ctx.git)
+    index.load_all_known_tasks(ctx.git, num_workers=os.cpu_count() or 1)
     try:
         if workspace.root_task_ids is None:
             root_task_ids = index.validate_all_loaded_tasks()
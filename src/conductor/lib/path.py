@@ -73,7 +73,17 @@ def where(
     If `non_existent_ok` is set to True, this will return the task's output path
     even if the path does not yet exist.
     """
-    ctx = Context.from_cwd()
+    return _where(
+        Context.from_cwd(), identifier, relative_to_project_root, non_existent_ok
+    )
+
+
+def _where(
+    ctx: Context,
+    identifier: str,
+    relative_to_project_root: bool,
+    non_existent_ok: bool,
+) -> Optional[pathlib.Path]:
     task_identifier = TaskIdentifier.from_str(
         identifier,
         require_prefix=False,
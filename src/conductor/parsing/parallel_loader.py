@@ -0,0 +1,185 @@
+import concurrent.futures
+import multiprocessing
+import pathlib
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+from conductor.errors import ConductorError
+from conductor.errors.generated import ERRORS_BY_CODE
+from conductor.parsing.parse_cache import CondParseCache, hash_file
+from conductor.parsing.task_loader import TaskLoader
+
+# Parsing a handful of COND files is faster than starting worker processes.
+_MIN_FILES_FOR_WORKERS = 8
+
+# Results for a single COND file: (path, raw tasks, error). Exactly one of the
+# raw tasks and the error is set.
+ParseResult = Tuple[pathlib.Path, Optional[Dict[str, Dict]], Optional[ConductorError]]
+
+
+class ParallelCondFileParser:
+    """
+    Parses COND files using a pool of worker processes, each running its own
+    `TaskLoader`. The workers send back the raw tasks (and any errors) in a
+    serialized form.
+
+    This class is meant to be used as a context manager so that the worker
+    processes are shut down after use.
+    """
+
+    def __init__(
+        self,
+        project_root: pathlib.Path,
+        num_workers: int,
+        loader: TaskLoader,
+        parse_cache: Optional[CondParseCache] = None,
+    ):
+        self._project_root = project_root
+        self._num_workers = num_workers
+        # Used to parse files in this process (e.g., when there are only a few
+        # files to parse).
+        self._loader = loader
+        self._parse_cache = parse_cache
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelCondFileParser":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def parse(self, abs_cond_file_paths: List[pathlib.Path]) -> List[ParseResult]:
+        """
+        Parses the specified COND files and returns their results, in the
+        same order as `abs_cond_file_paths`.
+        """
+        results: Dict[pathlib.Path, ParseResult] = {}
+        to_parse = []
+        for path in abs_cond_file_paths:
+            cached = (
+                self._parse_cache.lookup(path)
+                if self._parse_cache is not None
+                else None
+            )
+            if cached is not None:
+                results[path] = (path, cached, None)
+            else:
+                to_parse.append(path)
+
+        if self._num_workers <= 1 or len(to_parse) < _MIN_FILES_FOR_WORKERS:
+            for path in to_parse:
+                results[path] = self._parse_locally(path)
+        else:
+            pool = self._get_pool()
+            chunksize = max(1, len(to_parse) // (self._num_workers * 4))
+            for path, worker_result in zip(
+                to_parse, pool.map(_parse_in_worker, to_parse, chunksize=chunksize)
+            ):
+                results[path] = self._process_worker_result(path, worker_result)
+
+        return [results[path] for path in abs_cond_file_paths]
+
+    # N.B. The return type is a string so that the (slow) import of the process
+    # pool implementation is deferred until a pool is actually created.
+    def _get_pool(self) -> "concurrent.futures.ProcessPoolExecutor":
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._num_workers,
+                mp_context=_worker_context(),
+                initializer=_initialize_worker,
+                initargs=(self._project_root,),
+            )
+        return self._pool
+
+    def _parse_locally(self, path: pathlib.Path) -> ParseResult:
+        try:
+            if self._parse_cache is not None:
+                raw_tasks = self._parse_cache.parse_cond_file(self._loader, path)
+            else:
+                raw_tasks = self._loader.parse_cond_file(path)
+            return (path, raw_tasks, None)
+        except ConductorError as ex:
+            return (path, None, ex)
+
+    def _process_worker_result(
+        self, path: pathlib.Path, worker_result: "_WorkerResult"
+    ) -> ParseResult:
+        file_hash, serialized_tasks, included_files, serialized_error = worker_result
+        if serialized_error is not None:
+            return (path, None, _deserialize_error(serialized_error))
+        if serialized_tasks is None:
+            # The tasks could not be serialized, so we need to parse the file
+            # in this process.
+            return self._parse_locally(path)
+        raw_tasks: Dict[str, Dict] = pickle.loads(serialized_tasks)
+        if self._parse_cache is not None and file_hash is not None:
+            self._parse_cache.store(path, file_hash, included_files, raw_tasks)
+        return (path, raw_tasks, None)
+
+
+# (file hash, pickled raw tasks, included files, serialized error)
+_WorkerResult = Tuple[
+    Optional[str], Optional[bytes], List[pathlib.Path], Optional[Tuple[Any, ...]]
+]
+
+
+def _worker_context() -> Any:
+    """
+    Returns the multiprocessing context used to start the worker processes.
+
+    We avoid forking because the parser may be used by multithreaded processes
+    (e.g., the explorer's web server). A forked child only has a copy of the
+    forking thread, so it can deadlock on locks that other threads held.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# Each worker process has its own `TaskLoader`.
+_worker_loader: Optional[TaskLoader] = None
+
+
+def _initialize_worker(project_root: pathlib.Path) -> None:
+    global _worker_loader  # pylint: disable=global-statement
+    _worker_loader = TaskLoader(project_root)
+
+
+def _parse_in_worker(cond_file_path: pathlib.Path) -> _WorkerResult:
+    assert _worker_loader is not None
+    file_hash = hash_file(cond_file_path)
+    try:
+        raw_tasks = _worker_loader.parse_cond_file(cond_file_path)
+    except ConductorError as ex:
+        return (None, None, [], _serialize_error(ex))
+    try:
+        serialized_tasks: Optional[bytes] = pickle.dumps(raw_tasks)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        serialized_tasks = None
+    return (
+        file_hash,
+        serialized_tasks,
+        list(_worker_loader.last_included_files),
+        None,
+    )
+
+
+def _serialize_error(ex: ConductorError) -> Tuple[Any, ...]:
+    file_context = (
+        (str(ex.file_context.file_path), ex.file_context.line_number)
+        if ex.file_context is not None
+        else None
+    )
+    return (ex.error_code, ex.kwargs, file_context, ex.extra_context)
+
+
+def _deserialize_error(serialized: Tuple[Any, ...]) -> ConductorError:
+    error_code, kwargs, file_context, extra_context = serialized
+    error: ConductorError = ERRORS_BY_CODE[error_code](**kwargs)
+    if file_context is not None:
+        error.add_file_context(file_context[0], file_context[1])
+    if extra_context is not None:
+        error.add_extra_context(extra_context)
+    return error
@@ -0,0 +1,160 @@
+import hashlib
+import pathlib
+import pickle
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import conductor
+from conductor.parsing.task_loader import TaskLoader
+
+_CREATE_TABLE = """
+  CREATE TABLE IF NOT EXISTS parsed_cond_files (
+    cond_file TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    includes BLOB NOT NULL,
+    raw_tasks BLOB NOT NULL,
+    PRIMARY KEY (cond_file)
+  )
+"""
+
+_CREATE_METADATA_TABLE = """
+  CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key)
+  )
+"""
+
+_GET_CONDUCTOR_VERSION = "SELECT value FROM metadata WHERE key = 'conductor_version'"
+
+_SET_CONDUCTOR_VERSION = """
+  INSERT OR REPLACE INTO metadata (key, value) VALUES ('conductor_version', ?)
+"""
+
+_CLEAR_ENTRIES = "DELETE FROM parsed_cond_files"
+
+_GET_ENTRY = """
+  SELECT file_hash, includes, raw_tasks FROM parsed_cond_files WHERE cond_file = ?
+"""
+
+_UPSERT_ENTRY = """
+  INSERT OR REPLACE INTO parsed_cond_files (cond_file, file_hash, includes, raw_tasks)
+  VALUES (?, ?, ?, ?)
+"""
+
+
+class CondParseCache:
+    """
+    A persistent cache of the raw tasks produced by parsing COND files.
+
+    Entries are keyed by the COND file's path and are only used if the
+    content hash of the COND file and the content hashes of all the files it
+    includes are unchanged. Note that the cache assumes that COND files are
+    deterministic (e.g., that they do not depend on files other than their
+    includes).
+    """
+
+    def __init__(self, project_root: pathlib.Path, db_path: pathlib.Path):
+        self._project_root = project_root
+        self._db_path = db_path
+        # SQLite connections cannot be shared across threads (the explorer
+        # loads tasks from multiple threads).
+        self._local = threading.local()
+
+    def parse_cond_file(
+        self, loader: TaskLoader, cond_file_path: pathlib.Path
+    ) -> Dict[str, Dict]:
+        """
+        Returns the raw tasks defined in the (absolute) `cond_file_path`,
+        using `loader` to parse the file if the cached entry is missing or
+        stale.
+        """
+        cached = self.lookup(cond_file_path)
+        if cached is not None:
+            return cached
+
+        file_hash = hash_file(cond_file_path)
+        raw_tasks = loader.parse_cond_file(cond_file_path)
+        if file_hash is not None:
+            self.store(cond_file_path, file_hash, loader.last_included_files, raw_tasks)
+        return raw_tasks
+
+    def lookup(self, cond_file_path: pathlib.Path) -> Optional[Dict[str, Dict]]:
+        """
+        Returns the cached raw tasks for the (absolute) `cond_file_path`, or
+        `None` if there is no valid cached entry.
+        """
+        file_hash = hash_file(cond_file_path)
+        if file_hash is None:
+            return None
+        rel_path = str(cond_file_path.relative_to(self._project_root))
+        row = self._conn().execute(_GET_ENTRY, (rel_path,)).fetchone()
+        if row is None or row[0] != file_hash:
+            return None
+        includes: List[Tuple[str, str]] = pickle.loads(row[1])
+        for rel_include_path, include_hash in includes:
+            if hash_file(self._project_root / rel_include_path) != include_hash:
+                return None
+        raw_tasks: Dict[str, Dict] = pickle.loads(row[2])
+        for raw_task in raw_tasks.values():
+            raw_task["cond_file_path"] = cond_file_path
+        return raw_tasks
+
+    def store(
+        self,
+        cond_file_path: pathlib.Path,
+        file_hash: str,
+        included_files: List[pathlib.Path],
+        raw_tasks: Dict[str, Dict],
+    ) -> None:
+        """
+        Caches the raw tasks parsed from the (absolute) `cond_file_path`.
+        `file_hash` must be the hash of the file's contents before it was
+        parsed.
+        """
+        includes = []
+        for include_path in included_files:
+            include_hash = hash_file(include_path)
+            if include_hash is None:
+                return
+            includes.append(
+                (str(include_path.relative_to(self._project_root)), include_hash)
+            )
+        try:
+            serialized_tasks = pickle.dumps(raw_tasks)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            # The tasks contain values that cannot be serialized, so we do not
+            # cache them.
+            return
+        rel_path = str(cond_file_path.relative_to(self._project_root))
+        conn = self._conn()
+        conn.execute(
+            _UPSERT_ENTRY,
+            (rel_path, file_hash, pickle.dumps(includes), serialized_tasks),
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path)
+            conn.execute(_CREATE_TABLE)
+            conn.execute(_CREATE_METADATA_TABLE)
+            row = conn.execute(_GET_CONDUCTOR_VERSION).fetchone()
+            if row is None or row[0] != conductor.__version__:
+                # Cached entries may not be compatible with this version of
+                # Conductor.
+                conn.execute(_CLEAR_ENTRIES)
+                conn.execute(_SET_CONDUCTOR_VERSION, (conductor.__version__,))
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+
+def hash_file(path: pathlib.Path) -> Optional[str]:
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
@@ -11,6 +11,8 @@ from conductor.errors import (
     EnvNotEnv,
     DuplicateEnvName,
 )
+from conductor.parsing.parallel_loader import ParallelCondFileParser
+from conductor.parsing.parse_cache import CondParseCache
 from conductor.parsing.task_loader import TaskLoader
 from conductor.task_identifier import TaskIdentifier
 from conductor.task_types.base import TaskType
@@ -21,9 +23,14 @@ from conductor.task_types.run import RunCommand, RunExperiment
 
 
 class TaskIndex:
-    def __init__(self, project_root: pathlib.Path):
+    def __init__(
+        self,
+        project_root: pathlib.Path,
+        parse_cache: Optional[CondParseCache] = None,
+    ):
         self._project_root = project_root
         self._task_loader = TaskLoader(project_root)
+        self._parse_cache = parse_cache
         # Keyed by the relative path to the COND file
         self._loaded_raw_tasks: Dict[pathlib.Path, Dict[str, Dict]] = {}
         # Keyed by task identifier
@@ -69,10 +76,13 @@ class TaskIndex:
             return self._loaded_envs[env_name]
         raise EnvNotFound(env_name=env_name)
 
-    def load_transitive_closure(self, task_identifier: TaskIdentifier):
+    def load_transitive_closure(
+        self, task_identifier: TaskIdentifier, num_workers: int = 1
+    ):
         """
         Ensures all tasks in the transitive closure of the specified
-        `task_identifier` are loaded.
+        `task_identifier` are loaded. If `num_workers` is greater than 1, the
+        COND files are parsed using a pool of worker processes.
 
         This method will raise the appropriate errors if there are problems
         loading the needed tasks. This method will also check to ensure there
@@ -83,6 +93,9 @@ class TaskIndex:
         curr_path: Set[TaskIdentifier] = set()
 
         with prevent_module_caching():
+            if num_workers > 1:
+                self._prefetch_transitive_closure(task_identifier, num_workers)
+
             while len(identifiers_to_load) > 0:
                 identifier, expect_env, visit_count = identifiers_to_load.pop()
 
@@ -147,7 +160,7 @@ class TaskIndex:
         """
         rel_path = identifier.path_to_cond_file()
         if rel_path not in self._loaded_raw_tasks:
-            self._loaded_raw_tasks[rel_path] = self._task_loader.parse_cond_file(
+            self._loaded_raw_tasks[rel_path] = self._parse_cond_file(
                 identifier.path_to_cond_file(self._project_root),
             )
 
@@ -174,8 +187,8 @@ class TaskIndex:
         """
         if rel_cond_file_path not in self._loaded_raw_tasks:
             abs_cond_file_path = self._project_root / rel_cond_file_path
-            self._loaded_raw_tasks[rel_cond_file_path] = (
-                self._task_loader.parse_cond_file(abs_cond_file_path)
+            self._loaded_raw_tasks[rel_cond_file_path] = self._parse_cond_file(
+                abs_cond_file_path
             )
 
         tasks_loaded = 0
@@ -191,12 +204,14 @@ class TaskIndex:
         return tasks_loaded
 
     def load_all_known_tasks(
-        self, git: Git
+        self, git: Git, num_workers: int = 1
     ) -> List[Tuple[pathlib.Path, int, Optional[ConductorError]]]:
         """
         For Git-tracked projects, this method loads all tasks in all checked-in
         COND files. Note that this method does not validate the task
-        dependencies nor does it check for dependency cycles.
+        dependencies nor does it check for dependency cycles. If `num_workers`
+        is greater than 1, the COND files are parsed using a pool of worker
+        processes.
 
         Returns the number of tasks loaded for each COND file and any errors.
         """
@@ -209,7 +224,17 @@ class TaskIndex:
         ]
         load_results: List[Tuple[pathlib.Path, int, Optional[ConductorError]]] = []
         with prevent_module_caching():
+            parse_errors: Dict[pathlib.Path, ConductorError] = {}
+            if num_workers > 1:
+                with self._create_parallel_parser(num_workers) as parser:
+                    parse_errors = self._prefetch_cond_files(rel_cond_files, parser)
+
             for rel_cond_file in rel_cond_files:
+                if rel_cond_file in parse_errors:
+                    ex = parse_errors[rel_cond_file]
+                    ex.add_file_context(rel_cond_file)
+                    load_results.append((rel_cond_file, 0, ex))
+                    continue
                 try:
                     tasks_loaded = self.load_all_tasks_in_cond_file(rel_cond_file)
                     load_results.append((rel_cond_file, tasks_loaded, None))
@@ -303,6 +328,88 @@ class TaskIndex:
             if dependee_count == 0
         ]
 
+    def _create_parallel_parser(self, num_workers: int) -> ParallelCondFileParser:
+        return ParallelCondFileParser(
+            self._project_root, num_workers, self._task_loader, self._parse_cache
+        )
+
+    def _prefetch_cond_files(
+        self, rel_cond_files: List[pathlib.Path], parser: ParallelCondFileParser
+    ) -> Dict[pathlib.Path, ConductorError]:
+        """
+        Parses the specified COND files (that have not already been parsed)
+        using `parser` and returns any parsing errors.
+        """
+        to_parse = []
+        seen: Set[pathlib.Path] = set()
+        for rel_cond_file in rel_cond_files:
+            if rel_cond_file in self._loaded_raw_tasks or rel_cond_file in seen:
+                continue
+            to_parse.append(rel_cond_file)
+            seen.add(rel_cond_file)
+
+        errors: Dict[pathlib.Path, ConductorError] = {}
+        results = parser.parse([self._project_root / path for path in to_parse])
+        for rel_cond_file, (_, raw_tasks, error) in zip(to_parse, results):
+            if raw_tasks is not None:
+                self._loaded_raw_tasks[rel_cond_file] = raw_tasks
+            elif error is not None:
+                errors[rel_cond_file] = error
+        return errors
+
+    def _prefetch_transitive_closure(
+        self, task_identifier: TaskIdentifier, num_workers: int
+    ) -> None:
+        """
+        Parses the COND files in the transitive closure of `task_identifier`
+        in parallel, one "level" of dependencies at a time. Files that fail to
+        parse are skipped; the errors are reported when the tasks are loaded.
+        """
+        frontier = [task_identifier]
+        visited: Set[TaskIdentifier] = set()
+        with self._create_parallel_parser(num_workers) as parser:
+            while len(frontier) > 0:
+                self._prefetch_cond_files(
+                    [identifier.path_to_cond_file() for identifier in frontier],
+                    parser,
+                )
+                next_frontier = []
+                for identifier in frontier:
+                    if identifier in visited:
+                        continue
+                    visited.add(identifier)
+                    raw_tasks = self._loaded_raw_tasks.get(
+                        identifier.path_to_cond_file(), {}
+                    )
+                    if identifier.name not in raw_tasks:
+                        continue
+                    raw_task = raw_tasks[identifier.name]
+                    candidates = list(raw_task.get("deps", []))
+                    if raw_task.get("env", None) is not None:
+                        candidates.append(raw_task["env"])
+                    for candidate in candidates:
+                        try:
+                            if TaskIdentifier.is_relative_candidate(candidate):
+                                next_frontier.append(
+                                    TaskIdentifier.from_relative_str(
+                                        candidate, identifier.path
+                                    )
+                                )
+                            else:
+                                next_frontier.append(TaskIdentifier.from_str(candidate))
+                        except ConductorError:
+                            # Invalid identifiers are reported when the tasks
+                            # are loaded.
+                            continue
+                frontier = next_frontier
+
+    def _parse_cond_file(self, abs_cond_file_path: pathlib.Path) -> Dict[str, Dict]:
+        if self._parse_cache is not None:
+            return self._parse_cache.parse_cond_file(
+                self._task_loader, abs_cond_file_path
+            )
+        return self._task_loader.parse_cond_file(abs_cond_file_path)
+
     def _materialize_raw_task(
         self, identifier: TaskIdentifier, raw_task: Dict
     ) -> TaskType:
@@ -1,5 +1,5 @@
 import pathlib
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from conductor.config import COND_INCLUDE_EXTENSION
 from conductor.task_types import raw_task_types
 from conductor.errors import (
@@ -32,12 +32,21 @@ class TaskLoader:
         # Value is the resulting scope object.
         self._include_cache: Dict[str, Any] = {}
 
+        # The absolute paths of the files included by the most recently parsed
+        # COND file.
+        self._last_included_files: List[pathlib.Path] = []
+
+    @property
+    def last_included_files(self) -> List[pathlib.Path]:
+        return self._last_included_files
+
     def parse_cond_file(self, cond_file_path: pathlib.Path):
         """
         Parses all the tasks in a single COND file.
         """
         tasks: Dict[str, Dict] = {}
         self._tasks = tasks
+        self._last_included_files = []
         self._current_cond_file_path = cond_file_path
         try:
             with open(cond_file_path, encoding="UTF-8") as file:
@@ -134,6 +143,8 @@ class TaskLoader:
         except ValueError as ex:
             raise IncludeFileNotInProject(included_file=candidate_path) from ex
 
+        self._last_included_files.append(include_path)
+
         # 4. Check if the file is in our cache. If so, just use the cached results.
         if str(include_path) in self._include_cache:
             self._curr_exec_scope.update(self._include_cache[str(include_path)])
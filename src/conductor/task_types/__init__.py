@@ -17,6 +17,9 @@ _raw_task_types = [
             "options": dict,
             "deps": [str],
             "env": Optional[str],
+            "resources": dict,
+            "mutex": Optional[str],
+            "inputs": Optional[list],
         },
         defaults={
             "parallelizable": False,
@@ -24,6 +27,9 @@ _raw_task_types = [
             "options": {},
             "deps": [],
             "env": None,
+            "resources": {},
+            "mutex": None,
+            "inputs": None,
         },
         full_type=RunCommand,
     ),
@@ -37,6 +43,9 @@ _raw_task_types = [
             "options": dict,
             "deps": [str],
             "env": Optional[str],
+            "resources": dict,
+            "mutex": Optional[str],
+            "inputs": Optional[list],
         },
         defaults={
             "parallelizable": False,
@@ -44,6 +53,9 @@ _raw_task_types = [
             "options": {},
             "deps": [],
             "env": None,
+            "resources": {},
+            "mutex": None,
+            "inputs": None,
         },
         full_type=RunExperiment,
     ),
@@ -67,11 +79,13 @@ _raw_task_types = [
             "stop": Optional[str],
             "connect_config": str,
             "extra_files": [str],
+            "max_concurrent_tasks": Optional[int],
         },
         defaults={
             "start": None,
             "stop": None,
             "extra_files": [],
+            "max_concurrent_tasks": None,
         },
         full_type=Environment,
     ),
@@ -1,3 +1,4 @@
+import hashlib
 import pathlib
 from typing import Callable, Dict, Sequence, Optional, TYPE_CHECKING
 
@@ -92,6 +93,48 @@ class TaskType:
         """
         return True
 
+    def output_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        """
+        Returns a fingerprint that identifies this task's current outputs, or
+        `None` if the outputs cannot be identified (e.g., because the task
+        always runs). Tasks whose inputs include this task's outputs use the
+        fingerprint to detect when the outputs change.
+        """
+        return None
+
+    def _deps_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        """
+        Combines the output fingerprints of this task's dependencies. Returns
+        `None` if any dependency's outputs cannot be identified. The result is
+        memoized in `ctx.fingerprint_memo`.
+        """
+        memo_key = ("deps", self._identifier, at_least_commit)
+        if memo_key in ctx.fingerprint_memo:
+            return ctx.fingerprint_memo[memo_key]
+        fingerprint = self._compute_deps_fingerprint(ctx, at_least_commit)
+        ctx.fingerprint_memo[memo_key] = fingerprint
+        return fingerprint
+
+    def _compute_deps_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        hasher = hashlib.sha256()
+        for dep_identifier in self.deps:
+            dep_fingerprint = ctx.task_index.get_task(
+                dep_identifier
+            ).output_fingerprint(ctx, at_least_commit)
+            if dep_fingerprint is None:
+                return None
+            hasher.update(str(dep_identifier).encode())
+            hasher.update(b"\0")
+            hasher.update(dep_fingerprint.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
     def get_output_version(self, ctx: "c.Context") -> Optional[Version]:
         """
         If this task is versioned, this method returns the most relevant version
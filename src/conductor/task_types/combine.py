@@ -1,10 +1,13 @@
 import pathlib
-from typing import Sequence
+from typing import Sequence, Optional, TYPE_CHECKING
 
 from conductor.errors import CombineDuplicateDepName
 from conductor.task_identifier import TaskIdentifier
 from .base import TaskType
 
+if TYPE_CHECKING:
+    import conductor.context as c
+
 
 class Combine(TaskType):
     """
@@ -35,3 +38,8 @@ class Combine(TaskType):
 
     def __repr__(self) -> str:
         return super().__repr__() + ")"
+
+    def output_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        return self._deps_fingerprint(ctx, at_least_commit)
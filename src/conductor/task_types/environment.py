@@ -3,7 +3,11 @@ from typing import Optional, TYPE_CHECKING, Sequence, List
 
 from conductor.task_identifier import TaskIdentifier
 from .base import TaskType
-from conductor.errors import InternalError, EnvExtraFilesNotRelative
+from conductor.errors import (
+    InternalError,
+    EnvExtraFilesNotRelative,
+    EnvMaxConcurrentTasksInvalid,
+)
 
 if TYPE_CHECKING:
     import conductor.context as c
@@ -20,6 +24,7 @@ class Environment(TaskType):
         extra_files: Sequence[str],
         # Note that `deps` is supposed to be an empty sequence.
         deps: Sequence[TaskIdentifier],
+        max_concurrent_tasks: Optional[int] = None,
     ):
         if len(deps) > 0:
             # This is an internal error because we perform validation earlier.
@@ -40,6 +45,12 @@ class Environment(TaskType):
                 raise EnvExtraFilesNotRelative(env_name=identifier.name)
             self._extra_files.append(file_path)
 
+        if max_concurrent_tasks is not None and (
+            isinstance(max_concurrent_tasks, bool) or max_concurrent_tasks < 1
+        ):
+            raise EnvMaxConcurrentTasksInvalid(env_name=identifier.name)
+        self._max_concurrent_tasks = max_concurrent_tasks
+
     @property
     def start(self) -> Optional[str]:
         return self._start
@@ -56,6 +67,14 @@ class Environment(TaskType):
     def extra_files(self) -> List[pathlib.Path]:
         return self._extra_files
 
+    @property
+    def max_concurrent_tasks(self) -> Optional[int]:
+        """
+        The maximum number of tasks that may run at the same time in this
+        environment. If `None`, the environment's number of CPUs is used.
+        """
+        return self._max_concurrent_tasks
+
     def __repr__(self) -> str:
         # To reduce verbosity, we do not print out the other properties.
         return super().__repr__() + ")"
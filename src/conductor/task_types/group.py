@@ -22,6 +22,11 @@ class Group(TaskType):
     def __repr__(self) -> str:
         return super().__repr__() + ")"
 
+    def output_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        return self._deps_fingerprint(ctx, at_least_commit)
+
     def get_output_path(self, ctx: "c.Context") -> Optional[pathlib.Path]:
         # This task does not have any outputs.
         return None
@@ -1,12 +1,15 @@
+import hashlib
 import pathlib
-from typing import Sequence, Optional, TYPE_CHECKING
+from typing import Dict, Sequence, Optional, Union, TYPE_CHECKING
 
 import conductor.filename as f
-from conductor.errors import InternalError
+from conductor.errors import InternalError, InvalidTaskParameterType
 from conductor.execution.version_index import Version
 from conductor.task_identifier import TaskIdentifier
+from conductor.utils.git import Git, CommitGraph
 from conductor.utils.run_arguments import RunArguments
 from conductor.utils.run_options import RunOptions
+from conductor.utils.run_resources import RunResources
 from .base import TaskType
 
 if TYPE_CHECKING:
@@ -18,6 +21,9 @@ class _RunSubprocess(TaskType):
     An abstract base class representing tasks that launch a subprocess.
     """
 
+    # The name of the task type (used in error messages).
+    _TaskTypeName = ""
+
     def __init__(
         self,
         identifier: TaskIdentifier,
@@ -28,6 +34,9 @@ class _RunSubprocess(TaskType):
         options: dict,
         parallelizable: bool,
         env: Optional[str],
+        resources: Optional[dict] = None,
+        mutex: Optional[str] = None,
+        inputs: Optional[list] = None,
     ):
         super().__init__(
             identifier=identifier, cond_file_path=cond_file_path, deps=deps
@@ -40,6 +49,17 @@ class _RunSubprocess(TaskType):
         )
         self._parallelizable = parallelizable
         self._env = self._parse_env(env)
+        self._resources = RunResources.from_raw(
+            identifier, resources if resources is not None else {}
+        )
+        self._mutex = mutex
+        if inputs is not None and not all(isinstance(path, str) for path in inputs):
+            raise InvalidTaskParameterType(
+                parameter_name="inputs[...]",
+                type_name=str.__name__,
+                task_type_name=self._TaskTypeName,
+            )
+        self._inputs = tuple(inputs) if inputs is not None else None
 
     def __repr__(self) -> str:
         return "".join(
@@ -49,6 +69,8 @@ class _RunSubprocess(TaskType):
                 self._run,
                 ", parallelizable=",
                 str(self._parallelizable),
+                ", mutex=",
+                str(self._mutex),
                 ")",
             ]
         )
@@ -63,7 +85,17 @@ class _RunSubprocess(TaskType):
 
     @property
     def parallelizable(self) -> bool:
-        return self._parallelizable
+        # Tasks in a mutex group only need to be exclusive with respect to the
+        # other tasks in the same group.
+        return self._parallelizable or self._mutex is not None
+
+    @property
+    def mutex(self) -> Optional[str]:
+        """
+        The name of the mutex group that this task belongs to, if any. At most
+        one task in a mutex group executes at a time.
+        """
+        return self._mutex
 
     @property
     def raw_run(self) -> str:
@@ -81,10 +113,73 @@ class _RunSubprocess(TaskType):
     def env(self) -> Optional[TaskIdentifier]:
         return self._env
 
+    @property
+    def resources(self) -> RunResources:
+        """
+        The resources this task requests while it executes. Conductor only
+        launches the task when enough of each resource is available.
+        """
+        return self._resources
+
     @property
     def runs_in_env(self) -> bool:
         return self._env is not None
 
+    @property
+    def inputs(self) -> Optional[Sequence[str]]:
+        """
+        The glob patterns (relative to the task's directory) of the files that
+        this task reads, if they were declared.
+        """
+        return self._inputs
+
+    @property
+    def caches_by_fingerprint(self) -> bool:
+        """
+        If True, this task's results are cached by its fingerprint (see
+        `compute_fingerprint()`). Tasks that run in an environment are not,
+        because their fingerprints are not recorded.
+        """
+        return self._inputs is not None and not self.runs_in_env
+
+    def compute_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        """
+        Computes this task's fingerprint from its command (including its
+        arguments and options), the contents of its input files, and its
+        dependencies' output fingerprints. Returns `None` if the task is not
+        cached by its fingerprint or if a dependency's outputs cannot be
+        identified. The result is memoized in `ctx.fingerprint_memo`.
+        """
+        if self._inputs is None or not self.caches_by_fingerprint:
+            return None
+        memo_key = ("task", self.identifier, at_least_commit)
+        if memo_key in ctx.fingerprint_memo:
+            return ctx.fingerprint_memo[memo_key]
+        fingerprint = self._compute_fingerprint(ctx, self._inputs, at_least_commit)
+        ctx.fingerprint_memo[memo_key] = fingerprint
+        return fingerprint
+
+    def _compute_fingerprint(
+        self, ctx: "c.Context", inputs: Sequence[str], at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        deps_fingerprint = self._deps_fingerprint(ctx, at_least_commit)
+        if deps_fingerprint is None:
+            return None
+        inputs_hash = ctx.fingerprint_index.hash_inputs(
+            ctx.project_root,
+            self.get_working_path(ctx),
+            inputs,
+            ignored_path=ctx.output_path,
+            git=ctx.git if ctx.uses_git else None,
+        )
+        hasher = hashlib.sha256()
+        for part in (self._run, inputs_hash, deps_fingerprint):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
     def _create_new_version(self, ctx: "c.Context") -> None:
         # N.B. Only `RunExperiment` is versioned.
         pass
@@ -106,6 +201,8 @@ class RunCommand(_RunSubprocess):
     recorded. The task's outputs are not archivable either.
     """
 
+    _TaskTypeName = "run_command"
+
     def __init__(
         self,
         identifier: TaskIdentifier,
@@ -116,6 +213,9 @@ class RunCommand(_RunSubprocess):
         options: dict,
         parallelizable: bool,
         env: Optional[str],
+        resources: Optional[dict] = None,
+        mutex: Optional[str] = None,
+        inputs: Optional[list] = None,
     ):
         super().__init__(
             identifier=identifier,
@@ -126,12 +226,37 @@ class RunCommand(_RunSubprocess):
             options=options,
             parallelizable=parallelizable,
             env=env,
+            resources=resources,
+            mutex=mutex,
+            inputs=inputs,
         )
 
     @property
     def record_output(self) -> bool:
         return False
 
+    def should_run(self, ctx: "c.Context", at_least_commit: Optional[str]) -> bool:
+        """
+        Tasks that declare their `inputs` do not need to run again if their
+        fingerprint matches the fingerprint recorded when they last succeeded.
+        """
+        if not self.caches_by_fingerprint:
+            return True
+        output_path = self.get_output_path(ctx)
+        if output_path is None or not output_path.is_dir():
+            return True
+        fingerprint = self.compute_fingerprint(ctx, at_least_commit)
+        if fingerprint is None:
+            return True
+        return fingerprint != ctx.fingerprint_index.get_fingerprint(
+            str(self.identifier)
+        )
+
+    def output_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        return self.compute_fingerprint(ctx, at_least_commit)
+
 
 class RunExperiment(_RunSubprocess):
     """
@@ -142,6 +267,8 @@ class RunExperiment(_RunSubprocess):
     are archivable.
     """
 
+    _TaskTypeName = "run_experiment"
+
     def __init__(
         self,
         identifier: TaskIdentifier,
@@ -152,6 +279,9 @@ class RunExperiment(_RunSubprocess):
         options: dict,
         parallelizable: bool,
         env: Optional[str],
+        resources: Optional[dict] = None,
+        mutex: Optional[str] = None,
+        inputs: Optional[list] = None,
     ):
         super().__init__(
             identifier=identifier,
@@ -162,6 +292,9 @@ class RunExperiment(_RunSubprocess):
             options=options,
             parallelizable=parallelizable,
             env=env,
+            resources=resources,
+            mutex=mutex,
+            inputs=inputs,
         )
         self._did_retrieve_version = False
         self._most_relevant_version: Optional[Version] = None
@@ -207,13 +340,50 @@ class RunExperiment(_RunSubprocess):
     def should_run(self, ctx: "c.Context", at_least_commit: Optional[str]) -> bool:
         """
         We use the presence of a "most relevant" existing version to decide
-        whether or not this task needs to execute.
+        whether or not this task needs to execute. If the task is cached by its
+        fingerprint, the most relevant version is the newest version with the
+        task's current fingerprint.
         """
-        self._ensure_most_relevant_existing_version_computed(ctx)
+        self._ensure_most_relevant_existing_version_computed(ctx, at_least_commit)
         most_relevant_version = self._most_relevant_version
         if most_relevant_version is None:
             # Must run because no relevant version exists.
             return True
+        if not self._is_outdated(ctx, most_relevant_version, at_least_commit):
+            return False
+        if most_relevant_version.commit_hash is not None:
+            # Force a re-run and ensure the most relevant version is recomputed.
+            self._did_retrieve_version = False
+        return True
+
+    def output_fingerprint(
+        self, ctx: "c.Context", at_least_commit: Optional[str]
+    ) -> Optional[str]:
+        # Each version's outputs are written once, so a version identifies them.
+        # A task's most relevant version is replaced by a new version when the
+        # task runs.
+        self._ensure_most_relevant_existing_version_computed(ctx, at_least_commit)
+        most_relevant_version = self._most_relevant_version
+        if most_relevant_version is None or self._is_outdated(
+            ctx, most_relevant_version, at_least_commit
+        ):
+            return None
+        return "version:{}".format(most_relevant_version.timestamp)
+
+    def _is_outdated(
+        self,
+        ctx: "c.Context",
+        most_relevant_version: Version,
+        at_least_commit: Optional[str],
+    ) -> bool:
+        """
+        Returns whether this task must run again to produce a version that is
+        at least as new as `at_least_commit`.
+        """
+        if self.caches_by_fingerprint:
+            # The version has the task's current fingerprint, so it is up to
+            # date regardless of the commit it was produced at.
+            return False
         if at_least_commit is None or most_relevant_version.is_override:
             # There already is a most relevant version and we are not asked to
             # run for at least some commit. (Or this is an override, in which
@@ -233,29 +403,27 @@ class RunExperiment(_RunSubprocess):
         # is an ancestor of the given commit (and does not match the commit),
         # then it must be "older" (this is based on how we define the most
         # relevant version).
-        most_relevant_is_older = ctx.git.is_ancestor(
+        return self._commit_ancestry(ctx).is_ancestor(
             at_least_commit, most_relevant_version.commit_hash
         )
-        if not most_relevant_is_older:
-            # No need to re-run.
-            return False
-        else:
-            # Force a re-run and ensure the most relevant version is recomputed.
-            self._did_retrieve_version = False
-            return True
 
     def create_new_version(self, ctx: "c.Context") -> Version:
         self._create_new_version(ctx)
         assert self._most_relevant_version is not None
         return self._most_relevant_version
 
-    def recompute_most_relevant_version(self, ctx: "c.Context") -> None:
+    def recompute_most_relevant_version(
+        self, ctx: "c.Context", at_least_commit: Optional[str] = None
+    ) -> None:
         """
         For internal use only. Used by the explorer when the user changes the
-        version override for this task.
+        version override for this task, and by the planner when another
+        process may have produced a new version.
         """
         self._did_retrieve_version = False
-        self._ensure_most_relevant_existing_version_computed(ctx)
+        # The fingerprints of the tasks that depend on this task may change.
+        ctx.fingerprint_memo.clear()
+        self._ensure_most_relevant_existing_version_computed(ctx, at_least_commit)
 
     def _create_new_version(self, ctx: "c.Context") -> None:
         # N.B. If this task fails, the value of `most_relevant_version` will be
@@ -266,16 +434,20 @@ class RunExperiment(_RunSubprocess):
         self._most_relevant_version = ctx.version_index.generate_new_output_version(
             commit=ctx.current_commit
         )
+        # The fingerprints of the tasks that depend on this task change.
+        ctx.fingerprint_memo.clear()
 
-    def _ensure_most_relevant_existing_version_computed(self, ctx: "c.Context"):
+    def _ensure_most_relevant_existing_version_computed(
+        self, ctx: "c.Context", at_least_commit: Optional[str] = None
+    ):
         if self._did_retrieve_version:
             return
-        version = self._retrieve_most_relevant_existing_version(ctx)
+        version = self._retrieve_most_relevant_existing_version(ctx, at_least_commit)
         self._most_relevant_version = version
         self._did_retrieve_version = True
 
     def _retrieve_most_relevant_existing_version(
-        self, ctx: "c.Context"
+        self, ctx: "c.Context", at_least_commit: Optional[str] = None
     ) -> Optional[Version]:
         """
         Finds the "most relevant" existing version of this task's outputs, if
@@ -290,6 +462,16 @@ class RunExperiment(_RunSubprocess):
         if override is not None:
             return override
 
+        # If the task is cached by its fingerprint, we only use a version that
+        # was produced with the task's current fingerprint.
+        if self.caches_by_fingerprint:
+            fingerprint = self.compute_fingerprint(ctx, at_least_commit)
+            if fingerprint is None:
+                return None
+            return ctx.version_index.get_latest_version_with_fingerprint(
+                self._identifier, fingerprint
+            )
+
         # Simple case. If the project does not use git, the most relevant
         # existing version is the latest (newest) version (if it exists).
         if not ctx.uses_git:
@@ -304,19 +486,118 @@ class RunExperiment(_RunSubprocess):
         if curr_commit is None:
             return ctx.version_index.get_latest_output_version(self._identifier)
 
-        # Retrieve all existing versions for this task. Filter them into tasks
-        # with null commit hashes and ones that are ancestors.
         existing_versions = ctx.version_index.get_all_versions_for_task(
             self._identifier
         )
+        ancestor_distances = self._compute_ancestor_distances(
+            ctx, curr_commit.hash, existing_versions
+        )
+        return self._select_most_relevant_version(existing_versions, ancestor_distances)
+
+    @classmethod
+    def compute_most_relevant_versions(
+        cls, ctx: "c.Context", tasks: Sequence["RunExperiment"]
+    ) -> None:
+        """
+        Computes the "most relevant" existing version of each of the given
+        tasks in bulk. This method issues a fixed number of version index
+        queries and computes commit ancestry once for all the candidate
+        commits, instead of doing so separately for each task.
+
+        Tasks whose most relevant version has already been computed are
+        skipped.
+        """
+        # pylint: disable=protected-access
+        # N.B. Tasks that are cached by their fingerprint are skipped because
+        # their fingerprint depends on their dependencies' versions.
+        pending = [
+            task
+            for task in tasks
+            if not task._did_retrieve_version and not task.caches_by_fingerprint
+        ]
+        if len(pending) == 0:
+            return
+
+        task_ids = [task.identifier for task in pending]
+        overrides = ctx.version_index.get_version_overrides(task_ids)
+        all_versions = ctx.version_index.get_all_versions_for_tasks(task_ids)
+        curr_commit = ctx.current_commit if ctx.uses_git else None
+
+        ancestor_distances: Dict[str, int] = {}
+        if curr_commit is not None:
+            ancestor_distances = cls._compute_ancestor_distances(
+                ctx,
+                curr_commit.hash,
+                [v for versions in all_versions.values() for v in versions],
+            )
+
+        for task in pending:
+            override = overrides.get(task.identifier, None)
+            existing_versions = all_versions.get(task.identifier, [])
+            if override is not None:
+                task._most_relevant_version = override
+            elif curr_commit is None:
+                # The project does not use git or the repository is bare. See
+                # `_retrieve_most_relevant_existing_version()`.
+                task._most_relevant_version = (
+                    max(existing_versions, key=lambda v: v.timestamp)
+                    if len(existing_versions) > 0
+                    else None
+                )
+            else:
+                task._most_relevant_version = cls._select_most_relevant_version(
+                    existing_versions, ancestor_distances
+                )
+            task._did_retrieve_version = True
+
+    @classmethod
+    def _compute_ancestor_distances(
+        cls, ctx: "c.Context", curr_commit_hash: str, versions: Sequence[Version]
+    ) -> Dict[str, int]:
+        """
+        Returns the distance from `curr_commit_hash` to each of the versions'
+        commits that are ancestors of `curr_commit_hash`. Commits that are not
+        ancestors are omitted.
+        """
+        ancestry = cls._commit_ancestry(ctx)
+        distances: Dict[str, int] = {}
+        non_ancestors = set()
+        for version in versions:
+            commit_hash = version.commit_hash
+            if (
+                commit_hash is None
+                or commit_hash in distances
+                or commit_hash in non_ancestors
+            ):
+                continue
+            if ancestry.is_ancestor(
+                curr_commit_hash, candidate_ancestor_hash=commit_hash
+            ):
+                distances[commit_hash] = ancestry.get_distance(
+                    curr_commit_hash, commit_hash
+                )
+            else:
+                non_ancestors.add(commit_hash)
+        return distances
+
+    @staticmethod
+    def _select_most_relevant_version(
+        existing_versions: Sequence[Version], ancestor_distances: Dict[str, int]
+    ) -> Optional[Version]:
+        """
+        Selects the most relevant version among the existing versions of a task
+        in a project that uses git. `ancestor_distances` maps the commits that
+        are ancestors of the current commit to their distance from the current
+        commit.
+        """
+        # Filter the existing versions into ones with null commit hashes and
+        # ones that are ancestors.
         ancestor_versions = []
         null_commit_versions = []
         for version in existing_versions:
             if version.commit_hash is None:
                 null_commit_versions.append(version)
-            elif ctx.git.is_ancestor(
-                curr_commit.hash, candidate_ancestor_hash=version.commit_hash
-            ):
+            elif version.commit_hash in ancestor_distances:
                 ancestor_versions.append(version)
 
         # The most relevant existing version is the one that is "closest" to the
@@ -327,7 +608,7 @@ class RunExperiment(_RunSubprocess):
             closest_distance = -1
             for v in ancestor_versions:
                 assert v.commit_hash is not None
-                dist = ctx.git.get_distance(curr_commit.hash, v.commit_hash)
+                dist = ancestor_distances[v.commit_hash]
                 if selected_version is None or dist < closest_distance:
                     selected_version = v
                     closest_distance = dist
@@ -352,3 +633,12 @@ class RunExperiment(_RunSubprocess):
         # not ancestors of the current commit. For correctness, we should not
         # depend on the results from any previous version.
         return None
+
+    @staticmethod
+    def _commit_ancestry(ctx: "c.Context") -> Union[Git, CommitGraph]:
+        # Prefer the in-memory commit graph to avoid launching a `git`
+        # subprocess per query.
+        commit_graph = ctx.commit_graph
+        if commit_graph is not None:
+            return commit_graph
+        return ctx.git
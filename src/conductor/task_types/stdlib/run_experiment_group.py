@@ -1,4 +1,4 @@
-from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
 from conductor.utils.run_arguments import ArgumentValue
 from conductor.utils.run_options import OptionValue
 from conductor.errors import (
@@ -12,6 +12,8 @@ class ExperimentInstance(NamedTuple):
     args: List[ArgumentValue] = []
     options: Dict[str, OptionValue] = {}
     parallelizable: bool = False
+    resources: Optional[Dict[str, Union[int, float]]] = None
+    mutex: Optional[str] = None
 
 
 def run_experiment_group(
@@ -21,6 +23,7 @@ def run_experiment_group(
     env: Optional[str] = None,
     chain_experiments: bool = False,
     deps: Optional[Sequence[str]] = None,
+    inputs: Optional[Sequence[str]] = None,
 ) -> None:
     task_deps = deps if deps is not None else []
     relative_experiment_identifiers = []
@@ -50,10 +53,15 @@ def run_experiment_group(
                 name=experiment.name,
                 run=run,
                 parallelizable=experiment.parallelizable,
+                resources=(
+                    experiment.resources if experiment.resources is not None else {}
+                ),
+                mutex=experiment.mutex,
                 args=experiment.args,
                 options=experiment.options,
                 deps=experiment_deps,
                 env=env,
+                inputs=list(inputs) if inputs is not None else None,
             )
             experiment_identifier = ":" + experiment.name
             relative_experiment_identifiers.append(experiment_identifier)
@@ -0,0 +1,142 @@
+import contextlib
+import gzip
+import shutil
+import subprocess
+import zlib
+from typing import BinaryIO, Iterator, Optional
+
+from conductor.errors import ArchiveFileInvalid, CreateArchiveFailed
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Compressor:
+    """
+    Compresses (and decompresses) a stream of bytes (e.g., an archive).
+
+    `compress()` returns a writable stream; the compressed bytes are written to
+    `raw`. `decompress()` returns a readable stream of the decompressed bytes
+    read from `raw`. Neither method closes `raw`.
+    """
+
+    def compress(self, raw: BinaryIO) -> "contextlib.AbstractContextManager[BinaryIO]":
+        raise NotImplementedError
+
+    def decompress(
+        self, raw: BinaryIO
+    ) -> "contextlib.AbstractContextManager[BinaryIO]":
+        raise NotImplementedError
+
+
+class GzipCompressor(Compressor):
+    # Matches the `gzip` utility's default (the maximum level is much slower).
+    _Level = 6
+
+    @contextlib.contextmanager
+    def compress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self._Level) as out:
+            yield out  # type: ignore
+
+    @contextlib.contextmanager
+    def decompress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        try:
+            with gzip.GzipFile(fileobj=raw, mode="rb") as decompressed:
+                yield decompressed  # type: ignore
+        except (EOFError, zlib.error) as ex:
+            # For example, the archive was truncated.
+            raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+
+class ZstdCompressor(Compressor):
+    """
+    Uses the `zstandard` module, compressing with all available cores.
+    """
+
+    @contextlib.contextmanager
+    def compress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        assert zstandard is not None
+        compressor = zstandard.ZstdCompressor(threads=-1)
+        with compressor.stream_writer(raw, closefd=False) as out:
+            yield out
+
+    @contextlib.contextmanager
+    def decompress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        assert zstandard is not None
+        decompressor = zstandard.ZstdDecompressor()
+        try:
+            with decompressor.stream_reader(
+                raw, read_across_frames=True, closefd=False
+            ) as decompressed:
+                yield decompressed
+        except zstandard.ZstdError as ex:
+            raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+
+class ZstdProgramCompressor(Compressor):
+    """
+    Uses the `zstd` program (if the `zstandard` module is not installed),
+    compressing with all available cores.
+    """
+
+    def __init__(self, program: str) -> None:
+        self._program = program
+
+    @contextlib.contextmanager
+    def compress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        process = subprocess.Popen(
+            [self._program, "-T0", "-q", "-c"],
+            stdin=subprocess.PIPE,
+            stdout=raw,
+        )
+        assert process.stdin is not None
+        try:
+            yield process.stdin  # type: ignore
+            process.stdin.close()
+        except:
+            process.kill()
+            process.wait()
+            raise
+        if process.wait() != 0:
+            raise CreateArchiveFailed().add_extra_context(
+                "The zstd utility returned a non-zero error code."
+            )
+
+    @contextlib.contextmanager
+    def decompress(self, raw: BinaryIO) -> Iterator[BinaryIO]:
+        process = subprocess.Popen(
+            [self._program, "-d", "-q", "-c"],
+            stdin=raw,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdout is not None
+        try:
+            yield process.stdout  # type: ignore
+            # The reader may stop before the end of the stream (e.g., tar
+            # archives end with padding). Drain it so that `zstd` can exit.
+            while len(process.stdout.read(65536)) > 0:
+                pass
+            process.stdout.close()
+        except:
+            process.kill()
+            process.wait()
+            raise
+        if process.wait() != 0:
+            raise ArchiveFileInvalid().add_extra_context(
+                "The zstd utility returned a non-zero error code."
+            )
+
+
+def zstd_compressor() -> Optional[Compressor]:
+    """
+    Returns a zstd compressor, or `None` if zstd is not available. We prefer the
+    `zstandard` module and fall back to the `zstd` program.
+    """
+    if zstandard is not None:
+        return ZstdCompressor()
+    program = shutil.which("zstd")
+    if program is not None:
+        return ZstdProgramCompressor(program)
+    return None
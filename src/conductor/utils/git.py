@@ -1,7 +1,8 @@
+import heapq
 import pathlib
 import subprocess
 import datetime
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List
 
 
 class Git:
@@ -82,6 +83,17 @@ class Git:
         project root (e.g., if the Conductor project is defined in a
         subdirectory of the current repository).
         """
+        git_dir = self.git_dir()
+        if git_dir is None:
+            return None
+        return git_dir.parent
+
+    def git_dir(self) -> Optional[pathlib.Path]:
+        """
+        Returns an absolute path to the repository's git directory (e.g.,
+        `.git` in the repository's root directory), if the project is using
+        Git. Otherwise, returns `None`.
+        """
         result = subprocess.run(
             ["git", "rev-parse", "--path-format=absolute", "--git-dir"],
             cwd=self._project_root,
@@ -90,7 +102,22 @@ class Git:
         )
         if result.returncode != 0:
             return None
-        return pathlib.Path(result.stdout.decode("utf-8")).parent
+        return pathlib.Path(result.stdout.decode("utf-8").strip())
+
+    def is_shallow(self) -> bool:
+        """
+        Returns `True` if the repository is a shallow clone. The ancestry of a
+        shallow clone's commits is incomplete (its boundary commits appear to
+        have no parents).
+        """
+        result = subprocess.run(
+            ["git", "rev-parse", "--is-shallow-repository"],
+            cwd=self._project_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return result.returncode == 0 and result.stdout.strip() == "true"
 
     def current_commit(self) -> Optional[Commit]:
         """
@@ -154,6 +181,38 @@ class Git:
             raise RuntimeError("Failed to get the distance between commits.")
         return int(result.stdout.strip())
 
+    def get_parents_list(
+        self, commit_hash: str, exclude: Optional[List[str]] = None
+    ) -> Optional[List[List[str]]]:
+        """
+        Returns the ancestry of `commit_hash` (including itself) as a list of
+        `[commit, parent1, parent2, ...]` entries. The entries are in
+        topological order (children are listed before their parents). Commits
+        reachable from any commit in `exclude` are omitted. Returns `None` if
+        the command fails (e.g., a commit does not exist).
+        """
+        exclusions = [f"^{excluded}" for excluded in exclude or []]
+        result = subprocess.run(
+            ["git", "rev-list", "--topo-order", "--parents", commit_hash, *exclusions],
+            cwd=self._project_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            return None
+        return [line.split() for line in result.stdout.strip().splitlines()]
+
+    def load_commit_graph(self, commit_hash: str) -> Optional["CommitGraph"]:
+        """
+        Loads the ancestry of `commit_hash` into memory using a single `git`
+        invocation. Returns `None` if the ancestry could not be retrieved.
+        """
+        parents_list = self.get_parents_list(commit_hash)
+        if parents_list is None:
+            return None
+        return CommitGraph.from_parents_list(self, commit_hash, parents_list)
+
     def rev_parse(self, commit_symbol: str) -> Optional[str]:
         result = subprocess.run(
             ["git", "rev-parse", commit_symbol],
@@ -167,25 +226,58 @@ class Git:
         return result.stdout.strip()
 
     def create_bundle(
-        self, symbol: str, bundle_path: pathlib.Path, silent: bool = True
+        self,
+        symbol: str,
+        bundle_path: pathlib.Path,
+        silent: bool = True,
+        exclude: Optional[List[str]] = None,
     ) -> bool:
         """
         Creates a bundle file containing the specified commit symbol (e.g.,
         hash, tag, branch) and saves it to `bundle_path`. Returns `True` if the
         operation was successful.
+
+        Commits reachable from any commit in `exclude` are left out of the
+        bundle (i.e., the bundle is incremental). The bundle can then only be
+        unpacked in a repository that already has the excluded commits.
         """
         if silent:
             kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
         else:
             kwargs = {}
+        exclusions = [f"^{excluded}" for excluded in exclude or []]
         result = subprocess.run(
-            ["git", "bundle", "create", str(bundle_path), symbol],
+            ["git", "bundle", "create", str(bundle_path), symbol, *exclusions],
             cwd=self._project_root,
             check=False,
             **kwargs,  # type: ignore
         )
         return result.returncode == 0
 
+    def find_existing_commits(self, commit_hashes: List[str]) -> List[str]:
+        """
+        Returns the commits in `commit_hashes` that exist in this repository.
+        """
+        if len(commit_hashes) == 0:
+            return []
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            cwd=self._project_root,
+            input="".join(f"{commit_hash}\n" for commit_hash in commit_hashes),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            return []
+        existing = []
+        for line in result.stdout.splitlines():
+            # Each line is either "<hash> <type> <size>" or "<hash> missing".
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == "commit":
+                existing.append(parts[0])
+        return existing
+
     def find_files(self, file_patterns: List[str]) -> List[str]:
         """
         Returns a list of files in the project that match the specified pattern.
@@ -202,6 +294,37 @@ class Git:
             return []
         return result.stdout.strip().splitlines()
 
+    def list_files(self, path: pathlib.Path) -> Optional[List[pathlib.Path]]:
+        """
+        Returns the files under `path` that are tracked by git, or that are
+        untracked but not ignored. Returns `None` if the files could not be
+        listed (e.g., because `path` is not in the repository).
+        """
+        result = subprocess.run(
+            [
+                "git",
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                "--",
+                str(path),
+            ],
+            cwd=self._project_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            return None
+        # N.B. The listed paths are relative to the working directory.
+        return [
+            pathlib.Path(self._project_root, file_path)
+            for file_path in result.stdout.split("\0")
+            if len(file_path) > 0
+        ]
+
     def get_common_ancestor(self, commit_hashes: List[str]) -> Optional[str]:
         """
         Returns the hash of the most recent common ancestor of the specified
@@ -300,3 +423,168 @@ class Git:
             lines_added=added,
             lines_removed=removed,
         )
+
+
+class CommitGraph:
+    """
+    An in-memory copy of the ancestry of a commit (typically `HEAD`). It is
+    used to answer `is_ancestor()` and `get_distance()` queries without
+    launching a `git` subprocess per query.
+
+    Queries that involve commits outside of the loaded ancestry fall back to
+    the (slower) subprocess-based methods in `Git`.
+    """
+
+    # Flags used when "painting" commits in `get_distance()`.
+    _FROM_START = 1
+    _FROM_ANCESTOR = 2
+
+    def __init__(
+        self,
+        git: Git,
+        head_hash: str,
+        parents: Dict[str, List[str]],
+        generations: Dict[str, int],
+    ):
+        self._git = git
+        self._head_hash = head_hash
+        self._parents = parents
+        # A commit's generation number is one more than the maximum
+        # generation number of its parents (root commits have generation 1).
+        # If commit A is an ancestor of commit B (A != B), then
+        # gen(A) < gen(B).
+        self._generations = generations
+
+    @classmethod
+    def from_parents_list(
+        cls, git: Git, head_hash: str, parents_list: List[List[str]]
+    ) -> "CommitGraph":
+        """
+        Builds the graph from `Git.get_parents_list()` output (children must
+        be listed before their parents).
+        """
+        parents: Dict[str, List[str]] = {}
+        for entry in parents_list:
+            parents[entry[0]] = entry[1:]
+        generations = cls.compute_generations(parents_list)
+        return cls(git, head_hash, parents, generations)
+
+    @staticmethod
+    def compute_generations(
+        parents_list: List[List[str]],
+        lookup_generation: Optional[Callable[[str], Optional[int]]] = None,
+    ) -> Dict[str, int]:
+        """
+        Computes the generation numbers of the commits in `parents_list`
+        (children must be listed before their parents). The generation numbers
+        of parents that are not in the list are retrieved using
+        `lookup_generation`, if provided.
+        """
+        # Visit parents before children to compute the generation numbers.
+        generations: Dict[str, int] = {}
+        for entry in reversed(parents_list):
+            commit = entry[0]
+            max_parent_gen = 0
+            for parent in entry[1:]:
+                parent_gen = generations.get(parent, None)
+                if parent_gen is None and lookup_generation is not None:
+                    parent_gen = lookup_generation(parent)
+                # Parents may be missing in shallow clones.
+                if parent_gen is not None:
+                    max_parent_gen = max(max_parent_gen, parent_gen)
+            generations[commit] = max_parent_gen + 1
+        return generations
+
+    @property
+    def head_hash(self) -> str:
+        return self._head_hash
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __contains__(self, commit_hash: str) -> bool:
+        return commit_hash in self._parents
+
+    def generation_of(self, commit_hash: str) -> Optional[int]:
+        return self._generations.get(commit_hash, None)
+
+    def parents_of(self, commit_hash: str) -> List[str]:
+        return self._parents.get(commit_hash, [])
+
+    def is_ancestor(self, commit_hash: str, candidate_ancestor_hash: str) -> bool:
+        """
+        Returns `True` if `candidate_ancestor_hash` is an ancestor of
+        `commit_hash`. Matches the semantics of `Git.is_ancestor()`.
+        """
+        if commit_hash not in self._parents:
+            return self._git.is_ancestor(commit_hash, candidate_ancestor_hash)
+        if candidate_ancestor_hash not in self._parents:
+            # All ancestors of `commit_hash` are in the graph.
+            return False
+        if commit_hash == candidate_ancestor_hash:
+            return True
+        if commit_hash == self._head_hash:
+            return True
+
+        target_gen = self._generations[candidate_ancestor_hash]
+        stack = [commit_hash]
+        visited = {commit_hash}
+        while len(stack) > 0:
+            commit = stack.pop()
+            if commit == candidate_ancestor_hash:
+                return True
+            for parent in self._parents.get(commit, []):
+                if parent in visited:
+                    continue
+                # Commits with a lower generation number cannot have
+                # `candidate_ancestor_hash` as an ancestor.
+                if self._generations.get(parent, 0) < target_gen:
+                    continue
+                visited.add(parent)
+                stack.append(parent)
+        return False
+
+    def get_distance(self, start_hash: str, ancestor_hash: str) -> int:
+        """
+        Returns the number of commits reachable from `start_hash` that are not
+        reachable from `ancestor_hash`. Matches the semantics of
+        `Git.get_distance()`.
+        """
+        if start_hash not in self._parents or ancestor_hash not in self._parents:
+            return self._git.get_distance(start_hash, ancestor_hash)
+
+        # We walk both commits' ancestries in descending generation number
+        # order. All descendants of a commit (within the walk) are processed
+        # before the commit itself, so a commit's flags are final when it is
+        # popped. The walk stops once every queued commit is known to be
+        # reachable from `ancestor_hash`.
+        flags: Dict[str, int] = {start_hash: self._FROM_START}
+        flags[ancestor_hash] = flags.get(ancestor_hash, 0) | self._FROM_ANCESTOR
+        queue = [(-self._generations[commit], commit) for commit in flags]
+        heapq.heapify(queue)
+        num_start_only = sum(1 for f in flags.values() if f == self._FROM_START)
+        distance = 0
+
+        while len(queue) > 0 and num_start_only > 0:
+            _, commit = heapq.heappop(queue)
+            commit_flags = flags[commit]
+            if commit_flags == self._FROM_START:
+                num_start_only -= 1
+                distance += 1
+
+            for parent in self._parents.get(commit, []):
+                if parent not in self._generations:
+                    # Missing parent (e.g., in a shallow clone).
+                    continue
+                parent_flags = flags.get(parent, None)
+                if parent_flags is None:
+                    flags[parent] = commit_flags
+                    heapq.heappush(queue, (-self._generations[parent], parent))
+                    if commit_flags == self._FROM_START:
+                        num_start_only += 1
+                elif (parent_flags | commit_flags) != parent_flags:
+                    if parent_flags == self._FROM_START:
+                        num_start_only -= 1
+                    flags[parent] = parent_flags | commit_flags
+
+        return distance
@@ -2,12 +2,33 @@ import datetime
 import enum
 import pathlib
 import platform
-import subprocess
+import os
 import shutil
-from typing import List, Optional, Tuple, TYPE_CHECKING
+import tarfile
+import tempfile
+import time
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Set,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 import conductor.filename as f
-from conductor.config import ARCHIVE_VERSION_INDEX, ARCHIVE_STAGING
+from conductor.config import (
+    ARCHIVE_VERSION_INDEX,
+    ARCHIVE_INDEX_STAGING_PREFIX,
+    ARCHIVE_STAGING_PREFIX,
+    ARCHIVE_STREAM_CHUNK_SIZE,
+    BLOB_STORE_DIR,
+)
 from conductor.errors import (
     InternalError,
     CreateArchiveFailed,
@@ -16,12 +37,16 @@ from conductor.errors import (
     UnsupportedPlatform,
     UnsupportedArchiveType,
 )
+from conductor.execution.blob_store import BlobStore, FileId
 from conductor.execution.version_index import VersionIndex, Version
 from conductor.task_identifier import TaskIdentifier
+from conductor.utils.compression import Compressor, GzipCompressor, zstd_compressor
 
 if TYPE_CHECKING:
     from conductor.context import Context
 
+_MiB = 1024 * 1024
+
 
 class ArchiveType(enum.Enum):
     Gzip = "gzip"
@@ -36,10 +61,36 @@ class ArchiveType(enum.Enum):
             raise InternalError(details="Unknown archive type.")
 
 
+class ArchiveProgress(NamedTuple):
+    # The number of (uncompressed) archive bytes processed so far.
+    num_bytes: int
+    elapsed_s: float
+
+    @property
+    def throughput_mib_per_s(self) -> float:
+        if self.elapsed_s <= 0:
+            return 0.0
+        return self.num_bytes / _MiB / self.elapsed_s
+
+    def summary(self) -> str:
+        return "{:.1f} MiB in {:.1f} s ({:.1f} MiB/s)".format(
+            self.num_bytes / _MiB, self.elapsed_s, self.throughput_mib_per_s
+        )
+
+
+# Called periodically while an archive is created or restored (and once more
+# when the operation finishes).
+ArchiveProgressCallback = Callable[[ArchiveProgress], None]
+
+
 def platform_archive_type() -> ArchiveType:
     system = platform.system()
     if system == "Linux":
-        return ArchiveType.Zstd
+        # Gzip support is built into Python, but zstd is only available if
+        # the `zstandard` module or the `zstd` utility is installed.
+        if zstd_compressor() is not None:
+            return ArchiveType.Zstd
+        return ArchiveType.Gzip
     elif system == "Darwin":
         return ArchiveType.Gzip
     else:
@@ -58,12 +109,61 @@ def create_archive(
     tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]],
     output_archive_path: pathlib.Path,
     archive_type: ArchiveType,
+    progress: Optional[ArchiveProgressCallback] = None,
 ) -> int:
     """
     This utility is used to create an archive of the output directories of the
     given tasks for transport purposes (e.g., moving data to/from a remote
     environment).
     """
+    # Fingerprints are kept in the archive so that restored versions can be
+    # reused by tasks that are cached by their fingerprint.
+    version_fingerprints = {}
+    for task_id, version in tasks_to_archive:
+        if version is None:
+            continue
+        fingerprint = ctx.version_index.get_version_fingerprint(task_id, version)
+        if fingerprint is not None:
+            version_fingerprints[(task_id, version)] = fingerprint
+
+    try:
+        with open(output_archive_path, "wb") as raw:
+            return write_archive(
+                ctx,
+                tasks_to_archive,
+                raw,
+                archive_type,
+                progress,
+                version_fingerprints=version_fingerprints,
+            )
+    except OSError as ex:
+        raise CreateArchiveFailed().add_extra_context(str(ex))
+
+
+def write_archive(
+    ctx: "Context",
+    tasks_to_archive: List[Tuple[TaskIdentifier, Optional[Version]]],
+    raw: BinaryIO,
+    archive_type: ArchiveType,
+    progress: Optional[ArchiveProgressCallback] = None,
+    version_fingerprints: Optional[Dict[Tuple[TaskIdentifier, Version], str]] = None,
+) -> int:
+    """
+    Writes an archive of the given tasks' output directories to `raw` (e.g., a
+    file or a pipe). The archive is written in a single pass: task output files
+    are compressed as they are read.
+
+    Deduplicated task output files are archived as hard links to their blob,
+    which is archived once (before the first task output that uses it).
+
+    This function does not use the project's version index, so it can run on
+    any thread (as long as the tasks are already loaded). The fingerprints of
+    the archived versions (if any) are passed in `version_fingerprints`.
+    """
+    compressor = _compressor_for(archive_type)
+    blob_store = ctx.blob_store
+    blob_names = blob_store.blob_names_by_file_id()
+    archived_blobs: Set[pathlib.PurePosixPath] = set()
 
     # Ensure versions are specified when they should be specified.
     # Partition tasks into versioned and unversioned tasks.
@@ -80,56 +180,61 @@ def create_archive(
         else:
             unversioned_tasks.append(task_id)
 
-    try:
-        archive_index_path = ctx.output_path / ARCHIVE_VERSION_INDEX
-        archive_index_path.unlink(missing_ok=True)
+    # Collect the output directories for the tasks to archive. These paths are
+    # relative to `ctx.output_path`.
+    output_dirs = []
+    for task_id, version in versioned_tasks:
+        output_dirs.append(
+            pathlib.PurePosixPath(task_id.path, f.task_output_dir(task_id, version))
+        )
+    for task_id in unversioned_tasks:
+        output_dirs.append(
+            pathlib.PurePosixPath(task_id.path, f.task_output_dir(task_id))
+        )
+
+    # N.B. We use a unique directory for the archive's version index so that
+    # several archives can be created at the same time (e.g., when
+    # transferring task outputs to several remote environments at once).
+    with tempfile.TemporaryDirectory(
+        prefix=ARCHIVE_INDEX_STAGING_PREFIX
+    ) as archive_index_dir:
+        archive_index_path = pathlib.Path(archive_index_dir, ARCHIVE_VERSION_INDEX)
 
         # Store the versions of the tasks that are being archived.
-        archive_index = VersionIndex.create_or_load(
-            ctx.output_path / ARCHIVE_VERSION_INDEX
-        )
+        archive_index = VersionIndex.create_or_load(archive_index_path)
         VersionIndex.copy_specific_entries_to(archive_index, versioned_tasks)
+        if version_fingerprints is not None:
+            for (task_id, version), fingerprint in version_fingerprints.items():
+                archive_index.set_version_fingerprint(task_id, version, fingerprint)
         archive_index.bulk_load_unversioned(unversioned_tasks)
         archive_index.commit_changes()
 
-        # Collect the output directories for the tasks to archive.
-        output_dirs_str = []
-        for task_id, version in versioned_tasks:
-            output_dirs_str.append(
-                str(
-                    pathlib.Path(
-                        task_id.path,
-                        f.task_output_dir(task_id, version),
-                    )
-                )
-            )
-        for task_id in unversioned_tasks:
-            output_dirs_str.append(
-                str(pathlib.Path(task_id.path, f.task_output_dir(task_id)))
-            )
-
-        # Create the archive.
-        process_args = [
-            "tar",
-            "-cf",
-            str(output_archive_path),
-            "--use-compress-program",
-            archive_type.value,
-            "-C",  # Files to put in the archive are relative to `ctx.output_path`
-            str(ctx.output_path),
-            str(archive_index_path.relative_to(ctx.output_path)),
-            *output_dirs_str,
-        ]
-        result = subprocess.run(process_args, check=False, capture_output=True)
-        if result.returncode != 0:
-            raise CreateArchiveFailed().add_extra_context(
-                "The tar utility returned a non-zero error code."
-            )
-        return len(output_dirs_str)
-
-    finally:
-        # Clean up the archive index file.
-        archive_index_path.unlink(missing_ok=True)
+        try:
+            with compressor.compress(raw) as compressed:
+                stream = _ProgressStream(compressed, progress)
+                with tarfile.open(fileobj=stream, mode="w|") as tar:  # type: ignore
+                    # N.B. The version index must be the archive's first member
+                    # (see `_extract_version_index()`).
+                    tar.add(archive_index_path, arcname=ARCHIVE_VERSION_INDEX)
+                    for output_dir in output_dirs:
+                        output_dir_path = ctx.output_path / output_dir
+                        # N.B. The tar writer archives files that share a blob
+                        # as hard links to the first archived copy (the blob).
+                        for blob_name in _referenced_blobs(
+                            output_dir_path, blob_names, archived_blobs
+                        ):
+                            tar.add(
+                                blob_store.root / blob_name,
+                                arcname=str(
+                                    pathlib.PurePosixPath(BLOB_STORE_DIR, blob_name)
+                                ),
+                            )
+                        tar.add(output_dir_path, arcname=str(output_dir))
+                stream.finish()
+        except (OSError, tarfile.TarError) as ex:
+            raise CreateArchiveFailed().add_extra_context(str(ex))
+
+    return len(output_dirs)
 
 
 def restore_archive(
@@ -137,131 +242,505 @@ def restore_archive(
     archive_path: pathlib.Path,
     archive_type: Optional[ArchiveType] = None,
     expect_no_duplicates: bool = False,
+    progress: Optional[ArchiveProgressCallback] = None,
 ) -> int:
     """
     This utility is used to restore the output directories of tasks from an
-    archive created by `create_archive`.
+    archive created by `create_archive`. Returns the number of restored task
+    output directories.
+    """
+    if archive_type is None:
+        archive_type = _infer_compress_program(archive_path)
+    compressor = _compressor_for(archive_type)
+    try:
+        with open(archive_path, "rb") as raw:
+            return _restore_from_stream(
+                ctx, raw, compressor, expect_no_duplicates, progress
+            )
+    except OSError as ex:
+        raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+
+class ExtractedArchive(NamedTuple):
+    """
+    An archive that was extracted by `extract_archive_to_staging()`. Its task
+    outputs are not yet part of the project.
+    """
+
+    staging_path: pathlib.Path
+    versioned_tasks: List[Tuple[TaskIdentifier, Version]]
+    unversioned_tasks: List[TaskIdentifier]
+    # The fingerprints of the versioned task outputs that have one.
+    version_fingerprints: Dict[Tuple[TaskIdentifier, Version], str]
+
+    def discard(self) -> None:
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+
+
+def extract_archive_to_staging(
+    output_path: pathlib.Path,
+    raw: BinaryIO,
+    archive_type: ArchiveType,
+    progress: Optional[ArchiveProgressCallback] = None,
+) -> ExtractedArchive:
+    """
+    Extracts the (compressed) archive read from `raw` (e.g., a pipe) into a new
+    staging directory inside `output_path`, while the archive is read. This
+    function does not use the project's version index, so it can run on any
+    thread; use `install_extracted_archive()` to move the task outputs into
+    place afterwards.
+    """
+    compressor = _compressor_for(archive_type)
+    try:
+        output_path.mkdir(parents=True, exist_ok=True)
+        staging_path = pathlib.Path(
+            tempfile.mkdtemp(prefix=ARCHIVE_STAGING_PREFIX, dir=output_path)
+        )
+    except OSError as ex:
+        raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+    try:
+        with compressor.decompress(raw) as decompressed:
+            stream = _ProgressStream(decompressed, progress)
+            with tarfile.open(fileobj=stream, mode="r|") as tar:  # type: ignore
+                archive_version_index = VersionIndex.create_or_load(
+                    _extract_version_index(tar, staging_path)
+                )
+                versioned_tasks = archive_version_index.get_all_versions()
+                unversioned_tasks = archive_version_index.get_all_unversioned()
+                version_fingerprints = {}
+                for task_id, version in versioned_tasks:
+                    fingerprint = archive_version_index.get_version_fingerprint(
+                        task_id, version
+                    )
+                    if fingerprint is not None:
+                        version_fingerprints[(task_id, version)] = fingerprint
+                to_extract: Dict[str, str] = {}
+                for task_id, version in versioned_tasks:
+                    output_dir = pathlib.PurePosixPath(
+                        task_id.path, f.task_output_dir(task_id, version)
+                    )
+                    to_extract[str(output_dir)] = "'{}' at version {}".format(
+                        str(task_id), str(version)
+                    )
+                for task_id in unversioned_tasks:
+                    output_dir = pathlib.PurePosixPath(
+                        task_id.path, f.task_output_dir(task_id)
+                    )
+                    to_extract[str(output_dir)] = "'{}'".format(str(task_id))
+                tar.extractall(
+                    staging_path,
+                    members=_members_to_extract(
+                        tar,
+                        to_extract,
+                        staging_path,
+                        BlobStore(output_path / BLOB_STORE_DIR),
+                    ),
+                    **_extract_options(),
+                )
+            _drain(stream)
+            stream.finish()
+        _check_extracted(staging_path, to_extract)
+        return ExtractedArchive(
+            staging_path, versioned_tasks, unversioned_tasks, version_fingerprints
+        )
+
+    except (OSError, tarfile.TarError) as ex:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+    except:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise
+
+
+def install_extracted_archive(
+    ctx: "Context",
+    extracted: ExtractedArchive,
+    expect_no_duplicates: bool = False,
+) -> Tuple[int, List[Tuple[TaskIdentifier, Version]]]:
     """
+    Moves the task outputs of an extracted archive into place and records their
+    versions in the project's version index (versioned outputs that already
+    exist are skipped). Returns the number of restored task output directories
+    and the versioned task outputs that were restored.
 
+    The staging directory is on the same file system as the output directory,
+    so the moves are renames (no data is copied).
+    """
+    restored_versions: List[Tuple[TaskIdentifier, Version]] = []
+    # New versioned output directories; we remove them if the restore fails.
+    created_dirs: List[pathlib.Path] = []
+    num_restored = 0
+    # Commit any pending changes first (e.g., the versions of tasks that just
+    # finished, see `VersionIndex.group_commit_changes()`), so that undoing a
+    # failed restore does not roll them back.
+    ctx.version_index.commit_changes()
     try:
-        # Extract the archive to a staging location.
-        staging_path = ctx.output_path / ARCHIVE_STAGING
-        staging_path.mkdir(parents=True, exist_ok=True)
-        if archive_type is None:
-            archive_type = _infer_compress_program(archive_path)
-        if not _supports_compress_program(archive_type):
-            raise UnsupportedArchiveType(archive_type=archive_type.value)
-        _extract_archive(archive_path, staging_path, archive_type)
-
-        # Load the archive version index.
-        archive_version_index_path = staging_path / ARCHIVE_VERSION_INDEX
-        archive_version_index = VersionIndex.create_or_load(archive_version_index_path)
-
-        restored_task_output_count = 0
-        successful_restore_dirs: List[pathlib.Path] = []
-        # Copy over versioned tasks, skipping the ones that already exist.
-        for task_id, version in archive_version_index.get_all_versions():
+        for task_id, version in extracted.versioned_tasks:
             insert_count = ctx.version_index.insert_output_version(
                 task_id, version, unchecked=True
             )
             if insert_count == 0:
                 # Version already exists in the current version index.
                 if expect_no_duplicates:
-                    # We should not have duplicates, so we raise an error.
-                    # NOTE: We clear the successful restore directories before
-                    # raising the error to keep the output directory clean.
-                    for d in successful_restore_dirs:
-                        shutil.rmtree(d, ignore_errors=True)
                     raise DuplicateTaskOutput(output_dir=str(ctx.output_path))
-                else:
-                    # We skip copying over this task.
-                    continue
-
-            src_task_path = pathlib.Path(
-                staging_path, task_id.path, f.task_output_dir(task_id, version)
+                continue
+            fingerprint = extracted.version_fingerprints.get((task_id, version))
+            if fingerprint is not None:
+                ctx.version_index.set_version_fingerprint(task_id, version, fingerprint)
+            output_dir = pathlib.PurePosixPath(
+                task_id.path, f.task_output_dir(task_id, version)
             )
-            if not src_task_path.is_dir():
-                raise ArchiveFileInvalid().add_extra_context(
-                    "Missing archived task output for '{}' at version {} in the "
-                    "archive.".format(str(task_id), str(version))
+            dest_task_path = ctx.output_path / output_dir
+            if not dest_task_path.exists():
+                created_dirs.append(dest_task_path)
+            _move_tree(extracted.staging_path / output_dir, dest_task_path)
+            restored_versions.append((task_id, version))
+            num_restored += 1
+
+        # We always blindly overwrite unversioned outputs.
+        for task_id in extracted.unversioned_tasks:
+            output_dir = pathlib.PurePosixPath(task_id.path, f.task_output_dir(task_id))
+            _move_tree(
+                extracted.staging_path / output_dir, ctx.output_path / output_dir
+            )
+            num_restored += 1
+
+        # Safe to commit now.
+        ctx.version_index.commit_changes()
+        return num_restored, restored_versions
+
+    except OSError as ex:
+        _undo_restore(ctx, created_dirs)
+        raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+    except:
+        _undo_restore(ctx, created_dirs)
+        raise
+
+    finally:
+        extracted.discard()
+
+
+def _restore_from_stream(
+    ctx: "Context",
+    raw: BinaryIO,
+    compressor: Compressor,
+    expect_no_duplicates: bool,
+    progress: Optional[ArchiveProgressCallback],
+) -> int:
+    """
+    Restores the task outputs in the (compressed) archive read from `raw`. The
+    archive is read in a single pass and task outputs are extracted directly
+    into their final locations (no staging directory is used).
+    """
+    # Maps the output directories to restore (relative to `ctx.output_path`)
+    # to a description of the task output (used in error messages).
+    to_extract: Dict[str, str] = {}
+    # New versioned output directories; we remove them if the restore fails.
+    created_dirs: List[pathlib.Path] = []
+    # Commit any pending changes first (e.g., the versions of tasks that just
+    # finished, see `VersionIndex.group_commit_changes()`), so that undoing a
+    # failed restore does not roll them back.
+    ctx.version_index.commit_changes()
+
+    try:
+        with compressor.decompress(raw) as decompressed, tempfile.TemporaryDirectory(
+            prefix=ARCHIVE_INDEX_STAGING_PREFIX
+        ) as archive_index_dir:
+            stream = _ProgressStream(decompressed, progress)
+            with tarfile.open(fileobj=stream, mode="r|") as tar:  # type: ignore
+                # Load the archive version index (the archive's first member).
+                archive_version_index = VersionIndex.create_or_load(
+                    _extract_version_index(tar, pathlib.Path(archive_index_dir))
                 )
 
-            dest_task_path = pathlib.Path(
-                ctx.output_path, task_id.path, f.task_output_dir(task_id, version)
-            )
-            dest_task_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copytree(src_task_path, dest_task_path)
-            if not dest_task_path.is_dir():
-                raise ArchiveFileInvalid().add_extra_context(
-                    "Missing copied archived task output for '{}' at version {}.".format(
+                # Decide which task outputs to restore before extracting
+                # anything. Versioned outputs that already exist are skipped.
+                for task_id, version in archive_version_index.get_all_versions():
+                    insert_count = ctx.version_index.insert_output_version(
+                        task_id, version, unchecked=True
+                    )
+                    if insert_count == 0:
+                        # Version already exists in the current version index.
+                        if expect_no_duplicates:
+                            raise DuplicateTaskOutput(output_dir=str(ctx.output_path))
+                        continue
+                    fingerprint = archive_version_index.get_version_fingerprint(
+                        task_id, version
+                    )
+                    if fingerprint is not None:
+                        ctx.version_index.set_version_fingerprint(
+                            task_id, version, fingerprint
+                        )
+                    output_dir = pathlib.PurePosixPath(
+                        task_id.path, f.task_output_dir(task_id, version)
+                    )
+                    to_extract[str(output_dir)] = "'{}' at version {}".format(
                         str(task_id), str(version)
                     )
+                    dest_task_path = ctx.output_path / output_dir
+                    if not dest_task_path.exists():
+                        created_dirs.append(dest_task_path)
+
+                # We always blindly overwrite unversioned outputs.
+                for task_id in archive_version_index.get_all_unversioned():
+                    output_dir = pathlib.PurePosixPath(
+                        task_id.path, f.task_output_dir(task_id)
+                    )
+                    to_extract[str(output_dir)] = "'{}'".format(str(task_id))
+
+                tar.extractall(
+                    ctx.output_path,
+                    members=_members_to_extract(
+                        tar, to_extract, ctx.output_path, ctx.blob_store
+                    ),
+                    **_extract_options(),
                 )
-            successful_restore_dirs.append(dest_task_path)
-            restored_task_output_count += 1
-
-        # Copy over unversioned tasks. We always blindly copy over these outputs.
-        for task_id in archive_version_index.get_all_unversioned():
-            src_task_path = pathlib.Path(
-                staging_path, task_id.path, f.task_output_dir(task_id)
-            )
-            if not src_task_path.is_dir():
-                raise ArchiveFileInvalid().add_extra_context(
-                    "Missing archived task output for '{}' in the "
-                    "archive.".format(str(task_id))
-                )
+            stream.finish()
 
-            dest_task_path = pathlib.Path(
-                ctx.output_path, task_id.path, f.task_output_dir(task_id)
-            )
-            dest_task_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copytree(src_task_path, dest_task_path, dirs_exist_ok=True)
-            if not dest_task_path.is_dir():
-                raise ArchiveFileInvalid().add_extra_context(
-                    "Missing copied archived task output for '{}'.".format(str(task_id))
-                )
-            restored_task_output_count += 1
+        _check_extracted(ctx.output_path, to_extract)
 
         # Safe to commit now.
         ctx.version_index.commit_changes()
-        return restored_task_output_count
+        return len(to_extract)
+
+    except (OSError, tarfile.TarError) as ex:
+        _undo_restore(ctx, created_dirs)
+        raise ArchiveFileInvalid().add_extra_context(str(ex))
 
     except:
-        # Something went wrong, so undo our changes.
-        ctx.version_index.rollback_changes()
+        _undo_restore(ctx, created_dirs)
         raise
 
-    finally:
-        # Clean up the staging directory.
-        shutil.rmtree(staging_path, ignore_errors=True)
 
+def _undo_restore(ctx: "Context", created_dirs: List[pathlib.Path]) -> None:
+    # Something went wrong, so undo our changes.
+    ctx.version_index.rollback_changes()
+    for created_dir in created_dirs:
+        shutil.rmtree(created_dir, ignore_errors=True)
 
-def _extract_archive(
-    archive_file: pathlib.Path, staging_path: pathlib.Path, archive_type: ArchiveType
-) -> None:
-    try:
-        process_args = [
-            "tar",
-            "-xf",
-            str(archive_file),
-        ]
-        if archive_type == ArchiveType.Zstd:
-            process_args.append("--use-compress-program")
-            process_args.append(archive_type.value)
-        process_args.extend(
-            [
-                "-C",
-                str(staging_path),
-            ]
+
+def _extract_version_index(
+    tar: tarfile.TarFile, dest_dir: pathlib.Path
+) -> pathlib.Path:
+    member = tar.next()
+    if member is None or member.name != ARCHIVE_VERSION_INDEX or not member.isfile():
+        raise ArchiveFileInvalid().add_extra_context(
+            "The archive does not start with a version index."
         )
-        result = subprocess.run(process_args, check=False, capture_output=True)
-        if result.returncode != 0:
+    index_file = tar.extractfile(member)
+    assert index_file is not None
+    index_path = dest_dir / ARCHIVE_VERSION_INDEX
+    with open(index_path, "wb") as out:
+        shutil.copyfileobj(index_file, out)
+    return index_path
+
+
+def _members_to_extract(
+    tar: tarfile.TarFile,
+    to_extract: Dict[str, str],
+    dest: pathlib.Path,
+    blob_store: BlobStore,
+) -> Iterator[tarfile.TarInfo]:
+    """
+    Yields the archive members that are part of the task output directories
+    in `to_extract`. Archived blobs are added to `blob_store` and task output
+    files that link to a blob are linked to the stored blob instead of being
+    yielded.
+    """
+    for member in tar:
+        name = pathlib.PurePosixPath(member.name)
+        if name.is_absolute() or ".." in name.parts:
             raise ArchiveFileInvalid().add_extra_context(
-                "The tar utility returned a non-zero error code."
+                "The archive contains an invalid path: {}".format(member.name)
+            )
+        blob_digest = _archived_blob_digest(name)
+        if blob_digest is not None and member.isfile():
+            contents = tar.extractfile(member)
+            assert contents is not None
+            if not blob_store.add(blob_digest, contents, member.mode):
+                raise ArchiveFileInvalid().add_extra_context(
+                    "The contents of {} do not match its name.".format(member.name)
+                )
+            continue
+        if not any(str(part) in to_extract for part in (name, *name.parents)):
+            # For example, the archive's version index or a task output that
+            # already exists.
+            continue
+        if not member.isdir():
+            # N.B. We replace existing files instead of writing over them
+            # because they may be hard linked elsewhere (e.g., in Maestro's
+            # task output store).
+            target = dest / name
+            if target.is_symlink() or (target.exists() and not target.is_dir()):
+                target.unlink()
+            link_digest = (
+                _archived_blob_digest(pathlib.PurePosixPath(member.linkname))
+                if member.islnk()
+                else None
+            )
+            if link_digest is not None:
+                _link_blob(blob_store, link_digest, target)
+                continue
+        yield member
+
+
+def _referenced_blobs(
+    output_dir: pathlib.Path,
+    blob_names: Dict[FileId, pathlib.PurePosixPath],
+    archived_blobs: Set[pathlib.PurePosixPath],
+) -> Iterator[pathlib.PurePosixPath]:
+    """
+    Yields the names of the (not yet archived) blobs that the files in
+    `output_dir` link to.
+    """
+    if len(blob_names) == 0:
+        return
+    for dirpath, _, filenames in os.walk(output_dir):
+        for filename in filenames:
+            file_stat = os.lstat(os.path.join(dirpath, filename))
+            if file_stat.st_nlink <= 1:
+                continue
+            blob_name = blob_names.get((file_stat.st_dev, file_stat.st_ino), None)
+            if blob_name is None or blob_name in archived_blobs:
+                continue
+            archived_blobs.add(blob_name)
+            yield blob_name
+
+
+def _archived_blob_digest(name: pathlib.PurePosixPath) -> Optional[str]:
+    if len(name.parts) == 0 or name.parts[0] != BLOB_STORE_DIR:
+        return None
+    return BlobStore.digest_from_name(pathlib.PurePosixPath(*name.parts[1:]))
+
+
+def _link_blob(blob_store: BlobStore, digest: str, target: pathlib.Path) -> None:
+    blob_path = blob_store.blob_path(digest)
+    if not blob_path.is_file():
+        raise ArchiveFileInvalid().add_extra_context(
+            "The archive refers to a missing file: {}".format(target.name)
+        )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    _link_or_copy(str(blob_path), str(target))
+
+
+def _check_extracted(dest: pathlib.Path, extracted: Dict[str, str]) -> None:
+    for output_dir, description in extracted.items():
+        if not (dest / output_dir).is_dir():
+            raise ArchiveFileInvalid().add_extra_context(
+                "Missing archived task output for {} in the archive.".format(
+                    description
+                )
             )
 
-    except OSError as ex:
-        raise ArchiveFileInvalid().add_extra_context(str(ex))
+
+def _drain(stream: "_ProgressStream") -> None:
+    # Tar readers stop at the archive's end-of-archive marker, which may be
+    # followed by padding. We read the rest of the stream so that the writer
+    # (e.g., on the other end of a pipe) can finish.
+    while len(stream.read(ARCHIVE_STREAM_CHUNK_SIZE)) > 0:
+        pass
+
+
+def _extract_options() -> Dict[str, Any]:
+    # Python versions with extraction filters (3.12+ and some patch releases of
+    # earlier versions) warn if a filter is not specified. The "tar" filter
+    # keeps the archive's symlinks but rejects paths outside the destination.
+    if hasattr(tarfile, "tar_filter"):
+        return {"filter": "tar"}
+    return {}
+
+
+class _ProgressStream:
+    """
+    Wraps an (uncompressed) archive stream to keep track of the number of bytes
+    that were read or written.
+    """
+
+    # How often to report progress.
+    _ReportIntervalS = 0.5
+
+    def __init__(
+        self, stream: BinaryIO, callback: Optional[ArchiveProgressCallback]
+    ) -> None:
+        self._stream = stream
+        self._callback = callback
+        self._num_bytes = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._advance(len(data))
+        return data
+
+    def write(self, data: bytes) -> int:
+        self._stream.write(data)
+        self._advance(len(data))
+        return len(data)
+
+    def finish(self) -> ArchiveProgress:
+        progress = ArchiveProgress(self._num_bytes, time.monotonic() - self._start)
+        if self._callback is not None:
+            self._callback(progress)
+        return progress
+
+    def _advance(self, num_bytes: int) -> None:
+        self._num_bytes += num_bytes
+        if self._callback is None:
+            return
+        now = time.monotonic()
+        if now - self._last_report < self._ReportIntervalS:
+            return
+        self._last_report = now
+        self._callback(ArchiveProgress(self._num_bytes, now - self._start))
+
+
+def link_tree(src: pathlib.Path, dest: pathlib.Path) -> None:
+    """
+    Copies the directory tree at `src` to `dest`, using hard links instead of
+    copying file data whenever possible. The trees share their files, so task
+    outputs copied this way must not be modified afterwards.
+    """
+    shutil.copytree(src, dest, symlinks=True, copy_function=_link_or_copy)
+
+
+def _move_tree(src: pathlib.Path, dest: pathlib.Path) -> None:
+    """
+    Moves the directory tree at `src` to `dest`, merging it into `dest` if it
+    already exists (files in `src` replace files in `dest`). Moves are renames
+    when possible, so they usually do not copy any data.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if not dest.exists():
+        try:
+            os.rename(src, dest)
+            return
+        except OSError:
+            # For example, `src` and `dest` are on different file systems.
+            pass
+    shutil.copytree(
+        src, dest, symlinks=True, dirs_exist_ok=True, copy_function=_move_or_copy
+    )
+
+
+def _move_or_copy(src: str, dest: str) -> str:
+    try:
+        os.replace(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+    return dest
+
+
+def _link_or_copy(src: str, dest: str) -> str:
+    try:
+        os.link(src, dest)
+    except OSError:
+        # For example, `src` and `dest` are on different file systems.
+        shutil.copy2(src, dest)
+    return dest
 
 
 def _infer_compress_program(archive_file: pathlib.Path) -> ArchiveType:
@@ -275,11 +754,11 @@ def _infer_compress_program(archive_file: pathlib.Path) -> ArchiveType:
         return ArchiveType.Zstd
 
 
-def _supports_compress_program(archive_type: ArchiveType) -> bool:
-    system = platform.system()
-    if archive_type == ArchiveType.Zstd:
-        return system == "Linux"
-    elif archive_type == ArchiveType.Gzip:
-        return system == "Linux" or system == "Darwin"
-    else:
-        return False
+def _compressor_for(archive_type: ArchiveType) -> Compressor:
+    if archive_type == ArchiveType.Gzip:
+        return GzipCompressor()
+    elif archive_type == ArchiveType.Zstd:
+        compressor = zstd_compressor()
+        if compressor is not None:
+            return compressor
+    raise UnsupportedArchiveType(archive_type=archive_type.value)
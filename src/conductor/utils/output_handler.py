@@ -5,6 +5,7 @@ from concurrent.futures import Future
 from typing import Optional, TextIO, IO
 
 import conductor.context as c
+from conductor.utils.tee import OutputSink
 
 
 class RecordType(enum.Enum):
@@ -16,32 +17,55 @@ class RecordType(enum.Enum):
 class OutputHandler:
     """
     A utility class used for handling task output logging.
+
+    If a `sink` is provided, the output is always captured and sent to the sink
+    instead of the terminal (it is still logged if the record type requires
+    it). An `output_path` of `None` means that `Teed` output is only written to
+    the terminal.
     """
 
-    def __init__(self, output_path: pathlib.Path, record_type: RecordType):
+    def __init__(
+        self,
+        output_path: Optional[pathlib.Path],
+        record_type: RecordType,
+        sink: Optional[OutputSink] = None,
+    ):
         self._output_path = output_path
         self._type = record_type
+        self._sink = sink
         self._file = None
         self._tee_future: Optional[Future] = None
 
     def popen_arg(self):
-        if self._type == RecordType.NotRecorded:
+        if self._sink is not None:
+            return subprocess.PIPE
+        elif self._type == RecordType.NotRecorded:
             return None
         elif self._type == RecordType.Teed:
             return subprocess.PIPE
         elif self._type == RecordType.OnlyLogged:
+            assert self._output_path is not None
             if self._file is None:
                 self._file = open(self._output_path, "wb")
             return self._file
 
     def maybe_tee(self, pipe: Optional[IO[bytes]], stream: TextIO, ctx: "c.Context"):
+        if self._sink is not None:
+            assert pipe is not None
+            log_path = (
+                self._output_path if self._type != RecordType.NotRecorded else None
+            )
+            self._tee_future = ctx.tee_processor.tee_pipe_to_sink(
+                pipe, self._sink, log_path
+            )
+            return
         if self._type != RecordType.Teed:
             return
         assert pipe is not None
         self._tee_future = ctx.tee_processor.tee_pipe(pipe, stream, self._output_path)
 
     def finish(self):
-        if self._type == RecordType.Teed and self._tee_future is not None:
+        if self._tee_future is not None:
             self._tee_future.result()
             self._tee_future = None
         elif self._type == RecordType.OnlyLogged and self._file is not None:
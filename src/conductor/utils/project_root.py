@@ -0,0 +1,18 @@
+import itertools
+import pathlib
+from typing import Optional
+
+from conductor.config import CONFIG_FILE_NAME
+
+
+def find_project_root(start: pathlib.Path) -> Optional[pathlib.Path]:
+    """
+    Returns the project root that contains `start` (i.e., the closest
+    directory, starting from `start`, that contains a Conductor configuration
+    file). Returns `None` if `start` is not inside a Conductor project.
+    """
+    for path in itertools.chain([start], start.parents):
+        maybe_config_path = path / CONFIG_FILE_NAME
+        if maybe_config_path.is_file():
+            return path
+    return None
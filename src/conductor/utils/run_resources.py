@@ -0,0 +1,131 @@
+import os
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from conductor.errors import RunResourcesInvalidValue
+from conductor.task_identifier import TaskIdentifier
+
+ResourceAmount = Union[int, float]
+
+# Resources with a well-known meaning. Conductor detects the machine's capacity
+# for these resources if it is not configured. Any other resource name is
+# treated as a user-defined "token" (e.g., GPUs or licenses), whose capacity
+# must be configured.
+CPUS_RESOURCE = "cpus"
+MEMORY_GB_RESOURCE = "memory_gb"
+
+# Used to avoid spurious capacity violations due to floating point error when
+# repeatedly acquiring and releasing fractional resource amounts.
+_EPSILON = 1e-9
+
+
+class RunResources:
+    """
+    Represents the resources that a `run_experiment()` or `run_command()` task
+    requests while it executes (e.g., `{"cpus": 4, "memory_gb": 16}`).
+    """
+
+    def __init__(self, resources: Dict[str, ResourceAmount]):
+        self._resources = resources
+
+    @classmethod
+    def from_raw(
+        cls, identifier: TaskIdentifier, raw_resources: dict
+    ) -> "RunResources":
+        for key, value in raw_resources.items():
+            if not isinstance(key, str) or not _is_valid_amount(value):
+                raise RunResourcesInvalidValue(identifier=identifier, key=str(key))
+        return cls(raw_resources)
+
+    def empty(self) -> bool:
+        return len(self._resources) == 0
+
+    def items(self) -> Iterable[Tuple[str, ResourceAmount]]:
+        return self._resources.items()
+
+    def serialize_str_dict(self) -> Dict[str, str]:
+        return {key: str(value) for key, value in self._resources.items()}
+
+    def __repr__(self) -> str:
+        return "RunResources({})".format(repr(self._resources))
+
+
+class ResourcePool:
+    """
+    Tracks the amount of each resource that is available for running tasks.
+    Resources that are missing from the pool's capacity have a capacity of 0.
+    """
+
+    def __init__(self, capacity: Dict[str, ResourceAmount]):
+        self._capacity = capacity
+        self._available: Dict[str, float] = {
+            key: float(value) for key, value in capacity.items()
+        }
+
+    @classmethod
+    def from_configured(
+        cls, configured_capacity: Dict[str, ResourceAmount]
+    ) -> "ResourcePool":
+        """
+        Creates a pool with the machine's detected capacity, overridden by any
+        explicitly configured capacities.
+        """
+        capacity: Dict[str, ResourceAmount] = {}
+        cpus = os.cpu_count()
+        if cpus is not None:
+            capacity[CPUS_RESOURCE] = cpus
+        memory_gb = _detect_memory_gb()
+        if memory_gb is not None:
+            capacity[MEMORY_GB_RESOURCE] = memory_gb
+        capacity.update(configured_capacity)
+        return cls(capacity)
+
+    def capacity_of(self, resource: str) -> ResourceAmount:
+        return self._capacity.get(resource, 0)
+
+    def find_exceeding(
+        self, request: RunResources
+    ) -> Optional[Tuple[str, ResourceAmount]]:
+        """
+        Returns a resource (and the requested amount) that exceeds the pool's
+        total capacity, if any. Such a request can never be satisfied.
+        """
+        for resource, amount in request.items():
+            if amount > self.capacity_of(resource) + _EPSILON:
+                return resource, amount
+        return None
+
+    def fits(self, request: RunResources) -> bool:
+        return all(
+            amount <= self._available.get(resource, 0.0) + _EPSILON
+            for resource, amount in request.items()
+        )
+
+    def acquire(self, request: RunResources) -> None:
+        for resource, amount in request.items():
+            self._available[resource] = self._available.get(resource, 0.0) - amount
+
+    def release(self, request: RunResources) -> None:
+        for resource, amount in request.items():
+            self._available[resource] = self._available.get(resource, 0.0) + amount
+
+
+def is_valid_capacity(value: object) -> bool:
+    return _is_valid_amount(value)
+
+
+def _is_valid_amount(value: object) -> bool:
+    # N.B. `bool` is a subclass of `int`, but it is not a meaningful amount.
+    return (
+        isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+    )
+
+
+def _detect_memory_gb() -> Optional[float]:
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        num_pages = os.sysconf("SC_PHYS_PAGES")
+        if page_size <= 0 or num_pages <= 0:
+            return None
+        return page_size * num_pages / (1024**3)
+    except (AttributeError, OSError, ValueError):
+        return None
@@ -1,11 +1,30 @@
+import collections
 import contextlib
 import errno
 import os
+import resource
+import select
 import signal
-from typing import List, Optional, Tuple
+import threading
+from concurrent.futures import Future
+from typing import Deque, NamedTuple, Optional, Set, Union
+
+
+class ExitedChild(NamedTuple):
+    pid: int
+    returncode: int
+    # The child's resource usage (which includes the resource usage of any of
+    # its descendants that it waited for).
+    rusage: resource.struct_rusage
 
 
 class SigchldHelper:
+    """
+    Used to wait for tracked child processes to exit. Work that runs in the
+    background (e.g., on a thread) can also signal its completion through this
+    helper so that a single `wait()` call can wait for both kinds of events.
+    """
+
     _Instance: "Optional[SigchldHelper]" = None
 
     @staticmethod
@@ -15,10 +34,15 @@ class SigchldHelper:
         return SigchldHelper._Instance
 
     def __init__(self) -> None:
-        # Maps pids to return codes
-        self._returncodes: List[Tuple[int, int]] = []
+        self._events: Deque[Union[ExitedChild, Future]] = collections.deque()
+        # N.B. We only reap processes that we were asked to track. Reaping any
+        # child (i.e., `wait4(-1)`) would steal the exit status of processes
+        # that are waited on elsewhere (e.g., by `subprocess.run()`).
+        self._tracked_pids: Set[int] = set()
         self._read_pipe: Optional[int] = None
         self._write_pipe: Optional[int] = None
+        # Protects the pipe against concurrent use by background threads.
+        self._pipe_lock = threading.Lock()
 
     @contextlib.contextmanager
     def track(self):
@@ -28,42 +52,95 @@ class SigchldHelper:
             yield
         finally:
             signal.signal(signal.SIGCHLD, existing_handler)
-            os.close(self._write_pipe)
-            os.close(self._read_pipe)
-            self._returncodes.clear()
-            self._write_pipe = None
-            self._read_pipe = None
+            with self._pipe_lock:
+                os.close(self._write_pipe)
+                os.close(self._read_pipe)
+                self._events.clear()
+                self._tracked_pids.clear()
+                self._write_pipe = None
+                self._read_pipe = None
 
-    def wait(self) -> Tuple[int, int]:
+    def track_pid(self, pid: int) -> None:
+        """
+        Starts tracking the given child process. The process will be reaped
+        once it exits and its exit will be reported by `wait()`.
+        """
+        self._tracked_pids.add(pid)
+        # The process may have exited before we started tracking it (in which
+        # case its SIGCHLD was already delivered).
+        self._reap_tracked()
+
+    def post_completed(self, future: Future) -> None:
+        """
+        Reports that the given (completed) future is done. This method is
+        thread safe.
+        """
+        with self._pipe_lock:
+            if self._write_pipe is None:
+                # We are no longer tracking events (e.g., the execution was
+                # aborted while this future was running).
+                return
+            self._events.append(future)
+            os.write(self._write_pipe, b"\0")
+
+    def wait(self) -> Union[ExitedChild, Future]:
+        """
+        Waits for a tracked child process to exit or for a future to be posted
+        as completed (whichever happens first).
+        """
         assert self._read_pipe is not None
         _ = os.read(self._read_pipe, 1)
-        return self._extract_any()
+        return self._events.popleft()
 
-    def _add_returncode(self, pid: int, returncode: int) -> None:
+    def wait_until_ready(self, timeout: float) -> bool:
+        """
+        Waits for at most `timeout` seconds for an event that `wait()` would
+        return. Returns `True` if there is such an event (i.e., if `wait()`
+        would not block).
+        """
+        assert self._read_pipe is not None
+        readable, _, _ = select.select([self._read_pipe], [], [], max(timeout, 0.0))
+        return len(readable) > 0
+
+    def _add_exited_child(self, child: ExitedChild) -> None:
         assert self._write_pipe is not None
-        self._returncodes.append((pid, returncode))
+        self._events.append(child)
         os.write(self._write_pipe, b"\0")
 
-    def _extract_any(self) -> Tuple[int, int]:
-        # Precondition: `self._returncodes` must be non-empty.
-        return self._returncodes.pop()
+    def _reap_tracked(self) -> None:
+        for pid in list(self._tracked_pids):
+            try:
+                reaped_pid, status, rusage = os.wait4(pid, os.WNOHANG)
+            except OSError as ex:
+                if ex.errno != errno.ECHILD:
+                    raise
+                # The process was already reaped elsewhere. This should not
+                # happen, but we stop tracking it to avoid retrying forever.
+                self._tracked_pids.discard(pid)
+                continue
+            if reaped_pid == 0:
+                # Still running.
+                continue
+
+            self._tracked_pids.discard(pid)
+            self._add_exited_child(
+                ExitedChild(pid, returncode_from_status(status), rusage)
+            )
 
     @staticmethod
     def _handler(sig, frame) -> None:  # pylint: disable=unused-argument
-        try:
-            while True:
-                pid, status = os.waitpid(-1, os.WNOHANG)
-                if pid == 0 and status == 0:
-                    break
-
-                if os.WIFEXITED(status):
-                    returncode = os.WEXITSTATUS(status)
-                elif os.WIFSIGNALED(status):
-                    returncode = os.WTERMSIG(status)
-                else:
-                    raise AssertionError
-                # pylint: disable=protected-access
-                SigchldHelper.instance()._add_returncode(pid, returncode)
-        except OSError as ex:
-            if ex.errno != errno.ECHILD:
-                raise
+        # pylint: disable=protected-access
+        SigchldHelper.instance()._reap_tracked()
+
+
+def returncode_from_status(status: int) -> int:
+    """
+    Converts a child's wait status (e.g., from `os.wait4()`) into the return
+    code that Conductor reports.
+    """
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    elif os.WIFSIGNALED(status):
+        return os.WTERMSIG(status)
+    else:
+        raise AssertionError
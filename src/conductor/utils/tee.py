@@ -1,6 +1,10 @@
 import pathlib
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import IO, TextIO
+import threading
+from concurrent.futures import Future
+from typing import Callable, IO, List, Optional, TextIO
+
+# Receives chunks of output (e.g., to forward them to a remote caller).
+OutputSink = Callable[[bytes], None]
 
 
 class TeeProcessor:
@@ -8,25 +12,67 @@ class TeeProcessor:
     A utility that uses threads to implement tee-like functionality.
     """
 
-    def __init__(self):
-        self._executor = ThreadPoolExecutor(max_workers=2)
+    def __init__(self) -> None:
+        # N.B. We use one thread per pipe (instead of a fixed size pool) because
+        # a tee runs for as long as its process does. A fixed size pool would
+        # stall the output of concurrently running processes (e.g., tasks that
+        # run concurrently in a remote environment).
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
         self._has_shutdown = False
 
     def shutdown(self):
         if self._has_shutdown:
             return
-        self._executor.shutdown(wait=True)
+        with self._lock:
+            threads = list(self._threads)
+            self._threads.clear()
+        for thread in threads:
+            thread.join()
         self._has_shutdown = True
 
     def tee_pipe(
-        self, pipe: IO[bytes], stream: TextIO, file_name: pathlib.Path
+        self, pipe: IO[bytes], stream: TextIO, file_name: Optional[pathlib.Path]
     ) -> Future:
-        return self._executor.submit(self._tee_pipe_run, pipe, stream, file_name)
+        """
+        Copies the pipe's contents to `stream` and to `file_name` (if not
+        `None`).
+        """
+
+        def write_to_stream(data: bytes) -> None:
+            stream.buffer.write(data)
+            # Needed to maintain interactivity.
+            stream.flush()
+
+        return self.tee_pipe_to_sink(pipe, write_to_stream, file_name)
+
+    def tee_pipe_to_sink(
+        self, pipe: IO[bytes], sink: OutputSink, file_name: Optional[pathlib.Path]
+    ) -> Future:
+        """
+        Copies the pipe's contents to `sink` and to `file_name` (if not `None`).
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                self._tee_pipe_run(pipe, sink, file_name)
+                future.set_result(None)
+            except BaseException as ex:  # pylint: disable=broad-except
+                future.set_exception(ex)
+
+        thread = threading.Thread(target=run, name="conductor-tee")
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+        return future
 
     def _tee_pipe_run(
-        self, pipe: IO[bytes], stream: TextIO, file_name: pathlib.Path
+        self, pipe: IO[bytes], sink: OutputSink, file_name: Optional[pathlib.Path]
     ) -> None:
-        with open(file_name, "wb") as file:
+        file = open(file_name, "wb") if file_name is not None else None
+        try:
             while True:
                 # Read up to 4096 bytes at a time, but return as soon as we read
                 # some bytes.
@@ -34,8 +80,9 @@ class TeeProcessor:
                 if len(data) == 0:
                     # End of the stream.
                     break
-                file.write(data)
-                stream.buffer.write(data)
-                # Needed to maintain interactivity.
-                stream.flush()
-            stream.flush()
+                if file is not None:
+                    file.write(data)
+                sink(data)
+        finally:
+            if file is not None:
+                file.close()
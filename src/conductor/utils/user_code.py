@@ -47,9 +47,18 @@ def cli_command(main):
             register_signal_handlers()
             main(args)
         except ConductorError as ex:
-            if args.debug:
-                print(traceback.format_exc(), file=sys.stderr)
-            print("ERROR:", ex.printable_message(), file=sys.stderr)
+            print_error(ex, debug=args.debug)
             sys.exit(1)
 
     return command_main
+
+
+def print_error(ex: ConductorError, debug: bool) -> None:
+    """
+    Reports an error that occurred when running a command. This should be
+    called while handling `ex` so that its traceback can be printed in debug
+    mode.
+    """
+    if debug:
+        print(traceback.format_exc(), file=sys.stderr)
+    print("ERROR:", ex.printable_message(), file=sys.stderr)
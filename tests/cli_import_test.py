@@ -0,0 +1,68 @@
+import json
+import pathlib
+import subprocess
+import sys
+from typing import List, Set
+
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+# Runs `cond` in-process and then prints the names of the modules it imported.
+_RUN_AND_LIST_MODULES = """
+import json
+import sys
+
+from conductor.__main__ import main
+
+sys.argv = ["cond", *sys.argv[1:]]
+try:
+    main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules.keys())), file=sys.stderr)
+"""
+
+# Modules that are slow to import. Commands should only import them if they
+# are needed (e.g., when a task runs in a remote environment).
+_SLOW_MODULES = [
+    "concurrent.futures.process",
+    "conductor.envs.manager_impl",
+    "conductor.envs.remote_env",
+    "conductor.explorer.explorer",
+    "fabric",
+    "fastapi",
+    "grpc",
+    "paramiko",
+]
+
+
+def test_cond_where_imports(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    modules = _imported_modules(cond, ["where", "//:process", "--non-existent-ok"])
+    assert "conductor.cli.where" in modules
+    # Other commands are not loaded.
+    assert "conductor.cli.run" not in modules
+    assert "conductor.execution.executor" not in modules
+    for module in _SLOW_MODULES:
+        assert module not in modules
+
+
+def test_cond_run_local_imports(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    modules = _imported_modules(cond, ["run", "//:process"])
+    assert "conductor.cli.run" in modules
+    assert "conductor.cli.explorer" not in modules
+    for module in _SLOW_MODULES:
+        assert module not in modules
+
+
+def _imported_modules(cond: ConductorRunner, args: List[str]) -> Set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _RUN_AND_LIST_MODULES, *args],
+        cwd=cond.project_root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0
+    return set(json.loads(result.stderr.splitlines()[-1]))
@@ -0,0 +1,116 @@
+import pathlib
+import subprocess
+
+from conductor.config import COMMIT_INDEX_NAME
+from conductor.execution.commit_index import CommitIndex
+from conductor.utils.git import Git
+from .git_utils import setup_git, create_commit
+
+
+def test_commit_index_incremental(tmp_path: pathlib.Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    setup_git(repo, initialize=False)
+    commit1 = create_commit(repo, "C1")
+    commit2 = create_commit(repo, "C2")
+
+    g = Git(repo)
+    index_path = tmp_path / COMMIT_INDEX_NAME
+    index = CommitIndex.create_or_load(index_path)
+    graph = index.load_commit_graph(g, commit2)
+    assert graph is not None
+    assert len(graph) == 2
+    assert graph.is_ancestor(commit2, commit1)
+    assert graph.get_distance(commit2, commit1) == 1
+
+    # Branch off and merge to add new commits incrementally.
+    results = subprocess.run(["git", "checkout", "-b", "side"], cwd=repo, check=False)
+    assert results.returncode == 0
+    side = create_commit(repo, "Side")
+    results = subprocess.run(["git", "checkout", "-"], cwd=repo, check=False)
+    assert results.returncode == 0
+    commit3 = create_commit(repo, "C3")
+    results = subprocess.run(
+        ["git", "merge", "--no-ff", "-m", "Merge", "side"], cwd=repo, check=False
+    )
+    assert results.returncode == 0
+    merge = g.rev_parse("HEAD")
+    assert merge is not None
+
+    index = CommitIndex.create_or_load(index_path)
+    graph = index.load_commit_graph(g, merge)
+    assert graph is not None
+    assert len(graph) == 5
+    assert graph.generation_of(commit1) == 1
+    assert graph.generation_of(side) == 3
+    assert graph.generation_of(merge) == 4
+    for commit in [commit1, commit2, side, commit3]:
+        assert graph.is_ancestor(merge, commit)
+        assert graph.get_distance(merge, commit) == g.get_distance(merge, commit)
+    assert not graph.is_ancestor(commit3, side)
+
+    # Loading an older commit only includes its ancestry.
+    graph = index.load_commit_graph(g, commit3)
+    assert graph is not None
+    assert len(graph) == 3
+    assert side not in graph
+
+
+def test_commit_index_avoids_git(tmp_path: pathlib.Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    setup_git(repo, initialize=False)
+    commit1 = create_commit(repo, "C1")
+    commit2 = create_commit(repo, "C2")
+
+    index_path = tmp_path / COMMIT_INDEX_NAME
+    index = CommitIndex.create_or_load(index_path)
+    assert index.load_commit_graph(Git(repo), commit2) is not None
+
+    # Once indexed, the graph is served from the index. We use a `Git`
+    # instance that does not refer to a repository to check that `git` is not
+    # needed.
+    not_a_repo = tmp_path / "not_a_repo"
+    not_a_repo.mkdir()
+    index = CommitIndex.create_or_load(index_path)
+    graph = index.load_commit_graph(Git(not_a_repo), commit2)
+    assert graph is not None
+    assert graph.is_ancestor(commit2, commit1)
+    assert graph.get_distance(commit2, commit1) == 1
+
+    # Unknown commits cannot be indexed without git.
+    assert index.load_commit_graph(Git(not_a_repo), "0" * 40) is None
+
+
+def test_commit_index_shallow_clone(tmp_path: pathlib.Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    setup_git(repo, initialize=False)
+    commit1 = create_commit(repo, "C1")
+    commit2 = create_commit(repo, "C2")
+
+    clone = tmp_path / "clone"
+    results = subprocess.run(
+        ["git", "clone", "--depth", "1", "file://{}".format(repo), str(clone)],
+        check=False,
+    )
+    assert results.returncode == 0
+    g = Git(clone)
+    assert g.is_shallow()
+
+    # The clone's history only contains its boundary commit.
+    index_path = tmp_path / COMMIT_INDEX_NAME
+    index = CommitIndex.create_or_load(index_path)
+    graph = index.load_commit_graph(g, commit2)
+    assert graph is not None
+    assert commit1 not in graph
+
+    # Deepening the clone reveals the boundary commit's ancestors.
+    results = subprocess.run(["git", "fetch", "--unshallow"], cwd=clone, check=False)
+    assert results.returncode == 0
+    assert not g.is_shallow()
+    index = CommitIndex.create_or_load(index_path)
+    graph = index.load_commit_graph(g, commit2)
+    assert graph is not None
+    assert graph.is_ancestor(commit2, commit1)
+    assert graph.get_distance(commit2, commit1) == 1
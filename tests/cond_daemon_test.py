@@ -0,0 +1,111 @@
+import contextlib
+import pathlib
+from typing import Iterator
+
+from conductor.config import DAEMON_SOCKET_NAME
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+
+def test_daemon_runs_commands(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["daemon"])
+    expected_path = str(cond.output_path / "greet.task")
+
+    with _running_daemon(cond):
+        for _ in range(3):
+            result = cond.where("//:greet", non_existent_ok=True)
+            assert result.returncode == 0
+            assert result.stdout.decode().strip() == expected_path
+        result = cond.run("//:greet", check=True)
+        assert result.returncode == 0
+
+        # Errors are reported by the client.
+        result = cond.where("//:missing")
+        assert result.returncode != 0
+        assert "ERROR" in result.stderr.decode()
+
+        # The daemon only parsed the COND file once.
+        assert _num_parses(cond) == 1
+
+    # Commands run locally if the daemon is not running.
+    result = cond.daemon("status")
+    assert result.returncode == 0
+    assert "not running" in result.stdout.decode()
+    result = cond.where("//:greet", non_existent_ok=True)
+    assert result.returncode == 0
+    assert result.stdout.decode().strip() == expected_path
+    assert _num_parses(cond) == 2
+
+
+def test_daemon_reparses_changed_files(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["daemon"])
+
+    with _running_daemon(cond):
+        result = cond.run("//:greet", check=True)
+        assert result.returncode == 0
+        assert _num_parses(cond) == 1
+
+        # Changing an included file invalidates the files that include it.
+        (cond.project_root / "common.cond").write_text('GREETING = "hi there"\n')
+        result = cond.run("//:greet", check=True)
+        assert result.returncode == 0
+        assert _num_parses(cond) == 2
+
+        # New tasks are found after the COND file changes.
+        with open(cond.project_root / "COND", "a", encoding="UTF-8") as cond_file:
+            cond_file.write('\nrun_command(name="new", run="echo new")\n')
+        result = cond.where("//:new", non_existent_ok=True)
+        assert result.returncode == 0
+        assert result.stdout.decode().strip() == str(cond.output_path / "new.task")
+        assert _num_parses(cond) == 3
+
+
+def test_daemon_finds_new_versions(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["daemon"])
+
+    with _running_daemon(cond):
+        # Tasks are executed locally, even when the daemon is running.
+        result = cond.run("//:exp")
+        assert result.returncode == 0
+        result = cond.where("//:exp")
+        assert result.returncode == 0
+        first_path = result.stdout.decode().strip()
+        assert pathlib.Path(first_path).is_dir()
+
+        result = cond.run("//:exp", again=True)
+        assert result.returncode == 0
+        result = cond.where("//:exp")
+        assert result.returncode == 0
+        second_path = result.stdout.decode().strip()
+        assert pathlib.Path(second_path).is_dir()
+        assert second_path != first_path
+
+
+def test_daemon_exits_when_socket_is_removed(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["daemon"])
+
+    with _running_daemon(cond):
+        result = cond.daemon("start")
+        assert result.returncode == 0
+        assert "already running" in result.stdout.decode()
+
+        # For example, `cond clean` removes the socket.
+        (cond.output_path / DAEMON_SOCKET_NAME).unlink()
+        result = cond.daemon("status")
+        assert result.returncode == 0
+        assert "not running" in result.stdout.decode()
+        result = cond.where("//:greet", non_existent_ok=True)
+        assert result.returncode == 0
+
+
+@contextlib.contextmanager
+def _running_daemon(cond: ConductorRunner) -> Iterator[None]:
+    result = cond.daemon("start")
+    assert result.returncode == 0
+    try:
+        yield
+    finally:
+        cond.daemon("stop")
+
+
+def _num_parses(cond: ConductorRunner) -> int:
+    return len((cond.project_root / "parse-count.txt").read_text())
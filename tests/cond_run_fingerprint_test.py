@@ -0,0 +1,235 @@
+import pathlib
+import shutil
+import subprocess
+from typing import Iterable, List
+
+import pytest
+
+from conductor.config import TASK_OUTPUT_DIR_SUFFIX
+from conductor.context import Context
+from conductor.execution.fingerprint_index import FingerprintIndex
+from conductor.execution.planning.planner import ExecutionPlanner
+from conductor.task_identifier import TaskIdentifier
+from conductor.utils.output_archiving import platform_archive_type
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+
+def test_unchanged_inputs_are_cached(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    result = cond.run("//:report")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 1
+    assert _num_runs(cond, "report") == 1
+
+    # Nothing changed, so neither task runs again.
+    result = cond.run("//:report")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 1
+    assert _num_runs(cond, "report") == 1
+
+    # Unless we ask for it.
+    result = cond.run("//:report", again=True)
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 2
+    assert _num_runs(cond, "report") == 2
+
+
+def test_changed_input_runs_dependents(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    result = cond.run("//:report")
+    assert result.returncode == 0
+
+    # Files in an input directory are inputs. `report` depends on `process`'s
+    # outputs, so it runs again too.
+    (cond.project_root / "config" / "settings.toml").write_text("threads = 8\n")
+    result = cond.run("//:report")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 2
+    assert _num_runs(cond, "report") == 2
+
+    # New files are also detected.
+    (cond.project_root / "config" / "extra.toml").write_text("debug = true\n")
+    result = cond.run("//:process")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 3
+
+    result = cond.run("//:report")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 3
+    assert _num_runs(cond, "report") == 3
+
+
+def test_new_dependency_version_runs_dependents(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    result = cond.run("//:process")
+    assert result.returncode == 0
+
+    # A new version of the experiment's outputs changes the fingerprint.
+    result = cond.run("//:data", again=True)
+    assert result.returncode == 0
+    result = cond.run("//:process")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 2
+
+
+def test_missing_output_runs_again(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    result = cond.run("//:process")
+    assert result.returncode == 0
+
+    shutil.rmtree(_output_dir(cond, "process"))
+    result = cond.run("//:process")
+    assert result.returncode == 0
+    assert _num_runs(cond, "process") == 1
+    assert _output_dir(cond, "process").is_dir()
+
+
+def test_unidentified_dependency_runs_dependents(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    for _ in range(2):
+        result = cond.run("//:after_always")
+        assert result.returncode == 0
+
+    # `always` does not declare its inputs, so its outputs cannot be
+    # identified.
+    assert _num_runs(cond, "always") == 2
+    assert _num_runs(cond, "after_always") == 2
+
+
+def test_experiment_reuses_version_across_unrelated_commits(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    _set_up_git(cond)
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 1
+
+    # The new commit does not change the task's inputs.
+    (cond.project_root / "README.md").write_text("An updated README.\n")
+    _git(cond, ["commit", "-am", "Update the README."])
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 1
+
+    # Neither do files that git ignores.
+    (cond.project_root / "config" / "scratch.tmp").write_text("scratch\n")
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 1
+
+    # An uncommitted change to an input creates a new version...
+    (cond.project_root / "config" / "settings.toml").write_text("threads = 8\n")
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 2
+
+    # ...that is reused once the change is committed.
+    _git(cond, ["commit", "-am", "Change the settings."])
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 2
+
+    # Reverting the change reuses the first version.
+    (cond.project_root / "config" / "settings.toml").write_text("threads = 4\n")
+    result = cond.run("//:keyed")
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 2
+
+
+def test_restored_versions_keep_fingerprints(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    _set_up_git(cond)
+    result = cond.run("//:keyed")
+    assert result.returncode == 0
+
+    archive_path = tmp_path / "archive.tar.{}".format(
+        platform_archive_type().extension()
+    )
+    result = cond.archive("//:keyed", output_path=archive_path, latest=True)
+    assert result.returncode == 0
+    shutil.rmtree(cond.output_path)
+    result = cond.restore(archive_path, strict=True)
+    assert result.returncode == 0
+
+    # The restored version is reused at a different commit.
+    (cond.project_root / "README.md").write_text("An updated README.\n")
+    _git(cond, ["commit", "-am", "Update the README."])
+    result = cond.run("//:keyed", this_commit=True)
+    assert result.returncode == 0
+    assert len(_version_dirs(cond, "keyed")) == 1
+
+
+def test_diamond_fingerprints_are_computed_once(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["fingerprint"])
+    # Each layer has two tasks that both depend on both tasks in the layer
+    # below, so each task is reachable through 2^layer paths.
+    num_layers = 12
+    with open(cond.project_root / "COND", "a", encoding="UTF-8") as cond_file:
+        prev_deps: List[str] = []
+        for layer in range(num_layers):
+            for side in ["a", "b"]:
+                cond_file.write(
+                    "\nrun_command(\n"
+                    '  name="layer{}_{}",\n'
+                    '  run="true",\n'
+                    '  inputs=["record.sh"],\n'
+                    "  deps=[{}],\n"
+                    ")\n".format(
+                        layer, side, ", ".join('"{}"'.format(d) for d in prev_deps)
+                    )
+                )
+            prev_deps = [":layer{}_a".format(layer), ":layer{}_b".format(layer)]
+    top = "//:layer{}_a".format(num_layers - 1)
+    result = cond.run(top)
+    assert result.returncode == 0
+
+    num_hashes = 0
+    hash_inputs = FingerprintIndex.hash_inputs
+
+    def counting_hash_inputs(self, *args, **kwargs):
+        nonlocal num_hashes
+        num_hashes += 1
+        return hash_inputs(self, *args, **kwargs)
+
+    monkeypatch.setattr(FingerprintIndex, "hash_inputs", counting_hash_inputs)
+
+    ctx = Context(cond.project_root)
+    task_id = TaskIdentifier.from_str(top)
+    ctx.task_index.load_transitive_closure(task_id)
+    plan = ExecutionPlanner(ctx).create_plan_for(task_id)
+    assert plan.num_tasks_to_run == 0
+    # Each task's inputs are hashed once, even though the planner checks the
+    # fingerprint of every task.
+    assert num_hashes == 2 * num_layers - 1
+
+
+def _set_up_git(cond: ConductorRunner) -> None:
+    _git(cond, ["init", "--initial-branch", "master"])
+    _git(cond, ["add", "."])
+    _git(cond, ["commit", "-m", "First commit."])
+
+
+def _git(cond: ConductorRunner, args: Iterable[str]) -> None:
+    subprocess.run(
+        ["git", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        cwd=cond.project_root,
+    )
+
+
+def _version_dirs(cond: ConductorRunner, task_name: str) -> List[pathlib.Path]:
+    return list(cond.output_path.glob(task_name + TASK_OUTPUT_DIR_SUFFIX + ".*"))
+
+
+def _output_dir(cond: ConductorRunner, task_name: str) -> pathlib.Path:
+    return cond.output_path / (task_name + TASK_OUTPUT_DIR_SUFFIX)
+
+
+def _num_runs(cond: ConductorRunner, task_name: str) -> int:
+    runs_log = _output_dir(cond, task_name) / "runs.log"
+    if not runs_log.exists():
+        return 0
+    return len(runs_log.read_text().splitlines())
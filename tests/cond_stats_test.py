@@ -0,0 +1,65 @@
+import pathlib
+
+from conductor.config import VERSION_INDEX_NAME
+from conductor.execution.version_index import VersionIndex
+from conductor.task_identifier import TaskIdentifier
+from .conductor_runner import ConductorRunner, EXAMPLE_TEMPLATES
+
+
+def test_cond_run_records_executions(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    result = cond.run("//figures:graph")
+    assert result.returncode == 0
+
+    index = VersionIndex.create_or_load(cond.output_path / VERSION_INDEX_NAME)
+    executions = index.get_task_executions()
+    build = TaskIdentifier.from_str("//experiments:build")
+    benchmark = TaskIdentifier.from_str("//experiments:run_benchmark")
+    graph = TaskIdentifier.from_str("//figures:graph")
+    # Both `run_experiment()` and `run_command()` tasks should be recorded.
+    assert set(executions.keys()) == {build, benchmark, graph}
+
+    benchmark_version = index.get_latest_output_version(benchmark)
+    assert benchmark_version is not None
+    for task_id, task_executions in executions.items():
+        assert len(task_executions) == 1
+        execution = task_executions[0]
+        assert execution.wall_time_s >= 0
+        assert execution.cpu_time_s is not None
+        assert execution.peak_rss_kb is not None and execution.peak_rss_kb > 0
+        assert execution.output_bytes is not None
+        if task_id == benchmark:
+            assert execution.version_timestamp == benchmark_version.timestamp
+        else:
+            assert execution.version_timestamp is None
+
+    # Re-running the experiment should add a new record.
+    result = cond.run("//experiments:run_benchmark", again=True)
+    assert result.returncode == 0
+    executions = index.get_task_executions([benchmark])
+    assert len(executions[benchmark]) == 2
+
+
+def test_cond_stats(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    result = cond.stats()
+    assert result.returncode == 0
+    assert "No task execution statistics" in result.stdout.decode("utf-8")
+
+    result = cond.run("//figures:graph")
+    assert result.returncode == 0
+
+    result = cond.stats()
+    assert result.returncode == 0
+    output = result.stdout.decode("utf-8")
+    assert "//experiments:build" in output
+    assert "//experiments:run_benchmark" in output
+    assert "//figures:graph" in output
+
+    # Only the task and its dependencies should be reported.
+    result = cond.stats("//experiments:run_benchmark")
+    assert result.returncode == 0
+    output = result.stdout.decode("utf-8")
+    assert "//experiments:build" in output
+    assert "//experiments:run_benchmark" in output
+    assert "//figures:graph" not in output
@@ -116,6 +116,15 @@ class ConductorRunner:
             cmd.append("--non-existent-ok")
         return self._run_command(cmd)
 
+    def stats(self, task_identifier: Optional[str] = None):
+        cmd = ["stats"]
+        if task_identifier is not None:
+            cmd.append(task_identifier)
+        return self._run_command(cmd)
+
+    def daemon(self, action: str) -> subprocess.CompletedProcess:
+        return self._run_command(["daemon", action])
+
     def find_task_output_dir(
         self, task_identifier: str, is_experiment: bool = True
     ) -> Optional[pathlib.Path]:
@@ -186,6 +195,11 @@ FIXTURE_TEMPLATES = {
     "git-commit": pathlib.Path(_TESTS_DIR, "fixture-projects", "git-commit"),
     "include": pathlib.Path(_TESTS_DIR, "fixture-projects", "include"),
     "cyclic-deps": pathlib.Path(_TESTS_DIR, "fixture-projects", "cyclic-deps"),
+    "daemon": pathlib.Path(_TESTS_DIR, "fixture-projects", "daemon"),
+    "dedup": pathlib.Path(_TESTS_DIR, "fixture-projects", "dedup"),
+    "fingerprint": pathlib.Path(_TESTS_DIR, "fixture-projects", "fingerprint"),
+    "leases": pathlib.Path(_TESTS_DIR, "fixture-projects", "leases"),
     "missing-deps": pathlib.Path(_TESTS_DIR, "fixture-projects", "missing-deps"),
     "remote-envs": pathlib.Path(_TESTS_DIR, "fixture-projects", "remote-envs"),
+    "resources": pathlib.Path(_TESTS_DIR, "fixture-projects", "resources"),
 }
@@ -33,3 +33,72 @@ def test_valid_disable_git(tmp_path: pathlib.Path):
 
     config = ConfigFile.load_from_file(test_file)
     assert config.disable_git == True
+
+
+def test_invalid_cache_cond_files(tmp_path: pathlib.Path):
+    test_file = tmp_path / "config.toml"
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write('cache_cond_files = "yes"\n')
+
+    config = ConfigFile.load_from_file(test_file)
+    with pytest.raises(ConfigInvalidValue):
+        _ = config.cache_cond_files
+
+
+def test_valid_cache_cond_files(tmp_path: pathlib.Path):
+    test_file = tmp_path / "config.toml"
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("cache_cond_files = true\n")
+
+    config = ConfigFile.load_from_file(test_file)
+    assert config.cache_cond_files == True
+
+    empty_file = tmp_path / "empty.toml"
+    empty_file.touch()
+    assert ConfigFile.load_from_file(empty_file).cache_cond_files == False
+
+
+def test_invalid_resources(tmp_path: pathlib.Path):
+    test_file = tmp_path / "config.toml"
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("resources = 123\n")
+
+    config = ConfigFile.load_from_file(test_file)
+    with pytest.raises(ConfigInvalidValue):
+        _ = config.resources
+
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("[resources]\ngpus = -1\n")
+
+    config = ConfigFile.load_from_file(test_file)
+    with pytest.raises(ConfigInvalidValue):
+        _ = config.resources
+
+
+def test_valid_resources(tmp_path: pathlib.Path):
+    test_file = tmp_path / "config.toml"
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("[resources]\ngpus = 2\nmemory_gb = 12.5\n")
+
+    config = ConfigFile.load_from_file(test_file)
+    assert config.resources == {"gpus": 2, "memory_gb": 12.5}
+
+    empty_file = tmp_path / "empty.toml"
+    empty_file.touch()
+    assert ConfigFile.load_from_file(empty_file).resources == {}
+
+
+def test_deduplicate_outputs(tmp_path: pathlib.Path):
+    test_file = tmp_path / "config.toml"
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("deduplicate_outputs = true\n")
+    assert ConfigFile.load_from_file(test_file).deduplicate_outputs == True
+
+    with open(test_file, "w", encoding="UTF-8") as file:
+        file.write("deduplicate_outputs = 1\n")
+    with pytest.raises(ConfigInvalidValue):
+        _ = ConfigFile.load_from_file(test_file).deduplicate_outputs
+
+    empty_file = tmp_path / "empty.toml"
+    empty_file.touch()
+    assert ConfigFile.load_from_file(empty_file).deduplicate_outputs == False
@@ -0,0 +1,86 @@
+import pathlib
+import subprocess
+import time
+
+import pytest
+
+import conductor.execution.version_index as vi
+from conductor.config import VERSION_INDEX_NAME
+from conductor.execution.version_index import VersionIndex
+from conductor.task_identifier import TaskIdentifier
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+
+def test_execution_leases(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    # Separate processes that share a project open separate indexes. The first
+    # index is opened first, so it belongs to the "older" process.
+    index_path = tmp_path / VERSION_INDEX_NAME
+    older = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+    newer = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+    task_id = TaskIdentifier.from_str("//:exp")
+
+    assert older.execution_lease_renewal_due_in() is None
+    assert older.try_acquire_execution_lease(task_id, "abcd")
+    assert older.try_acquire_execution_lease(task_id, "abcd")
+    assert older.execution_lease_renewal_due_in() is not None
+    assert not older.must_wait_for_execution_lease(task_id, "abcd")
+
+    # Other processes cannot acquire the lease. Only newer processes wait for
+    # it, so processes never wait for each other.
+    assert not newer.try_acquire_execution_lease(task_id, "abcd")
+    assert newer.must_wait_for_execution_lease(task_id, "abcd")
+    assert newer.try_acquire_execution_lease(task_id, "efgh")
+    assert not older.try_acquire_execution_lease(task_id, "efgh")
+    assert not older.must_wait_for_execution_lease(task_id, "efgh")
+
+    # Released leases can be acquired by other processes.
+    newer.release_execution_leases()
+    newer.commit_changes()
+    assert newer.execution_lease_renewal_due_in() is None
+    assert older.try_acquire_execution_lease(task_id, "efgh")
+
+    # Stale leases are taken over.
+    monkeypatch.setattr(vi, "EXECUTION_LEASE_TIMEOUT_S", -1.0)
+    assert not newer.must_wait_for_execution_lease(task_id, "abcd")
+    assert newer.try_acquire_execution_lease(task_id, "abcd")
+    monkeypatch.setattr(vi, "EXECUTION_LEASE_TIMEOUT_S", 60.0)
+    assert not older.try_acquire_execution_lease(task_id, "abcd")
+
+    # Leases are renewed once their renewal is due.
+    monkeypatch.setattr(vi, "EXECUTION_LEASE_HEARTBEAT_INTERVAL_S", 0.0)
+    due_in = older.execution_lease_renewal_due_in()
+    assert due_in is not None and due_in <= 0.0
+    older.renew_execution_leases()
+    monkeypatch.setattr(vi, "EXECUTION_LEASE_HEARTBEAT_INTERVAL_S", 10.0)
+    due_in = older.execution_lease_renewal_due_in()
+    assert due_in is not None and due_in > 0.0
+
+
+def test_concurrent_runs_share_results(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["leases"])
+    runs_log = cond.project_root / "runs.log"
+
+    with subprocess.Popen(
+        ["cond", "run", "//:shared"],
+        cwd=cond.project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    ) as first_run:
+        # Wait until the first run is executing the task.
+        deadline = time.monotonic() + 30.0
+        while not runs_log.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert runs_log.exists()
+
+        # The second run waits for the first run and uses its results.
+        result = cond.run("//:shared")
+        assert result.returncode == 0
+        output = result.stdout.decode()
+        assert "Waiting for another Conductor process" in output
+        assert "Using cached results for //:shared" in output
+        assert first_run.wait() == 0
+
+    assert runs_log.read_text().splitlines() == ["run"]
+    result = cond.where("//:shared")
+    assert result.returncode == 0
+    assert pathlib.Path(result.stdout.decode().strip()).is_dir()
@@ -0,0 +1,263 @@
+import pathlib
+import subprocess
+import tempfile
+import threading
+from typing import Optional
+
+import pytest
+
+from conductor.config import CONFIG_FILE_NAME, VERSION_INDEX_NAME
+from conductor.context import Context
+from conductor.errors import ArchiveFileInvalid, InternalError
+from conductor.execution.executor import Executor
+from conductor.execution.handle import OperationExecutionHandle
+from conductor.execution.ops.noop import NoOp
+from conductor.execution.ops.run_task_executable import RunTaskExecutable
+from conductor.execution.ops.transfer_results import (
+    TransferDirection,
+    TransferResults,
+)
+from conductor.execution.operation_state import OperationState
+from conductor.execution.plan import ExecutionPlan
+from conductor.execution.version_index import VersionIndex
+from conductor.task_identifier import TaskIdentifier
+from conductor.task_types.group import Group
+from conductor.utils.output_archiving import ExtractedArchive
+from conductor.utils.run_arguments import RunArguments
+from conductor.utils.run_options import RunOptions
+from conductor.utils.run_resources import RunResources
+import conductor.filename as f
+from conductor.utils.sigchld import ExitedChild, SigchldHelper
+
+
+class _BackgroundOp(NoOp):
+    """
+    Waits (in the background) for `release` to be set.
+    """
+
+    def __init__(self, release: threading.Event, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._release = release
+        self.finished = False
+
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    @property
+    def runs_locally(self) -> bool:
+        return False
+
+    def start_execution(
+        self, ctx: Context, slot: Optional[int]
+    ) -> OperationExecutionHandle:
+        def work() -> str:
+            if not self._release.wait(timeout=10):
+                raise InternalError(details="Background operation was not released.")
+            return "done"
+
+        return OperationExecutionHandle.from_background_work(work)
+
+    def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
+        assert handle.background_result() == "done"
+        self.finished = True
+
+
+class _ReleasingOp(NoOp):
+    """
+    Releases a `_BackgroundOp` when it starts.
+    """
+
+    def __init__(self, release: threading.Event, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._release = release
+        self.slot: Optional[int] = None
+
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+    def start_execution(
+        self, ctx: Context, slot: Optional[int]
+    ) -> OperationExecutionHandle:
+        self.slot = slot
+        self._release.set()
+        return OperationExecutionHandle.from_sync_execution()
+
+
+class _FailingBackgroundOp(NoOp):
+    def start_execution(
+        self, ctx: Context, slot: Optional[int]
+    ) -> OperationExecutionHandle:
+        def work() -> None:
+            raise InternalError(details="Failed in the background.")
+
+        return OperationExecutionHandle.from_background_work(work)
+
+    def finish_execution(self, handle: OperationExecutionHandle, ctx: Context) -> None:
+        handle.background_result()
+
+
+def test_background_op_does_not_block_other_ops(tmp_path: pathlib.Path):
+    ctx = _make_context(tmp_path)
+    release = threading.Event()
+    background = _BackgroundOp(release, **_op_args("background"))
+    releasing = _ReleasingOp(release, **_op_args("releasing"))
+    root = NoOp(**_op_args("root"))
+    for op in [background, releasing]:
+        op.add_dep_of(root)
+        root.add_exe_dep(op)
+
+    # The background operation is dequeued first. If it blocked the executor,
+    # it would never be released.
+    plan = _make_plan(root, [background, releasing, root], [background, releasing])
+    Executor(execution_slots=2, silent=True).run_plan(plan, ctx)
+    assert background.finished
+    assert root.state == OperationState.SUCCEEDED
+
+
+def test_background_op_does_not_take_up_slot(tmp_path: pathlib.Path):
+    ctx = _make_context(tmp_path)
+    release = threading.Event()
+    background = _BackgroundOp(release, **_op_args("background"))
+    releasing = _ReleasingOp(release, **_op_args("releasing"))
+    root = NoOp(**_op_args("root"))
+    for op in [background, releasing]:
+        op.add_dep_of(root)
+        root.add_exe_dep(op)
+
+    # The background operation does not run locally, so the local operation
+    # can run alongside it even though there is only one execution slot.
+    plan = _make_plan(root, [background, releasing, root], [background, releasing])
+    Executor(execution_slots=1, silent=True).run_plan(plan, ctx)
+    assert background.finished
+    assert releasing.slot == 0
+    assert root.state == OperationState.SUCCEEDED
+
+
+def test_background_op_failure(tmp_path: pathlib.Path):
+    ctx = _make_context(tmp_path)
+    background = _FailingBackgroundOp(**_op_args("background"))
+    plan = _make_plan(background, [background], [background])
+    with pytest.raises(InternalError):
+        Executor(execution_slots=1, silent=True).run_plan(plan, ctx)
+    assert background.state == OperationState.FAILED
+
+
+class _FailingTransfer(TransferResults):
+    """
+    Receives an archive whose task outputs are missing, so installing it fails.
+    """
+
+    def start_execution(
+        self, ctx: Context, slot: Optional[int]
+    ) -> OperationExecutionHandle:
+        staging_path = pathlib.Path(tempfile.mkdtemp(dir=ctx.output_path))
+        extracted = ExtractedArchive(
+            staging_path=staging_path,
+            versioned_tasks=self.versioned_tasks,
+            unversioned_tasks=[],
+            version_fingerprints={},
+        )
+        return OperationExecutionHandle.from_background_work(lambda: extracted)
+
+
+def test_failed_transfer_keeps_finished_versions(tmp_path: pathlib.Path):
+    ctx = _make_context(tmp_path)
+    exp_id = TaskIdentifier.from_str("//:exp")
+    exp_task = Group(identifier=exp_id, cond_file_path=pathlib.Path("."), deps=[])
+    exp_version = ctx.version_index.generate_new_output_version(commit=None)
+    exp = RunTaskExecutable(
+        initial_state=OperationState.QUEUED,
+        identifier=exp_id,
+        task=exp_task,
+        run="true",
+        args=RunArguments([]),
+        options=RunOptions({}),
+        working_path=tmp_path,
+        output_path=ctx.output_path / f.task_output_dir(exp_id, exp_version),
+        deps_output_paths=[],
+        record_output=False,
+        version_to_record=exp_version,
+        serialize_args_options=False,
+        parallelizable=False,
+        resources=RunResources({}),
+        mutex=None,
+    )
+    remote_id = TaskIdentifier.from_str("//:remote")
+    transfer = _FailingTransfer(
+        initial_state=OperationState.QUEUED,
+        env_name="env",
+        workspace_rel_project_root=pathlib.Path("."),
+        versioned_tasks=[
+            (remote_id, ctx.version_index.generate_new_output_version(commit=None))
+        ],
+        unversioned_tasks=[],
+        direction=TransferDirection.FromEnv,
+    )
+    exp.add_dep_of(transfer)
+    transfer.add_exe_dep(exp)
+
+    # The transfer fails right after the experiment succeeds (i.e., while the
+    # experiment's version is waiting for a group commit).
+    plan = ExecutionPlan(
+        task_to_run=exp_task,
+        all_ops=[exp, transfer],
+        root_op=transfer,
+        initial_ops=[exp],
+        cached_tasks=[],
+        num_tasks_to_run=2,
+        used_envs=set(),
+    )
+    with pytest.raises(ArchiveFileInvalid):
+        Executor(execution_slots=1, silent=True).run_plan(plan, ctx)
+    assert exp.state == OperationState.SUCCEEDED
+    assert transfer.state == OperationState.FAILED
+
+    # Undoing the failed transfer does not undo the experiment's version.
+    index = VersionIndex.create_or_load(ctx.output_path / VERSION_INDEX_NAME)
+    assert index.get_all_versions() == [(exp_id, exp_version)]
+
+
+def test_sigchld_only_reaps_tracked_processes():
+    helper = SigchldHelper.instance()
+    with helper.track():
+        tracked = subprocess.Popen(["sh", "-c", "exit 7"])
+        helper.track_pid(tracked.pid)
+        # Untracked processes keep their exit codes (they used to be reaped by
+        # our SIGCHLD handler).
+        for _ in range(10):
+            result = subprocess.run(["sh", "-c", "exit 3"], check=False)
+            assert result.returncode == 3
+        event = helper.wait()
+        assert isinstance(event, ExitedChild)
+        assert event.pid == tracked.pid
+        assert event.returncode == 7
+
+
+def _make_context(project_root: pathlib.Path) -> Context:
+    (project_root / CONFIG_FILE_NAME).touch()
+    return Context(project_root)
+
+
+def _op_args(name: str) -> dict:
+    task_id = TaskIdentifier.from_str("//:{}".format(name))
+    task = Group(identifier=task_id, cond_file_path=pathlib.Path("."), deps=[])
+    return {
+        "initial_state": OperationState.QUEUED,
+        "identifier": task_id,
+        "task": task,
+    }
+
+
+def _make_plan(root: NoOp, all_ops, initial_ops) -> ExecutionPlan:
+    assert root.main_task is not None
+    return ExecutionPlan(
+        task_to_run=root.main_task,
+        all_ops=all_ops,
+        root_op=root,
+        initial_ops=initial_ops,
+        cached_tasks=[],
+        num_tasks_to_run=len(all_ops),
+        used_envs=set(),
+    )
@@ -0,0 +1,139 @@
+import pathlib
+from typing import List
+
+from conductor.execution.executor import (
+    _ReadyToRunQueue,
+    compute_critical_path_priorities,
+)
+from conductor.execution.ops.noop import NoOp
+from conductor.execution.ops.operation import Operation
+from conductor.execution.operation_state import OperationState
+from conductor.task_identifier import TaskIdentifier
+from conductor.task_types.group import Group
+
+
+class _ParallelNoOp(NoOp):
+    @property
+    def parallelizable(self) -> bool:
+        return True
+
+
+def test_critical_path_priorities():
+    # a -> b -> c -> d
+    #   \-> e
+    # f
+    a = _make_op("a")
+    b = _make_op("b")
+    c = _make_op("c")
+    d = _make_op("d")
+    e = _make_op("e")
+    f = _make_op("f")
+    _link(a, b)
+    _link(b, c)
+    _link(c, d)
+    _link(a, e)
+
+    priorities = compute_critical_path_priorities([a, b, c, d, e, f], lambda _: 1.0)
+    assert priorities[id(a)] == 4.0
+    assert priorities[id(b)] == 3.0
+    assert priorities[id(c)] == 2.0
+    assert priorities[id(d)] == 1.0
+    assert priorities[id(e)] == 1.0
+    assert priorities[id(f)] == 1.0
+
+
+def test_critical_path_priorities_costs():
+    # a -> b (cost 1 each), c -> d (c is expensive).
+    a = _make_op("a")
+    b = _make_op("b")
+    c = _make_op("c")
+    d = _make_op("d")
+    _link(a, b)
+    _link(c, d)
+    costs = {id(a): 1.0, id(b): 1.0, id(c): 10.0, id(d): 1.0}
+
+    priorities = compute_critical_path_priorities(
+        [a, b, c, d], lambda op: costs[id(op)]
+    )
+    assert priorities[id(a)] == 2.0
+    assert priorities[id(c)] == 11.0
+
+
+def test_ready_queue_longest_path_first():
+    # Three independent chains of different lengths, all ready at once.
+    short = _make_op("short")
+    medium = _make_op("medium")
+    long = _make_op("long")
+    prev = medium
+    for op in _make_ops(["m1"]):
+        _link(prev, op)
+        prev = op
+    prev = long
+    for op in _make_ops(["l1", "l2", "l3"]):
+        _link(prev, op)
+        prev = op
+
+    queue = _ReadyToRunQueue()
+    all_ops = [short, medium, long]
+    queue.load(all_ops, compute_critical_path_priorities(all_ops, lambda _: 1.0))
+    dequeued = [queue.dequeue_next() for _ in range(3)]
+    assert dequeued == [long, medium, short]
+    assert not queue.has_ops()
+
+
+def test_ready_queue_ties_are_fifo():
+    ops = _make_ops(["a", "b", "c"])
+    queue = _ReadyToRunQueue()
+    queue.load(ops, compute_critical_path_priorities(ops, lambda _: 1.0))
+    assert [queue.dequeue_next() for _ in range(3)] == ops
+
+
+def test_ready_queue_parallelizable_first():
+    sequential = _make_op("seq")
+    long_sequential = _make_op("long_seq")
+    for op in _make_ops(["s1", "s2"]):
+        _link(long_sequential, op)
+    parallel = _make_op("par", parallelizable=True)
+
+    queue = _ReadyToRunQueue()
+    all_ops = [sequential, long_sequential, parallel]
+    queue.load(all_ops, compute_critical_path_priorities(all_ops, lambda _: 1.0))
+    assert queue.has_parallelizable_ops()
+    assert queue.dequeue_next() == parallel
+    assert not queue.has_parallelizable_ops()
+    assert queue.dequeue_next() == long_sequential
+    assert queue.dequeue_next() == sequential
+
+
+def test_ready_queue_dequeue_parallelizable_that_fits():
+    long = _make_op("long", parallelizable=True)
+    short = _make_op("short", parallelizable=True)
+    for op in _make_ops(["l1", "l2"]):
+        _link(long, op)
+
+    queue = _ReadyToRunQueue()
+    all_ops = [short, long]
+    queue.load(all_ops, compute_critical_path_priorities(all_ops, lambda _: 1.0))
+
+    # The highest priority operation is skipped if it cannot run, but it stays
+    # in the queue.
+    assert queue.dequeue_next_parallelizable(lambda op: op is not long) == short
+    assert queue.dequeue_next_parallelizable(lambda op: False) is None
+    assert queue.dequeue_next_parallelizable(lambda op: True) == long
+    assert not queue.has_ops()
+
+
+def _make_op(name: str, parallelizable: bool = False) -> Operation:
+    op_class = _ParallelNoOp if parallelizable else NoOp
+    task_id = TaskIdentifier.from_str("//:{}".format(name))
+    task = Group(identifier=task_id, cond_file_path=pathlib.Path("."), deps=[])
+    return op_class(initial_state=OperationState.QUEUED, identifier=task_id, task=task)
+
+
+def _make_ops(names: List[str], parallelizable: bool = False) -> List[Operation]:
+    return [_make_op(name, parallelizable) for name in names]
+
+
+def _link(upstream: Operation, downstream: Operation) -> None:
+    upstream.add_dep_of(downstream)
+    downstream.add_exe_dep(upstream)
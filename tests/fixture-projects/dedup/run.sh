@@ -0,0 +1,6 @@
+#! /bin/bash
+
+# The same (incompressible) data in every version.
+python3 -c "import random, sys; sys.stdout.buffer.write(random.Random(0).getrandbits(8 << 20).to_bytes(1 << 20, 'little'))" > "$COND_OUT/data.bin"
+# Different in every version.
+date +%s%N > "$COND_OUT/result.txt"
@@ -0,0 +1,4 @@
+#! /bin/bash
+
+# Records each run of the task in its output directory.
+echo "$1" >> "$COND_OUT/runs.log"
@@ -0,0 +1,6 @@
+#! /bin/bash
+
+# Records each run of the task (in the project root) and then takes long
+# enough for another `cond run` to start while it is running.
+echo "run" >> runs.log
+sleep 2
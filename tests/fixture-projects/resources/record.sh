@@ -0,0 +1,9 @@
+#! /bin/bash
+
+# Records when this task starts and finishes running (and its slot).
+echo "Started ${COND_NAME}"
+date +%s.%N > ${COND_OUT}/start.txt
+echo "${COND_SLOT:-none}" > ${COND_OUT}/slot.txt
+sleep ${1:-0.5}
+date +%s.%N > ${COND_OUT}/end.txt
+echo "Finished ${COND_NAME}" >&2
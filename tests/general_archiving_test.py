@@ -1,14 +1,22 @@
+import os
 import pathlib
+import shutil
+from typing import List
+
+import pytest
 from conductor.config import VERSION_INDEX_NAME
 from conductor.context import Context
 from conductor.execution.version_index import VersionIndex
 from conductor.task_identifier import TaskIdentifier
+from conductor.errors import ArchiveFileInvalid, DuplicateTaskOutput
+from conductor.utils.compression import ZstdProgramCompressor
 from conductor.utils.output_archiving import (
     create_archive,
     restore_archive,
+    ArchiveProgress,
     ArchiveType,
 )
-from .conductor_runner import ConductorRunner, EXAMPLE_TEMPLATES
+from .conductor_runner import ConductorRunner, count_task_outputs, EXAMPLE_TEMPLATES
 
 
 def test_overall_archiving(tmp_path: pathlib.Path):
@@ -54,3 +62,163 @@ def test_overall_archiving(tmp_path: pathlib.Path):
     assert figures_out_dir.exists()
     assert figures_out_dir.is_dir()
     assert (figures_out_dir / "graph.csv").exists()
+
+
+def test_restore_without_renames(tmp_path: pathlib.Path, monkeypatch):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    result = cond.run("//figures:graph")
+    assert result.returncode == 0
+
+    run_benchmark_id = TaskIdentifier.from_str("//experiments:run_benchmark")
+    figures_id = TaskIdentifier.from_str("//figures:graph")
+    version_index = VersionIndex.create_or_load(cond.output_path / VERSION_INDEX_NAME)
+    versions = version_index.get_all_versions_for_task(run_benchmark_id)
+    assert len(versions) == 1
+
+    ctx = Context(cond.project_root)
+    ctx.task_index.load_transitive_closure(figures_id)
+    archive_output_path = cond.project_root / "test_archive.tar.gz"
+    create_archive(
+        ctx,
+        [(run_benchmark_id, versions[0]), (figures_id, None)],
+        archive_output_path,
+        archive_type=ArchiveType.Gzip,
+    )
+    result = cond.clean()
+    assert result.returncode == 0
+
+    # An existing unversioned output is merged with the restored one.
+    figures_out_dir = cond.output_path / "figures" / "graph.task"
+    figures_out_dir.mkdir(parents=True)
+    (figures_out_dir / "extra.txt").touch()
+
+    # Restoring falls back to copying if renames fail (e.g., across file
+    # systems).
+    def failing_rename(src, dest):
+        raise OSError("Simulated rename failure.")
+
+    monkeypatch.setattr(os, "rename", failing_rename)
+    monkeypatch.setattr(os, "replace", failing_rename)
+    ctx = Context(cond.project_root)
+    num_restored = restore_archive(
+        ctx, archive_output_path, archive_type=ArchiveType.Gzip
+    )
+    monkeypatch.undo()
+    assert num_restored == 2
+
+    expt_out_dir = cond.find_task_output_dir(str(run_benchmark_id), is_experiment=True)
+    assert expt_out_dir is not None
+    assert (expt_out_dir / "results.csv").exists()
+    assert (figures_out_dir / "graph.csv").exists()
+    assert (figures_out_dir / "extra.txt").exists()
+
+
+def test_archive_without_external_programs(tmp_path: pathlib.Path, monkeypatch):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    result = cond.run("//figures:graph")
+    assert result.returncode == 0
+
+    run_benchmark_id = TaskIdentifier.from_str("//experiments:run_benchmark")
+    figures_id = TaskIdentifier.from_str("//figures:graph")
+    ctx = Context(cond.project_root)
+    ctx.task_index.load_transitive_closure(figures_id)
+    versions = ctx.version_index.get_all_versions_for_task(run_benchmark_id)
+    to_archive = [(run_benchmark_id, versions[0]), (figures_id, None)]
+
+    # Gzip archives are created and restored in-process (without `tar`).
+    archive_output_path = cond.project_root / "test_archive.tar.gz"
+    progress: List[ArchiveProgress] = []
+    with monkeypatch.context() as m:
+        m.setenv("PATH", "")
+        num_archived = create_archive(
+            ctx,
+            to_archive,
+            archive_output_path,
+            archive_type=ArchiveType.Gzip,
+            progress=progress.append,
+        )
+    assert num_archived == 2
+    assert len(progress) > 0
+    final = progress[-1]
+    assert isinstance(final, ArchiveProgress)
+    assert final.num_bytes > archive_output_path.stat().st_size
+
+    result = cond.clean()
+    assert result.returncode == 0
+    ctx = Context(cond.project_root)
+    progress.clear()
+    with monkeypatch.context() as m:
+        m.setenv("PATH", "")
+        num_restored = restore_archive(
+            ctx, archive_output_path, ArchiveType.Gzip, progress=progress.append
+        )
+    assert num_restored == 2
+    assert progress[-1].num_bytes > 0
+
+    expt_out_dir = cond.find_task_output_dir(str(run_benchmark_id), is_experiment=True)
+    assert expt_out_dir is not None
+    assert (expt_out_dir / "results.csv").exists()
+    assert (cond.output_path / "figures" / "graph.task" / "graph.csv").exists()
+
+    # Restoring the same outputs again should fail in strict mode, without
+    # changing the existing outputs.
+    ctx = Context(cond.project_root)
+    with pytest.raises(DuplicateTaskOutput):
+        restore_archive(
+            ctx, archive_output_path, ArchiveType.Gzip, expect_no_duplicates=True
+        )
+    assert (expt_out_dir / "results.csv").exists()
+
+
+def test_restore_corrupted_archive(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    result = cond.run("//experiments:run_benchmark")
+    assert result.returncode == 0
+
+    run_benchmark_id = TaskIdentifier.from_str("//experiments:run_benchmark")
+    ctx = Context(cond.project_root)
+    ctx.task_index.load_transitive_closure(run_benchmark_id)
+    versions = ctx.version_index.get_all_versions_for_task(run_benchmark_id)
+    archive_output_path = cond.project_root / "test_archive.tar.gz"
+    create_archive(
+        ctx,
+        [(run_benchmark_id, versions[0])],
+        archive_output_path,
+        archive_type=ArchiveType.Gzip,
+    )
+    truncated_path = cond.project_root / "truncated.tar.gz"
+    with open(archive_output_path, "rb") as file:
+        data = file.read()
+    with open(truncated_path, "wb") as file:
+        # Drop the end of the compressed stream (most members are still
+        # readable).
+        file.write(data[: len(data) - 16])
+
+    result = cond.clean()
+    assert result.returncode == 0
+    ctx = Context(cond.project_root)
+    with pytest.raises(ArchiveFileInvalid):
+        restore_archive(ctx, truncated_path, ArchiveType.Gzip)
+
+    # The failed restore should not leave any task outputs behind.
+    experiments_dir = cond.output_path / "experiments"
+    assert not experiments_dir.exists() or count_task_outputs(experiments_dir) == 0
+    assert len(ctx.version_index.get_all_versions_for_task(run_benchmark_id)) == 0
+
+
+def test_zstd_program_round_trip(tmp_path: pathlib.Path):
+    program = shutil.which("zstd")
+    if program is None:
+        pytest.skip("The zstd utility is not installed.")
+    compressor = ZstdProgramCompressor(program)
+    data = os.urandom(1024) * 64
+
+    archive_path = tmp_path / "data.zst"
+    with open(archive_path, "wb") as out_file:
+        with compressor.compress(out_file) as compressed:
+            compressed.write(data)
+    assert archive_path.stat().st_size < len(data)
+
+    with open(archive_path, "rb") as in_file:
+        with compressor.decompress(in_file) as decompressed:
+            assert decompressed.read(len(data)) == data
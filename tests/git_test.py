@@ -1,7 +1,7 @@
 import pathlib
 import subprocess
 
-from conductor.utils.git import Git
+from conductor.utils.git import Git, CommitGraph
 from conductor.config import COND_FILE_NAME
 from .git_utils import setup_git, create_commit
 
@@ -122,6 +122,64 @@ def test_distance(tmp_path: pathlib.Path):
     assert g.is_ancestor(commit3, commit2)
 
 
+def test_commit_graph_matches_git(tmp_path: pathlib.Path):
+    setup_git(tmp_path, initialize=False)
+    root = create_commit(tmp_path, "Root")
+    main1 = create_commit(tmp_path, "Main1")
+
+    # Create a side branch and merge it back.
+    results = subprocess.run(
+        ["git", "checkout", "-b", "side"], cwd=tmp_path, check=False
+    )
+    assert results.returncode == 0
+    side1 = create_commit(tmp_path, "Side1")
+    side2 = create_commit(tmp_path, "Side2")
+    results = subprocess.run(["git", "checkout", "-"], cwd=tmp_path, check=False)
+    assert results.returncode == 0
+    main2 = create_commit(tmp_path, "Main2")
+    results = subprocess.run(
+        ["git", "merge", "--no-ff", "-m", "Merge", "side"], cwd=tmp_path, check=False
+    )
+    assert results.returncode == 0
+    head = create_commit(tmp_path, "Main3")
+
+    g = Git(tmp_path)
+    merge = g.rev_parse("HEAD~1")
+    assert merge is not None
+    graph = g.load_commit_graph(head)
+    assert graph is not None
+    assert isinstance(graph, CommitGraph)
+    assert len(graph) == 7
+
+    commits = [root, main1, side1, side2, main2, merge, head]
+    for commit in commits:
+        assert commit in graph
+        for candidate in commits:
+            assert graph.is_ancestor(commit, candidate) == g.is_ancestor(
+                commit, candidate
+            )
+            if g.is_ancestor(commit, candidate):
+                assert graph.get_distance(commit, candidate) == g.get_distance(
+                    commit, candidate
+                )
+
+
+def test_commit_graph_outside_commits(tmp_path: pathlib.Path):
+    setup_git(tmp_path, initialize=False)
+    commit1 = create_commit(tmp_path, "C1")
+    commit2 = create_commit(tmp_path, "C2")
+
+    g = Git(tmp_path)
+    graph = g.load_commit_graph(commit1)
+    assert graph is not None
+    assert commit2 not in graph
+
+    # Queries about commits outside the graph fall back to `git`.
+    assert graph.is_ancestor(commit2, commit1)
+    assert not graph.is_ancestor(commit1, commit2)
+    assert graph.get_distance(commit2, commit1) == 1
+
+
 def test_create_unpack_bundle(tmp_path: pathlib.Path):
     orig_git = tmp_path / "orig"
     orig_git.mkdir(exist_ok=True, parents=True)
@@ -155,6 +213,46 @@ def test_create_unpack_bundle(tmp_path: pathlib.Path):
     assert (new_git / "test.txt").exists()
 
 
+def test_create_incremental_bundle(tmp_path: pathlib.Path):
+    orig_git = tmp_path / "orig"
+    orig_git.mkdir()
+    setup_git(orig_git, initialize=True)
+    commit1 = create_commit(orig_git, "Commit 1")
+    commit2 = create_commit(orig_git, "Commit 2")
+
+    g = Git(orig_git)
+    missing = "0" * 40
+    assert g.find_existing_commits([commit1, missing, commit2]) == [commit1, commit2]
+    assert g.find_existing_commits([]) == []
+
+    # The incremental bundle only contains commits that are not reachable from
+    # the excluded commits.
+    full_bundle = tmp_path / "full.bundle"
+    incremental_bundle = tmp_path / "incremental.bundle"
+    assert g.create_bundle("HEAD", full_bundle)
+    assert g.create_bundle("HEAD", incremental_bundle, exclude=[commit1])
+    assert incremental_bundle.stat().st_size < full_bundle.stat().st_size
+
+    # The bundle can only be unpacked in a repository that has `commit1`.
+    result = subprocess.run(
+        ["git", "bundle", "verify", str(incremental_bundle)],
+        cwd=orig_git,
+        check=False,
+        capture_output=True,
+    )
+    assert result.returncode == 0
+    empty_git = tmp_path / "empty"
+    empty_git.mkdir()
+    setup_git(empty_git, initialize=False)
+    result = subprocess.run(
+        ["git", "bundle", "verify", str(incremental_bundle)],
+        cwd=empty_git,
+        check=False,
+        capture_output=True,
+    )
+    assert result.returncode != 0
+
+
 def test_find_cond_files(tmp_path: pathlib.Path):
     setup_git(tmp_path, initialize=True)
 
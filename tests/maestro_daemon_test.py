@@ -0,0 +1,443 @@
+import asyncio
+import pathlib
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from conductor.config import (
+    MAESTRO_BUNDLE_LOCATION,
+    MAESTRO_WORKSPACE_LOCATION,
+    STDERR_LOG_FILE,
+    STDOUT_LOG_FILE,
+)
+from conductor.context import Context
+from conductor.envs.maestro.daemon import Maestro
+from conductor.envs.maestro.interface import ExecuteTaskType, TaskOutputStream
+from conductor.execution.version_index import Version
+from conductor.task_identifier import TaskIdentifier
+from conductor.utils.git import Git
+from conductor.utils.output_archiving import ArchiveType
+from .conductor_runner import FIXTURE_TEMPLATES
+from .git_utils import setup_git
+from .run_resources_test import max_concurrency
+
+_WORKSPACE_NAME = "workspace"
+_PROJECT_ROOT = pathlib.Path("root")
+
+
+def test_maestro_runs_parallelizable_tasks_concurrently(tmp_path: pathlib.Path):
+    maestro, project_root = _create_maestro(tmp_path, max_concurrent_tasks=2)
+    task_ids = ["//:shared-{}".format(i) for i in range(4)]
+    results = _execute_tasks(maestro, project_root, task_ids)
+
+    intervals = [interval for interval, _ in results]
+    slots = {slot for _, slot in results}
+    # At most two tasks run at a time, and they use the two available slots.
+    assert max_concurrency(intervals) == 2
+    assert slots == {"0", "1"}
+
+
+def test_maestro_runs_other_tasks_exclusively(tmp_path: pathlib.Path):
+    maestro, project_root = _create_maestro(tmp_path, max_concurrent_tasks=4)
+    task_ids = ["//:shared-0", "//:sequential-0", "//:shared-1", "//:sequential-1"]
+    results = _execute_tasks(maestro, project_root, task_ids)
+
+    shared = [results[0][0], results[2][0]]
+    for sequential_interval, slot in [results[1], results[3]]:
+        assert slot == "none"
+        # A task that is not parallelizable does not overlap with any other
+        # task.
+        for interval in shared:
+            assert max_concurrency([sequential_interval, interval]) == 1
+    assert max_concurrency([results[1][0], results[3][0]]) == 1
+
+
+def test_maestro_streams_task_output(tmp_path: pathlib.Path):
+    maestro, project_root = _create_maestro(tmp_path, max_concurrent_tasks=2)
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    version = Version(timestamp=1, commit_hash=None, has_uncommitted_changes=False)
+    received: Dict[TaskOutputStream, bytes] = {
+        TaskOutputStream.Stdout: b"",
+        TaskOutputStream.Stderr: b"",
+    }
+
+    def output_sink(stream: TaskOutputStream, data: bytes) -> None:
+        received[stream] += data
+
+    asyncio.run(
+        maestro.execute_task(
+            _WORKSPACE_NAME,
+            _PROJECT_ROOT,
+            task_id,
+            {},
+            ExecuteTaskType.RunExperiment,
+            version,
+            output_sink,
+        )
+    )
+    assert received[TaskOutputStream.Stdout] == b"Started shared-0\n"
+    assert received[TaskOutputStream.Stderr] == b"Finished shared-0\n"
+
+    # The streamed output is still recorded in the task's logs.
+    ctx = Context(project_root)
+    ctx.task_index.load_transitive_closure(task_id)
+    output_path = ctx.task_index.get_task(task_id).get_specific_output_path(
+        ctx, version
+    )
+    assert output_path is not None
+    assert _read(output_path / STDOUT_LOG_FILE) == "Started shared-0"
+    assert _read(output_path / STDERR_LOG_FILE) == "Finished shared-0"
+
+
+def test_maestro_creates_workspaces_from_mirror(tmp_path: pathlib.Path):
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    setup_git(repo_root, initialize=True)
+    commit1 = _commit_file(repo_root, "file1.txt")
+    git = Git(repo_root)
+
+    maestro_root = tmp_path / "maestro"
+    maestro = Maestro(maestro_root, max_concurrent_tasks=1)
+    rel_bundle_path = pathlib.Path(MAESTRO_BUNDLE_LOCATION) / "repo.bundle"
+    (maestro_root / MAESTRO_BUNDLE_LOCATION).mkdir(parents=True)
+
+    async def create_workspace(commit_hash: str) -> pathlib.Path:
+        # Only send the commits that Maestro does not already have.
+        remote_commits = await maestro.get_repository_commits("repo")
+        if commit_hash in remote_commits:
+            bundle_path = None
+        else:
+            assert git.create_bundle(
+                "HEAD", maestro_root / rel_bundle_path, exclude=remote_commits
+            )
+            bundle_path = rel_bundle_path
+        workspace_name = await maestro.unpack_bundle("repo", commit_hash, bundle_path)
+        return maestro_root / MAESTRO_WORKSPACE_LOCATION / workspace_name
+
+    workspace1 = asyncio.run(create_workspace(commit1))
+    assert (workspace1 / "file1.txt").exists()
+    assert asyncio.run(maestro.get_repository_commits("repo")) == [commit1]
+
+    # The second bundle is incremental.
+    commit2 = _commit_file(repo_root, "file2.txt")
+    workspace2 = asyncio.run(create_workspace(commit2))
+    assert workspace2 != workspace1
+    assert (workspace2 / "file1.txt").exists()
+    assert (workspace2 / "file2.txt").exists()
+    assert not (workspace1 / "file2.txt").exists()
+
+    # Maestro already has the commit, so no bundle is needed.
+    workspace3 = asyncio.run(create_workspace(commit2))
+    assert (workspace3 / "file2.txt").exists()
+    assert asyncio.run(maestro.get_repository_commits("repo")) == sorted(
+        [commit1, commit2]
+    )
+
+
+def test_maestro_restores_cached_task_outputs(tmp_path: pathlib.Path):
+    maestro_root = tmp_path / "maestro"
+    maestro = Maestro(maestro_root, max_concurrent_tasks=1)
+    commit_hash, rel_bundle_path = _create_repo_bundle(tmp_path, maestro_root)
+
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    other_task_id = TaskIdentifier.from_str("//:shared-1")
+    version = Version(
+        timestamp=1, commit_hash=commit_hash, has_uncommitted_changes=False
+    )
+    other_version = Version(
+        timestamp=2, commit_hash=commit_hash, has_uncommitted_changes=False
+    )
+
+    async def run():
+        # Running the task in one workspace adds its output to the store.
+        workspace1 = await maestro.unpack_bundle("repo", commit_hash, rel_bundle_path)
+        await maestro.execute_task(
+            workspace1,
+            pathlib.Path("."),
+            task_id,
+            {},
+            ExecuteTaskType.RunExperiment,
+            version,
+        )
+        # So a later workspace does not need it to be transferred.
+        workspace2 = await maestro.unpack_bundle("repo", commit_hash, None)
+        restored = await maestro.restore_cached_task_outputs(
+            workspace2,
+            pathlib.Path("."),
+            [(task_id, version), (other_task_id, other_version)],
+        )
+        return workspace2, restored
+
+    workspace2, restored = asyncio.run(run())
+    assert restored == [(task_id, version)]
+
+    ctx = Context(maestro_root / MAESTRO_WORKSPACE_LOCATION / workspace2)
+    ctx.task_index.load_transitive_closure(task_id)
+    assert ctx.version_index.get_all_versions() == [(task_id, version)]
+    output_path = ctx.task_index.get_task(task_id).get_specific_output_path(
+        ctx, version
+    )
+    assert output_path is not None
+    assert _read(output_path / "slot.txt") == "none"
+
+
+def test_maestro_does_not_restore_other_projects_outputs(tmp_path: pathlib.Path):
+    maestro_root = tmp_path / "maestro"
+    maestro = Maestro(maestro_root, max_concurrent_tasks=1)
+    commit_hash, rel_bundle_path = _create_repo_bundle(tmp_path, maestro_root)
+
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    version = Version(
+        timestamp=1, commit_hash=commit_hash, has_uncommitted_changes=False
+    )
+    # For example, produced by another project with the same name.
+    other_version = Version(
+        timestamp=1, commit_hash="0" * 40, has_uncommitted_changes=False
+    )
+    uncommitted_version = Version(
+        timestamp=2, commit_hash=None, has_uncommitted_changes=True
+    )
+
+    async def run():
+        workspace1 = await maestro.unpack_bundle("repo", commit_hash, rel_bundle_path)
+        for v in [version, uncommitted_version]:
+            await maestro.execute_task(
+                workspace1,
+                pathlib.Path("."),
+                task_id,
+                {},
+                ExecuteTaskType.RunExperiment,
+                v,
+            )
+        workspace2 = await maestro.unpack_bundle("repo", commit_hash, None)
+        return await maestro.restore_cached_task_outputs(
+            workspace2,
+            pathlib.Path("."),
+            [(task_id, other_version), (task_id, uncommitted_version)],
+        )
+
+    # Versions without a commit are not stored.
+    assert asyncio.run(run()) == []
+
+
+def test_maestro_restores_over_leftover_outputs(tmp_path: pathlib.Path):
+    maestro_root = tmp_path / "maestro"
+    maestro = Maestro(maestro_root, max_concurrent_tasks=1)
+    commit_hash, rel_bundle_path = _create_repo_bundle(tmp_path, maestro_root)
+
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    version = Version(
+        timestamp=1, commit_hash=commit_hash, has_uncommitted_changes=False
+    )
+
+    async def create_workspaces():
+        workspace1 = await maestro.unpack_bundle("repo", commit_hash, rel_bundle_path)
+        await maestro.execute_task(
+            workspace1,
+            pathlib.Path("."),
+            task_id,
+            {},
+            ExecuteTaskType.RunExperiment,
+            version,
+        )
+        return await maestro.unpack_bundle("repo", commit_hash, None)
+
+    workspace2 = asyncio.run(create_workspaces())
+    ctx = Context(maestro_root / MAESTRO_WORKSPACE_LOCATION / workspace2)
+    ctx.task_index.load_transitive_closure(task_id)
+    # For example, left behind by an interrupted transfer.
+    leftover_path = ctx.task_index.get_task(task_id).get_specific_output_path(
+        ctx, version
+    )
+    assert leftover_path is not None
+    leftover_path.mkdir(parents=True)
+    (leftover_path / "slot.txt").write_text("partial")
+
+    restored = asyncio.run(
+        maestro.restore_cached_task_outputs(
+            workspace2, pathlib.Path("."), [(task_id, version)]
+        )
+    )
+    assert restored == [(task_id, version)]
+    assert _read(leftover_path / "slot.txt") == "none"
+
+
+def test_maestro_streams_task_output_archives(tmp_path: pathlib.Path):
+    maestro, project_root = _create_maestro(tmp_path, max_concurrent_tasks=1)
+    other_workspace = tmp_path / "maestro" / MAESTRO_WORKSPACE_LOCATION / "other"
+    other_workspace.mkdir()
+    shutil.copytree(FIXTURE_TEMPLATES["resources"], other_workspace / _PROJECT_ROOT)
+
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    version = Version(timestamp=1, commit_hash=None, has_uncommitted_changes=False)
+    assert asyncio.run(_transfer_task_output(maestro, task_id, version)) == 1
+
+    ctx = Context(other_workspace / _PROJECT_ROOT)
+    ctx.task_index.load_transitive_closure(task_id)
+    assert ctx.version_index.get_all_versions() == [(task_id, version)]
+    output_path = ctx.task_index.get_task(task_id).get_specific_output_path(
+        ctx, version
+    )
+    assert output_path is not None
+    assert _read(output_path / STDOUT_LOG_FILE) == "Started shared-0"
+    # The staging directory was cleaned up.
+    assert sorted(p.name for p in ctx.output_path.iterdir()) == sorted(
+        p.name for p in Context(project_root).output_path.iterdir()
+    )
+
+
+def test_maestro_transfers_with_few_executor_threads(tmp_path: pathlib.Path):
+    maestro, _ = _create_maestro(tmp_path, max_concurrent_tasks=1)
+    other_workspace = tmp_path / "maestro" / MAESTRO_WORKSPACE_LOCATION / "other"
+    other_workspace.mkdir()
+    shutil.copytree(FIXTURE_TEMPLATES["resources"], other_workspace / _PROJECT_ROOT)
+
+    task_id = TaskIdentifier.from_str("//:shared-0")
+    version = Version(timestamp=1, commit_hash=None, has_uncommitted_changes=False)
+
+    async def run():
+        # The transfers must not need more than one of the event loop's
+        # default executor threads.
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+        return await asyncio.wait_for(
+            _transfer_task_output(maestro, task_id, version), timeout=30
+        )
+
+    assert asyncio.run(run()) == 1
+
+
+async def _transfer_task_output(
+    maestro: Maestro, task_id: TaskIdentifier, version: Version
+) -> int:
+    await maestro.execute_task(
+        _WORKSPACE_NAME,
+        _PROJECT_ROOT,
+        task_id,
+        {},
+        ExecuteTaskType.RunExperiment,
+        version,
+    )
+    # Pack the task's output in one workspace and stream the archive (in
+    # small chunks) into the other workspace.
+    chunks = [
+        data
+        async for data in maestro.pack_task_outputs(
+            _WORKSPACE_NAME,
+            _PROJECT_ROOT,
+            [(task_id, version)],
+            [],
+            ArchiveType.Gzip,
+        )
+    ]
+    archive = b"".join(chunks)
+
+    async def archive_data():
+        for offset in range(0, len(archive), 64):
+            yield archive[offset : offset + 64]
+
+    return await maestro.unpack_task_outputs(
+        "other", _PROJECT_ROOT, ArchiveType.Gzip, archive_data()
+    )
+
+
+def _create_repo_bundle(
+    tmp_path: pathlib.Path, maestro_root: pathlib.Path
+) -> Tuple[str, pathlib.Path]:
+    repo_root = tmp_path / "repo"
+    shutil.copytree(FIXTURE_TEMPLATES["resources"], repo_root)
+    setup_git(repo_root, initialize=False)
+    subprocess.run(["git", "add", "."], cwd=repo_root, check=True)
+    subprocess.run(
+        ["git", "commit", "--quiet", "-m", "Add project"], cwd=repo_root, check=True
+    )
+    commit_hash = Git(repo_root).rev_parse("HEAD")
+    assert commit_hash is not None
+
+    rel_bundle_path = pathlib.Path(MAESTRO_BUNDLE_LOCATION) / "repo.bundle"
+    (maestro_root / MAESTRO_BUNDLE_LOCATION).mkdir(parents=True)
+    assert Git(repo_root).create_bundle("HEAD", maestro_root / rel_bundle_path)
+    return commit_hash, rel_bundle_path
+
+
+def _commit_file(repo_root: pathlib.Path, file_name: str) -> str:
+    (repo_root / file_name).touch()
+    subprocess.run(["git", "add", file_name], cwd=repo_root, check=True)
+    subprocess.run(
+        ["git", "commit", "--quiet", "-m", f"Add {file_name}"],
+        cwd=repo_root,
+        check=True,
+    )
+    commit_hash = Git(repo_root).rev_parse("HEAD")
+    assert commit_hash is not None
+    return commit_hash
+
+
+def _create_maestro(
+    tmp_path: pathlib.Path, max_concurrent_tasks: int
+) -> Tuple[Maestro, pathlib.Path]:
+    """
+    Creates a Maestro daemon with a workspace containing the resources fixture
+    project. Returns the daemon and the project's root.
+    """
+    maestro_root = tmp_path / "maestro"
+    workspace = maestro_root / MAESTRO_WORKSPACE_LOCATION / _WORKSPACE_NAME
+    workspace.mkdir(parents=True)
+    project_root = workspace / _PROJECT_ROOT
+    shutil.copytree(FIXTURE_TEMPLATES["resources"], project_root)
+    return Maestro(maestro_root, max_concurrent_tasks), project_root
+
+
+def _execute_tasks(
+    maestro: Maestro, project_root: pathlib.Path, raw_task_ids: List[str]
+) -> List[Tuple[Tuple[float, float], str]]:
+    """
+    Concurrently executes the given tasks using `maestro`. Returns each task's
+    execution interval and slot.
+    """
+    task_ids = [TaskIdentifier.from_str(raw_id) for raw_id in raw_task_ids]
+    versions = [
+        Version(timestamp=i + 1, commit_hash=None, has_uncommitted_changes=False)
+        for i in range(len(task_ids))
+    ]
+
+    async def execute_all():
+        await asyncio.gather(
+            *[
+                maestro.execute_task(
+                    _WORKSPACE_NAME,
+                    _PROJECT_ROOT,
+                    task_id,
+                    {},
+                    ExecuteTaskType.RunExperiment,
+                    version,
+                )
+                for task_id, version in zip(task_ids, versions)
+            ]
+        )
+
+    asyncio.run(execute_all())
+
+    ctx = Context(project_root)
+    results = []
+    for task_id, version in zip(task_ids, versions):
+        ctx.task_index.load_transitive_closure(task_id)
+        output_path = ctx.task_index.get_task(task_id).get_specific_output_path(
+            ctx, version
+        )
+        assert output_path is not None
+        results.append((_read_interval(output_path), _read(output_path / "slot.txt")))
+    return results
+
+
+def _read_interval(output_path: pathlib.Path) -> Tuple[float, float]:
+    return (
+        float(_read(output_path / "start.txt")),
+        float(_read(output_path / "end.txt")),
+    )
+
+
+def _read(path: pathlib.Path) -> str:
+    with open(path, encoding="UTF-8") as file:
+        return file.read().strip()
@@ -0,0 +1,68 @@
+import pathlib
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from conductor.execution.version_index import Version
+from conductor.task_identifier import TaskIdentifier
+from conductor.task_types.run import RunExperiment
+from .git_utils import create_commit, create_git_project
+
+
+def _create_experiment(ctx, name: str) -> RunExperiment:
+    return RunExperiment(
+        identifier=TaskIdentifier.from_str(f"//:{name}"),
+        cond_file_path=ctx.project_root / "COND",
+        deps=[],
+        run="exit 0",
+        args=[],
+        options={},
+        parallelizable=False,
+        env=None,
+    )
+
+
+def test_bulk_matches_individual(tmp_path: pathlib.Path):
+    project_root = tmp_path / "project"
+    ctx = create_git_project(project_root)
+    commit1 = create_commit(project_root, "C1")
+    commit2 = create_commit(project_root, "C2")
+    results = subprocess.run(
+        ["git", "checkout", "-b", "side", commit1], cwd=project_root, check=False
+    )
+    assert results.returncode == 0
+    side = create_commit(project_root, "Side")
+    results = subprocess.run(["git", "checkout", "-"], cwd=project_root, check=False)
+    assert results.returncode == 0
+    commit3 = create_commit(project_root, "C3")
+
+    names = ["ancestors", "non-ancestor", "null-only", "mixed", "override", "none"]
+    versions: Dict[str, List[Tuple[int, Optional[str]]]] = {
+        "ancestors": [(1, commit1), (2, commit2), (3, commit2)],
+        "non-ancestor": [(4, side)],
+        "null-only": [(5, None), (6, None)],
+        "mixed": [(7, None), (8, side)],
+        "override": [(9, commit2), (10, commit1)],
+        "none": [],
+    }
+    for name, task_versions in versions.items():
+        for timestamp, commit in task_versions:
+            ctx.version_index.insert_output_version(
+                TaskIdentifier.from_str(f"//:{name}"), Version(timestamp, commit, False)
+            )
+    ctx.version_index.set_version_override(TaskIdentifier.from_str("//:override"), 10)
+    ctx.version_index.commit_changes()
+
+    individual: List[RunExperiment] = [_create_experiment(ctx, n) for n in names]
+    bulk: List[RunExperiment] = [_create_experiment(ctx, n) for n in names]
+    RunExperiment.compute_most_relevant_versions(ctx, bulk)
+
+    for single_task, bulk_task in zip(individual, bulk):
+        assert single_task.get_output_version(ctx) == bulk_task.get_output_version(ctx)
+
+    def timestamp_of(task: RunExperiment):
+        version = task.get_output_version(ctx)
+        return version.timestamp if version is not None else None
+
+    assert ctx.current_commit is not None
+    assert ctx.current_commit.hash == commit3
+    assert [timestamp_of(task) for task in bulk] == [3, None, 6, None, 10, None]
@@ -0,0 +1,176 @@
+import pathlib
+import shutil
+import threading
+from typing import List
+
+import pytest
+
+from conductor.config import BLOB_STORE_DIR
+from conductor.context import Context
+from conductor.execution.blob_store import BlobStore, DeduplicationResult
+from conductor.execution.executor import Executor
+from conductor.execution.planning.planner import ExecutionPlanner
+from conductor.task_identifier import TaskIdentifier
+from conductor.utils.output_archiving import platform_archive_type
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+_MiB = 1024 * 1024
+
+
+def test_repeated_versions_share_files(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["dedup"])
+    version_dirs = _run_versions(cond, 2)
+
+    # Identical files are deduplicated, files that differ are not.
+    assert _same_file(version_dirs[0] / "data.bin", version_dirs[1] / "data.bin")
+    assert not _same_file(
+        version_dirs[0] / "result.txt", version_dirs[1] / "result.txt"
+    )
+    assert (version_dirs[0] / "data.bin").stat().st_nlink == 3
+    assert len(_blob_store(cond).blob_names_by_file_id()) > 0
+
+
+def test_archive_stores_shared_files_once(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["dedup"])
+    _run_versions(cond, 3)
+    data = (_find_version_dirs(cond)[0] / "data.bin").read_bytes()
+
+    archive_path = tmp_path / "archive.tar.{}".format(
+        platform_archive_type().extension()
+    )
+    result = cond.archive("//:sweep", output_path=archive_path, latest=False)
+    assert result.returncode == 0
+    # The data file is incompressible, so three copies would take up 3 MiB.
+    assert archive_path.stat().st_size < 2 * _MiB
+
+    shutil.rmtree(cond.output_path)
+    result = cond.restore(archive_path, strict=True)
+    assert result.returncode == 0
+
+    # The restored versions still share the file (through the blob store).
+    version_dirs = _find_version_dirs(cond)
+    assert len(version_dirs) == 3
+    for version_dir in version_dirs:
+        assert (version_dir / "data.bin").read_bytes() == data
+        assert _same_file(version_dirs[0] / "data.bin", version_dir / "data.bin")
+    assert len(_blob_store(cond).blob_names_by_file_id()) > 0
+
+
+def test_deduplicates_in_background(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["dedup"])
+    _run_versions(cond, 1)
+
+    deduplicated_on: List[threading.Thread] = []
+    deduplicate = BlobStore.deduplicate
+
+    def recording_deduplicate(
+        self: BlobStore, path: pathlib.Path
+    ) -> DeduplicationResult:
+        deduplicated_on.append(threading.current_thread())
+        return deduplicate(self, path)
+
+    monkeypatch.setattr(BlobStore, "deduplicate", recording_deduplicate)
+
+    ctx = Context(cond.project_root)
+    task_id = TaskIdentifier.from_str("//:sweep")
+    ctx.task_index.load_transitive_closure(task_id)
+    plan = ExecutionPlanner(ctx).create_plan_for(task_id, run_again=True)
+    Executor(execution_slots=1, silent=True).run_plan(plan, ctx)
+
+    # The new version's outputs are deduplicated off the main thread, before
+    # the plan finishes running.
+    assert len(deduplicated_on) == 1
+    assert deduplicated_on[0] is not threading.main_thread()
+    version_dirs = _find_version_dirs(cond)
+    assert len(version_dirs) == 2
+    assert _same_file(version_dirs[0] / "data.bin", version_dirs[1] / "data.bin")
+
+
+def test_gc_removes_unreferenced_blobs(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["dedup"])
+    version_dirs = _run_versions(cond, 2)
+    blob_store = _blob_store(cond)
+    num_blobs = len(blob_store.blob_names_by_file_id())
+
+    # The second version's unique files are no longer used.
+    shutil.rmtree(version_dirs[1])
+    result = cond.gc(dry_run=True)
+    assert result.returncode == 0
+    assert len(blob_store.blob_names_by_file_id()) == num_blobs
+
+    result = cond.gc()
+    assert result.returncode == 0
+    assert len(blob_store.blob_names_by_file_id()) < num_blobs
+    assert len(blob_store.unreferenced_blobs()) == 0
+    # The remaining version is intact.
+    assert (version_dirs[0] / "data.bin").stat().st_size == _MiB
+    assert (version_dirs[0] / "data.bin").stat().st_nlink == 2
+
+    shutil.rmtree(version_dirs[0])
+    result = cond.gc()
+    assert result.returncode == 0
+    assert len(blob_store.blob_names_by_file_id()) == 0
+
+
+def test_gc_removes_failed_tasks_in_blobs_directory(tmp_path: pathlib.Path):
+    # The project has a directory named "blobs" (its task outputs are stored
+    # alongside the blob store).
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["dedup"])
+    _run_versions(cond, 1)
+    result = cond.run("//blobs:fails")
+    assert result.returncode != 0
+    assert cond.find_task_output_dir("//blobs:fails") is not None
+
+    result = cond.gc()
+    assert result.returncode == 0
+    assert cond.find_task_output_dir("//blobs:fails") is None
+    assert len(_blob_store(cond).blob_names_by_file_id()) > 0
+    assert len(_find_version_dirs(cond)) == 1
+
+
+def test_deduplicate_skips_different_permissions(tmp_path: pathlib.Path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (output_dir / "a.sh").write_text("echo hello\n")
+    (output_dir / "b.sh").write_text("echo hello\n")
+    (output_dir / "c.sh").write_text("echo hello\n")
+    (output_dir / "c.sh").chmod(0o755)
+    (output_dir / "empty.txt").touch()
+
+    result = blob_store.deduplicate(output_dir)
+    assert result.num_deduplicated == 1
+    assert result.num_bytes_saved == len("echo hello\n")
+    assert _same_file(output_dir / "a.sh", output_dir / "b.sh")
+    # Linked files share their permissions, so `c.sh` is left as it is.
+    assert not _same_file(output_dir / "a.sh", output_dir / "c.sh")
+    assert (output_dir / "empty.txt").stat().st_nlink == 1
+
+    # Deduplicating again does not change anything.
+    assert blob_store.deduplicate(output_dir).num_deduplicated == 0
+
+
+def _run_versions(cond: ConductorRunner, num_versions: int) -> List[pathlib.Path]:
+    for _ in range(num_versions):
+        result = cond.run("//:sweep", again=True)
+        assert result.returncode == 0
+    version_dirs = _find_version_dirs(cond)
+    assert len(version_dirs) == num_versions
+    return version_dirs
+
+
+def _find_version_dirs(cond: ConductorRunner) -> List[pathlib.Path]:
+    return sorted(
+        cond.output_path.glob("sweep.task.*"),
+        key=lambda path: int(path.name.split(".")[-1]),
+    )
+
+
+def _blob_store(cond: ConductorRunner) -> BlobStore:
+    return BlobStore(cond.output_path / BLOB_STORE_DIR)
+
+
+def _same_file(path1: pathlib.Path, path2: pathlib.Path) -> bool:
+    return path1.samefile(path2)
@@ -0,0 +1,91 @@
+import pathlib
+from typing import List, Tuple
+
+from conductor.config import TASK_OUTPUT_DIR_SUFFIX
+from .conductor_runner import ConductorRunner, FIXTURE_TEMPLATES
+
+
+def read_intervals(
+    outputs: pathlib.Path, names: List[str]
+) -> List[Tuple[float, float]]:
+    intervals = []
+    for name in names:
+        with open(outputs / name / "start.txt", encoding="UTF-8") as f:
+            start = float(f.read().strip())
+        with open(outputs / name / "end.txt", encoding="UTF-8") as f:
+            end = float(f.read().strip())
+        intervals.append((start, end))
+    return intervals
+
+
+def max_concurrency(intervals: List[Tuple[float, float]]) -> int:
+    events = []
+    for start, end in intervals:
+        events.append((start, 1))
+        events.append((end, -1))
+    # Process ends before starts at the same timestamp.
+    events.sort(key=lambda event: (event[0], event[1]))
+    curr = 0
+    result = 0
+    for _, delta in events:
+        curr += delta
+        result = max(result, curr)
+    return result
+
+
+def test_resources_exclusive(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["resources"])
+    result = cond.run("//:exclusive", jobs=3)
+    assert result.returncode == 0
+
+    outputs = cond.output_path / ("exclusive" + TASK_OUTPUT_DIR_SUFFIX)
+    intervals = read_intervals(outputs, ["exclusive-{}".format(i) for i in range(3)])
+    # Each task requests the only "lock", so they cannot run concurrently even
+    # though there are enough slots.
+    assert max_concurrency(intervals) == 1
+
+
+def test_resources_shared(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["resources"])
+    result = cond.run("//:shared", jobs=4)
+    assert result.returncode == 0
+
+    outputs = cond.output_path / ("shared" + TASK_OUTPUT_DIR_SUFFIX)
+    intervals = read_intervals(outputs, ["shared-{}".format(i) for i in range(4)])
+    # Each task requests half of the "lock", so at most two run concurrently.
+    assert max_concurrency(intervals) <= 2
+
+
+def test_resources_exceeding_capacity(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["resources"])
+    result = cond.run("//:too_large", jobs=2)
+    assert result.returncode != 0
+    assert cond.find_task_output_dir("//:too_large") is None
+
+    # Resources without a configured capacity have no capacity.
+    result = cond.run("//:unknown_resource", jobs=2)
+    assert result.returncode != 0
+    assert cond.find_task_output_dir("//:unknown_resource") is None
+
+
+def test_resources_invalid(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["resources"])
+    result = cond.run("//:invalid")
+    assert result.returncode != 0
+
+
+def test_mutex(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["resources"])
+    result = cond.run("//:mutex_and_independent", jobs=4)
+    assert result.returncode == 0
+
+    outputs = cond.output_path / ("mutex" + TASK_OUTPUT_DIR_SUFFIX)
+    mutex_intervals = read_intervals(outputs, ["mutex-{}".format(i) for i in range(3)])
+    # Tasks in the same mutex group cannot run concurrently...
+    assert max_concurrency(mutex_intervals) == 1
+
+    # ...but they do not prevent other parallelizable tasks from running.
+    independent_dir = cond.find_task_output_dir("//:independent")
+    assert independent_dir is not None
+    independent = read_intervals(independent_dir.parent, [independent_dir.name])[0]
+    assert max_concurrency([*mutex_intervals, independent]) == 2
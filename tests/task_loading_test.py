@@ -1,7 +1,14 @@
+import concurrent.futures
 import pathlib
 import pytest
 import subprocess
+from typing import List
+from unittest.mock import patch
+from conductor.parsing.parse_cache import CondParseCache
 from conductor.parsing.task_index import TaskIndex
+from conductor.parsing.task_loader import TaskLoader
+from conductor.task_identifier import TaskIdentifier
+from conductor.task_types.run import RunExperiment
 from conductor.utils.git import Git
 from conductor.errors import CyclicDependency, TaskNotFound
 
@@ -67,3 +74,92 @@ def test_missing_deps_loading(tmp_path: pathlib.Path):
     with pytest.raises(TaskNotFound) as ex:
         task_index.validate_all_loaded_tasks()
         assert ex.value.task_identifier == "//mod2:test2"
+
+
+def test_parse_cache(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["include"])
+    cache_path = tmp_path / "parse_cache.sqlite"
+    exp1 = TaskIdentifier.from_str("//sharing/exp1:exp1")
+
+    def load_exp1_args(expect_cached: bool) -> List[str]:
+        task_index = TaskIndex(
+            cond.project_root,
+            parse_cache=CondParseCache(cond.project_root, cache_path),
+        )
+        with patch.object(
+            TaskLoader,
+            "parse_cond_file",
+            autospec=True,
+            side_effect=TaskLoader.parse_cond_file,
+        ) as parse:
+            task_index.load_single_task(exp1)
+            assert parse.called != expect_cached
+        task = task_index.get_task(exp1)
+        assert isinstance(task, RunExperiment)
+        return task.args.serialize_str_list()
+
+    assert load_exp1_args(expect_cached=False) == ["exp1", "1460"]
+    assert load_exp1_args(expect_cached=True) == ["exp1", "1460"]
+
+    # Changing an included file should invalidate the cached entry.
+    common2 = cond.project_root / "sharing" / "common2.cond"
+    with open(common2, "w", encoding="UTF-8") as file:
+        file.write("VALUE2 = 1\n")
+    assert load_exp1_args(expect_cached=False) == ["exp1", "124"]
+    assert load_exp1_args(expect_cached=True) == ["exp1", "124"]
+
+
+def test_parallel_loading(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, FIXTURE_TEMPLATES["missing-deps"])
+    # Add a COND file that cannot be parsed.
+    broken = cond.project_root / "broken"
+    broken.mkdir()
+    with open(broken / "COND", "w", encoding="UTF-8") as file:
+        file.write("run_command(name=123)\n")
+    setup_git(cond.project_root, initialize=True)
+    result = subprocess.run(["git", "add", "."], cwd=cond.project_root, check=False)
+    assert result.returncode == 0
+    create_commit(cond.project_root, "Add project files")
+
+    git = Git(cond.project_root)
+    serial_results = TaskIndex(cond.project_root).load_all_known_tasks(git)
+    task_index = TaskIndex(cond.project_root)
+    with patch(
+        "concurrent.futures.ProcessPoolExecutor",
+        wraps=concurrent.futures.ProcessPoolExecutor,
+    ) as pool_class:
+        parallel_results = task_index.load_all_known_tasks(git, num_workers=4)
+    # The workers are not forked (the caller may be multithreaded, e.g., the
+    # explorer's web server).
+    assert pool_class.call_count == 1
+    assert pool_class.call_args.kwargs["mp_context"].get_start_method() != "fork"
+
+    assert len(parallel_results) == 9
+    for serial, parallel in zip(serial_results, parallel_results):
+        assert serial[0] == parallel[0]
+        assert serial[1] == parallel[1]
+        if serial[2] is None:
+            assert parallel[2] is None
+        else:
+            assert parallel[2] is not None
+            assert serial[2].error_code == parallel[2].error_code
+            assert serial[2].printable_message() == parallel[2].printable_message()
+
+    num_loaded_tasks = sum([num_loaded for _, num_loaded, _ in parallel_results])
+    assert num_loaded_tasks == 15
+    with pytest.raises(TaskNotFound):
+        task_index.validate_all_loaded_tasks()
+
+
+def test_parallel_transitive_closure(tmp_path: pathlib.Path):
+    cond = ConductorRunner.from_template(tmp_path, EXAMPLE_TEMPLATES["dependencies"])
+    task_index = TaskIndex(cond.project_root)
+    task_index.load_transitive_closure(
+        TaskIdentifier.from_str("//figures:graph"), num_workers=4
+    )
+    loaded = {str(task_id) for task_id in task_index.get_all_loaded_tasks().keys()}
+    assert loaded == {
+        "//figures:graph",
+        "//experiments:run_benchmark",
+        "//experiments:build",
+    }
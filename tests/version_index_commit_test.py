@@ -0,0 +1,107 @@
+import pathlib
+import sqlite3
+
+import pytest
+
+import conductor.execution.version_index as vi
+from conductor.config import VERSION_INDEX_NAME
+from conductor.execution.version_index import Version, VersionIndex
+from conductor.task_identifier import TaskIdentifier
+
+
+def test_write_ahead_log(tmp_path: pathlib.Path):
+    index_path = tmp_path / VERSION_INDEX_NAME
+    index = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+    assert _journal_mode(index_path) == "wal"
+
+    # Readers can use the index while it has uncommitted changes.
+    task_id = TaskIdentifier.from_str("//:exp")
+    version = index.generate_new_output_version(commit=None)
+    index.insert_output_version(task_id, version)
+    assert _num_versions(index_path) == 0
+    index.commit_changes()
+    assert _num_versions(index_path) == 1
+
+    # Archive indexes do not use the write-ahead log.
+    archive_index_path = tmp_path / "archive.sqlite"
+    VersionIndex.create_or_load(archive_index_path)
+    assert _journal_mode(archive_index_path) == "delete"
+
+
+def test_group_commit(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(vi, "VERSION_INDEX_GROUP_COMMIT_WINDOW_S", 60.0)
+    index_path = tmp_path / VERSION_INDEX_NAME
+    index = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+    assert index.group_commit_due_in() is None
+
+    task_id = TaskIdentifier.from_str("//:exp")
+    for _ in range(3):
+        version = index.generate_new_output_version(commit=None)
+        index.insert_output_version(task_id, version)
+        index.group_commit_changes()
+
+    # The changes are committed together once the group is due.
+    due_in = index.group_commit_due_in()
+    assert due_in is not None and 0 < due_in <= 60.0
+    assert _num_versions(index_path) == 0
+    index.commit_changes()
+    assert index.group_commit_due_in() is None
+    assert _num_versions(index_path) == 3
+
+    # Changes made after the window elapses are committed right away.
+    monkeypatch.setattr(vi, "VERSION_INDEX_GROUP_COMMIT_WINDOW_S", 0.0)
+    version = index.generate_new_output_version(commit=None)
+    index.insert_output_version(task_id, version)
+    index.group_commit_changes()
+    assert index.group_commit_due_in() is None
+    assert _num_versions(index_path) == 4
+
+
+def test_shared_version_allocation(tmp_path: pathlib.Path):
+    # Separate processes that share a project open separate indexes.
+    index_path = tmp_path / VERSION_INDEX_NAME
+    index1 = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+    index2 = VersionIndex.create_or_load(index_path, write_ahead_log=True)
+
+    timestamps = []
+    for _ in range(3):
+        timestamps.append(index1.generate_new_output_version(commit=None).timestamp)
+        timestamps.append(index2.generate_new_output_version(commit=None).timestamp)
+    assert timestamps == sorted(set(timestamps))
+
+    # Allocations made while there are uncommitted changes are committed along
+    # with them.
+    task_id = TaskIdentifier.from_str("//:exp")
+    version = index1.generate_new_output_version(commit=None)
+    index1.insert_output_version(task_id, version)
+    next_version = index1.generate_new_output_version(commit=None)
+    index1.commit_changes()
+    assert next_version.timestamp > version.timestamp
+    assert index2.generate_new_output_version(commit=None).timestamp > (
+        next_version.timestamp
+    )
+
+    # Versions that are inserted (e.g., restored from an archive) are not
+    # allocated again.
+    restored = Version(next_version.timestamp + 1000, None, False)
+    index1.insert_output_version(task_id, restored)
+    index1.commit_changes()
+    assert index2.generate_new_output_version(commit=None).timestamp == (
+        restored.timestamp + 1
+    )
+
+
+def _journal_mode(index_path: pathlib.Path) -> str:
+    conn = sqlite3.connect(index_path)
+    try:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _num_versions(index_path: pathlib.Path) -> int:
+    conn = sqlite3.connect(index_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM version_index").fetchone()[0]
+    finally:
+        conn.close()
@@ -1,9 +1,10 @@
 import pathlib
 import sqlite3
+import time
 from typing import Iterable, Tuple, Optional
 import conductor.execution.version_index_queries as q
 from conductor.config import VERSION_INDEX_BACKUP_NAME_TEMPLATE, VERSION_INDEX_NAME
-from conductor.execution.version_index import VersionIndex
+from conductor.execution.version_index import TaskExecution, VersionIndex
 from conductor.errors import CorruptedVersionIndex
 from conductor.task_identifier import TaskIdentifier
 import pytest
@@ -177,6 +178,154 @@ def test_get_version_override_raises_for_corrupt_reference(tmp_path: pathlib.Pat
         vindex.get_version_override(task_id)
 
 
+def test_v3_to_v4_upgrade_e2e(tmp_path: pathlib.Path):
+    test_versions = [
+        ("//:test1", 100, None, 0),
+        ("//:test2", 200, "abc123", 1),
+    ]
+    version_index_path = tmp_path / VERSION_INDEX_NAME
+
+    # Create an existing version index (format 3).
+    create_v3_version_index(version_index_path, test_versions)
+
+    # Migration should automatically run.
+    vindex = VersionIndex.create_or_load(version_index_path)
+
+    # The backup version index should still exist.
+    assert (
+        tmp_path / VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=3, vto=4)
+    ).is_file()
+
+    # Should be able to read all the versions from the upgraded index.
+    all_versions = vindex.get_all_versions()
+    assert len(test_versions) == len(all_versions)
+    for expected, actual in zip(test_versions, all_versions):
+        assert expected[0] == str(actual[0])
+        assert expected[1] == actual[1].timestamp
+
+    # Should be able to record and read task executions.
+    task_id = TaskIdentifier.from_str("//:test1")
+    assert len(vindex.get_task_executions()) == 0
+    vindex.insert_task_execution(
+        task_id,
+        TaskExecution(
+            finished_at=1000.5,
+            wall_time_s=12.5,
+            cpu_time_s=3.0,
+            peak_rss_kb=2048,
+            output_bytes=None,
+            version_timestamp=100,
+        ),
+    )
+    vindex.commit_changes()
+
+    executions = vindex.get_task_executions([task_id])
+    assert list(executions.keys()) == [task_id]
+    assert len(executions[task_id]) == 1
+    execution = executions[task_id][0]
+    assert execution.finished_at == 1000.5
+    assert execution.wall_time_s == 12.5
+    assert execution.cpu_time_s == 3.0
+    assert execution.peak_rss_kb == 2048
+    assert execution.output_bytes is None
+    assert execution.version_timestamp == 100
+    assert len(vindex.get_task_executions([TaskIdentifier.from_str("//:test2")])) == 0
+
+
+def test_v4_to_v5_upgrade_e2e(tmp_path: pathlib.Path):
+    test_versions = [
+        ("//:test1", 100, None, 0),
+        ("//:test1", 200, "abc123", 1),
+    ]
+    version_index_path = tmp_path / VERSION_INDEX_NAME
+
+    # Create an existing version index (format 4).
+    create_v4_version_index(version_index_path, test_versions)
+
+    # Migration should automatically run.
+    vindex = VersionIndex.create_or_load(version_index_path)
+
+    # The backup version index should still exist.
+    assert (
+        tmp_path / VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=4, vto=5)
+    ).is_file()
+
+    # Existing versions do not have a fingerprint.
+    task_id = TaskIdentifier.from_str("//:test1")
+    versions = vindex.get_all_versions_for_task(task_id)
+    assert len(versions) == 2
+    for version in versions:
+        assert vindex.get_version_fingerprint(task_id, version) is None
+    assert vindex.get_latest_version_with_fingerprint(task_id, "abcd") is None
+
+    # Should be able to record and look up fingerprints.
+    for version in versions:
+        vindex.set_version_fingerprint(task_id, version, "abcd")
+    vindex.commit_changes()
+    latest = vindex.get_latest_version_with_fingerprint(task_id, "abcd")
+    assert latest is not None
+    assert latest.timestamp == 200
+    assert vindex.get_latest_version_with_fingerprint(task_id, "efgh") is None
+
+
+def test_v5_to_v6_upgrade_e2e(tmp_path: pathlib.Path):
+    # N.B. The newest version is in the future, so a new version would reuse
+    # its timestamp if the allocator was not initialized with it.
+    future_timestamp = int(time.time()) + 1000
+    test_versions = [
+        ("//:test1", 100, None, 0),
+        ("//:test2", future_timestamp, "abc123", 1),
+    ]
+    version_index_path = tmp_path / VERSION_INDEX_NAME
+
+    # Create an existing version index (format 5).
+    create_v5_version_index(version_index_path, test_versions)
+
+    # Migration should automatically run.
+    vindex = VersionIndex.create_or_load(version_index_path)
+
+    # The backup version index should still exist.
+    assert (
+        tmp_path / VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=5, vto=6)
+    ).is_file()
+
+    # Existing versions should be preserved.
+    assert len(vindex.get_all_versions()) == 2
+
+    # New versions should come after the existing ones.
+    version = vindex.generate_new_output_version(commit=None)
+    assert version.timestamp == future_timestamp + 1
+
+
+def test_v6_to_v7_upgrade_e2e(tmp_path: pathlib.Path):
+    test_versions = [
+        ("//:test1", 100, None, 0),
+        ("//:test1", 200, "abc123", 1),
+    ]
+    version_index_path = tmp_path / VERSION_INDEX_NAME
+
+    # Create an existing version index (format 6).
+    create_v6_version_index(version_index_path, test_versions)
+
+    # Migration should automatically run.
+    vindex = VersionIndex.create_or_load(version_index_path)
+
+    # The backup version index should still exist.
+    assert (
+        tmp_path / VERSION_INDEX_BACKUP_NAME_TEMPLATE.format(vfrom=6, vto=7)
+    ).is_file()
+
+    # Existing versions should be preserved.
+    assert len(vindex.get_all_versions()) == 2
+
+    # Should be able to acquire and release execution leases.
+    task_id = TaskIdentifier.from_str("//:test1")
+    assert vindex.try_acquire_execution_lease(task_id, "abcd")
+    vindex.release_execution_lease(task_id, "abcd")
+    vindex.commit_changes()
+    assert not vindex.must_wait_for_execution_lease(task_id, "abcd")
+
+
 def create_v1_version_index(
     filepath: pathlib.Path, entries: Iterable[Tuple[str, int, str]]
 ):
@@ -195,3 +344,59 @@ def create_v2_version_index(
     conn.execute(q.set_format_version.format(version=2))
     conn.executemany(q.insert_new_version, entries)
     conn.commit()
+
+
+def create_v3_version_index(
+    filepath: pathlib.Path, entries: Iterable[Tuple[str, int, Optional[str], int]]
+):
+    conn = sqlite3.connect(filepath)
+    conn.execute(q.create_table)
+    conn.execute(q.create_version_overrides_table)
+    conn.execute(q.set_format_version.format(version=3))
+    conn.executemany(q.insert_new_version, entries)
+    conn.commit()
+
+
+def create_v4_version_index(
+    filepath: pathlib.Path, entries: Iterable[Tuple[str, int, Optional[str], int]]
+):
+    conn = sqlite3.connect(filepath)
+    conn.execute(q.create_table)
+    conn.execute(q.create_version_overrides_table)
+    conn.execute(q.create_task_executions_table)
+    conn.execute(q.create_task_executions_index)
+    conn.execute(q.set_format_version.format(version=4))
+    conn.executemany(q.insert_new_version, entries)
+    conn.commit()
+
+
+def create_v5_version_index(
+    filepath: pathlib.Path, entries: Iterable[Tuple[str, int, Optional[str], int]]
+):
+    conn = sqlite3.connect(filepath)
+    conn.execute(q.create_table)
+    conn.execute(q.create_version_overrides_table)
+    conn.execute(q.create_task_executions_table)
+    conn.execute(q.create_task_executions_index)
+    conn.execute(q.create_version_fingerprints_table)
+    conn.execute(q.create_version_fingerprints_index)
+    conn.execute(q.set_format_version.format(version=5))
+    conn.executemany(q.insert_new_version, entries)
+    conn.commit()
+
+
+def create_v6_version_index(
+    filepath: pathlib.Path, entries: Iterable[Tuple[str, int, Optional[str], int]]
+):
+    conn = sqlite3.connect(filepath)
+    conn.execute(q.create_table)
+    conn.execute(q.create_version_overrides_table)
+    conn.execute(q.create_task_executions_table)
+    conn.execute(q.create_task_executions_index)
+    conn.execute(q.create_version_fingerprints_table)
+    conn.execute(q.create_version_fingerprints_index)
+    conn.execute(q.create_version_allocator_table)
+    conn.execute(q.set_format_version.format(version=6))
+    conn.executemany(q.insert_new_version, entries)
+    conn.execute(q.initialize_version_allocator)
+    conn.commit()
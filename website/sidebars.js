@@ -41,7 +41,9 @@ module.exports = {
             'cli/where',
             'cli/clean',
             'cli/gc',
+            'cli/stats',
             'cli/explorer',
+            'cli/daemon',
           ],
         },
         'configuration',